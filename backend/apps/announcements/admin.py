@@ -1,7 +1,7 @@
 from django.contrib import admin
 from django.utils.html import format_html
 
-from .models import Announcement
+from .models import Announcement, AnnouncementDelivery
 
 
 @admin.register(Announcement)
@@ -52,3 +52,21 @@ class AnnouncementAdmin(admin.ModelAdmin):
         if not change:  # Only set creator on new objects
             obj.created_by = request.user
         super().save_model(request, obj, form, change)
+
+
+@admin.register(AnnouncementDelivery)
+class AnnouncementDeliveryAdmin(admin.ModelAdmin):
+    list_display = ["announcement", "status", "resolved", "started_by", "created_at", "finished_at"]
+    list_filter = ["status"]
+    search_fields = ["announcement__title"]
+    readonly_fields = [
+        "announcement",
+        "status",
+        "resolved",
+        "resolved_through",
+        "last_error",
+        "started_by",
+        "created_at",
+        "heartbeat_at",
+        "finished_at",
+    ]
@@ -5,3 +5,17 @@ class AnnouncementsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.announcements"
     verbose_name = "Announcements"
+
+    def ready(self):
+        from apps.ministries.models import Ministry
+        from common.cache import invalidate_on_change
+        from common.images import register_image_fields
+        from core.scheduler import register_job
+
+        from .models import Announcement
+        from .services import process_announcements
+
+        invalidate_on_change("public_announcements", Announcement, Ministry)
+        register_image_fields(Announcement, "photo")
+        # Short lease: a scheduler killed mid-run must not hold up dispatch for long
+        register_job("announcements.dispatch", "* * * * *", process_announcements, timeout=120)
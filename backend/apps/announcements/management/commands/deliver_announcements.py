@@ -0,0 +1,76 @@
+"""
+Management command that emails announcements when they are due.
+
+Every tick it dispatches scheduled announcements whose publish_at has passed,
+then runs pending delivery jobs: jobs that were never started
+(ANNOUNCEMENT_DELIVERY_MODE=off, or the process exited before the job ran)
+and jobs whose runner stopped sending heartbeats. Recipients already queued
+are not queued again. Several dispatchers can run at the same time.
+
+Runs as a long-lived worker by default, polling every
+ANNOUNCEMENT_DISPATCH_INTERVAL seconds; --once runs a single tick and exits
+(e.g. from cron).
+
+Usage:
+    python manage.py deliver_announcements
+    python manage.py deliver_announcements --once
+    python manage.py deliver_announcements --interval=5
+"""
+
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from apps.announcements.services import dispatch_due_announcements, resume_deliveries
+
+
+class Command(BaseCommand):
+    help = "Dispatch scheduled announcements and run pending or interrupted deliveries"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Dispatch and deliver what is due, then exit",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=None,
+            help="Seconds between ticks (default: ANNOUNCEMENT_DISPATCH_INTERVAL)",
+        )
+
+    def tick(self):
+        dispatched = dispatch_due_announcements()
+        if dispatched["dispatched"]:
+            self.stdout.write(
+                f"Dispatched {dispatched['dispatched']} scheduled announcement(s), "
+                f"up to {dispatched['max_lag_seconds']:.0f}s after publish_at"
+            )
+        deliveries = resume_deliveries()
+        for delivery in deliveries:
+            self.stdout.write(
+                f"Announcement {delivery.announcement_id}: {delivery.status} "
+                f"({delivery.recipients.count()} recipients)"
+            )
+        return deliveries
+
+    def handle(self, *args, **options):
+        interval = options["interval"]
+        if interval is None:
+            interval = getattr(settings, "ANNOUNCEMENT_DISPATCH_INTERVAL", 15)
+
+        total = 0
+        try:
+            while True:
+                total += len(self.tick())
+                if options["once"]:
+                    break
+                close_old_connections()
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write(self.style.SUCCESS(f"Done: {total} deliveries processed"))
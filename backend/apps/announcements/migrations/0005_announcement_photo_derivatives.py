@@ -0,0 +1,18 @@
+# Generated by Django 5.1.4 on 2026-10-19 04:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("announcements", "0004_alter_announcement_photo"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="announcement",
+            name="photo_derivatives",
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
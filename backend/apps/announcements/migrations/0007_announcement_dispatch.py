@@ -0,0 +1,25 @@
+# Generated by Django 5.1.4 on 2026-10-19 04:59
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("announcements", "0006_announcement_delivery"),
+        ("ministries", "0004_alter_ministrymember_options_remove_assignment_user_and_more"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="announcementdelivery",
+            name="scheduled",
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddIndex(
+            model_name="announcement",
+            index=models.Index(fields=["sent", "publish_at"], name="announcemen_sent_cfc508_idx"),
+        ),
+    ]
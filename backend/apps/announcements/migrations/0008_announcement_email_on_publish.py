@@ -0,0 +1,20 @@
+# Generated by Django 5.1.4 on 2026-10-19 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("announcements", "0007_announcement_dispatch"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="announcement",
+            name="email_on_publish",
+            field=models.BooleanField(
+                default=False, help_text="Email the audience when publish_at comes due"
+            ),
+        ),
+    ]
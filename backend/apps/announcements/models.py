@@ -27,6 +27,8 @@ class Announcement(models.Model):
         verbose_name="Photo",
         help_text="Optional photo for this announcement",
     )
+    # Resized copies generated by common.images (srcset + blur placeholder)
+    photo_derivatives = models.JSONField(default=dict, blank=True, editable=False)
     # Targeting (Feature #2: Group-specific messages)
     audience = models.CharField(
         max_length=20,
@@ -54,6 +56,9 @@ class Announcement(models.Model):
     # Status
     is_active = models.BooleanField(default=True)
     sent = models.BooleanField(default=False, help_text="Has email notification been sent")
+    email_on_publish = models.BooleanField(
+        default=False, help_text="Email the audience when publish_at comes due"
+    )
 
     # Metadata
     created_by = models.ForeignKey(
@@ -67,6 +72,8 @@ class Announcement(models.Model):
         indexes = [
             models.Index(fields=["-publish_at"]),
             models.Index(fields=["audience", "ministry"]),
+            # Scheduled dispatcher: unsent announcements by publish time
+            models.Index(fields=["sent", "publish_at"]),
         ]
 
     def __str__(self):
@@ -80,3 +87,78 @@ class Announcement(models.Model):
         if self.expire_at and self.expire_at < now:
             return False
         return True
+
+
+class AnnouncementDelivery(models.Model):
+    """
+    Email delivery job for an announcement (apps/announcements/services.py).
+
+    Recipients are resolved into DeliveryRecipient rows in chunks, then queued
+    in the email outbox in chunks. Both steps are idempotent, so a job that
+    stopped half way resumes without sending anyone a second copy.
+    """
+
+    STATUS_PENDING = "pending"
+    STATUS_RUNNING = "running"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pending"),
+        (STATUS_RUNNING, "Running"),
+        (STATUS_DONE, "Done"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    announcement = models.OneToOneField(
+        Announcement, on_delete=models.CASCADE, related_name="delivery"
+    )
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    # Resolution is done when every recipient up to this email has a row
+    resolved = models.BooleanField(default=False)
+    resolved_through = models.CharField(max_length=254, blank=True)
+    last_error = models.TextField(blank=True)
+    # Started by the scheduled dispatcher when publish_at came due (not send_now)
+    scheduled = models.BooleanField(default=False)
+    started_by = models.ForeignKey(
+        User, null=True, blank=True, on_delete=models.SET_NULL, related_name="+"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    # Updated after every chunk; a running job with an old heartbeat has died
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "announcement_deliveries"
+
+    def __str__(self):
+        return f"Delivery of {self.announcement_id} ({self.status})"
+
+
+class DeliveryRecipient(models.Model):
+    """One recipient of an announcement delivery and its outbox email."""
+
+    delivery = models.ForeignKey(
+        AnnouncementDelivery, on_delete=models.CASCADE, related_name="recipients"
+    )
+    email = models.EmailField()
+    # Set in the same transaction that creates the outbox row
+    queued_at = models.DateTimeField(null=True, blank=True)
+    outbox_email = models.ForeignKey(
+        "notifications.OutboxEmail",
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="+",
+    )
+
+    class Meta:
+        db_table = "announcement_delivery_recipients"
+        constraints = [
+            models.UniqueConstraint(fields=["delivery", "email"], name="unique_delivery_recipient"),
+        ]
+        indexes = [
+            models.Index(fields=["delivery", "queued_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.email} ({'queued' if self.queued_at else 'pending'})"
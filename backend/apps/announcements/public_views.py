@@ -10,6 +10,9 @@ from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from common.cache import cached_view
+from common.images import image_variants
+
 from .models import Announcement
 
 
@@ -18,6 +21,7 @@ class PublicAnnouncementSerializer(serializers.ModelSerializer):
 
     ministry_name = serializers.SerializerMethodField()
     photo = serializers.SerializerMethodField()
+    photo_variants = serializers.SerializerMethodField()
 
     class Meta:
         model = Announcement
@@ -26,6 +30,7 @@ class PublicAnnouncementSerializer(serializers.ModelSerializer):
             "title",
             "body",
             "photo",
+            "photo_variants",
             "audience",
             "ministry_name",
             "publish_at",
@@ -39,16 +44,46 @@ class PublicAnnouncementSerializer(serializers.ModelSerializer):
             return obj.photo.url
         return None
 
+    def get_photo_variants(self, obj):
+        """Responsive srcset (WebP/JPEG) and blur placeholder, once generated."""
+        return image_variants(obj, "photo")
+
     def get_ministry_name(self, obj):
         return obj.ministry.name if obj.ministry else None
 
 
+def get_public_announcements(ministry_id=None, limit=10):
+    """
+    Published announcements for the public site.
+    Shared by the public API and the homepage bundle publisher.
+    """
+    now = timezone.now()
+
+    # Base queryset: active, published, not expired
+    queryset = (
+        Announcement.objects.select_related("ministry")
+        .filter(is_active=True, publish_at__lte=now)
+        .filter(Q(expire_at__isnull=True) | Q(expire_at__gt=now))
+    )
+
+    if ministry_id:
+        queryset = queryset.filter(
+            Q(audience="all") | Q(audience="ministry", ministry_id=ministry_id)
+        )
+    else:
+        # If no ministry specified, only return "all" audience announcements
+        queryset = queryset.filter(audience="all")
+
+    return queryset.order_by("-publish_at")[:limit]
+
+
 class PublicAnnouncementsView(APIView):
     """
     GET /api/public/announcements/
 
     Public endpoint for fetching published announcements.
-    No authentication required.
+    No authentication required. Responses are cached per query string and
+    carry ETag/Last-Modified/Cache-Control headers (304 on revalidation).
 
     Query Parameters:
         ministry (int): Optional filter by ministry ID
@@ -57,33 +92,17 @@ class PublicAnnouncementsView(APIView):
 
     permission_classes = [AllowAny]
 
+    @cached_view("public_announcements", timeout=60, max_age=60, stale_while_revalidate=300)
     def get(self, request):
-        now = timezone.now()
-
-        # Base queryset: active, published, not expired
-        queryset = (
-            Announcement.objects.select_related("ministry")
-            .filter(is_active=True, publish_at__lte=now)
-            .filter(Q(expire_at__isnull=True) | Q(expire_at__gt=now))
-        )
-
-        # Filter by ministry if provided
-        ministry_id = request.query_params.get("ministry")
-        if ministry_id:
-            queryset = queryset.filter(
-                Q(audience="all") | Q(audience="ministry", ministry_id=ministry_id)
-            )
-        else:
-            # If no ministry specified, only return "all" audience announcements
-            queryset = queryset.filter(audience="all")
-
         # Apply limit
         try:
             limit = min(int(request.query_params.get("limit", 10)), 50)
         except (ValueError, TypeError):
             limit = 10
 
-        queryset = queryset.order_by("-publish_at")[:limit]
+        queryset = get_public_announcements(
+            ministry_id=request.query_params.get("ministry"), limit=limit
+        )
 
         serializer = PublicAnnouncementSerializer(queryset, many=True)
         return Response(
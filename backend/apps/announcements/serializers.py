@@ -26,6 +26,7 @@ class AnnouncementSerializer(serializers.ModelSerializer):
             "publish_at",
             "expire_at",
             "is_active",
+            "email_on_publish",
             "sent",
             "created_by",
             "created_by_name",
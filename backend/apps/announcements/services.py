@@ -1,54 +1,82 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
 
 from django.conf import settings
-from django.core.mail import send_mass_mail
+from django.db import close_old_connections, connection, transaction
+from django.db.models import Count, Exists, Min, OuterRef, Q
+from django.utils import timezone
 
 from apps.members.models import Member
+from apps.notifications.models import OutboxEmail
+from apps.notifications.outbox import queue_mass_email
 
+from .models import Announcement, AnnouncementDelivery, DeliveryRecipient
 
-def get_announcement_recipients(announcement):
-    """
-    Get recipient emails based on announcement audience.
-    Similar to how ministries/utils.py gets volunteers for rotation.
-    """
+logger = logging.getLogger(__name__)
+
+# Rows per resolve / queue step (each step is one short transaction)
+DELIVERY_CHUNK_SIZE = 500
+# A running delivery whose heartbeat is older than this is taken over
+DELIVERY_STALE_AFTER = timedelta(minutes=5)
+
+_executor = None
+
+
+def _recipient_source(announcement):
+    """Queryset and email field for the announcement's audience."""
     if announcement.audience == "all":
         # Get all active members with valid emails
-        return (
-            Member.objects.filter(is_active=True)
-            .exclude(email__isnull=True)
-            .exclude(email="")
-            .values_list("email", flat=True)
+        queryset = (
+            Member.objects.filter(is_active=True).exclude(email__isnull=True).exclude(email="")
         )
+        return queryset, "email"
 
     elif announcement.audience == "ministry" and announcement.ministry:
         # Get ministry members via MinistryMember → Member relationship
-        return (
+        queryset = (
             announcement.ministry.ministry_members.filter(is_active=True)
             .exclude(member__email__isnull=True)
             .exclude(member__email="")
-            .values_list("member__email", flat=True)
         )
+        return queryset, "member__email"
 
-    return []
+    return None, None
 
 
-def send_announcement_email(announcement):
+def get_announcement_recipients(announcement):
+    """
+    Get recipient emails based on announcement audience.
+    Similar to how ministries/utils.py gets volunteers for rotation.
     """
-    Send announcement via email to target audience.
-    Pattern copied from ministries/utils.py:_send_assignment_notification()
+    queryset, field = _recipient_source(announcement)
+    if queryset is None:
+        return Member.objects.none().values_list("email", flat=True)
+    return queryset.values_list(field, flat=True)
+
+
+def recipient_counts(announcement):
+    """
+    Size of the announcement's audience and how much of it an earlier send
+    already queued (a re-send only emails the rest).
+
+    Returns:
+        dict: {recipients, already_queued, new_recipients}
     """
-    recipients = list(get_announcement_recipients(announcement))
-    recipients = [email for email in recipients if email]  # Filter out empty emails
-
-    if not recipients:
-        return {
-            "success": False,
-            "message": "No recipients found",
-            "sent": 0,
-            "total": 0,
-        }
-
-    # Format subject and message (similar to ministries email pattern)
+    emails = get_announcement_recipients(announcement).distinct()
+    total = emails.count()
+    already_queued = DeliveryRecipient.objects.filter(
+        delivery__announcement=announcement, queued_at__isnull=False, email__in=emails
+    ).count()
+    return {
+        "recipients": total,
+        "already_queued": already_queued,
+        "new_recipients": total - already_queued,
+    }
+
+
+def build_announcement_email(announcement):
+    """Subject and plain-text body of the announcement email."""
     subject = f"[Announcement] {announcement.title}"
 
     # Build message body
@@ -66,31 +94,304 @@ def send_announcement_email(announcement):
 Santa Cruz Bible Christian Church
 Posted: {announcement.publish_at.strftime("%A, %B %d, %Y")}
     """.strip()
+    return subject, message
+
+
+def announce_in_app(announcement):
+    """In-app notification to all users (stored once) for a sent announcement."""
+    from apps.notifications.models import Notification
+    from apps.notifications.services import broadcast_notification
+
+    broadcast_notification(
+        audience=Notification.AUDIENCE_ALL,
+        notification_type="announcement",
+        title=f"📢 {announcement.title}",
+        message=(
+            announcement.body[:100] + "..." if len(announcement.body) > 100 else announcement.body
+        ),
+        link="/announcements",
+    )
+
+
+# ============ Delivery jobs ============
+
+
+def start_delivery(announcement, user=None):
+    """
+    Create (or re-open) the announcement's delivery job and run it in the
+    background after the current transaction commits.
+
+    Re-opening a finished job only reaches recipients added since; nobody
+    who was already queued gets a second email.
+
+    Returns:
+        tuple: (AnnouncementDelivery, created)
+    """
+    delivery, created = AnnouncementDelivery.objects.get_or_create(
+        announcement=announcement, defaults={"started_by": user}
+    )
+    if not created and delivery.status != AnnouncementDelivery.STATUS_RUNNING:
+        delivery.status = AnnouncementDelivery.STATUS_PENDING
+        delivery.resolved = False
+        delivery.resolved_through = ""
+        delivery.last_error = ""
+        delivery.finished_at = None
+        delivery.save(
+            update_fields=["status", "resolved", "resolved_through", "last_error", "finished_at"]
+        )
+    schedule_delivery(delivery.pk)
+    return delivery, created
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="announcement-delivery")
+    return _executor
 
-    from_email = settings.DEFAULT_FROM_EMAIL
 
+def _run_in_thread(delivery_id):
     try:
-        # Use send_mass_mail for bulk sending (like ministries/utils.py)
-        messages = [(subject, message, from_email, [email]) for email in recipients]
+        run_delivery(delivery_id)
+    except Exception:
+        logger.exception(f"Announcement delivery {delivery_id} crashed")
+    finally:
+        close_old_connections()
 
-        sent_count = send_mass_mail(messages, fail_silently=False)
 
-        # Mark as sent
+def schedule_delivery(delivery_id):
+    """Run a delivery job after commit, per ANNOUNCEMENT_DELIVERY_MODE (thread/sync/off)."""
+    mode = getattr(settings, "ANNOUNCEMENT_DELIVERY_MODE", "thread")
+    if mode == "off":
+        return
+    if mode == "sync":
+        transaction.on_commit(lambda: run_delivery(delivery_id))
+    else:
+        transaction.on_commit(lambda: _get_executor().submit(_run_in_thread, delivery_id))
+
+
+def _claim(delivery_id):
+    """Take the job lease; False if another live runner holds it."""
+    now = timezone.now()
+    return bool(
+        AnnouncementDelivery.objects.filter(pk=delivery_id)
+        .filter(
+            Q(status=AnnouncementDelivery.STATUS_PENDING)
+            | Q(
+                status=AnnouncementDelivery.STATUS_RUNNING,
+                heartbeat_at__lt=now - DELIVERY_STALE_AFTER,
+            )
+        )
+        .update(status=AnnouncementDelivery.STATUS_RUNNING, heartbeat_at=now)
+    )
+
+
+def _resolve_recipients(delivery, chunk_size):
+    """Copy recipients into DeliveryRecipient rows, keyset-paginated by email."""
+    queryset, field = _recipient_source(delivery.announcement)
+    while not delivery.resolved:
+        emails = []
+        if queryset is not None:
+            emails = list(
+                queryset.filter(**{f"{field}__gt": delivery.resolved_through})
+                .order_by(field)
+                .values_list(field, flat=True)
+                .distinct()[:chunk_size]
+            )
+        with transaction.atomic():
+            DeliveryRecipient.objects.bulk_create(
+                [DeliveryRecipient(delivery=delivery, email=email) for email in emails],
+                ignore_conflicts=True,
+            )
+            if emails:
+                delivery.resolved_through = emails[-1]
+            delivery.resolved = len(emails) < chunk_size
+            delivery.heartbeat_at = timezone.now()
+            delivery.save(update_fields=["resolved", "resolved_through", "heartbeat_at"])
+
+
+def _queue_recipients(delivery, chunk_size):
+    """Queue outbox emails for unqueued recipients, one transaction per chunk."""
+    subject, message = build_announcement_email(delivery.announcement)
+    from_email = settings.DEFAULT_FROM_EMAIL
+    while True:
+        with transaction.atomic():
+            batch = list(
+                delivery.recipients.filter(queued_at__isnull=True).order_by("id")[:chunk_size]
+            )
+            if not batch:
+                return
+            # Outbox rows and queued_at commit together: a crash either
+            # leaves the chunk unqueued or fully queued, never sent twice
+            rows = queue_mass_email(
+                [(subject, message, from_email, [r.email]) for r in batch], kind="announcement"
+            )
+            now = timezone.now()
+            for recipient, row in zip(batch, rows):
+                recipient.queued_at = now
+                recipient.outbox_email = row
+            DeliveryRecipient.objects.bulk_update(batch, ["queued_at", "outbox_email"])
+            AnnouncementDelivery.objects.filter(pk=delivery.pk).update(heartbeat_at=now)
+
+
+def run_delivery(delivery_id, chunk_size=None):
+    """
+    Resolve and queue an announcement delivery, resuming where it stopped.
+
+    Returns:
+        AnnouncementDelivery, or None if another runner holds the job
+    """
+    if not _claim(delivery_id):
+        return None
+
+    chunk_size = chunk_size or DELIVERY_CHUNK_SIZE
+    delivery = AnnouncementDelivery.objects.select_related(
+        "announcement", "announcement__ministry"
+    ).get(pk=delivery_id)
+    try:
+        _resolve_recipients(delivery, chunk_size)
+        _queue_recipients(delivery, chunk_size)
+    except Exception as e:
+        logger.exception(f"Announcement delivery {delivery_id} failed")
+        delivery.status = AnnouncementDelivery.STATUS_FAILED
+        delivery.last_error = str(e)[:1000]
+        delivery.save(update_fields=["status", "last_error"])
+        return delivery
+
+    with transaction.atomic():
+        announcement = delivery.announcement
         announcement.sent = True
         announcement.save(update_fields=["sent"])
+        delivery.status = AnnouncementDelivery.STATUS_DONE
+        delivery.finished_at = timezone.now()
+        delivery.save(update_fields=["status", "finished_at"])
+    logger.info(
+        f"Announcement {announcement.pk} queued for {delivery.recipients.count()} recipients"
+    )
+    return delivery
 
-        return {
-            "success": True,
-            "message": "Announcement sent successfully",
-            "sent": sent_count,
-            "total": len(recipients),
-        }
 
-    except Exception as e:
-        logging.exception("Failed to send announcement email for announcement %s", announcement.id)
-        return {
-            "success": False,
-            "message": f"Failed to send: {str(e)}",
-            "sent": 0,
-            "total": len(recipients),
-        }
+def resume_deliveries():
+    """Run pending jobs and take over running ones whose runner died."""
+    stale = timezone.now() - DELIVERY_STALE_AFTER
+    ids = AnnouncementDelivery.objects.filter(
+        Q(status=AnnouncementDelivery.STATUS_PENDING)
+        | Q(status=AnnouncementDelivery.STATUS_RUNNING, heartbeat_at__lt=stale)
+    ).values_list("id", flat=True)
+    return [delivery for delivery in map(run_delivery, list(ids)) if delivery]
+
+
+# ============ Scheduled dispatch ============
+
+
+def dispatch_due_announcements(now=None, batch_size=None):
+    """
+    Start delivery jobs for scheduled announcements whose publish_at has passed
+    (only those created with email_on_publish).
+
+    Due rows are claimed in batches with SELECT ... FOR UPDATE SKIP LOCKED
+    (where supported) on the (sent, publish_at) index, and each claim creates
+    the announcement's one delivery job in the same transaction, so several
+    dispatchers never start the same announcement twice. The jobs are left
+    pending for the caller (deliver_announcements) to run.
+
+    Returns:
+        dict: dispatched, max_lag_seconds (publish_at -> dispatch)
+    """
+    now = now or timezone.now()
+    batch_size = batch_size or getattr(settings, "ANNOUNCEMENT_DISPATCH_BATCH_SIZE", 20)
+    max_age = timedelta(hours=getattr(settings, "ANNOUNCEMENT_DISPATCH_MAX_AGE_HOURS", 24))
+    summary = {"dispatched": 0, "max_lag_seconds": 0}
+
+    while True:
+        with transaction.atomic():
+            due = (
+                Announcement.objects.filter(
+                    sent=False,
+                    email_on_publish=True,
+                    is_active=True,
+                    publish_at__lte=now,
+                    publish_at__gt=now - max_age,
+                )
+                .filter(Q(expire_at__isnull=True) | Q(expire_at__gt=now))
+                .exclude(Exists(AnnouncementDelivery.objects.filter(announcement=OuterRef("pk"))))
+                .order_by("publish_at", "id")
+            )
+            if connection.features.has_select_for_update_skip_locked:
+                due = due.select_for_update(skip_locked=True)
+            batch = list(due[:batch_size])
+
+            for announcement in batch:
+                _, created = AnnouncementDelivery.objects.get_or_create(
+                    announcement=announcement, defaults={"scheduled": True}
+                )
+                if not created:
+                    continue
+                announce_in_app(announcement)
+                lag = (now - announcement.publish_at).total_seconds()
+                summary["dispatched"] += 1
+                summary["max_lag_seconds"] = max(summary["max_lag_seconds"], lag)
+                logger.info(
+                    f"Dispatching scheduled announcement {announcement.pk} ({lag:.0f}s late)"
+                )
+
+        if len(batch) < batch_size:
+            return summary
+
+
+def process_announcements():
+    """Dispatch due scheduled announcements, then run pending deliveries (every minute)."""
+    summary = dispatch_due_announcements()
+    deliveries = resume_deliveries()
+    return {"rows": summary["dispatched"], "deliveries": len(deliveries), **summary}
+
+
+def delivery_progress(delivery, failure_limit=50):
+    """Progress counts plus the failing recipients of a delivery job."""
+    recipients = delivery.recipients.all()
+    counts = recipients.aggregate(
+        total=Count("id"),
+        queued=Count("id", filter=Q(queued_at__isnull=False)),
+        sent=Count("id", filter=Q(outbox_email__status=OutboxEmail.STATUS_SENT)),
+        failed=Count("id", filter=Q(outbox_email__status=OutboxEmail.STATUS_DEAD)),
+        retrying=Count(
+            "id",
+            filter=Q(outbox_email__status=OutboxEmail.STATUS_PENDING, outbox_email__attempts__gt=0),
+        ),
+        first_sent_at=Min("outbox_email__sent_at"),
+    )
+    first_sent_at = counts.pop("first_sent_at")
+    latency = None
+    if delivery.scheduled and first_sent_at:
+        # publish_at -> first email handed to the mail server
+        latency = (first_sent_at - delivery.announcement.publish_at).total_seconds()
+    failures = (
+        recipients.filter(outbox_email__attempts__gt=0)
+        .exclude(outbox_email__status=OutboxEmail.STATUS_SENT)
+        .select_related("outbox_email")
+        .order_by("id")[:failure_limit]
+    )
+    return {
+        "status": delivery.status,
+        "resolved": delivery.resolved,
+        "started_at": delivery.created_at,
+        "heartbeat_at": delivery.heartbeat_at,
+        "finished_at": delivery.finished_at,
+        "last_error": delivery.last_error,
+        "scheduled": delivery.scheduled,
+        "first_sent_at": first_sent_at,
+        "latency_seconds": latency,
+        **counts,
+        "pending": counts["total"] - counts["queued"],
+        "in_queue": counts["queued"] - counts["sent"] - counts["failed"],
+        "failures": [
+            {
+                "email": r.email,
+                "status": r.outbox_email.status,
+                "attempts": r.outbox_email.attempts,
+                "next_attempt_at": r.outbox_email.next_attempt_at,
+                "error": r.outbox_email.last_error,
+            }
+            for r in failures
+        ],
+    }
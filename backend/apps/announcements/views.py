@@ -5,11 +5,19 @@ from rest_framework.decorators import action
 from rest_framework.parsers import FormParser, JSONParser, MultiPartParser
 from rest_framework.response import Response
 
+from apps.notifications.models import OutboxEmail
+from apps.notifications.outbox import retry_now
 from common.permissions import IsAdminPastorOrMultimediaReadOnly
 
-from .models import Announcement
+from .models import Announcement, AnnouncementDelivery
 from .serializers import AnnouncementSerializer
-from .services import send_announcement_email
+from .services import (
+    announce_in_app,
+    delivery_progress,
+    get_announcement_recipients,
+    recipient_counts,
+    start_delivery,
+)
 
 
 class AnnouncementViewSet(viewsets.ModelViewSet):
@@ -62,48 +70,92 @@ class AnnouncementViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=["post"], permission_classes=[IsAdminPastorOrMultimediaReadOnly])
     def send_now(self, request, pk=None):
         """
-        Send announcement email to target audience (Feature #2)
+        Start sending the announcement email to its target audience (Feature #2)
         POST /api/announcements/{id}/send_now/
 
-        Pattern similar to: ministries/views.py rotate_shifts action
+        Recipients are resolved and queued in the background; follow progress
+        at GET /api/announcements/{id}/delivery/.
+
+        Sending again only emails recipients who weren't queued before; the
+        response says how many that is (200 with nothing to do if none).
         """
         announcement = self.get_object()
 
-        # Send email using service (like ministries/utils.py rotation)
-        result = send_announcement_email(announcement)
-
-        if result["success"]:
-            # Also send in-app notification to all users
-            from apps.authentication.models import User
-            from apps.notifications.services import create_notification
-
-            all_users = User.objects.filter(is_active=True)
-            create_notification(
-                user=all_users,
-                notification_type="announcement",
-                title=f"📢 {announcement.title}",
-                message=(
-                    announcement.body[:100] + "..."
-                    if len(announcement.body) > 100
-                    else announcement.body
-                ),
-                link="/announcements",
-            )
+        counts = recipient_counts(announcement)
+        if not counts["recipients"]:
+            return Response({"error": "No recipients found"}, status=status.HTTP_400_BAD_REQUEST)
 
+        if not counts["new_recipients"]:
             return Response(
                 {
-                    "message": result["message"],
-                    "recipients": result["total"],
-                    "sent": result["sent"],
-                },
-                status=status.HTTP_200_OK,
+                    "message": "Announcement was already sent to all recipients",
+                    **counts,
+                    "delivery": delivery_progress(announcement.delivery),
+                }
             )
+
+        delivery, created = start_delivery(announcement, user=request.user)
+
+        if created:
+            # Also send in-app notification to all users (stored once)
+            announce_in_app(announcement)
+            message = "Announcement is being sent"
         else:
+            message = (
+                f"Sending to {counts['new_recipients']} new recipients; "
+                f"{counts['already_queued']} already received it"
+            )
+
+        return Response(
+            {"message": message, **counts, "delivery": delivery_progress(delivery)},
+            status=status.HTTP_202_ACCEPTED,
+        )
+
+    @action(detail=True, methods=["get"], permission_classes=[IsAdminPastorOrMultimediaReadOnly])
+    def delivery(self, request, pk=None):
+        """
+        Email delivery progress of an announcement
+        GET /api/announcements/{id}/delivery/
+
+        Returns: { status, total, pending, queued, in_queue, sent, retrying, failed, failures }
+        """
+        announcement = self.get_object()
+        delivery = AnnouncementDelivery.objects.filter(announcement=announcement).first()
+        if delivery is None:
+            return Response(
+                {"error": "Announcement has not been sent"}, status=status.HTTP_404_NOT_FOUND
+            )
+        return Response(delivery_progress(delivery))
+
+    @action(
+        detail=True,
+        methods=["post"],
+        url_path="delivery/retry",
+        permission_classes=[IsAdminPastorOrMultimediaReadOnly],
+    )
+    def retry_delivery(self, request, pk=None):
+        """
+        Retry failed recipients now and resume a stopped delivery
+        POST /api/announcements/{id}/delivery/retry/
+        """
+        announcement = self.get_object()
+        delivery = AnnouncementDelivery.objects.filter(announcement=announcement).first()
+        if delivery is None:
             return Response(
-                {"error": result["message"]},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                {"error": "Announcement has not been sent"}, status=status.HTTP_404_NOT_FOUND
             )
 
+        requeued = retry_now(
+            OutboxEmail.objects.filter(
+                id__in=delivery.recipients.values("outbox_email"),
+                status=OutboxEmail.STATUS_DEAD,
+            )
+        )
+        if delivery.status == AnnouncementDelivery.STATUS_FAILED:
+            delivery, _ = start_delivery(announcement, user=request.user)
+
+        return Response({"requeued": requeued, "delivery": delivery_progress(delivery)})
+
     @action(detail=True, methods=["get"])
     def preview_recipients(self, request, pk=None):
         """
@@ -114,8 +166,6 @@ class AnnouncementViewSet(viewsets.ModelViewSet):
         """
         announcement = self.get_object()
 
-        from .services import get_announcement_recipients
-
         recipients = list(get_announcement_recipients(announcement))
 
         return Response(
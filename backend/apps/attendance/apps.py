@@ -0,0 +1,18 @@
+from django.apps import AppConfig
+
+
+class AttendanceConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "apps.attendance"
+    verbose_name = "Attendance"
+
+    def ready(self):
+        from apps.members.models import Member
+        from common.cache import invalidate_on_change
+        from core.scheduler import register_job
+
+        from .models import Attendance, AttendanceSheet
+        from .services import refresh_absence_report
+
+        invalidate_on_change("absence_report", Attendance, AttendanceSheet, Member)
+        register_job("attendance.absence_report", "0 * * * *", refresh_absence_report)
@@ -0,0 +1,303 @@
+"""
+QR code check-in.
+
+A check-in token identifies who is checking in to what and until when, and
+carries an HMAC of those fields keyed with SECRET_KEY, so a scanned token is
+verified without reading the database:
+
+    a2f.1c.67a1b2c3.<signature>
+    │ │  │  │        └ truncated HMAC-SHA256, base64url
+    │ │  │  └ expiry (unix time, hex)
+    │ │  └ event id (hex; 0 for visitors)
+    │ └ member or visitor id (hex)
+    └ kind: "a" service attendance, "r" event registration, "v" visitor
+
+The frontend renders tokens as QR codes. Scanned tokens are posted in
+batches and recorded with a few bulk queries per batch (scan_tokens), however
+many tokens it holds.
+"""
+
+import base64
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+from django.utils.crypto import constant_time_compare, salted_hmac
+
+from apps.events.models import Event, EventRegistration
+from apps.members.models import Member
+from apps.visitors.models import Visitor, VisitorAttendance
+from apps.visitors.services import AttendanceService
+from common.cache import invalidate_namespace
+
+from .models import Attendance, AttendanceSheet
+
+logger = logging.getLogger(__name__)
+
+SALT = "attendance.checkin"
+SIGNATURE_BYTES = 12
+
+# Tokens accepted per scan request
+MAX_SCAN_BATCH = 500
+
+ATTENDANCE = "a"
+REGISTRATION = "r"
+VISITOR = "v"
+KINDS = {ATTENDANCE: "attendance", REGISTRATION: "registration", VISITOR: "visitor"}
+
+# Event types checked in on an attendance sheet; other events check in registrations
+SERVICE_EVENT_TYPES = {"service", "bible_study", "prayer_meeting"}
+
+# Scan results
+CHECKED_IN = "checked_in"
+ALREADY_CHECKED_IN = "already_checked_in"
+NOT_REGISTERED = "not_registered"
+NOT_FOUND = "not_found"
+INVALID = "invalid"
+EXPIRED = "expired"
+
+
+# ============ Tokens ============
+
+
+def _signature(payload):
+    digest = salted_hmac(SALT, payload, algorithm="sha256").digest()[:SIGNATURE_BYTES]
+    return base64.urlsafe_b64encode(digest).decode().rstrip("=")
+
+
+def kind_for_event(event):
+    """Token kind for checking members in to ``event``."""
+    return ATTENDANCE if event.event_type in SERVICE_EVENT_TYPES else REGISTRATION
+
+
+def token_expiry(event=None, now=None):
+    """
+    Expiry for tokens issued now: CHECKIN_TOKEN_TTL_HOURS after the event
+    ends (or after now, when that is later or there is no event).
+    """
+    start = now or timezone.now()
+    if event is not None:
+        start = max(start, event.end_date or event.date)
+    return start + timedelta(hours=settings.CHECKIN_TOKEN_TTL_HOURS)
+
+
+def make_token(kind, subject_id, event_id=0, expires=None):
+    """
+    Signed check-in token.
+
+    Args:
+        kind: ATTENDANCE, REGISTRATION or VISITOR
+        subject_id: Member id (visitor id for VISITOR)
+        event_id: Event id (0 for VISITOR)
+        expires: Expiry datetime (default: token_expiry())
+    """
+    if kind not in KINDS:
+        raise ValueError(f"Unknown check-in token kind: {kind}")
+    expires = expires or token_expiry()
+    payload = f"{kind}{subject_id:x}.{event_id:x}.{int(expires.timestamp()):x}"
+    return f"{payload}.{_signature(payload)}"
+
+
+def read_token(token, now=None):
+    """
+    Verify a token and return (kind, subject_id, event_id).
+
+    Raises:
+        ValueError: INVALID if malformed or tampered with, EXPIRED if expired
+    """
+    try:
+        payload, signature = str(token).strip().rsplit(".", 1)
+        head, event_hex, expires_hex = payload.split(".")
+        kind, subject_id = head[0], int(head[1:], 16)
+        event_id, expires = int(event_hex, 16), int(expires_hex, 16)
+    except (ValueError, IndexError):
+        raise ValueError(INVALID)
+    if kind not in KINDS or not constant_time_compare(signature, _signature(payload)):
+        raise ValueError(INVALID)
+    if expires < (now or timezone.now()).timestamp():
+        raise ValueError(EXPIRED)
+    return kind, subject_id, event_id
+
+
+# ============ Scanning ============
+
+
+def _check_in_attendance(scans, day, now):
+    """Mark members present on the events' attendance sheets for ``day``."""
+    event_ids = {event_id for _, event_id in scans}
+    sheets = dict(
+        AttendanceSheet.objects.filter(event__in=event_ids, date=day).values_list("event", "id")
+    )
+    missing = event_ids - set(sheets)
+    if missing:
+        existing = set(Event.objects.filter(pk__in=missing).values_list("pk", flat=True))
+        AttendanceSheet.objects.bulk_create(
+            [AttendanceSheet(event_id=event_id, date=day) for event_id in existing],
+            ignore_conflicts=True,
+        )
+        sheets.update(
+            AttendanceSheet.objects.filter(event__in=existing, date=day).values_list("event", "id")
+        )
+
+    results = {}
+    scans = {(member_id, event_id) for member_id, event_id in scans if event_id in sheets}
+    present = set(
+        Attendance.objects.filter(
+            sheet__in=sheets.values(),
+            member__in={member_id for member_id, _ in scans},
+            attended=True,
+        )
+        .order_by()
+        .values_list("member", "sheet")
+    )
+    rows = []
+    for member_id, event_id in scans:
+        if (member_id, sheets[event_id]) in present:
+            results[(member_id, event_id)] = ALREADY_CHECKED_IN
+        else:
+            results[(member_id, event_id)] = CHECKED_IN
+            rows.append(
+                Attendance(
+                    sheet_id=sheets[event_id], member_id=member_id, attended=True, check_in_time=now
+                )
+            )
+    Attendance.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=["sheet", "member"],
+        update_fields=["attended", "check_in_time", "updated_at"],
+    )
+    return results
+
+
+def _check_in_registrations(scans, now):
+    """Mark registered members as attended."""
+    registrations = {
+        (member_id, event_id): (pk, attended)
+        for pk, member_id, event_id, attended in EventRegistration.objects.filter(
+            event__in={event_id for _, event_id in scans},
+            member__in={member_id for member_id, _ in scans},
+        ).values_list("pk", "member", "event", "attended")
+    }
+    results, pks = {}, []
+    for scan in scans:
+        if scan not in registrations:
+            results[scan] = NOT_REGISTERED
+        elif registrations[scan][1]:
+            results[scan] = ALREADY_CHECKED_IN
+        else:
+            results[scan] = CHECKED_IN
+            pks.append(registrations[scan][0])
+    if pks:
+        EventRegistration.objects.filter(pk__in=pks).update(attended=True, check_in_time=now)
+    return results
+
+
+def _check_in_visitors(visitor_ids, day, user):
+    """Record visitor attendance for ``day`` and update follow-up statuses."""
+    visitors = Visitor.objects.filter(pk__in=visitor_ids).annotate(
+        visits=Count("attendance_records"),
+        visited_today=Count("attendance_records", filter=Q(attendance_records__service_date=day)),
+    )
+    results = {visitor_id: NOT_FOUND for visitor_id in visitor_ids}
+    rows, changed = [], []
+    for visitor in visitors:
+        if visitor.visited_today:
+            results[visitor.pk] = ALREADY_CHECKED_IN
+            continue
+        results[visitor.pk] = CHECKED_IN
+        rows.append(VisitorAttendance(visitor=visitor, service_date=day, added_by=user))
+        status, first_time = AttendanceService.follow_up_status_for(visitor.visits + 1)
+        visitor.follow_up_status, visitor.is_first_time = status, first_time
+        # bulk_update skips auto_now
+        visitor.updated_at = timezone.now()
+        changed.append(visitor)
+    VisitorAttendance.objects.bulk_create(rows, ignore_conflicts=True)
+    Visitor.objects.bulk_update(changed, ["follow_up_status", "is_first_time", "updated_at"])
+    return results
+
+
+def scan_tokens(tokens, user=None, now=None):
+    """
+    Verify scanned tokens and record the check-ins in bulk.
+
+    Tokens are verified in memory; the check-ins of each kind are then written
+    with a handful of queries for the whole batch, and checked-in members get
+    last_attended set. Scanning a token again is harmless.
+
+    Args:
+        tokens: Scanned token strings
+        user: User operating the scanner (recorded on visitor attendance)
+        now: Scan time (default: now); its local date is the service date
+
+    Returns:
+        dict: {"results": [{"token", "status", "kind", "id", "event"}, ...],
+        "counts": {status: count}} with results in ``tokens`` order
+    """
+    now = now or timezone.now()
+    day = timezone.localdate(now)
+
+    parsed = []
+    for token in tokens:
+        try:
+            parsed.append(read_token(token, now))
+        except ValueError as e:
+            parsed.append(str(e))
+
+    scans = {kind: set() for kind in KINDS}
+    for item in parsed:
+        if isinstance(item, tuple):
+            kind, subject_id, event_id = item
+            scans[kind].add(subject_id if kind == VISITOR else (subject_id, event_id))
+
+    outcome = {kind: {} for kind in KINDS}
+    with transaction.atomic():
+        member_ids = {member_id for member_id, _ in scans[ATTENDANCE] | scans[REGISTRATION]}
+        if member_ids:
+            known = set(Member.objects.filter(pk__in=member_ids).values_list("pk", flat=True))
+            for kind in (ATTENDANCE, REGISTRATION):
+                for scan in [scan for scan in scans[kind] if scan[0] not in known]:
+                    scans[kind].discard(scan)
+                    outcome[kind][scan] = NOT_FOUND
+        if scans[ATTENDANCE]:
+            outcome[ATTENDANCE].update(_check_in_attendance(scans[ATTENDANCE], day, now))
+        if scans[REGISTRATION]:
+            outcome[REGISTRATION].update(_check_in_registrations(scans[REGISTRATION], now))
+        if scans[VISITOR]:
+            outcome[VISITOR].update(_check_in_visitors(scans[VISITOR], day, user))
+
+        attended = {
+            member_id
+            for kind in (ATTENDANCE, REGISTRATION)
+            for (member_id, _), result in outcome[kind].items()
+            if result == CHECKED_IN
+        }
+        if attended:
+            Member.objects.filter(pk__in=attended).filter(
+                Q(last_attended__isnull=True) | Q(last_attended__lt=day)
+            ).update(last_attended=day, consecutive_absences=0)
+            # The bulk writes send no signals (see apps.py invalidate_on_change)
+            transaction.on_commit(lambda: invalidate_namespace("absence_report"))
+
+    results, counts = [], {}
+    for token, item in zip(tokens, parsed):
+        if isinstance(item, tuple):
+            kind, subject_id, event_id = item
+            key = subject_id if kind == VISITOR else (subject_id, event_id)
+            result = {
+                "token": token,
+                "status": outcome[kind].get(key, NOT_FOUND),
+                "kind": KINDS[kind],
+                "id": subject_id,
+                "event": event_id or None,
+            }
+        else:
+            result = {"token": token, "status": item, "kind": None, "id": None, "event": None}
+        results.append(result)
+        counts[result["status"]] = counts.get(result["status"], 0) + 1
+
+    logger.info(f"Check-in scan: {len(tokens)} token(s), {counts}")
+    return {"results": results, "counts": counts}
@@ -2,15 +2,20 @@ import logging
 from datetime import timedelta
 
 from django.conf import settings
-from django.core.mail import send_mail
+from django.core.cache import cache
 from django.utils import timezone
 
 from apps.members.models import Member
+from apps.notifications.outbox import queue_email
+from common.cache import make_key
 
 from .models import Attendance
 
 logger = logging.getLogger(__name__)
 
+# Cached absence reports outlive the hourly refresh by one run
+ABSENCE_REPORT_TIMEOUT = 2 * 60 * 60
+
 
 def check_frequent_absences(threshold=3, days=30, notify=False):
     """
@@ -68,6 +73,28 @@ def check_frequent_absences(threshold=3, days=30, notify=False):
     return problem_members
 
 
+def get_absence_report(threshold=3, days=30):
+    """
+    Frequent-absence report from the cache, computed on a miss.
+
+    The cached copy is refreshed hourly by the attendance.absence_report job
+    and dropped whenever attendance or members change (see apps.py).
+    """
+    key = make_key("absence_report", threshold, days)
+    problem_members = cache.get(key)
+    if problem_members is None:
+        problem_members = check_frequent_absences(threshold=threshold, days=days)
+        cache.set(key, problem_members, ABSENCE_REPORT_TIMEOUT)
+    return problem_members
+
+
+def refresh_absence_report(threshold=3, days=30):
+    """Recompute the default frequent-absence report off the request path (scheduled hourly)."""
+    problem_members = check_frequent_absences(threshold=threshold, days=days)
+    cache.set(make_key("absence_report", threshold, days), problem_members, ABSENCE_REPORT_TIMEOUT)
+    return len(problem_members)
+
+
 def _notify_admins_about_absences(problem_members, threshold, days):
     """Send email to admins about members with frequent absences"""
     from apps.authentication.models import User
@@ -99,12 +126,12 @@ def _notify_admins_about_absences(problem_members, threshold, days):
     message += "=" * 60 + "\n"
     message += "Please follow up with these members.\n"
 
-    send_mail(
+    queue_email(
         subject=subject,
         message=message,
         from_email=settings.DEFAULT_FROM_EMAIL,
         recipient_list=list(admin_emails),
-        fail_silently=True,
+        kind="attendance_alert",
     )
 
     # Also send in-app notification
@@ -147,17 +174,17 @@ With love and prayers,
 """
 
     try:
-        send_mail(
+        queue_email(
             subject=subject,
             message=message,
             from_email=settings.DEFAULT_FROM_EMAIL,
             recipient_list=[member.email],
-            fail_silently=False,
+            kind="pastoral_care",
         )
-        logger.info(f"Pastoral care email sent to {member.full_name} ({member.email})")
+        logger.info(f"Pastoral care email queued for {member.full_name} ({member.email})")
         return True
     except Exception as e:
-        logger.error(f"Failed to send pastoral care email to {member.full_name}: {e}")
+        logger.error(f"Failed to queue pastoral care email for {member.full_name}: {e}")
         return False
 
 
@@ -1,11 +1,12 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from .views import AttendanceSheetViewSet, AttendanceViewSet
+from .views import AttendanceSheetViewSet, AttendanceViewSet, CheckInViewSet
 
 router = DefaultRouter()
 router.register(r"sheets", AttendanceSheetViewSet, basename="attendance-sheet")
 router.register(r"records", AttendanceViewSet, basename="attendance")
+router.register(r"checkin", CheckInViewSet, basename="checkin")
 
 urlpatterns = [
     path("", include(router.urls)),
@@ -9,9 +9,12 @@ from rest_framework.decorators import action
 from rest_framework.filters import OrderingFilter, SearchFilter
 from rest_framework.response import Response
 
+from apps.events.models import Event
 from apps.members.models import Member
-from common.permissions import IsAdminOrPastorReadOnly
+from apps.visitors.models import Visitor
+from common.permissions import IsAdminOrPastor, IsAdminOrPastorReadOnly
 
+from . import checkin
 from .models import Attendance, AttendanceSheet
 from .serializers import (
     AttendanceSerializer,
@@ -22,6 +25,7 @@ from .services import (
     check_frequent_absences,
     generate_member_report,
     generate_ministry_report,
+    get_absence_report,
     notify_inactive_members,
 )
 
@@ -214,7 +218,10 @@ class AttendanceSheetViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        problem_members = check_frequent_absences(threshold=threshold, days=days, notify=notify)
+        if notify:
+            problem_members = check_frequent_absences(threshold=threshold, days=days, notify=True)
+        else:
+            problem_members = get_absence_report(threshold=threshold, days=days)
 
         return Response({"threshold": threshold, "days": days, "problem_members": problem_members})
 
@@ -292,3 +299,111 @@ class AttendanceViewSet(viewsets.ModelViewSet):
 
         report = generate_ministry_report(ministry_id, days)
         return Response(report)
+
+
+def _id_list(value):
+    """Parse a comma-separated id list ("1,2,3"); None if absent or malformed."""
+    try:
+        return [int(part) for part in value.split(",") if part.strip()] if value else None
+    except ValueError:
+        return None
+
+
+class CheckInViewSet(viewsets.ViewSet):
+    """QR code check-in with signed tokens (see checkin.py)"""
+
+    permission_classes = [permissions.IsAuthenticated, IsAdminOrPastor]
+
+    @action(detail=False, methods=["get"])
+    def tokens(self, request):
+        """
+        Issue check-in tokens for members of an event, or for visitors
+        GET /api/attendance/checkin/tokens/?event=1&members=1,2,3
+        GET /api/attendance/checkin/tokens/?visitors=4,5
+
+        Without ``members``, tokens are issued for every registered member
+        (registration check-in) or every active member (service attendance).
+        ``kind=attendance|registration`` overrides the kind derived from the
+        event type.
+        """
+        params = request.query_params
+        if params.get("visitors"):
+            visitor_ids = _id_list(params["visitors"])
+            if visitor_ids is None:
+                return Response(
+                    {"error": "visitors must be a list of ids"}, status=status.HTTP_400_BAD_REQUEST
+                )
+            expires = checkin.token_expiry()
+            visitors = Visitor.objects.filter(pk__in=visitor_ids).values_list("pk", flat=True)
+            return Response(
+                {
+                    "kind": "visitor",
+                    "expires_at": expires,
+                    "tokens": [
+                        {
+                            "visitor": pk,
+                            "token": checkin.make_token(checkin.VISITOR, pk, 0, expires),
+                        }
+                        for pk in visitors
+                    ],
+                }
+            )
+
+        event_id = params.get("event")
+        if not event_id:
+            return Response(
+                {"error": "event or visitors parameter is required"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        event = Event.objects.filter(pk=event_id).first() if event_id.isdigit() else None
+        if event is None:
+            return Response({"error": "Event not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        kinds = {name: kind for kind, name in checkin.KINDS.items() if kind != checkin.VISITOR}
+        kind = kinds.get(params.get("kind")) or checkin.kind_for_event(event)
+        member_ids = _id_list(params.get("members"))
+        if params.get("members") and member_ids is None:
+            return Response(
+                {"error": "members must be a list of ids"}, status=status.HTTP_400_BAD_REQUEST
+            )
+        if member_ids is not None:
+            members = Member.objects.filter(pk__in=member_ids)
+        elif kind == checkin.REGISTRATION:
+            members = Member.objects.filter(event_registrations__event=event)
+        else:
+            members = Member.objects.filter(is_active=True, status="active")
+
+        expires = checkin.token_expiry(event)
+        return Response(
+            {
+                "event": event.pk,
+                "kind": checkin.KINDS[kind],
+                "expires_at": expires,
+                "tokens": [
+                    {"member": pk, "token": checkin.make_token(kind, pk, event.pk, expires)}
+                    for pk in members.values_list("pk", flat=True)
+                ],
+            }
+        )
+
+    @action(detail=False, methods=["post"])
+    def scan(self, request):
+        """
+        Record a batch of scanned check-in tokens
+        POST /api/attendance/checkin/scan/
+        Body: {"tokens": ["a2f.1c.67a1b2c3.…", ...]}
+
+        Returns per-token results in order (checked_in, already_checked_in,
+        not_registered, not_found, invalid or expired) and counts per result.
+        """
+        tokens = request.data.get("tokens")
+        if not isinstance(tokens, list) or not all(isinstance(token, str) for token in tokens):
+            return Response(
+                {"error": "tokens must be a list of strings"}, status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(tokens) > checkin.MAX_SCAN_BATCH:
+            return Response(
+                {"error": f"At most {checkin.MAX_SCAN_BATCH} tokens per request"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return Response(checkin.scan_tokens(tokens, user=request.user))
@@ -0,0 +1,17 @@
+from django.apps import AppConfig
+
+
+class AuthenticationConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "apps.authentication"
+    verbose_name = "Authentication"
+
+    def ready(self):
+        from common.images import register_image_fields
+        from core.scheduler import register_job
+
+        from .models import User
+        from .services import flush_expired_tokens
+
+        register_image_fields(User, "profile_picture")
+        register_job("authentication.flush_expired_tokens", "0 4 * * *", flush_expired_tokens)
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.4 on 2026-10-19 04:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("authentication", "0004_alter_user_role_add_multimedia"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="profile_picture_derivatives",
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
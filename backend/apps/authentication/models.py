@@ -28,6 +28,8 @@ class User(AbstractUser):
         null=True,
         help_text="User profile picture (recommended: 200x200px)",
     )
+    # Resized copies generated by common.images (srcset + blur placeholder)
+    profile_picture_derivatives = models.JSONField(default=dict, blank=True, editable=False)
 
     class Meta:
         db_table = "users"
@@ -1,16 +1,21 @@
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
-from django.core.mail import send_mail
+from django.db import transaction
 from rest_framework import serializers
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 
+from apps.notifications.outbox import queue_email
+from common.images import image_variants
+
 User = get_user_model()
 
 
 class UserSerializer(serializers.ModelSerializer):
     """Serializer for User model"""
 
+    profile_picture_variants = serializers.SerializerMethodField()
+
     class Meta:
         model = User
         fields = [
@@ -22,12 +27,16 @@ class UserSerializer(serializers.ModelSerializer):
             "role",
             "phone",
             "profile_picture",
+            "profile_picture_variants",
             "is_active",
             "date_joined",
             "last_login",
         ]
         read_only_fields = ["id", "date_joined", "last_login"]
 
+    def get_profile_picture_variants(self, obj):
+        return image_variants(obj, "profile_picture")
+
 
 class ProfileUpdateSerializer(serializers.ModelSerializer):
     """Serializer for users updating their own profile (limited fields)"""
@@ -280,8 +289,14 @@ class ForgotPasswordSerializer(serializers.Serializer):
             pass
         return value
 
+    @transaction.atomic
     def save(self):
-        """Create reset token and send email"""
+        """
+        Create reset token and queue the reset email (committed together).
+        The email is sent in the background right after commit, so the response
+        takes as long whether or not the account exists; the outbox retries
+        if that send fails.
+        """
         from .models import PasswordResetToken
 
         if hasattr(self, "user"):
@@ -291,8 +306,8 @@ class ForgotPasswordSerializer(serializers.Serializer):
             frontend_url = getattr(settings, "FRONTEND_URL", "http://localhost:5173")
             reset_url = f"{frontend_url}/reset-password?token={token_obj.token}"
 
-            # Send email
-            send_mail(
+            # Queue email
+            queue_email(
                 subject="Password Reset Request - SBCC Management System",
                 message=f"""
 Hello {self.user.first_name},
@@ -310,7 +325,8 @@ SBCC Management System
                 """.strip(),
                 from_email=settings.DEFAULT_FROM_EMAIL,
                 recipient_list=[self.user.email],
-                fail_silently=False,
+                kind="password_reset",
+                send_now=True,
             )
 
             return token_obj
@@ -0,0 +1,11 @@
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+
+
+def flush_expired_tokens():
+    """
+    Delete expired refresh tokens (and their blacklist entries).
+    Scheduled daily; same as simplejwt's `flushexpiredtokens` command.
+    """
+    deleted, _ = OutstandingToken.objects.filter(expires_at__lte=timezone.now()).delete()
+    return deleted
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Event, EventRegistration
+from .models import Event, EventRegistration, EventWaitlistEntry
 
 
 @admin.register(Event)
@@ -19,18 +19,35 @@ class EventAdmin(admin.ModelAdmin):
     list_filter = ("event_type", "status", "ministry", "date", "organizer")
     search_fields = ("title", "description", "location")
     date_hierarchy = "date"
-    readonly_fields = ("created_at", "updated_at", "is_full", "available_slots")
+    readonly_fields = (
+        "created_at",
+        "updated_at",
+        "registered_count",
+        "is_full",
+        "available_slots",
+    )
 
     fieldsets = (
         ("Basic Information", {"fields": ("title", "description", "event_type", "status")}),
         ("Schedule", {"fields": ("date", "end_date", "location")}),
         ("Organization", {"fields": ("organizer", "ministry")}),
-        ("Settings", {"fields": ("max_attendees", "is_recurring", "is_full", "available_slots")}),
+        (
+            "Settings",
+            {
+                "fields": (
+                    "max_attendees",
+                    "is_recurring",
+                    "registered_count",
+                    "is_full",
+                    "available_slots",
+                )
+            },
+        ),
         ("Timestamps", {"fields": ("created_at", "updated_at"), "classes": ("collapse",)}),
     )
 
     def attendee_count(self, obj):
-        return obj.registrations.count()
+        return obj.registered_count
 
     attendee_count.short_description = "Registered"
 
@@ -53,3 +70,11 @@ class EventRegistrationAdmin(admin.ModelAdmin):
         ("Attendance", {"fields": ("attended", "check_in_time")}),
         ("Notes", {"fields": ("notes",), "classes": ("collapse",)}),
     )
+
+
+@admin.register(EventWaitlistEntry)
+class EventWaitlistEntryAdmin(admin.ModelAdmin):
+    list_display = ("member", "event", "joined_at")
+    list_filter = ("event__event_type", "event__ministry")
+    search_fields = ("member__first_name", "member__last_name", "event__title")
+    readonly_fields = ("joined_at",)
@@ -0,0 +1,21 @@
+from django.apps import AppConfig
+
+
+class EventsConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "apps.events"
+    verbose_name = "Events"
+
+    def ready(self):
+        from django.db.models.signals import post_delete, post_save
+
+        from apps.ministries.models import Ministry
+        from common.cache import invalidate_on_change
+
+        from .models import Event, EventRegistration
+        from .services import _on_registration_deleted, _on_registration_saved
+
+        invalidate_on_change("public_events", Event, EventRegistration, Ministry)
+        invalidate_on_change("ical_events", Event, Ministry)
+        post_save.connect(_on_registration_saved, sender=EventRegistration)
+        post_delete.connect(_on_registration_deleted, sender=EventRegistration)
@@ -0,0 +1,117 @@
+"""
+iCalendar feeds of published events (see common/ical.py).
+
+Recurring events are published as one VEVENT with their RRULE rather than
+expanded; a stored occurrence becomes a VEVENT with the parent's UID and a
+RECURRENCE-ID, so calendar clients show it in place of that occurrence (or
+hide the occurrence if it was cancelled).
+"""
+
+from datetime import datetime, time, timedelta
+
+from django.db.models import Q
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.ministries.models import Ministry
+from common import ical
+from common.cache import cached_view
+
+from .models import Event
+
+# Past events kept in feeds
+FEED_HISTORY_DAYS = 90
+
+# Feeds are invalidated on change, so they can stay cached until then
+FEED_CACHE_TIMEOUT = 60 * 60 * 24
+
+PUBLIC_STATUSES = ["published", "completed"]
+
+
+def _rrule(event):
+    rule = event.recurrence_rule
+    if event.recurrence_end_date and "UNTIL=" not in rule and "COUNT=" not in rule:
+        # Last moment of the end date; UNTIL must be UTC when DTSTART has a TZID
+        until = timezone.make_aware(
+            datetime.combine(event.recurrence_end_date, time.max.replace(microsecond=0))
+        )
+        rule += f";UNTIL={ical.format_utc(until)}"
+    return rule
+
+
+def _render(event):
+    override = event.parent_event_id is not None
+    return ical.vevent(
+        uid=ical.uid("event", event.parent_event_id if override else event.pk),
+        start=event.date,
+        end=event.end_date,
+        summary=event.title,
+        description=event.description,
+        location=event.location,
+        categories=event.get_event_type_display(),
+        status="CONFIRMED" if event.status in PUBLIC_STATUSES else "CANCELLED",
+        stamp=event.updated_at,
+        rrule="" if override else _rrule(event),
+        recurrence_id=event.original_date if override else None,
+    )
+
+
+def build_events_feed(ministry=None):
+    """
+    Calendar text of published events (optionally one ministry's), from the
+    last FEED_HISTORY_DAYS on. One query; VEVENTs are re-rendered only for
+    events updated since they were last cached.
+    """
+    cutoff = timezone.now() - timedelta(days=FEED_HISTORY_DAYS)
+    filters = Q(status__in=PUBLIC_STATUSES)
+    if ministry is not None:
+        filters &= Q(ministry=ministry)
+    single = Q(parent_event__isnull=True, recurrence_rule="", date__gte=cutoff)
+    recurring = (
+        Q(parent_event__isnull=True)
+        & ~Q(recurrence_rule="")
+        & (Q(recurrence_end_date__isnull=True) | Q(recurrence_end_date__gte=cutoff.date()))
+    )
+    overrides = Q(parent_event__isnull=False, original_date__gte=cutoff)
+
+    rows = list(
+        Event.objects.filter((filters & (single | recurring)) | overrides)
+        .select_related("ministry")
+        .order_by("date", "id")
+    )
+    parents = {row.pk for row in rows if row.recurrence_rule and not row.parent_event_id}
+    # Overrides of events outside this feed are dropped
+    events = [row for row in rows if not row.parent_event_id or row.parent_event_id in parents]
+
+    blocks = ical.cached_vevents(
+        "event",
+        events,
+        lambda event: (event.updated_at, event.ministry.updated_at if event.ministry else 0),
+        _render,
+    )
+    name = f"{ministry.name} events" if ministry else "Church events"
+    return ical.calendar(name, blocks)
+
+
+class EventsFeedView(APIView):
+    """
+    GET /api/public/calendar/events.ics
+    GET /api/public/calendar/ministries/{id}/events.ics
+
+    Subscribable iCalendar feed of published events. No authentication.
+    Cached until an event or ministry changes, with ETag/Last-Modified so
+    polling clients mostly get 304 Not Modified.
+    """
+
+    permission_classes = [AllowAny]
+    renderer_classes = [ical.ICalendarRenderer]
+
+    @cached_view("ical_events", timeout=FEED_CACHE_TIMEOUT, max_age=900)
+    def get(self, request, ministry_id=None):
+        ministry = None
+        if ministry_id is not None:
+            ministry = get_object_or_404(Ministry, pk=ministry_id, is_active=True)
+        return Response(build_events_feed(ministry))
@@ -1,14 +1,21 @@
 """
 Management command to generate recurring event occurrences.
 
+Occurrences missing for every recurring event are computed in memory and
+written with bulk inserts; occurrences that already exist are left alone, so
+the command can be re-run safely. Reads expand recurring events on the fly,
+so this is only needed to store occurrences ahead of time.
+
 Usage:
     python manage.py generate_recurring_events
     python manage.py generate_recurring_events --weeks=8
+    python manage.py generate_recurring_events --weeks=52 --batch-size=2000
+    python manage.py generate_recurring_events --dry-run
 """
 
 from django.core.management.base import BaseCommand
 
-from apps.events.models import Event
+from apps.events.services import generate_recurring_occurrences, get_recurring_events
 
 
 class Command(BaseCommand):
@@ -21,6 +28,12 @@ class Command(BaseCommand):
             default=4,
             help="Number of weeks ahead to generate occurrences (default: 4)",
         )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Rows per INSERT (default: 1000)",
+        )
         parser.add_argument(
             "--dry-run",
             action="store_true",
@@ -28,33 +41,29 @@ class Command(BaseCommand):
         )
 
     def handle(self, *args, **options):
-        weeks_ahead = options["weeks"]
         dry_run = options["dry_run"]
+        events = list(get_recurring_events().select_related("organizer", "ministry"))
 
-        # Find all parent recurring events (not occurrences)
-        recurring_events = Event.objects.filter(
-            recurrence_pattern__in=["daily", "weekly", "biweekly", "monthly"],
-            parent_event__isnull=True,
+        report = generate_recurring_occurrences(
+            events=events,
+            weeks_ahead=options["weeks"],
+            batch_size=max(options["batch_size"], 1),
+            dry_run=dry_run,
         )
 
-        total_created = 0
-
-        for event in recurring_events:
-            if dry_run:
-                self.stdout.write(
-                    f"Would generate occurrences for: {event.title} ({event.recurrence_pattern})"
-                )
-            else:
-                created = event.generate_occurrences(weeks_ahead=weeks_ahead)
-                if created:
-                    self.stdout.write(
-                        self.style.SUCCESS(
-                            f"Created {len(created)} occurrence(s) for: {event.title}"
-                        )
-                    )
-                    total_created += len(created)
+        verb = "Would create" if dry_run else "Created"
+        for event in events:
+            count = report["per_event"].get(event.pk)
+            if count and (dry_run or options["verbosity"] > 1):
+                self.stdout.write(f"{verb} {count} occurrence(s) for: {event.title}")
 
+        self.stdout.write(
+            f"Recurring events: {report['events']}\n"
+            f"Occurrences already stored: {report['existing']}\n"
+            f"Occurrences {'to create' if dry_run else 'created'}: {report['created']}"
+            f" in {report['batches']} batch(es), {report['seconds']:.2f}s"
+        )
         if dry_run:
             self.stdout.write(self.style.WARNING("Dry run - no events created"))
         else:
-            self.stdout.write(self.style.SUCCESS(f"Total occurrences created: {total_created}"))
+            self.stdout.write(self.style.SUCCESS(f"Total occurrences created: {report['created']}"))
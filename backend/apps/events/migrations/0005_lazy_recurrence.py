@@ -0,0 +1,166 @@
+# Generated by Django 5.1.4 on 2026-10-19 05:13
+
+from datetime import datetime, time, timedelta
+
+from dateutil.rrule import rrulestr
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+PATTERN_RULES = {
+    "daily": "FREQ=DAILY",
+    "weekly": "FREQ=WEEKLY",
+    "biweekly": "FREQ=WEEKLY;INTERVAL=2",
+    "monthly": "FREQ=MONTHLY",
+}
+
+# Copied from the parent by the old generate_occurrences()
+COPIED_FIELDS = [
+    "title",
+    "description",
+    "event_type",
+    "status",
+    "location",
+    "organizer_id",
+    "ministry_id",
+    "max_attendees",
+]
+
+
+def _local(dt):
+    return timezone.localtime(dt).replace(tzinfo=None)
+
+
+def _nearest_slot(parent, start):
+    """The parent's rule occurrence closest to ``start``, or None."""
+    if not parent.recurrence_rule:
+        return None
+    rule = rrulestr(parent.recurrence_rule, dtstart=_local(parent.date), ignoretz=True)
+    local = _local(start)
+    candidates = [dt for dt in (rule.before(local, inc=True), rule.after(local)) if dt]
+    if parent.recurrence_end_date:
+        limit = datetime.combine(parent.recurrence_end_date + timedelta(days=1), time.min)
+        candidates = [dt for dt in candidates if dt < limit]
+    if not candidates:
+        return None
+    slot = min(candidates, key=lambda dt: abs(dt - local))
+    return timezone.make_aware(slot, timezone.get_current_timezone())
+
+
+def _is_untouched(occurrence, parent, references):
+    """True if the row is exactly what generate_occurrences() created and nothing points at it."""
+    if any(getattr(occurrence, f) != getattr(parent, f) for f in COPIED_FIELDS):
+        return False
+    duration = parent.end_date - parent.date if parent.end_date else None
+    if (occurrence.end_date - occurrence.date if occurrence.end_date else None) != duration:
+        return False
+    return not any(
+        rel.related_model._base_manager.filter(**{rel.field.name: occurrence}).exists()
+        for rel in references
+    )
+
+
+def fill_recurrence(apps, schema_editor):
+    """
+    Store preset patterns as rules and give existing occurrences a slot.
+
+    The old generator stepped by fixed intervals (30 days for "monthly", UTC
+    weeks across DST), so its rows often miss the rule's slots and would be
+    listed next to the virtual occurrence. Untouched future rows off the rule
+    are deleted; the rest take the nearest free slot, or their own date.
+    """
+    Event = apps.get_model("events", "Event")
+    for pattern, rule in PATTERN_RULES.items():
+        Event.objects.filter(recurrence_pattern=pattern).update(recurrence_rule=rule)
+
+    references = [
+        rel
+        for rel in Event._meta.related_objects
+        if rel.related_model is not Event and (rel.one_to_many or rel.one_to_one)
+    ]
+    now = timezone.now()
+    occurrences = list(
+        Event.objects.filter(parent_event__isnull=False)
+        .select_related("parent_event")
+        .order_by("date")
+    )
+    slots = {
+        occurrence.pk: _nearest_slot(occurrence.parent_event, occurrence.date)
+        for occurrence in occurrences
+    }
+    taken = {
+        (occurrence.parent_event_id, occurrence.date)
+        for occurrence in occurrences
+        if slots[occurrence.pk] == occurrence.date
+    }
+    for occurrence in occurrences:
+        parent, slot = occurrence.parent_event, slots[occurrence.pk]
+        if slot == occurrence.date:
+            occurrence.original_date = slot
+        elif occurrence.date >= now and _is_untouched(occurrence, parent, references):
+            occurrence.delete()
+            continue
+        elif slot and slot != parent.date and (parent.pk, slot) not in taken:
+            occurrence.original_date = slot
+            taken.add((parent.pk, slot))
+        else:
+            occurrence.original_date = occurrence.date
+        occurrence.save(update_fields=["original_date"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("events", "0004_add_recurrence_fields"),
+        ("ministries", "0004_alter_ministrymember_options_remove_assignment_user_and_more"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="event",
+            name="original_date",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="Start of the recurring slot this occurrence replaces (even if moved)",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="event",
+            name="recurrence_rule",
+            field=models.CharField(
+                blank=True,
+                help_text="iCalendar RRULE without DTSTART, e.g. FREQ=WEEKLY;BYDAY=SU",
+                max_length=500,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="event",
+            name="recurrence_pattern",
+            field=models.CharField(
+                choices=[
+                    ("none", "None"),
+                    ("daily", "Daily"),
+                    ("weekly", "Weekly"),
+                    ("biweekly", "Every 2 Weeks"),
+                    ("monthly", "Monthly"),
+                    ("custom", "Custom rule"),
+                ],
+                default="none",
+                help_text="How often this event repeats",
+                max_length=20,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(fields=["date"], name="events_date_e70fc0_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(
+                fields=["parent_event", "original_date"], name="events_parent__835d38_idx"
+            ),
+        ),
+        migrations.RunPython(fill_recurrence, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.1.4 on 2026-10-19 05:18
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("events", "0005_lazy_recurrence"),
+        ("ministries", "0004_alter_ministrymember_options_remove_assignment_user_and_more"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="event",
+            name="events_parent__835d38_idx",
+        ),
+        migrations.AddConstraint(
+            model_name="event",
+            constraint=models.UniqueConstraint(
+                fields=("parent_event", "original_date"), name="unique_event_occurrence"
+            ),
+        ),
+    ]
@@ -0,0 +1,77 @@
+# Generated by Django 5.1.4 on 2026-10-19 05:23
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_registrations(apps, schema_editor):
+    Event = apps.get_model("events", "Event")
+    EventRegistration = apps.get_model("events", "EventRegistration")
+    counts = (
+        EventRegistration.objects.filter(event=OuterRef("pk"))
+        .values("event")
+        .annotate(total=Count("id"))
+        .values("total")
+    )
+    Event.objects.update(registered_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("events", "0006_unique_occurrence"),
+        ("members", "0011_rename_members_ministr_2_status_idx_members_ministr_dc85c8_idx_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="event",
+            name="registered_count",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, help_text="Number of members who registered (RSVP'd)"
+            ),
+        ),
+        migrations.CreateModel(
+            name="EventWaitlistEntry",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                (
+                    "notes",
+                    models.TextField(
+                        blank=True, help_text="Notes carried over to the registration"
+                    ),
+                ),
+                ("joined_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "event",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="waitlist",
+                        to="events.event",
+                    ),
+                ),
+                (
+                    "member",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="event_waitlist_entries",
+                        to="members.member",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "event waitlist entries",
+                "db_table": "event_waitlist",
+                "ordering": ["joined_at", "id"],
+                "unique_together": {("event", "member")},
+            },
+        ),
+        migrations.RunPython(count_registrations, migrations.RunPython.noop),
+    ]
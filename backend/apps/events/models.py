@@ -4,6 +4,23 @@ from django.db import models
 User = get_user_model()
 
 
+def capacity_fields(max_attendees, registered_count):
+    """
+    Capacity of an event from its limit and registration count, without
+    querying registrations (blank or 0 max_attendees means unlimited).
+
+    Returns:
+        dict: registered_count, available_slots (None if unlimited), is_full
+    """
+    if not max_attendees:
+        return {"registered_count": registered_count, "available_slots": None, "is_full": False}
+    return {
+        "registered_count": registered_count,
+        "available_slots": max(0, max_attendees - registered_count),
+        "is_full": registered_count >= max_attendees,
+    }
+
+
 class Event(models.Model):
     """Church events and services"""
 
@@ -29,6 +46,7 @@ class Event(models.Model):
         ("weekly", "Weekly"),
         ("biweekly", "Every 2 Weeks"),
         ("monthly", "Monthly"),
+        ("custom", "Custom rule"),
     ]
 
     # Basic Information
@@ -62,6 +80,11 @@ class Event(models.Model):
     max_attendees = models.PositiveIntegerField(
         null=True, blank=True, help_text="Maximum number of attendees (leave blank for unlimited)"
     )
+    # Maintained with atomic UPDATEs (services.register_member, registration
+    # signals); never written by save()
+    registered_count = models.PositiveIntegerField(
+        default=0, editable=False, help_text="Number of members who registered (RSVP'd)"
+    )
 
     # Recurrence Settings
     recurrence_pattern = models.CharField(
@@ -70,6 +93,12 @@ class Event(models.Model):
         default="none",
         help_text="How often this event repeats",
     )
+    # Set from recurrence_pattern on save, or given directly with pattern "custom"
+    recurrence_rule = models.CharField(
+        max_length=500,
+        blank=True,
+        help_text="iCalendar RRULE without DTSTART, e.g. FREQ=WEEKLY;BYDAY=SU",
+    )
     recurrence_end_date = models.DateField(
         null=True,
         blank=True,
@@ -83,6 +112,11 @@ class Event(models.Model):
         related_name="occurrences",
         help_text="Parent event if this is a generated occurrence",
     )
+    original_date = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="Start of the recurring slot this occurrence replaces (even if moved)",
+    )
 
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
@@ -91,10 +125,39 @@ class Event(models.Model):
     class Meta:
         db_table = "events"
         ordering = ["-date"]
+        indexes = [models.Index(fields=["date"])]
+        constraints = [
+            # One row per recurring slot, so generating occurrences is idempotent
+            models.UniqueConstraint(
+                fields=["parent_event", "original_date"], name="unique_event_occurrence"
+            ),
+        ]
 
     def __str__(self):
         return f"{self.title} - {self.date.strftime('%Y-%m-%d %H:%M')}"
 
+    def save(self, *args, **kwargs):
+        from .recurrence import PATTERN_RULES
+
+        # Preset patterns are stored as their rule; "custom" keeps the given rule
+        if self.recurrence_pattern in PATTERN_RULES:
+            self.recurrence_rule = PATTERN_RULES[self.recurrence_pattern]
+        elif self.recurrence_pattern != "custom":
+            self.recurrence_rule = ""
+        if (
+            kwargs.get("update_fields") is not None
+            and "recurrence_pattern" in kwargs["update_fields"]
+        ):
+            kwargs["update_fields"] = {*kwargs["update_fields"], "recurrence_rule"}
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            # A stale in-memory counter must not overwrite concurrent RSVPs
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != "registered_count"
+            ]
+        super().save(*args, **kwargs)
+
     @property
     def is_recurring(self):
         """Check if this is a recurring event (computed from recurrence_pattern)."""
@@ -105,39 +168,39 @@ class Event(models.Model):
         """Check if this event is a generated occurrence of a parent event."""
         return self.parent_event is not None
 
+    @property
+    def is_virtual(self):
+        """An occurrence expanded from its parent's rule, with no row of its own."""
+        return self.pk is None and self.parent_event_id is not None
+
     @property
     def is_full(self):
         """Check if event has reached maximum capacity"""
-        if not self.max_attendees:
-            return False
-        return self.registrations.count() >= self.max_attendees
+        return capacity_fields(self.max_attendees, self.registered_count)["is_full"]
 
     @property
     def available_slots(self):
         """Return number of available slots"""
-        if not self.max_attendees:
-            return None
-        return max(0, self.max_attendees - self.registrations.count())
-
-    @property
-    def registered_count(self):
-        """Number of members who registered (RSVP'd)"""
-        return self.registrations.count()
+        return capacity_fields(self.max_attendees, self.registered_count)["available_slots"]
 
     def generate_occurrences(self, weeks_ahead=4):
         """
-        Generate future occurrences for this recurring event.
+        Materialize future occurrences for this recurring event.
+
+        Occurrences are expanded from the rule when events are read
+        (apps/events/recurrence.py), so rows are only needed in advance when
+        something must be attached to them ahead of time.
 
         Args:
-            weeks_ahead: How many weeks into the future to generate
+            weeks_ahead: How many weeks from now to generate
 
         Returns:
             List of created Event occurrences
         """
-        from datetime import timedelta
-
         from django.utils import timezone
 
+        from .services import generate_recurring_occurrences
+
         if not self.is_recurring:
             return []
 
@@ -145,62 +208,14 @@ class Event(models.Model):
             # This is already an occurrence, don't generate from it
             return []
 
-        created = []
-        current_date = self.date
-        end_limit = timezone.now() + timedelta(weeks=weeks_ahead)
-
-        # Respect recurrence_end_date if set
-        if self.recurrence_end_date:
-            end_date_aware = timezone.make_aware(
-                timezone.datetime.combine(self.recurrence_end_date, timezone.datetime.min.time())
-            )
-            end_limit = min(end_limit, end_date_aware)
-
-        # Calculate interval based on pattern
-        intervals = {
-            "daily": timedelta(days=1),
-            "weekly": timedelta(weeks=1),
-            "biweekly": timedelta(weeks=2),
-            "monthly": timedelta(days=30),  # Approximate
-        }
-        interval = intervals.get(self.recurrence_pattern)
-        if not interval:
+        report = generate_recurring_occurrences(
+            events=[self], weeks_ahead=weeks_ahead, now=timezone.now()
+        )
+        if not report["created"]:
             return []
-
-        # Get existing occurrence dates to avoid duplicates
-        existing_dates = set(self.occurrences.values_list("date__date", flat=True))
-        existing_dates.add(self.date.date())  # Include parent event date
-
-        # Generate occurrences
-        next_date = current_date + interval
-        while next_date <= end_limit:
-            if next_date.date() not in existing_dates:
-                # Calculate end_date offset if original has one
-                new_end_date = None
-                if self.end_date:
-                    duration = self.end_date - self.date
-                    new_end_date = next_date + duration
-
-                occurrence = Event.objects.create(
-                    title=self.title,
-                    description=self.description,
-                    event_type=self.event_type,
-                    status=self.status,
-                    date=next_date,
-                    end_date=new_end_date,
-                    location=self.location,
-                    organizer=self.organizer,
-                    ministry=self.ministry,
-                    max_attendees=self.max_attendees,
-                    recurrence_pattern="none",  # Occurrences don't recur
-                    parent_event=self,
-                )
-                created.append(occurrence)
-                existing_dates.add(next_date.date())
-
-            next_date += interval
-
-        return created
+        # Look up exactly the planned slots (the bulk insert returns no ids)
+        slots = [occurrence.original_date for occurrence in report["occurrences"]]
+        return list(self.occurrences.filter(original_date__in=slots).order_by("date"))
 
 
 class EventRegistration(models.Model):
@@ -239,3 +254,42 @@ class EventRegistration(models.Model):
         self.attended = True
         self.check_in_time = check_in_time or timezone.now()
         self.save()
+
+
+class EventWaitlistEntry(models.Model):
+    """A member waiting for a place at a full event, promoted in joined order."""
+
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name="waitlist")
+    member = models.ForeignKey(
+        "members.Member", on_delete=models.CASCADE, related_name="event_waitlist_entries"
+    )
+    notes = models.TextField(blank=True, help_text="Notes carried over to the registration")
+    joined_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "event_waitlist"
+        unique_together = ("event", "member")
+        ordering = ["joined_at", "id"]
+        verbose_name_plural = "event waitlist entries"
+
+    def __str__(self):
+        return f"{self.member.full_name} - {self.event.title} (waitlist)"
+
+    @property
+    def position(self):
+        """
+        1-based place in the event's waitlist. Lists annotate it as
+        ``waitlist_position`` (a row number) instead of counting per entry.
+        """
+        annotated = getattr(self, "waitlist_position", None)
+        if annotated is not None:
+            return annotated
+        return (
+            EventWaitlistEntry.objects.filter(event_id=self.event_id)
+            .filter(
+                models.Q(joined_at__lt=self.joined_at)
+                | models.Q(joined_at=self.joined_at, id__lt=self.id)
+            )
+            .count()
+            + 1
+        )
@@ -3,13 +3,22 @@ Public API views for events.
 No authentication required - for homepage consumption.
 """
 
+from datetime import timedelta
+
+from django.db.models import Q
 from django.utils import timezone
 from rest_framework import serializers
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from common.cache import cached_view
+
 from .models import Event
+from .recurrence import expand_events
+
+# How far back and ahead the public site lists events
+PUBLIC_EVENTS_HORIZON_DAYS = 365
 
 
 class PublicEventSerializer(serializers.ModelSerializer):
@@ -34,6 +43,8 @@ class PublicEventSerializer(serializers.ModelSerializer):
             "registered_count",
             "available_slots",
             "is_full",
+            "parent_event",
+            "original_date",
         ]
 
     def get_ministry_name(self, obj):
@@ -46,12 +57,48 @@ class PublicEventSerializer(serializers.ModelSerializer):
         return None
 
 
+def get_public_events(time_filter="all", event_type=None, ministry_id=None, limit=10):
+    """
+    Published/completed events for the public site.
+    Shared by the public API and the homepage bundle publisher.
+
+    Recurring events are expanded into their occurrences within
+    PUBLIC_EVENTS_HORIZON of today (one query, see recurrence.expand_events).
+    For time_filter 'all', upcoming events come first (soonest first),
+    followed by past events (most recent first).
+    """
+    now = timezone.now()
+    horizon = timedelta(days=PUBLIC_EVENTS_HORIZON_DAYS)
+
+    # Published events (includes completed for historical display)
+    filters = Q(status__in=["published", "completed"])
+    if event_type:
+        filters &= Q(event_type=event_type)
+    if ministry_id:
+        filters &= Q(ministry_id=ministry_id)
+
+    start = now if time_filter == "upcoming" else now - horizon
+    end = now if time_filter == "past" else now + horizon
+    events = expand_events(start, end, filters=filters)
+
+    upcoming = [event for event in events if event.date >= now][:limit]
+    past = [event for event in reversed(events) if event.date < now]
+    if time_filter == "upcoming":
+        return upcoming
+    if time_filter == "past":
+        return past[:limit]
+
+    # 'all': upcoming first, then fill with past events
+    return upcoming + past[: limit - len(upcoming)]
+
+
 class PublicEventsView(APIView):
     """
     GET /api/public/events/
 
     Public endpoint for fetching published events (including past events).
-    No authentication required.
+    No authentication required. Responses are cached per query string and
+    carry ETag/Last-Modified/Cache-Control headers (304 on revalidation).
 
     Query Parameters:
         event_type (str): Optional filter by event type (service, bible_study, etc.)
@@ -62,53 +109,21 @@ class PublicEventsView(APIView):
 
     permission_classes = [AllowAny]
 
+    @cached_view("public_events", timeout=60, max_age=60, stale_while_revalidate=300)
     def get(self, request):
-        now = timezone.now()
-
-        # Base queryset: published events (includes completed for historical display)
-        queryset = Event.objects.select_related("ministry", "organizer").filter(
-            status__in=["published", "completed"],
-        )
-
-        # Time filter: upcoming, past, or all (default: all)
-        time_filter = request.query_params.get("time_filter", "all").lower()
-        if time_filter == "upcoming":
-            queryset = queryset.filter(date__gte=now)
-        elif time_filter == "past":
-            queryset = queryset.filter(date__lt=now)
-        # 'all' - no date filtering
-
-        # Filter by event_type if provided
-        event_type = request.query_params.get("event_type")
-        if event_type:
-            queryset = queryset.filter(event_type=event_type)
-
-        # Filter by ministry if provided
-        ministry_id = request.query_params.get("ministry")
-        if ministry_id:
-            queryset = queryset.filter(ministry_id=ministry_id)
-
         # Apply limit
         try:
             limit = min(int(request.query_params.get("limit", 10)), 50)
         except (ValueError, TypeError):
             limit = 10
 
-        # Order: upcoming events ascending (soonest first), past events descending (most recent first)
-        if time_filter == "upcoming":
-            queryset = queryset.order_by("date")[:limit]
-        elif time_filter == "past":
-            queryset = queryset.order_by("-date")[:limit]
-        else:
-            # For 'all': show upcoming first (ascending), then past (descending)
-            # Split and recombine for proper ordering
-            upcoming = list(queryset.filter(date__gte=now).order_by("date")[:limit])
-            remaining = limit - len(upcoming)
-            if remaining > 0:
-                past = list(queryset.filter(date__lt=now).order_by("-date")[:remaining])
-                queryset = upcoming + past
-            else:
-                queryset = upcoming
+        # Time filter: upcoming, past, or all (default: all)
+        queryset = get_public_events(
+            time_filter=request.query_params.get("time_filter", "all").lower(),
+            event_type=request.query_params.get("event_type"),
+            ministry_id=request.query_params.get("ministry"),
+            limit=limit,
+        )
 
         serializer = PublicEventSerializer(queryset, many=True)
         return Response(
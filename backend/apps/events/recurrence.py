@@ -0,0 +1,185 @@
+"""
+Recurring events.
+
+A recurring event is a single Event row (the parent) carrying an iCalendar
+RRULE in ``recurrence_rule``; the preset patterns (weekly, monthly, ...) are
+stored as their rule. Its occurrences are not stored: reads over a date
+window expand them in memory (expand_events), so the events table no longer
+grows with every weekly service.
+
+An occurrence only gets a row of its own when something has to point at it,
+i.e. a registration, an attendance sheet, an edit or a cancellation
+(materialize_occurrence). That row has ``parent_event`` set and
+``original_date`` = the slot it stands for, and replaces the virtual
+occurrence for that slot even if its own date is moved.
+"""
+
+from datetime import datetime, time, timedelta
+
+from dateutil.rrule import rrulestr
+from django.db.models import BooleanField, ExpressionWrapper, Q, Value
+from django.utils import timezone
+
+from .models import Event
+
+# recurrence_pattern presets -> RRULE
+PATTERN_RULES = {
+    "daily": "FREQ=DAILY",
+    "weekly": "FREQ=WEEKLY",
+    "biweekly": "FREQ=WEEKLY;INTERVAL=2",
+    "monthly": "FREQ=MONTHLY",
+}
+
+# Longest window the API expands in one request
+MAX_WINDOW = timedelta(days=400)
+
+# Copied from the parent into each occurrence
+OCCURRENCE_FIELDS = [
+    "title",
+    "description",
+    "event_type",
+    "status",
+    "location",
+    "organizer",
+    "ministry",
+    "max_attendees",
+]
+
+
+def _local(dt):
+    """Naive local wall time; rules repeat at the same local time across DST."""
+    return timezone.localtime(dt).replace(tzinfo=None)
+
+
+def parse_rule(rule, dtstart=None):
+    """dateutil rrule for an RRULE string; raises ValueError if it is invalid."""
+    rule = rule.strip()
+    if rule.upper().startswith("RRULE:"):
+        rule = rule[6:]
+    if "FREQ=" not in rule.upper():
+        raise ValueError("Rule must contain FREQ=")
+    # ignoretz: UNTIL is read as local wall time, like DTSTART
+    return rrulestr(rule, dtstart=dtstart or datetime(2000, 1, 1), ignoretz=True)
+
+
+def occurrence_starts(event, start, end):
+    """Start times of the event's occurrences in [start, end), including its own date."""
+    if not event.recurrence_rule:
+        return []
+    rule = parse_rule(event.recurrence_rule, dtstart=_local(event.date))
+    low, high = _local(start), _local(end)
+    if event.recurrence_end_date:
+        high = min(high, datetime.combine(event.recurrence_end_date + timedelta(days=1), time.min))
+    if low >= high:
+        return []
+    tz = timezone.get_current_timezone()
+    return [timezone.make_aware(dt, tz) for dt in rule.between(low, high, inc=True) if dt < high]
+
+
+def _occurrence_values(parent, start):
+    values = {field: getattr(parent, field) for field in OCCURRENCE_FIELDS}
+    values["date"] = start
+    values["end_date"] = start + (parent.end_date - parent.date) if parent.end_date else None
+    return values
+
+
+def virtual_occurrence(parent, start):
+    """Unsaved Event for one occurrence of a recurring event."""
+    occurrence = Event(
+        parent_event=parent, original_date=start, **_occurrence_values(parent, start)
+    )
+    occurrence.registration_count = 0
+    return occurrence
+
+
+def stored_occurrence(parent, start):
+    """Unsaved row for one occurrence, as materialize_occurrence would create it."""
+    return Event(
+        parent_event=parent,
+        original_date=start,
+        recurrence_pattern="none",
+        **_occurrence_values(parent, start),
+    )
+
+
+def materialize_occurrence(parent, start):
+    """
+    Get or create the row for one occurrence of a recurring event.
+
+    Returns:
+        tuple: (Event, created); the parent itself for its own date
+
+    Raises:
+        ValueError: if ``start`` is not an occurrence of the event
+    """
+    if start == parent.date:
+        return parent, False
+    if start not in occurrence_starts(parent, start, start + timedelta(seconds=1)):
+        raise ValueError("Not an occurrence of this event")
+    return Event.objects.get_or_create(
+        parent_event=parent,
+        original_date=start,
+        defaults={**_occurrence_values(parent, start), "recurrence_pattern": "none"},
+    )
+
+
+def expand_events(start, end, filters=None, queryset=None):
+    """
+    Events in [start, end), with recurring events expanded into occurrences.
+
+    ``queryset`` defaults to services.event_list_queryset().
+
+    One query loads the one-off events in the window, every recurring parent
+    that may have occurrences in it, and the materialized occurrences for the
+    window; the rest happens in memory. ``filters`` (a Q on Event fields)
+    applies to every returned event. Materialized occurrences are loaded even
+    when they do not match it, so that e.g. a cancelled occurrence still
+    hides its slot when listing published events.
+
+    Returns:
+        list: Event instances sorted by date; virtual occurrences have no pk
+    """
+    if queryset is None:
+        from .services import event_list_queryset
+
+        queryset = event_list_queryset()
+
+    in_window = Q(date__gte=start, date__lt=end)
+    single = Q(parent_event__isnull=True, recurrence_rule="") & in_window
+    recurring = (
+        Q(parent_event__isnull=True, date__lt=end)
+        & ~Q(recurrence_rule="")
+        & (Q(recurrence_end_date__isnull=True) | Q(recurrence_end_date__gte=_local(start).date()))
+    )
+    materialized = Q(parent_event__isnull=False) & (
+        in_window | Q(original_date__gte=start, original_date__lt=end)
+    )
+    if filters:
+        condition = (filters & (single | recurring)) | materialized
+        matches = ExpressionWrapper(filters, output_field=BooleanField())
+    else:
+        condition = single | recurring | materialized
+        matches = Value(True)
+
+    rows = queryset.filter(condition).annotate(matches_filters=matches)
+
+    events, parents, replaced = [], [], set()
+    for row in rows:
+        if row.parent_event_id:
+            replaced.add((row.parent_event_id, row.original_date))
+            if row.matches_filters and start <= row.date < end:
+                events.append(row)
+        elif row.recurrence_rule:
+            parents.append(row)
+        else:
+            events.append(row)
+
+    for parent in parents:
+        if start <= parent.date < end:
+            events.append(parent)
+        for occurrence_start in occurrence_starts(parent, start, end):
+            if occurrence_start != parent.date and (parent.pk, occurrence_start) not in replaced:
+                events.append(virtual_occurrence(parent, occurrence_start))
+
+    events.sort(key=lambda event: (event.date, event.pk or 0))
+    return events
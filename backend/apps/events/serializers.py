@@ -1,6 +1,7 @@
 from rest_framework import serializers
 
-from .models import Event, EventRegistration
+from .models import Event, EventRegistration, EventWaitlistEntry
+from .recurrence import parse_rule
 
 
 class EventRegistrationSerializer(serializers.ModelSerializer):
@@ -21,11 +22,22 @@ class EventRegistrationSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "registered_at"]
 
 
+class EventWaitlistEntrySerializer(serializers.ModelSerializer):
+    member_name = serializers.CharField(source="member.full_name", read_only=True)
+    position = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = EventWaitlistEntry
+        fields = ["id", "event", "member", "member_name", "position", "joined_at", "notes"]
+        read_only_fields = fields
+
+
 class EventSerializer(serializers.ModelSerializer):
     organizer_name = serializers.CharField(source="organizer.get_full_name", read_only=True)
     ministry_name = serializers.CharField(source="ministry.name", read_only=True, allow_null=True)
     registration_count = serializers.IntegerField(read_only=True)
     is_occurrence = serializers.BooleanField(read_only=True)
+    is_virtual = serializers.BooleanField(read_only=True)
 
     class Meta:
         model = Event
@@ -44,10 +56,13 @@ class EventSerializer(serializers.ModelSerializer):
             "ministry_name",
             "max_attendees",
             "recurrence_pattern",
+            "recurrence_rule",
             "recurrence_end_date",
             "parent_event",
+            "original_date",
             "is_recurring",
             "is_occurrence",
+            "is_virtual",
             "registration_count",
             "is_full",
             "available_slots",
@@ -62,4 +77,28 @@ class EventSerializer(serializers.ModelSerializer):
             "available_slots",
             "is_recurring",
             "is_occurrence",
+            "is_virtual",
+            "original_date",
         ]
+        # Occurrence slots (parent_event, original_date) are only created
+        # server-side, so the unique constraint needs no serializer validator
+        validators = []
+
+    def validate_recurrence_rule(self, value):
+        if value:
+            try:
+                parse_rule(value)
+            except ValueError as e:
+                raise serializers.ValidationError(f"Invalid recurrence rule: {e}")
+        return value.strip()
+
+    def validate(self, attrs):
+        pattern = attrs.get(
+            "recurrence_pattern", getattr(self.instance, "recurrence_pattern", None)
+        )
+        rule = attrs.get("recurrence_rule", getattr(self.instance, "recurrence_rule", ""))
+        if pattern == "custom" and not rule:
+            raise serializers.ValidationError(
+                {"recurrence_rule": "A rule is required for a custom recurrence."}
+            )
+        return attrs
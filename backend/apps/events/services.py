@@ -0,0 +1,343 @@
+import logging
+import time
+from datetime import timedelta
+
+from django.db import IntegrityError, connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from apps.members.models import Member
+from common.cache import invalidate_namespace
+
+from .models import Event, EventRegistration, EventWaitlistEntry
+from .recurrence import occurrence_starts, stored_occurrence
+
+logger = logging.getLogger(__name__)
+
+
+def event_list_queryset(queryset=None):
+    """
+    Events with everything the list serializers read, in one query: organizer,
+    ministry and the registration count (as ``registration_count``, from the
+    registered_count column rather than a COUNT over registrations).
+    """
+    if queryset is None:
+        queryset = Event.objects.all()
+    return queryset.select_related("organizer", "ministry").annotate(
+        registration_count=F("registered_count")
+    )
+
+
+def get_recurring_events():
+    """Parent recurring events (not generated occurrences)."""
+    return Event.objects.filter(parent_event__isnull=True).exclude(recurrence_rule="")
+
+
+def plan_occurrences(parents, start, end):
+    """
+    Unsaved rows for the occurrences of ``parents`` in [start, end) that are
+    not stored yet. Existing occurrences are read with one query.
+
+    Returns:
+        tuple: (list of unsaved Events, number of slots already stored)
+    """
+    parents = [parent for parent in parents if parent.recurrence_rule]
+    existing = set(
+        Event.objects.filter(
+            parent_event__in=[parent.pk for parent in parents],
+            original_date__gte=start,
+            original_date__lt=end,
+        ).values_list("parent_event_id", "original_date")
+    )
+
+    missing, stored = [], 0
+    for parent in parents:
+        for slot in occurrence_starts(parent, start, end):
+            if slot == parent.date:
+                continue
+            if (parent.pk, slot) in existing:
+                stored += 1
+            else:
+                missing.append(stored_occurrence(parent, slot))
+    return missing, stored
+
+
+def generate_recurring_occurrences(
+    events=None, weeks_ahead=4, batch_size=1000, dry_run=False, now=None
+):
+    """
+    Store the occurrences of recurring events for the next ``weeks_ahead`` weeks.
+
+    Missing occurrences are computed in memory and written with one
+    bulk INSERT per ``batch_size`` rows; slots that already have a row are
+    skipped (and the unique slot constraint makes concurrent runs safe).
+    Reads don't need stored occurrences (see recurrence.py); this is for
+    attaching things to occurrences ahead of time.
+
+    Returns:
+        dict: events, existing, created, batches, seconds, per_event
+            (parent id -> occurrences created), occurrences (the planned
+            unsaved Event instances; bulk_create doesn't set their ids)
+    """
+    started = time.monotonic()
+    now = now or timezone.now()
+    if events is None:
+        events = get_recurring_events().select_related("organizer", "ministry")
+    events = list(events)
+
+    missing, existing = plan_occurrences(events, now, now + timedelta(weeks=weeks_ahead))
+    per_event = {}
+    for occurrence in missing:
+        per_event[occurrence.parent_event_id] = per_event.get(occurrence.parent_event_id, 0) + 1
+
+    batches = 0
+    if not dry_run:
+        for i in range(0, len(missing), batch_size):
+            Event.objects.bulk_create(missing[i : i + batch_size], ignore_conflicts=True)
+            batches += 1
+        if missing:
+            # bulk_create sends no post_save signals
+            invalidate_namespace("public_events", "ical_events")
+
+    return {
+        "events": len(events),
+        "existing": existing,
+        "created": len(missing),
+        "batches": batches,
+        "seconds": round(time.monotonic() - started, 3),
+        "per_event": per_event,
+        "occurrences": missing,
+    }
+
+
+# ============ Registration ============
+
+
+def _reserve_slot(event_id):
+    """Take one place at the event if it has room, in a single conditional UPDATE."""
+    has_room = (
+        Q(max_attendees__isnull=True)
+        | Q(max_attendees=0)
+        | Q(registered_count__lt=F("max_attendees"))
+    )
+    reserved = Event.objects.filter(has_room, pk=event_id).update(
+        registered_count=F("registered_count") + 1
+    )
+    return reserved == 1
+
+
+def _create_registration(event, member_id, notes):
+    registration = EventRegistration(event=event, member_id=member_id, notes=notes)
+    # The slot was already counted by _reserve_slot
+    registration._slot_reserved = True
+    registration.save()
+    return registration
+
+
+def register_member(event, member, notes="", waitlist=True):
+    """
+    Register a member for an event, or put them on its waitlist if it is full.
+
+    Capacity is enforced by a conditional UPDATE on the event's
+    registered_count, so concurrent RSVPs don't wait on a row lock and can't
+    overbook.
+
+    Returns:
+        tuple: (EventRegistration or EventWaitlistEntry, waitlisted)
+
+    Raises:
+        ValueError: if the member is already registered or waitlisted, or
+            the event is full and ``waitlist`` is False
+    """
+    try:
+        with transaction.atomic():
+            if _reserve_slot(event.pk):
+                registration = _create_registration(event, member.pk, notes)
+                EventWaitlistEntry.objects.filter(event=event, member=member).delete()
+                event.refresh_from_db(fields=["registered_count"])
+                return registration, False
+    except IntegrityError:
+        # Already registered; the rollback released the reserved slot
+        raise ValueError("Already registered") from None
+
+    if EventRegistration.objects.filter(event=event, member=member).exists():
+        raise ValueError("Already registered")
+    if not waitlist:
+        raise ValueError("Event is full")
+    entry, created = EventWaitlistEntry.objects.get_or_create(
+        event=event, member=member, defaults={"notes": notes}
+    )
+    if not created:
+        raise ValueError("Already on the waitlist")
+    logger.info(f"Member {member.pk} waitlisted for event {event.pk}")
+    return entry, True
+
+
+# Bulk registration outcomes
+REGISTERED = "registered"
+ALREADY_REGISTERED = "already_registered"
+WAITLISTED = "waitlisted"
+ALREADY_WAITLISTED = "already_waitlisted"
+FULL = "full"
+NOT_FOUND = "not_found"
+
+
+def register_members(event, member_ids, notes="", waitlist=True):
+    """
+    Register a group of members for an event at once.
+
+    Capacity is checked once, with the event row locked: members fill the
+    free places in the given order and the rest join the waitlist (or are
+    refused when ``waitlist`` is False). Registrations and waitlist entries
+    are bulk inserted and registered_count is bumped in one UPDATE, so the
+    number of queries doesn't depend on the group size.
+
+    Returns:
+        dict: member id -> REGISTERED, ALREADY_REGISTERED, WAITLISTED,
+        ALREADY_WAITLISTED, FULL or NOT_FOUND, in ``member_ids`` order
+    """
+    member_ids = list(dict.fromkeys(member_ids))
+    with transaction.atomic():
+        max_attendees, registered_count = (
+            Event.objects.select_for_update()
+            .filter(pk=event.pk)
+            .values_list("max_attendees", "registered_count")
+            .get()
+        )
+        known = set(
+            Member.objects.filter(pk__in=member_ids).order_by().values_list("pk", flat=True)
+        )
+        registered = set(
+            EventRegistration.objects.filter(event=event, member__in=known)
+            .order_by()
+            .values_list("member", flat=True)
+        )
+        waitlisted = set(
+            EventWaitlistEntry.objects.filter(event=event, member__in=known)
+            .order_by()
+            .values_list("member", flat=True)
+        )
+
+        room = len(member_ids) if not max_attendees else max(max_attendees - registered_count, 0)
+        outcomes, new_registrations, new_entries = {}, [], []
+        for member_id in member_ids:
+            if member_id not in known:
+                outcomes[member_id] = NOT_FOUND
+            elif member_id in registered:
+                outcomes[member_id] = ALREADY_REGISTERED
+            elif len(new_registrations) < room:
+                outcomes[member_id] = REGISTERED
+                new_registrations.append(
+                    EventRegistration(event=event, member_id=member_id, notes=notes)
+                )
+            elif member_id in waitlisted:
+                outcomes[member_id] = ALREADY_WAITLISTED
+            elif waitlist:
+                outcomes[member_id] = WAITLISTED
+                new_entries.append(
+                    EventWaitlistEntry(event=event, member_id=member_id, notes=notes)
+                )
+            else:
+                outcomes[member_id] = FULL
+
+        if new_registrations:
+            # bulk_create sends no post_save, so the count is bumped here
+            EventRegistration.objects.bulk_create(new_registrations, ignore_conflicts=True)
+            Event.objects.filter(pk=event.pk).update(
+                registered_count=F("registered_count") + len(new_registrations)
+            )
+            promoted = waitlisted & {item.member_id for item in new_registrations}
+            if promoted:
+                EventWaitlistEntry.objects.filter(event=event, member__in=promoted).delete()
+            # No post_save either, so the public list's counts are dropped here
+            transaction.on_commit(lambda: invalidate_namespace("public_events"))
+        if new_entries:
+            EventWaitlistEntry.objects.bulk_create(new_entries, ignore_conflicts=True)
+
+    event.registered_count = registered_count + len(new_registrations)
+    logger.info(
+        f"Bulk registration for event {event.pk}: {len(new_registrations)} registered, "
+        f"{len(new_entries)} waitlisted"
+    )
+    return outcomes
+
+
+def promote_waitlist(event):
+    """
+    Move waitlisted members into free places, first come first served.
+
+    Returns:
+        list: the new EventRegistrations
+    """
+    promoted = []
+    while True:
+        with transaction.atomic():
+            entries = EventWaitlistEntry.objects.filter(event_id=event.pk).order_by(
+                "joined_at", "id"
+            )
+            if connection.features.has_select_for_update_skip_locked:
+                entries = entries.select_for_update(skip_locked=True)
+            entry = entries.first()
+            if entry is None or not _reserve_slot(event.pk):
+                break
+            promoted.append(_create_registration(event, entry.member_id, entry.notes))
+            entry.delete()
+
+    if promoted:
+        event.refresh_from_db(fields=["registered_count"])
+        logger.info(f"Promoted {len(promoted)} member(s) from the waitlist of event {event.pk}")
+    return promoted
+
+
+def unregister_member(event, member_id):
+    """
+    Cancel a member's registration (or waitlist place) and fill the freed
+    place from the waitlist.
+
+    Returns:
+        list: registrations promoted from the waitlist
+
+    Raises:
+        ValueError: if the member is neither registered nor waitlisted
+    """
+    registration = EventRegistration.objects.filter(event=event, member_id=member_id).first()
+    if registration is None:
+        deleted, _ = EventWaitlistEntry.objects.filter(event=event, member_id=member_id).delete()
+        if not deleted:
+            raise ValueError("Not registered for this event")
+        return []
+    # Promoted here rather than after commit, so the caller gets the new registrations
+    registration._promotes_waitlist = False
+    registration.delete()
+    event.refresh_from_db(fields=["registered_count"])
+    return promote_waitlist(event)
+
+
+def _on_registration_saved(sender, instance, created, **kwargs):
+    """Count registrations created outside register_member (admin, API, imports)."""
+    if not created or getattr(instance, "_slot_reserved", False):
+        return
+    Event.objects.filter(pk=instance.event_id).update(registered_count=F("registered_count") + 1)
+    if EventRegistration.event.is_cached(instance):
+        instance.event.registered_count += 1
+
+
+def _on_registration_deleted(sender, instance, **kwargs):
+    """
+    Uncount deleted registrations, however they were deleted (admin, API,
+    cascades), and give the freed place to the waitlist after commit.
+    """
+    Event.objects.filter(pk=instance.event_id, registered_count__gt=0).update(
+        registered_count=F("registered_count") - 1
+    )
+    if EventRegistration.event.is_cached(instance) and instance.event.registered_count:
+        instance.event.registered_count -= 1
+    if getattr(instance, "_promotes_waitlist", True):
+        transaction.on_commit(lambda: _promote_waitlist_of(instance.event_id))
+
+
+def _promote_waitlist_of(event_id):
+    # The event itself may be what was deleted
+    event = Event.objects.filter(pk=event_id).first()
+    if event is not None:
+        promote_waitlist(event)
@@ -1,6 +1,9 @@
-from django.db import transaction
-from django.db.models import Count
-from django.shortcuts import get_object_or_404
+from datetime import datetime, time
+
+from django.db.models import F, Q, Window
+from django.db.models.functions import RowNumber
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import permissions, status, viewsets
 from rest_framework.decorators import action
@@ -8,10 +11,35 @@ from rest_framework.filters import OrderingFilter, SearchFilter
 from rest_framework.response import Response
 
 from apps.members.models import Member
+from apps.ministries.models import Ministry
 from common.permissions import IsAdminOrPastorReadOnly
 
-from .models import Event, EventRegistration
-from .serializers import EventRegistrationSerializer, EventSerializer
+from .models import EventRegistration
+from .recurrence import MAX_WINDOW, expand_events, materialize_occurrence
+from .serializers import EventRegistrationSerializer, EventSerializer, EventWaitlistEntrySerializer
+from .services import (
+    event_list_queryset,
+    promote_waitlist,
+    register_member,
+    register_members,
+    unregister_member,
+)
+
+
+def _parse_when(value):
+    """Aware datetime from an ISO date or datetime string (dates: local midnight)."""
+    if not value:
+        return None
+    try:
+        when = parse_datetime(value)
+        if when is None:
+            day = parse_date(value)
+            when = datetime.combine(day, time.min) if day else None
+    except ValueError:
+        return None
+    if when is not None and timezone.is_naive(when):
+        when = timezone.make_aware(when)
+    return when
 
 
 class EventViewSet(viewsets.ModelViewSet):
@@ -24,32 +52,127 @@ class EventViewSet(viewsets.ModelViewSet):
     ordering = ["-date"]
 
     def get_queryset(self):
-        return (
-            Event.objects.select_related("organizer", "ministry")
-            .annotate(registration_count=Count("registrations"))
-            .order_by("-date")
+        return event_list_queryset().order_by("-date")
+
+    def _expanded_filters(self):
+        """The list filters (status, event_type, ministry, search) as a Q."""
+        params = self.request.query_params
+        filters = Q()
+        for field in self.filterset_fields:
+            if params.get(field):
+                filters &= Q(**{field: params[field]})
+        if params.get("search"):
+            search = Q()
+            for field in self.search_fields:
+                search |= Q(**{f"{field}__icontains": params["search"]})
+            filters &= search
+        return filters
+
+    def _window(self, request):
+        """(start, end) from ?start=&end=, or an error Response."""
+        start = _parse_when(request.query_params.get("start"))
+        end = _parse_when(request.query_params.get("end"))
+        if start is None or end is None:
+            return None, Response(
+                {"detail": "start and end are required (ISO date or datetime)"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if not start < end <= start + MAX_WINDOW:
+            return None, Response(
+                {"detail": f"end must be after start and within {MAX_WINDOW.days} days"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return (start, end), None
+
+    def list(self, request, *args, **kwargs):
+        """
+        With ?start=&end=, recurring events are expanded into their occurrences
+        within that window (virtual occurrences have no id).
+        """
+        if "start" not in request.query_params and "end" not in request.query_params:
+            return super().list(request, *args, **kwargs)
+        window, error = self._window(request)
+        if error:
+            return error
+        events = expand_events(*window, filters=self._expanded_filters())
+        page = self.paginate_queryset(events)
+        if page is not None:
+            return self.get_paginated_response(self.get_serializer(page, many=True).data)
+        return Response(self.get_serializer(events, many=True).data)
+
+    @action(detail=False, methods=["get"])
+    def calendar(self, request):
+        """
+        Events between two dates, recurring events expanded, soonest first.
+        GET /api/events/calendar/?start=2026-03-01&end=2026-04-01
+        Accepts the list filters (status, event_type, ministry, search).
+        """
+        window, error = self._window(request)
+        if error:
+            return error
+        events = expand_events(*window, filters=self._expanded_filters())
+        return Response(self.get_serializer(events, many=True).data)
+
+    def _materialize(self, event, value):
+        """The stored occurrence of ``event`` starting at ``value`` (created if needed)."""
+        start = _parse_when(value)
+        if start is None:
+            raise ValueError("Invalid occurrence date")
+        if not event.recurrence_rule or event.parent_event_id:
+            raise ValueError("This event is not recurring")
+        return materialize_occurrence(event, start)
+
+    @action(
+        detail=True,
+        methods=["post"],
+        permission_classes=[permissions.IsAuthenticated, IsAdminOrPastorReadOnly],
+    )
+    def materialize(self, request, pk=None):
+        """
+        Store one occurrence of a recurring event so it can be edited or cancelled.
+        POST /api/events/{id}/materialize/
+        Body: { "date": "2026-03-08T09:00:00+08:00" }  (the occurrence's date)
+        """
+        event = self.get_object()
+        try:
+            occurrence, created = self._materialize(event, request.data.get("date"))
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(
+            self.get_serializer(occurrence).data,
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
         )
 
+    def perform_update(self, serializer):
+        event = serializer.save()
+        # Raising max_attendees frees places for the waitlist
+        promote_waitlist(event)
+
     @action(
         detail=True,
         methods=["post"],
         permission_classes=[permissions.IsAuthenticated, IsAdminOrPastorReadOnly],
     )
-    @transaction.atomic
     def register(self, request, pk=None):
         """
         Register a member for this event.
-        Body: { "member_id": 123, "notes": "optional" }
+        Body: { "member_id": 123, "notes": "optional", "occurrence_date": "optional",
+                "waitlist": true }
+
+        With occurrence_date, registers for that occurrence of a recurring
+        event, storing the occurrence first if it only exists virtually.
 
-        Uses select_for_update to prevent race conditions during capacity check.
+        When the event is full the member joins its waitlist (202) and is
+        registered automatically when a place frees up; with "waitlist": false
+        a full event is refused instead.
         """
-        # Lock the event row to prevent concurrent registrations from overbooking
-        # Use get_object_or_404 to preserve DRF 404 behavior
-        event = get_object_or_404(self.get_queryset().select_for_update(), pk=pk)
-        self.check_object_permissions(request, event)
+        event = self.get_object()
 
-        if event.is_full:
-            return Response({"detail": "Event is full"}, status=status.HTTP_400_BAD_REQUEST)
+        if request.data.get("occurrence_date"):
+            try:
+                event, _ = self._materialize(event, request.data["occurrence_date"])
+            except ValueError as e:
+                return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
         member_id = request.data.get("member_id")
         if not member_id:
@@ -66,16 +189,97 @@ class EventViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        registration, created = EventRegistration.objects.get_or_create(
-            event=event, member=member, defaults={"notes": request.data.get("notes", "")}
-        )
-
-        if not created:
-            return Response({"detail": "Already registered"}, status=status.HTTP_400_BAD_REQUEST)
+        waitlist = str(request.data.get("waitlist", True)).lower() not in ("false", "0")
+        try:
+            result, waitlisted = register_member(
+                event, member, notes=request.data.get("notes", ""), waitlist=waitlist
+            )
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-        serializer = EventRegistrationSerializer(registration)
+        if waitlisted:
+            data = EventWaitlistEntrySerializer(result).data
+            return Response(
+                {"detail": f"Event is full; added to the waitlist at #{data['position']}", **data},
+                status=status.HTTP_202_ACCEPTED,
+            )
+        serializer = EventRegistrationSerializer(result)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
+    @action(
+        detail=True,
+        methods=["post"],
+        permission_classes=[permissions.IsAuthenticated, IsAdminOrPastorReadOnly],
+    )
+    def bulk_register(self, request, pk=None):
+        """
+        Register a group of members (or a whole ministry) for this event.
+        POST /api/events/{id}/bulk_register/
+        Body: { "member_ids": [1, 2, 3] } or { "ministry_id": 4 },
+              "notes": "optional", "occurrence_date": "optional", "waitlist": true
+
+        Members fill the free places in the given order (a ministry's active
+        members by name); the rest join the waitlist, or are refused with
+        "waitlist": false. Returns each member's outcome: registered,
+        already_registered, waitlisted, already_waitlisted, full or not_found.
+        """
+        event = self.get_object()
+
+        if request.data.get("occurrence_date"):
+            try:
+                event, _ = self._materialize(event, request.data["occurrence_date"])
+            except ValueError as e:
+                return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        member_ids = request.data.get("member_ids")
+        ministry_id = request.data.get("ministry_id")
+        if ministry_id:
+            if not str(ministry_id).isdigit():
+                return Response(
+                    {"detail": "ministry_id must be an id"}, status=status.HTTP_400_BAD_REQUEST
+                )
+            if not Ministry.objects.filter(pk=ministry_id).exists():
+                return Response({"detail": "Ministry not found"}, status=status.HTTP_404_NOT_FOUND)
+            member_ids = Member.objects.filter(
+                Q(ministry_id=ministry_id)
+                | Q(ministry_2_id=ministry_id)
+                | Q(ministry_3_id=ministry_id),
+                is_active=True,
+                status="active",
+            ).values_list("pk", flat=True)
+        elif not isinstance(member_ids, list) or not member_ids:
+            return Response(
+                {"detail": "member_ids or ministry_id is required"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            member_ids = [int(member_id) for member_id in member_ids]
+        except (TypeError, ValueError):
+            return Response(
+                {"detail": "member_ids must be a list of ids"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        waitlist = str(request.data.get("waitlist", True)).lower() not in ("false", "0")
+        outcomes = register_members(
+            event, member_ids, notes=request.data.get("notes", ""), waitlist=waitlist
+        )
+
+        counts = {}
+        for outcome in outcomes.values():
+            counts[outcome] = counts.get(outcome, 0) + 1
+        return Response(
+            {
+                "event": event.pk,
+                "registered_count": event.registered_count,
+                "counts": counts,
+                "results": [
+                    {"member": member_id, "status": outcome}
+                    for member_id, outcome in outcomes.items()
+                ],
+            }
+        )
+
     @action(
         detail=True,
         methods=["delete"],
@@ -83,8 +287,10 @@ class EventViewSet(viewsets.ModelViewSet):
     )
     def unregister(self, request, pk=None):
         """
-        Unregister a member from this event.
+        Unregister a member from this event (or remove them from its waitlist).
         Query param: ?member_id=123
+
+        The freed place goes to the first member on the waitlist.
         """
         event = self.get_object()
         member_id = request.query_params.get("member_id")
@@ -96,13 +302,25 @@ class EventViewSet(viewsets.ModelViewSet):
             )
 
         try:
-            registration = EventRegistration.objects.get(event=event, member_id=member_id)
-            registration.delete()
-            return Response({"detail": "Unregistered successfully"})
-        except EventRegistration.DoesNotExist:
-            return Response(
-                {"detail": "Not registered for this event"}, status=status.HTTP_400_BAD_REQUEST
-            )
+            promoted = unregister_member(event, member_id)
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(
+            {
+                "detail": "Unregistered successfully",
+                "promoted": EventRegistrationSerializer(promoted, many=True).data,
+            }
+        )
+
+    @action(detail=True, methods=["get"])
+    def waitlist(self, request, pk=None):
+        """Members waiting for a place, in the order they will be promoted"""
+        event = self.get_object()
+        entries = event.waitlist.select_related("member").annotate(
+            waitlist_position=Window(RowNumber(), order_by=[F("joined_at").asc(), F("id").asc()])
+        )
+        serializer = EventWaitlistEntrySerializer(entries, many=True)
+        return Response(serializer.data)
 
     @action(detail=True, methods=["get"])
     def registrations(self, request, pk=None):
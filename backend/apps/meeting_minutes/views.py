@@ -14,6 +14,7 @@ from rest_framework.filters import OrderingFilter, SearchFilter
 from rest_framework.response import Response
 
 from common.permissions import IsAdminOrPastorReadOnly
+from common.uploads import DirectUploadMixin
 
 from .models import MeetingMinutes, MeetingMinutesAttachment
 from .serializers import (
@@ -350,14 +351,23 @@ class MeetingMinutesViewSet(viewsets.ModelViewSet):
         return response
 
 
-class MeetingMinutesAttachmentViewSet(viewsets.ModelViewSet):
-    """ViewSet for Meeting Minutes Attachments."""
+class MeetingMinutesAttachmentViewSet(DirectUploadMixin, viewsets.ModelViewSet):
+    """
+    ViewSet for Meeting Minutes Attachments.
+
+    Large files go through upload_url/finalize (common/uploads.py) instead of
+    a multipart POST.
+    """
 
     queryset = MeetingMinutesAttachment.objects.select_related("meeting_minutes", "uploaded_by")
     serializer_class = MeetingMinutesAttachmentSerializer
     permission_classes = [permissions.IsAuthenticated, IsAdminOrPastorReadOnly]
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ["meeting_minutes"]
+    upload_parent_field = "meeting_minutes"
+
+    def direct_upload_fields(self, file_name, content_type):
+        return {"file_type": file_name.split(".")[-1] if "." in file_name else ""}
 
     def perform_create(self, serializer):
         """Set uploaded_by to current user."""
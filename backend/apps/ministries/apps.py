@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class MinistriesConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.ministries"
+
+    def ready(self):
+        from common.cache import invalidate_on_change
+
+        from .models import Assignment, Ministry, Shift, ShiftFeedKey
+
+        # ShiftFeedKey: a revoked feed URL must stop serving its cached copy
+        invalidate_on_change("ical_shifts", Shift, Assignment, Ministry, ShiftFeedKey)
@@ -0,0 +1,114 @@
+"""
+Per-member iCalendar feed of shift assignments (see common/ical.py).
+
+Calendar clients can't log in, so the feed URL carries a signed member id
+and the member's ShiftFeedKey instead (feed_token); anyone with the URL can
+read that member's shifts until the key is rotated.
+"""
+
+import secrets
+from datetime import datetime, timedelta
+
+from django.core import signing
+from django.http import Http404
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from common import ical
+from common.cache import cached_view
+
+from .models import Assignment, ShiftFeedKey
+
+FEED_SALT = "ministries.shift-feed"
+
+# Past shifts kept in the feed
+FEED_HISTORY_DAYS = 90
+
+# Feeds are invalidated on change, so they can stay cached until then
+FEED_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def feed_token(member, rotate=False):
+    """Signed "<member id>:<key>"; ``rotate`` replaces the key, revoking older tokens."""
+    feed_key, created = ShiftFeedKey.objects.get_or_create(
+        member=member, defaults={"key": secrets.token_urlsafe(16)}
+    )
+    if rotate and not created:
+        feed_key.key = secrets.token_urlsafe(16)
+        feed_key.save()
+    return signing.Signer(salt=FEED_SALT).sign(f"{member.pk}:{feed_key.key}")
+
+
+def read_feed_token(token):
+    """The member id of a valid, unrevoked token, or None."""
+    try:
+        member_id, key = signing.Signer(salt=FEED_SALT).unsign(token).split(":", 1)
+        member_id = int(member_id)
+    except (signing.BadSignature, ValueError):
+        return None
+    if not ShiftFeedKey.objects.filter(member_id=member_id, key=key).exists():
+        return None
+    return member_id
+
+
+def feed_url(request, member, rotate=False):
+    path = reverse("public-shift-feed", kwargs={"token": feed_token(member, rotate=rotate)})
+    return request.build_absolute_uri(path)
+
+
+def _render(assignment):
+    shift = assignment.shift
+    start = timezone.make_aware(datetime.combine(shift.date, shift.start_time))
+    end = timezone.make_aware(datetime.combine(shift.date, shift.end_time))
+    if end <= start:
+        # Overnight shift
+        end += timedelta(days=1)
+    return ical.vevent(
+        uid=ical.uid("shift", shift.pk),
+        start=start,
+        end=end,
+        summary=f"{shift.ministry.name} shift",
+        description=shift.notes or "",
+        stamp=max(shift.updated_at, assignment.assigned_at),
+    )
+
+
+def build_shifts_feed(member_id):
+    """Calendar text of a member's assigned shifts from the last FEED_HISTORY_DAYS on."""
+    cutoff = timezone.localdate() - timedelta(days=FEED_HISTORY_DAYS)
+    assignments = list(
+        Assignment.objects.filter(member_id=member_id, shift__date__gte=cutoff)
+        .select_related("shift__ministry")
+        .order_by("shift__date", "shift__start_time")
+    )
+    blocks = ical.cached_vevents(
+        "assignment",
+        assignments,
+        lambda a: (a.shift.updated_at, a.assigned_at, a.shift.ministry.updated_at),
+        _render,
+    )
+    return ical.calendar("Ministry shifts", blocks)
+
+
+class ShiftFeedView(APIView):
+    """
+    GET /api/public/calendar/shifts/{token}.ics
+
+    Subscribable iCalendar feed of one member's shift assignments; the token
+    comes from GET /api/ministries/assignments/calendar_feed/?member={id}.
+    Cached until a shift, assignment, ministry or feed key changes.
+    """
+
+    permission_classes = [AllowAny]
+    authentication_classes = []
+    renderer_classes = [ical.ICalendarRenderer]
+
+    @cached_view("ical_shifts", timeout=FEED_CACHE_TIMEOUT, max_age=900)
+    def get(self, request, token):
+        member_id = read_feed_token(token)
+        if member_id is None:
+            raise Http404
+        return Response(build_shifts_feed(member_id))
@@ -0,0 +1,36 @@
+# Generated by Django 5.1.4 on 2026-10-19 09:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("members", "0011_rename_members_ministr_2_status_idx_members_ministr_dc85c8_idx_and_more"),
+        ("ministries", "0004_alter_ministrymember_options_remove_assignment_user_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ShiftFeedKey",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("key", models.CharField(max_length=32)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "member",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="shift_feed_key",
+                        to="members.member",
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -104,3 +104,17 @@ class Assignment(models.Model):
 
     def __str__(self):
         return f"{self.member.full_name} → {self.shift}"
+
+
+class ShiftFeedKey(models.Model):
+    """
+    Secret part of a member's shift calendar URL (apps/ministries/feeds.py).
+    Replacing the key revokes every URL handed out before.
+    """
+
+    member = models.OneToOneField(Member, on_delete=models.CASCADE, related_name="shift_feed_key")
+    key = models.CharField(max_length=32)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Shift feed key of {self.member.full_name}"
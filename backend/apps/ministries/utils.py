@@ -2,12 +2,15 @@ import logging
 from datetime import timedelta
 
 from django.conf import settings
-from django.core.mail import send_mail
 from django.db import transaction
 from django.utils import timezone
 
+from apps.notifications.outbox import queue_email
+
 from .models import Assignment, MinistryMember, Shift
 
+logger = logging.getLogger(__name__)
+
 
 def rotate_and_assign(
     ministry_ids=None,
@@ -186,7 +189,6 @@ def rotate_and_assign(
                                             )
                                             if email_sent:
                                                 summary["emailed"] += 1
-                                                print("    📧 Email sent")
                                             else:
                                                 summary["skipped_no_email"] += 1
                                                 print("    ⚠️ Email skipped (no address)")
@@ -305,17 +307,15 @@ Thank you for serving!
 SBCC Management System
         """.strip()
 
-        print(f"Sending email to {member.email}")
-
-        send_mail(
+        queue_email(
             subject=subject,
             message=message,
             from_email=settings.DEFAULT_FROM_EMAIL,
             recipient_list=[member.email],
-            fail_silently=False,
+            kind="shift_assignment",
         )
 
-        print(f"Email sent successfully to {member.email}")
+        logger.info(f"Shift assignment email queued for {member.email}")
         return True
 
     except Exception as e:
@@ -1,11 +1,14 @@
+from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import permissions, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.filters import OrderingFilter, SearchFilter
 from rest_framework.response import Response
 
+from apps.members.models import Member
 from common.permissions import IsAdminOrMinistryLeaderForMinistry, IsAdminOrMinistryLeaderForRelated
 
+from .feeds import feed_url
 from .models import Assignment, Ministry, MinistryMember, Shift
 from .serializers import (
     AssignmentSerializer,
@@ -124,3 +127,29 @@ class AssignmentViewSet(viewsets.ModelViewSet):
     search_fields = ["member__first_name", "member__last_name", "shift__ministry__name"]
     ordering_fields = ["assigned_at"]
     ordering = ["-assigned_at"]
+
+    @action(detail=False, methods=["get", "post"], permission_classes=[permissions.IsAuthenticated])
+    def calendar_feed(self, request):
+        """
+        Subscription URL of a member's shift calendar (.ics).
+        GET /api/ministries/assignments/calendar_feed/?member=12
+        POST (same URL) revokes the member's earlier URLs and returns a new one.
+
+        Admins only, or the user whose email is the member's.
+        """
+        member_id = request.query_params.get("member", "")
+        if not member_id.isdigit():
+            return Response({"detail": "member must be an id"}, status=status.HTTP_400_BAD_REQUEST)
+        member = get_object_or_404(Member, pk=member_id)
+
+        user = request.user
+        is_admin = user.is_superuser or user.role in ["super_admin", "admin"]
+        is_own = bool(member.email) and member.email.lower() == (user.email or "").lower()
+        if not (is_admin or is_own):
+            return Response(
+                {"detail": "You can only subscribe to your own shifts."},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        url = feed_url(request, member, rotate=request.method == "POST")
+        return Response({"member": member.pk, "url": url})
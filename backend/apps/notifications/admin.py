@@ -1,12 +1,52 @@
 from django.contrib import admin
 
-from .models import Notification
+from .models import Notification, OutboxEmail
+from .outbox import outbox_stats, retry_now
 
 
 @admin.register(Notification)
 class NotificationAdmin(admin.ModelAdmin):
-    list_display = ["id", "user", "type", "title", "read", "created_at"]
-    list_filter = ["type", "read", "created_at"]
+    list_display = ["id", "user", "audience", "type", "title", "read", "created_at"]
+    list_filter = ["type", "audience", "read", "created_at"]
     search_fields = ["title", "message", "user__username", "user__email"]
     ordering = ["-created_at"]
     readonly_fields = ["created_at"]
+
+
+@admin.register(OutboxEmail)
+class OutboxEmailAdmin(admin.ModelAdmin):
+    """Email queue; the change list shows queue depth and top failure reasons."""
+
+    list_display = [
+        "id",
+        "kind",
+        "subject",
+        "recipients",
+        "status",
+        "attempts",
+        "next_attempt_at",
+        "short_error",
+        "created_at",
+    ]
+    list_filter = ["status", "kind", "created_at"]
+    search_fields = ["subject", "to", "last_error"]
+    ordering = ["-created_at"]
+    readonly_fields = ["created_at", "sent_at", "locked_at", "attempts", "last_error"]
+    actions = ["retry_selected"]
+
+    @admin.display(description="To")
+    def recipients(self, obj):
+        return ", ".join(obj.to)
+
+    @admin.display(description="Last error")
+    def short_error(self, obj):
+        return obj.last_error[:80]
+
+    @admin.action(description="Retry selected emails now")
+    def retry_selected(self, request, queryset):
+        count = retry_now(queryset)
+        self.message_user(request, f"{count} email(s) requeued")
+
+    def changelist_view(self, request, extra_context=None):
+        extra_context = {**(extra_context or {}), "outbox_stats": outbox_stats()}
+        return super().changelist_view(request, extra_context=extra_context)
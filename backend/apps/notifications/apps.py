@@ -5,3 +5,19 @@ class NotificationsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.notifications"
     verbose_name = "Notifications"
+
+    def ready(self):
+        from django.db.models.signals import post_delete, post_save
+
+        from core.scheduler import register_job
+
+        from .models import Notification, NotificationReceipt, NotificationWatermark
+        from .retention import scheduled_prune
+        from .stream import _on_notification_saved, _on_read_state_saved
+
+        post_save.connect(_on_notification_saved, sender=Notification)
+        post_delete.connect(_on_read_state_saved, sender=Notification)
+        post_save.connect(_on_read_state_saved, sender=NotificationReceipt)
+        post_delete.connect(_on_read_state_saved, sender=NotificationReceipt)
+        post_save.connect(_on_read_state_saved, sender=NotificationWatermark)
+        register_job("notifications.prune", "15 3 * * *", scheduled_prune)
@@ -0,0 +1 @@
+# Required for Python package
@@ -0,0 +1,116 @@
+"""
+Management command to archive and delete expired notifications.
+
+TTLs per type come from NOTIFICATION_RETENTION_DAYS. Rows are removed in small
+batches (one short transaction each) and, unless --no-archive is given, written
+to gzipped JSON-lines archives in the default storage first.
+
+Usage:
+    python manage.py prune_notifications --dry-run
+    python manage.py prune_notifications
+    python manage.py prune_notifications --batch-size=500 --pause=0.5 --vacuum
+    python manage.py prune_notifications --no-archive
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.notifications.models import Notification, NotificationReceipt
+from apps.notifications.retention import (
+    get_retention_days,
+    get_table_sizes,
+    prune_notifications,
+    vacuum,
+)
+
+TABLES = [Notification._meta.db_table, NotificationReceipt._meta.db_table]
+
+
+def _size(value):
+    if value is None:
+        return "n/a"
+    if value >= 1024 * 1024:
+        return f"{value / (1024 * 1024):.1f} MB"
+    return f"{value / 1024:.1f} KB"
+
+
+class Command(BaseCommand):
+    help = "Archive and delete notifications older than their per-type retention period"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Rows deleted per transaction (default: 1000)",
+        )
+        parser.add_argument(
+            "--max-batches",
+            type=int,
+            default=None,
+            help="Stop after this many batches (default: until done)",
+        )
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=0,
+            help="Seconds to wait between batches (default: 0)",
+        )
+        parser.add_argument(
+            "--no-archive",
+            action="store_true",
+            help="Delete without writing archive files",
+        )
+        parser.add_argument(
+            "--vacuum",
+            action="store_true",
+            help="Run VACUUM ANALYZE afterwards so freed space shows up (PostgreSQL)",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Show what would be removed without deleting",
+        )
+
+    def write_sizes(self, title):
+        self.stdout.write(f"\n=== {title} ===")
+        for table in TABLES:
+            sizes = get_table_sizes(table)
+            self.stdout.write(
+                f"  {table}: {sizes['rows']} rows, table {_size(sizes['table_bytes'])}, "
+                f"indexes {_size(sizes['index_bytes'])}"
+            )
+            for name, size in sorted(sizes["indexes"].items()):
+                self.stdout.write(f"    {name}: {_size(size)}")
+
+    def handle(self, *args, **options):
+        ttls = ", ".join(f"{t}={d}d" for t, d in sorted(get_retention_days().items()))
+        self.stdout.write(f"Retention: {ttls}")
+        self.write_sizes("Before")
+
+        result = prune_notifications(
+            batch_size=options["batch_size"],
+            archive=not options["no_archive"],
+            dry_run=options["dry_run"],
+            max_batches=options["max_batches"],
+            pause=options["pause"],
+        )
+
+        if options["dry_run"]:
+            self.stdout.write(
+                self.style.WARNING(f"\nDry run - {result['expired']} notification(s) expired")
+            )
+            return
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"\nDeleted {result['deleted']} of {result['expired']} expired notification(s) "
+                f"in {result['batches']} batch(es)"
+            )
+        )
+        for name in result["archives"]:
+            self.stdout.write(f"  Archived to {name}")
+
+        if options["vacuum"]:
+            for table in TABLES:
+                vacuum(table)
+        self.write_sizes("After")
@@ -0,0 +1,106 @@
+"""
+Management command that delivers queued emails from the outbox.
+
+Runs as a long-lived worker by default; --once drains what is due and exits
+(e.g. from cron). Several workers can run at the same time.
+
+Usage:
+    python manage.py send_queued_emails
+    python manage.py send_queued_emails --once
+    python manage.py send_queued_emails --workers=8 --rate=10
+    python manage.py send_queued_emails --stats
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from apps.notifications.outbox import close_idle_connections, outbox_stats, process_outbox
+
+
+class Command(BaseCommand):
+    help = "Deliver queued emails with retries, backoff and rate limiting"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Deliver everything that is due, then exit",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=None,
+            help="Emails claimed per batch (default: EMAIL_OUTBOX_BATCH_SIZE)",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Concurrent sending threads (default: EMAIL_OUTBOX_WORKERS)",
+        )
+        parser.add_argument(
+            "--rate",
+            type=float,
+            default=None,
+            help="Max emails per second, 0 = unlimited (default: EMAIL_OUTBOX_RATE_LIMIT)",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5,
+            help="Seconds to wait when the queue is empty (default: 5)",
+        )
+        parser.add_argument(
+            "--stats",
+            action="store_true",
+            help="Print queue depth and failure reasons, then exit",
+        )
+
+    def write_stats(self):
+        stats = outbox_stats()
+        counts = ", ".join(f"{status}={n}" for status, n in stats["counts"].items())
+        self.stdout.write(f"Outbox: {counts}")
+        self.stdout.write(
+            f"Due now: {stats['due']} (oldest waiting {stats['oldest_due_seconds']}s)"
+        )
+        for reason, count in stats["failures"]:
+            self.stdout.write(f"  {count} x {reason[:120]}")
+
+    def handle(self, *args, **options):
+        if options["stats"]:
+            self.write_stats()
+            return
+
+        totals = {"claimed": 0, "sent": 0, "retried": 0, "dead": 0}
+        try:
+            while True:
+                result = process_outbox(
+                    batch_size=options["batch_size"],
+                    workers=options["workers"],
+                    rate_limit=options["rate"],
+                )
+                for key in totals:
+                    totals[key] += result[key]
+                if result["claimed"]:
+                    self.stdout.write(
+                        f"Sent {result['sent']}, retrying {result['retried']}, "
+                        f"dead {result['dead']}"
+                    )
+                elif options["once"]:
+                    break
+                else:
+                    close_old_connections()
+                    time.sleep(options["interval"])
+        except KeyboardInterrupt:
+            pass
+        finally:
+            close_idle_connections()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Done: {totals['sent']} sent, {totals['retried']} to retry, "
+                f"{totals['dead']} dead-lettered"
+            )
+        )
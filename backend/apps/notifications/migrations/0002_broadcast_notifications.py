@@ -0,0 +1,109 @@
+# Generated by Django 5.1.4 on 2026-10-19 04:22
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notifications", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="NotificationReceipt",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("read", models.BooleanField(default=False)),
+                ("dismissed", models.BooleanField(default=False, help_text="Deleted by the user")),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "db_table": "notification_receipts",
+            },
+        ),
+        migrations.CreateModel(
+            name="NotificationWatermark",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("read_up_to", models.DateTimeField()),
+            ],
+            options={
+                "db_table": "notification_watermarks",
+            },
+        ),
+        migrations.AddField(
+            model_name="notification",
+            name="audience",
+            field=models.CharField(
+                blank=True,
+                choices=[("all", "All Users"), ("admins", "Admins & Pastors")],
+                default="",
+                help_text="Broadcast audience (blank for personal notifications)",
+                max_length=20,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="notification",
+            name="user",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="notifications",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="notification",
+            index=models.Index(
+                fields=["audience", "-created_at"], name="notificatio_audienc_b53402_idx"
+            ),
+        ),
+        migrations.AddField(
+            model_name="notificationreceipt",
+            name="notification",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="receipts",
+                to="notifications.notification",
+            ),
+        ),
+        migrations.AddField(
+            model_name="notificationreceipt",
+            name="user",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="notification_receipts",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddField(
+            model_name="notificationwatermark",
+            name="user",
+            field=models.OneToOneField(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="notification_watermark",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="notificationreceipt",
+            constraint=models.UniqueConstraint(
+                fields=("notification", "user"), name="unique_notification_receipt"
+            ),
+        ),
+    ]
@@ -1,10 +1,17 @@
 from django.db import models
+from django.utils import timezone
 
 from apps.authentication.models import User
 
 
 class Notification(models.Model):
-    """In-app notification for users."""
+    """
+    In-app notification for users.
+
+    Personal notifications have a ``user``. Broadcasts (``user`` is null) are
+    stored once for a whole audience; per-user read state lives in
+    NotificationReceipt / NotificationWatermark (fan-out on read).
+    """
 
     TYPE_CHOICES = [
         ("prayer_request", "Prayer Request"),
@@ -15,7 +22,25 @@ class Notification(models.Model):
         ("system", "System"),
     ]
 
-    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="notifications")
+    AUDIENCE_ALL = "all"
+    AUDIENCE_ADMINS = "admins"
+    AUDIENCE_CHOICES = [
+        (AUDIENCE_ALL, "All Users"),
+        (AUDIENCE_ADMINS, "Admins & Pastors"),
+    ]
+    # Roles that receive AUDIENCE_ADMINS broadcasts
+    ADMIN_ROLES = ["super_admin", "admin", "pastor"]
+
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="notifications", null=True, blank=True
+    )
+    audience = models.CharField(
+        max_length=20,
+        choices=AUDIENCE_CHOICES,
+        blank=True,
+        default="",
+        help_text="Broadcast audience (blank for personal notifications)",
+    )
     type = models.CharField(max_length=20, choices=TYPE_CHOICES)
     title = models.CharField(max_length=200)
     message = models.TextField(blank=True)
@@ -30,7 +55,103 @@ class Notification(models.Model):
         ordering = ["-created_at"]
         indexes = [
             models.Index(fields=["user", "read", "-created_at"]),
+            models.Index(fields=["audience", "-created_at"]),
+        ]
+
+    def __str__(self):
+        recipient = self.user.username if self.user_id else f"[{self.audience}]"
+        return f"{self.type}: {self.title} → {recipient}"
+
+    @property
+    def is_broadcast(self):
+        return self.user_id is None
+
+    @classmethod
+    def audiences_for(cls, user):
+        """Broadcast audiences a user belongs to."""
+        if user.role in cls.ADMIN_ROLES or user.is_superuser:
+            return [cls.AUDIENCE_ALL, cls.AUDIENCE_ADMINS]
+        return [cls.AUDIENCE_ALL]
+
+
+class NotificationReceipt(models.Model):
+    """Per-user read/dismissed state of a broadcast notification."""
+
+    notification = models.ForeignKey(
+        Notification, on_delete=models.CASCADE, related_name="receipts"
+    )
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="notification_receipts")
+    read = models.BooleanField(default=False)
+    dismissed = models.BooleanField(default=False, help_text="Deleted by the user")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "notification_receipts"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["notification", "user"], name="unique_notification_receipt"
+            ),
+        ]
+
+    def __str__(self):
+        return f"Receipt: {self.notification_id} → {self.user_id}"
+
+
+class NotificationWatermark(models.Model):
+    """Broadcasts created at or before ``read_up_to`` count as read for the user."""
+
+    user = models.OneToOneField(
+        User, on_delete=models.CASCADE, related_name="notification_watermark"
+    )
+    read_up_to = models.DateTimeField()
+
+    class Meta:
+        db_table = "notification_watermarks"
+
+    def __str__(self):
+        return f"{self.user_id} read up to {self.read_up_to}"
+
+
+class OutboxEmail(models.Model):
+    """
+    Transactional email outbox.
+
+    Rows are written in the same transaction as the change that triggers the
+    email and delivered later by ``manage.py send_queued_emails``
+    (see apps/notifications/outbox.py).
+    """
+
+    STATUS_PENDING = "pending"
+    STATUS_SENDING = "sending"
+    STATUS_SENT = "sent"
+    STATUS_DEAD = "dead"
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pending"),
+        (STATUS_SENDING, "Sending"),
+        (STATUS_SENT, "Sent"),
+        (STATUS_DEAD, "Dead letter"),
+    ]
+
+    kind = models.CharField(max_length=50, blank=True, help_text="What triggered the email")
+    subject = models.CharField(max_length=300)
+    body = models.TextField()
+    html_body = models.TextField(blank=True)
+    from_email = models.CharField(max_length=255, blank=True)
+    to = models.JSONField(default=list)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "email_outbox"
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"]),
         ]
 
     def __str__(self):
-        return f"{self.type}: {self.title} → {self.user.username}"
+        return f"{self.subject} → {', '.join(self.to)} ({self.status})"
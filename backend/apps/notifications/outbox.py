@@ -0,0 +1,413 @@
+"""
+Transactional email outbox.
+
+Code that sends email queues it instead of talking to SMTP/Brevo inline:
+
+    queue_email(subject, message, [member.email], kind="pastoral_care")
+    queue_mass_email([(subject, message, from_email, [email]), ...], kind="announcement")
+
+The rows are plain inserts, so they commit (or roll back) together with the
+surrounding transaction. `manage.py send_queued_emails` drains the queue (the
+production image runs it next to the web server, see start.sh):
+
+- rows are claimed in batches (SELECT ... FOR UPDATE SKIP LOCKED where the
+  database supports it), so several workers can run side by side;
+- each batch is delivered on EMAIL_OUTBOX_WORKERS threads, each reusing one
+  backend connection (SMTP connections stay open between batches);
+- failures are retried with exponential backoff (EMAIL_OUTBOX_RETRY_BASE,
+  doubling up to EMAIL_OUTBOX_RETRY_MAX) and moved to the dead-letter state
+  after EMAIL_OUTBOX_MAX_ATTEMPTS;
+- EMAIL_OUTBOX_RATE_LIMIT caps messages per second (0 = unlimited).
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import close_old_connections, connection, transaction
+from django.db.models import Count, Min
+from django.utils import timezone
+
+from .models import OutboxEmail
+
+logger = logging.getLogger(__name__)
+
+# Rows stuck in "sending" longer than this (crashed worker) are released
+LOCK_TIMEOUT = timedelta(minutes=10)
+
+# Open SMTP connections kept between batches; CustomEmailBackend NOOPs an idle
+# one before reuse and reconnects if the server hung up
+_idle_connections = {}
+_idle_lock = threading.Lock()
+
+# Background pool for send_now deliveries (created on first use)
+_executor = None
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+# ============ Queueing ============
+
+
+def _row(subject, message, recipient_list, from_email=None, html_message="", kind=""):
+    return OutboxEmail(
+        kind=kind,
+        subject=subject,
+        body=message,
+        html_body=html_message or "",
+        from_email=from_email or "",
+        to=[addr for addr in recipient_list if addr],
+    )
+
+
+def queue_email(
+    subject, message, recipient_list, from_email=None, html_message="", kind="", send_now=False
+):
+    """
+    Queue one email (same arguments as django.core.mail.send_mail).
+
+    With ``send_now`` the email is also sent right after the transaction
+    commits (best effort, see deliver_now), for mail the user is waiting on.
+    Per EMAIL_OUTBOX_SEND_NOW_MODE that happens on a background thread, so
+    the response does not wait on (or reveal) the mail provider.
+
+    Returns:
+        OutboxEmail or None if there are no recipients
+    """
+    row = _row(subject, message, recipient_list, from_email, html_message, kind)
+    if not row.to:
+        return None
+    row.save()
+    if send_now:
+        schedule_delivery([row.id])
+    return row
+
+
+def queue_mass_email(datatuple, kind=""):
+    """
+    Queue many emails at once (same datatuple as django.core.mail.send_mass_mail).
+
+    Returns:
+        list: The OutboxEmail rows created (with primary keys)
+    """
+    rows = [
+        _row(subject, message, recipients, from_email, kind=kind)
+        for subject, message, from_email, recipients in datatuple
+    ]
+    rows = [row for row in rows if row.to]
+    return OutboxEmail.objects.bulk_create(rows, batch_size=500)
+
+
+# ============ Claiming ============
+
+
+def retry_delay(attempts):
+    """Backoff before the next attempt after `attempts` failures."""
+    base = _setting("EMAIL_OUTBOX_RETRY_BASE", 60)
+    cap = _setting("EMAIL_OUTBOX_RETRY_MAX", 3600)
+    return timedelta(seconds=min(base * 2 ** (attempts - 1), cap))
+
+
+def release_stale(now=None):
+    """Put rows claimed by a worker that died back in the queue."""
+    now = now or timezone.now()
+    return OutboxEmail.objects.filter(
+        status=OutboxEmail.STATUS_SENDING, locked_at__lt=now - LOCK_TIMEOUT
+    ).update(status=OutboxEmail.STATUS_PENDING, locked_at=None)
+
+
+def claim_batch(limit, now=None):
+    """Mark up to `limit` due rows as sending and return them."""
+    now = now or timezone.now()
+    with transaction.atomic():
+        due = OutboxEmail.objects.filter(
+            status=OutboxEmail.STATUS_PENDING, next_attempt_at__lte=now
+        ).order_by("next_attempt_at", "id")
+        if connection.features.has_select_for_update_skip_locked:
+            due = due.select_for_update(skip_locked=True)
+        ids = list(due.values_list("id", flat=True)[:limit])
+        OutboxEmail.objects.filter(id__in=ids, status=OutboxEmail.STATUS_PENDING).update(
+            status=OutboxEmail.STATUS_SENDING, locked_at=now
+        )
+    return list(
+        OutboxEmail.objects.filter(
+            id__in=ids, status=OutboxEmail.STATUS_SENDING, locked_at=now
+        ).order_by("id")
+    )
+
+
+# ============ Delivery ============
+
+
+def _message(row):
+    message = EmailMultiAlternatives(
+        subject=row.subject,
+        body=row.body,
+        from_email=row.from_email or settings.DEFAULT_FROM_EMAIL,
+        to=row.to,
+    )
+    if row.html_body:
+        message.attach_alternative(row.html_body, "text/html")
+    return message
+
+
+def _connection_key():
+    return (
+        settings.EMAIL_BACKEND,
+        getattr(settings, "EMAIL_HOST", ""),
+        getattr(settings, "EMAIL_PORT", None),
+        getattr(settings, "EMAIL_HOST_USER", ""),
+    )
+
+
+def _checkout_connection():
+    with _idle_lock:
+        idle = _idle_connections.get(_connection_key())
+        if idle:
+            return idle.pop()
+    return get_connection(fail_silently=False)
+
+
+def _release_connection(email_connection):
+    """Keep an open keep-alive capable connection for the next batch, else close it."""
+    if getattr(email_connection, "keepalive_interval", None) is not None and getattr(
+        email_connection, "connection", None
+    ):
+        with _idle_lock:
+            idle = _idle_connections.setdefault(_connection_key(), [])
+            if len(idle) < _setting("EMAIL_OUTBOX_WORKERS", 4):
+                idle.append(email_connection)
+                return
+    email_connection.close()
+
+
+def close_idle_connections():
+    """Close connections kept between batches (worker shutdown)."""
+    with _idle_lock:
+        connections = [c for idle in _idle_connections.values() for c in idle]
+        _idle_connections.clear()
+    for email_connection in connections:
+        email_connection.close()
+
+
+def send_rows(rows):
+    """
+    Deliver rows over a single backend connection (no database access).
+
+    Backends that report per-recipient results (Brevo, CustomEmailBackend) get
+    the whole chunk in one call: Brevo batches identical emails, SMTP sends
+    them all on one connection, which is then kept open for the next batch.
+    Other backends send one message at a time on the open connection.
+
+    Returns:
+        list: error message per row (None if sent)
+    """
+    email_connection = _checkout_connection()
+    messages = [_message(row) for row in rows]
+
+    if hasattr(email_connection, "results"):
+        error = None
+        try:
+            # Opened here so send_messages() leaves the connection open
+            email_connection.open()
+            email_connection.send_messages(messages)
+        except Exception as e:
+            error = str(e) or e.__class__.__name__
+        failed = {}
+        sent = set()
+        for result in email_connection.results:
+            if result["status"] == "sent":
+                sent.add(result["index"])
+            else:
+                failed[result["index"]] = result["error"] or "Rejected"
+        _release_connection(email_connection)
+        return [
+            failed.get(i) or (None if i in sent else error or "Not sent") for i in range(len(rows))
+        ]
+
+    errors = []
+    try:
+        email_connection.open()
+    except Exception as e:
+        return [str(e)] * len(rows)
+    try:
+        for message in messages:
+            try:
+                sent = email_connection.send_messages([message])
+                errors.append(None if sent else "Not accepted by the mail server")
+            except Exception as e:
+                errors.append(str(e) or e.__class__.__name__)
+                # Drop a possibly broken connection; the next send reopens it
+                email_connection.close()
+    finally:
+        email_connection.close()
+    return errors
+
+
+def _record(rows, errors, now):
+    max_attempts = _setting("EMAIL_OUTBOX_MAX_ATTEMPTS", 6)
+    summary = {"sent": 0, "retried": 0, "dead": 0}
+    for row, error in zip(rows, errors):
+        row.attempts += 1
+        row.locked_at = None
+        if error is None:
+            row.status = OutboxEmail.STATUS_SENT
+            row.sent_at = now
+            row.last_error = ""
+            summary["sent"] += 1
+        elif row.attempts >= max_attempts:
+            row.status = OutboxEmail.STATUS_DEAD
+            row.last_error = error[:1000]
+            summary["dead"] += 1
+            logger.error(f"Email {row.id} dead-lettered after {row.attempts} attempts: {error}")
+        else:
+            row.status = OutboxEmail.STATUS_PENDING
+            row.next_attempt_at = now + retry_delay(row.attempts)
+            row.last_error = error[:1000]
+            summary["retried"] += 1
+            logger.warning(f"Email {row.id} failed (attempt {row.attempts}), will retry: {error}")
+
+    OutboxEmail.objects.bulk_update(
+        rows, ["status", "attempts", "locked_at", "sent_at", "next_attempt_at", "last_error"]
+    )
+    return summary
+
+
+def process_outbox(batch_size=None, workers=None, rate_limit=None):
+    """
+    Claim and deliver one batch of due emails.
+
+    Returns:
+        dict: claimed, sent, retried, dead
+    """
+    batch_size = batch_size or _setting("EMAIL_OUTBOX_BATCH_SIZE", 100)
+    workers = workers or _setting("EMAIL_OUTBOX_WORKERS", 4)
+    if rate_limit is None:
+        rate_limit = _setting("EMAIL_OUTBOX_RATE_LIMIT", 0)
+    if rate_limit:
+        # Never claim more than one second's worth at a time
+        batch_size = max(1, min(batch_size, int(rate_limit)))
+
+    started = time.monotonic()
+    release_stale()
+    rows = claim_batch(batch_size)
+    summary = {"claimed": len(rows), "sent": 0, "retried": 0, "dead": 0}
+    if not rows:
+        return summary
+
+    chunk_size = -(-len(rows) // workers)
+    chunks = [rows[i : i + chunk_size] for i in range(0, len(rows), chunk_size)]
+    if len(chunks) == 1:
+        results = [send_rows(chunks[0])]
+    else:
+        with ThreadPoolExecutor(max_workers=len(chunks), thread_name_prefix="outbox") as pool:
+            results = list(pool.map(send_rows, chunks))
+
+    errors = [error for chunk_errors in results for error in chunk_errors]
+    summary.update(_record(rows, errors, timezone.now()))
+
+    if rate_limit:
+        remaining = len(rows) / rate_limit - (time.monotonic() - started)
+        if remaining > 0:
+            time.sleep(remaining)
+    return summary
+
+
+def deliver_now(ids):
+    """
+    Send specific queued rows immediately, on the calling thread.
+
+    The rows are claimed like a worker would, so a worker that got there first
+    wins and nothing is sent twice. Failures stay in the queue with the usual
+    backoff; nothing is raised.
+
+    Returns:
+        dict: claimed, sent, retried, dead
+    """
+    summary = {"claimed": 0, "sent": 0, "retried": 0, "dead": 0}
+    try:
+        now = timezone.now()
+        OutboxEmail.objects.filter(id__in=ids, status=OutboxEmail.STATUS_PENDING).update(
+            status=OutboxEmail.STATUS_SENDING, locked_at=now
+        )
+        rows = list(
+            OutboxEmail.objects.filter(
+                id__in=ids, status=OutboxEmail.STATUS_SENDING, locked_at=now
+            ).order_by("id")
+        )
+        summary["claimed"] = len(rows)
+        if rows:
+            summary.update(_record(rows, send_rows(rows), timezone.now()))
+    except Exception:
+        logger.exception(f"Immediate delivery of emails {ids} failed; left for the worker")
+    return summary
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="outbox-send-now")
+    return _executor
+
+
+def _deliver_in_thread(ids):
+    try:
+        deliver_now(ids)
+    finally:
+        close_old_connections()
+
+
+def schedule_delivery(ids):
+    """Send queued rows after commit, per EMAIL_OUTBOX_SEND_NOW_MODE (thread/sync/off)."""
+    mode = _setting("EMAIL_OUTBOX_SEND_NOW_MODE", "thread")
+    if mode == "off":
+        return
+    if mode == "sync":
+        transaction.on_commit(lambda: deliver_now(ids))
+    else:
+        transaction.on_commit(lambda: _get_executor().submit(_deliver_in_thread, ids))
+
+
+def retry_now(queryset):
+    """Requeue failed or dead-lettered rows for immediate delivery."""
+    return queryset.exclude(status=OutboxEmail.STATUS_SENT).update(
+        status=OutboxEmail.STATUS_PENDING,
+        attempts=0,
+        next_attempt_at=timezone.now(),
+        locked_at=None,
+    )
+
+
+# ============ Monitoring ============
+
+
+def outbox_stats(now=None):
+    """Queue depth per status, age of the oldest due email and top failure reasons."""
+    now = now or timezone.now()
+    counts = dict(
+        OutboxEmail.objects.values_list("status").annotate(n=Count("id")).values_list("status", "n")
+    )
+    oldest = OutboxEmail.objects.filter(
+        status=OutboxEmail.STATUS_PENDING, next_attempt_at__lte=now
+    ).aggregate(oldest=Min("created_at"))["oldest"]
+    failures = (
+        OutboxEmail.objects.exclude(last_error="")
+        .exclude(status=OutboxEmail.STATUS_SENT)
+        .values("last_error")
+        .annotate(count=Count("id"))
+        .order_by("-count")[:5]
+    )
+    return {
+        "counts": {status: counts.get(status, 0) for status, _ in OutboxEmail.STATUS_CHOICES},
+        "due": OutboxEmail.objects.filter(
+            status=OutboxEmail.STATUS_PENDING, next_attempt_at__lte=now
+        ).count(),
+        "oldest_due_seconds": int((now - oldest).total_seconds()) if oldest else 0,
+        "failures": [(f["last_error"], f["count"]) for f in failures],
+    }
@@ -0,0 +1,232 @@
+"""
+Notification retention.
+
+Notifications older than their type's TTL (NOTIFICATION_RETENTION_DAYS) are
+removed in small batches, each in its own short transaction, so no long locks
+are held on the notifications table. Expired rows can first be written to a
+compact archive in the default storage:
+
+    archives/notifications/<timestamp>-<first id>-<last id>.jsonl.gz
+
+Archive files are gzipped JSON lines: a header line with the column names,
+then one JSON array per notification (created_at as epoch seconds). Use
+read_archive() to load them back as dicts.
+"""
+
+import gzip
+import json
+import logging
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from common.storage import write_file
+
+from .models import Notification, NotificationReceipt
+from .stream import _state_changed
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_DIR = "archives/notifications"
+ARCHIVE_FIELDS = [
+    "id",
+    "user_id",
+    "audience",
+    "type",
+    "title",
+    "message",
+    "link",
+    "read",
+    "created_at",
+]
+DEFAULT_RETENTION_DAYS = {"default": 180}
+
+
+def get_retention_days():
+    """TTL in days per notification type, with a "default" entry for the rest."""
+    return getattr(settings, "NOTIFICATION_RETENTION_DAYS", DEFAULT_RETENTION_DAYS)
+
+
+def expired_notifications(now=None):
+    """Queryset of notifications past their type's TTL."""
+    now = now or timezone.now()
+    ttls = get_retention_days()
+    default_days = ttls.get("default")
+    condition = Q()
+
+    typed = [t for t, _ in Notification.TYPE_CHOICES if t in ttls]
+    for notification_type in typed:
+        cutoff = now - timedelta(days=ttls[notification_type])
+        condition |= Q(type=notification_type, created_at__lt=cutoff)
+    if default_days is not None:
+        condition |= Q(created_at__lt=now - timedelta(days=default_days)) & ~Q(type__in=typed)
+
+    if not condition:
+        return Notification.objects.none()
+    return Notification.objects.filter(condition)
+
+
+# ============ Archive format ============
+
+
+def _archive_rows(notifications):
+    rows = []
+    for n in notifications:
+        rows.append(
+            [
+                n.id,
+                n.user_id,
+                n.audience,
+                n.type,
+                n.title,
+                n.message,
+                n.link,
+                n.read,
+                int(n.created_at.timestamp()),
+            ]
+        )
+    return rows
+
+
+def write_archive(notifications):
+    """Write notifications to a gzipped JSON-lines archive; returns the file name."""
+    lines = [json.dumps(ARCHIVE_FIELDS)]
+    lines += [json.dumps(row, separators=(",", ":")) for row in _archive_rows(notifications)]
+    body = gzip.compress("\n".join(lines).encode(), compresslevel=9)
+
+    stamp = timezone.now().strftime("%Y%m%d%H%M%S")
+    name = f"{ARCHIVE_DIR}/{stamp}-{notifications[0].id}-{notifications[-1].id}.jsonl.gz"
+    return write_file(default_storage, name, body, content_type="application/gzip")
+
+
+def read_archive(name):
+    """Yield archived notifications as dicts."""
+    with default_storage.open(name, "rb") as fh:
+        lines = gzip.decompress(fh.read()).decode().splitlines()
+    fields = json.loads(lines[0])
+    for line in lines[1:]:
+        yield dict(zip(fields, json.loads(line)))
+
+
+# ============ Pruning ============
+
+
+def prune_notifications(
+    batch_size=1000, archive=True, dry_run=False, max_batches=None, pause=0, now=None
+):
+    """
+    Archive (optionally) and delete expired notifications in id-ordered batches.
+
+    Args:
+        batch_size: Rows per batch / transaction
+        archive: Write each batch to an archive file before deleting it
+        dry_run: Only count what would be removed
+        max_batches: Stop after this many batches (None = until done)
+        pause: Seconds to sleep between batches to leave room for other queries
+
+    Returns:
+        dict: expired, deleted, batches, archives (file names)
+    """
+    expired = expired_notifications(now)
+    result = {"expired": expired.count(), "deleted": 0, "batches": 0, "archives": []}
+    if dry_run:
+        return result
+
+    last_id = 0
+    affected_users = set()
+    while max_batches is None or result["batches"] < max_batches:
+        batch = list(expired.filter(pk__gt=last_id).order_by("pk")[:batch_size])
+        if not batch:
+            break
+        last_id = batch[-1].pk
+        ids = [n.pk for n in batch]
+
+        if archive:
+            result["archives"].append(write_archive(batch))
+
+        # Raw deletes: no per-row collection or post_delete signals (the
+        # stream would refresh read state once per row); receipts are the
+        # only rows that reference notifications
+        with transaction.atomic():
+            receipts = NotificationReceipt.objects.filter(notification_id__in=ids)
+            affected_users.update(receipts.values_list("user_id", flat=True))
+            receipts._raw_delete(receipts.db)
+            notifications = Notification.objects.filter(pk__in=ids)
+            deleted = notifications._raw_delete(notifications.db)
+        affected_users.update(n.user_id for n in batch if n.user_id)
+
+        result["deleted"] += deleted
+        result["batches"] += 1
+        logger.info(f"Pruned notification batch {result['batches']} ({deleted} rows)")
+        if pause:
+            time.sleep(pause)
+
+    # One read-state refresh per affected user for the whole run
+    for user_id in affected_users:
+        _state_changed(user_id)
+    return result
+
+
+def scheduled_prune():
+    """Archive and delete expired notifications (scheduled nightly)."""
+    result = prune_notifications(pause=0.1)
+    return {"rows": result["deleted"], "batches": result["batches"], "archives": result["archives"]}
+
+
+# ============ Size report ============
+
+
+def get_table_sizes(table=Notification._meta.db_table):
+    """
+    Row count plus table/index sizes in bytes.
+    Sizes are None on database backends that don't expose them.
+    """
+    report = {
+        "table": table,
+        "rows": None,
+        "table_bytes": None,
+        "index_bytes": None,
+        "indexes": {},
+    }
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT COUNT(*) FROM {connection.ops.quote_name(table)}")
+        report["rows"] = cursor.fetchone()[0]
+
+        if connection.vendor == "postgresql":
+            cursor.execute("SELECT pg_relation_size(%s), pg_indexes_size(%s)", [table, table])
+            report["table_bytes"], report["index_bytes"] = cursor.fetchone()
+            cursor.execute(
+                "SELECT indexrelname, pg_relation_size(indexrelid) "
+                "FROM pg_stat_user_indexes WHERE relname = %s",
+                [table],
+            )
+            report["indexes"] = dict(cursor.fetchall())
+        elif connection.vendor == "sqlite":
+            try:
+                cursor.execute("SELECT name, SUM(pgsize) FROM dbstat GROUP BY name")
+            except Exception:
+                return report
+            sizes = dict(cursor.fetchall())
+            report["table_bytes"] = sizes.get(table)
+            index_names = [
+                name
+                for name, info in connection.introspection.get_constraints(cursor, table).items()
+                if info["index"]
+            ]
+            report["indexes"] = {name: sizes.get(name) for name in index_names}
+            report["index_bytes"] = sum(size or 0 for size in report["indexes"].values())
+    return report
+
+
+def vacuum(table=Notification._meta.db_table):
+    """Reclaim space after large deletes (PostgreSQL VACUUM ANALYZE)."""
+    if connection.vendor != "postgresql":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(f"VACUUM (ANALYZE) {connection.ops.quote_name(table)}")
+    return True
@@ -16,6 +16,13 @@ class NotificationSerializer(serializers.ModelSerializer):
         fields = ["id", "type", "title", "message", "link", "read", "created_at", "time_ago"]
         read_only_fields = ["id", "type", "title", "message", "link", "created_at"]
 
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        # Per-user read state (broadcasts) from NotificationViewSet's queryset
+        if hasattr(instance, "is_read"):
+            data["read"] = instance.is_read
+        return data
+
     def get_time_ago(self, obj):
         """Human-readable time ago."""
         delta = timezone.now() - obj.created_at
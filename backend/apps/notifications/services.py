@@ -1,6 +1,8 @@
+from django.db.models import BooleanField, Case, Exists, F, OuterRef, Q, Subquery, Value, When
 from django.db.models.query import QuerySet
+from django.utils import timezone
 
-from .models import Notification
+from .models import Notification, NotificationReceipt, NotificationWatermark
 
 
 def create_notification(user, notification_type, title, message="", link=""):
@@ -16,6 +18,9 @@ def create_notification(user, notification_type, title, message="", link=""):
 
     Returns:
         Notification object or list of objects
+
+    Use broadcast_notification() for "everyone"/"all admins" messages so they
+    are stored once instead of once per user.
     """
     if isinstance(user, QuerySet):
         # Bulk create for multiple users
@@ -41,9 +46,113 @@ def create_notification(user, notification_type, title, message="", link=""):
         )
 
 
+def broadcast_notification(audience, notification_type, title, message="", link=""):
+    """
+    Create a single notification shown to every user in an audience.
+
+    Args:
+        audience: Notification.AUDIENCE_ALL or Notification.AUDIENCE_ADMINS
+
+    Returns:
+        Notification object
+    """
+    return Notification.objects.create(
+        audience=audience,
+        type=notification_type,
+        title=title,
+        message=message,
+        link=link,
+    )
+
+
 def notify_admins(notification_type, title, message="", link=""):
-    """Send notification to all admin users."""
+    """
+    Send notification to all admin users (one broadcast row).
+
+    Returns:
+        Notification object, or None if there are no active admins
+    """
     from apps.authentication.models import User
 
-    admins = User.objects.filter(role__in=["super_admin", "admin", "pastor"], is_active=True)
-    return create_notification(admins, notification_type, title, message, link)
+    if not User.objects.filter(role__in=Notification.ADMIN_ROLES, is_active=True).exists():
+        return None
+    return broadcast_notification(
+        Notification.AUDIENCE_ADMINS, notification_type, title, message, link
+    )
+
+
+def get_user_notifications(user):
+    """
+    Personal notifications plus the broadcasts a user can see, in one queryset.
+
+    Each row is annotated with ``is_read`` for this user: the row's own flag for
+    personal notifications; for broadcasts, the user's receipt if there is one
+    (so marking an old broadcast unread sticks), else the read-up-to watermark.
+    Broadcasts sent before the user joined and broadcasts the user deleted are
+    excluded.
+    """
+    receipts = NotificationReceipt.objects.filter(notification=OuterRef("pk"), user=user)
+    watermark = NotificationWatermark.objects.filter(user=user).values("read_up_to")[:1]
+
+    return (
+        Notification.objects.filter(
+            Q(user=user)
+            | Q(
+                user__isnull=True,
+                audience__in=Notification.audiences_for(user),
+                created_at__gte=user.date_joined,
+            )
+        )
+        .exclude(Exists(receipts.filter(dismissed=True)))
+        .annotate(
+            is_read=Case(
+                When(user__isnull=False, then=F("read")),
+                When(Exists(receipts.filter(read=True)), then=Value(True)),
+                When(Exists(receipts.filter(read=False)), then=Value(False)),
+                When(created_at__lte=Subquery(watermark), then=Value(True)),
+                default=Value(False),
+                output_field=BooleanField(),
+            )
+        )
+    )
+
+
+def mark_notification_read(notification, user):
+    """Mark one notification read for a user."""
+    if not notification.is_broadcast:
+        if not notification.read:
+            notification.read = True
+            notification.save(update_fields=["read"])
+        return
+    NotificationReceipt.objects.update_or_create(
+        notification=notification, user=user, defaults={"read": True}
+    )
+
+
+def mark_all_notifications_read(user):
+    """
+    Mark everything read for a user.
+    Broadcasts are covered by moving the user's watermark (a single row).
+
+    Returns:
+        int: number of notifications that were unread
+    """
+    now = timezone.now()
+    broadcasts = get_user_notifications(user).filter(user__isnull=True, is_read=False).count()
+    personal = Notification.objects.filter(user=user, read=False).update(read=True)
+    NotificationWatermark.objects.update_or_create(user=user, defaults={"read_up_to": now})
+    # Receipts older than the watermark are redundant unless they hide a broadcast
+    NotificationReceipt.objects.filter(
+        user=user, dismissed=False, notification__created_at__lte=now
+    ).delete()
+    return personal + broadcasts
+
+
+def delete_notification(notification, user):
+    """Delete a personal notification, or hide a broadcast for this user only."""
+    if not notification.is_broadcast:
+        notification.delete()
+        return
+    NotificationReceipt.objects.update_or_create(
+        notification=notification, user=user, defaults={"dismissed": True}
+    )
@@ -0,0 +1,290 @@
+"""
+In-process pub/sub for the notification stream (Server-Sent Events).
+
+New notifications are published to every open stream of their recipients:
+
+- instantly, from a post_save hook once the creating transaction commits
+  (notifications created by this process);
+- within NOTIFICATION_STREAM_POLL_INTERVAL, from a single background poller
+  per process that picks up rows created by other workers.
+
+Read-state changes (PATCH read, mark-all-read, deletes) bump a per-user cache
+namespace (common/cache.py) besides notifying local streams, so the poller
+also pushes changes made on other workers. The unread count is computed once
+per user per change and shared by that user's streams; a new notification
+just adds one to the stream's count.
+
+The poller re-scans a NOTIFICATION_STREAM_POLL_OVERLAP window behind its last
+poll and skips rows it already published, so a row that committed after a
+newer one (ids and created_at are assigned before commit) is not skipped.
+
+Each stream has an asyncio.Queue on the server's event loop; publishing is
+thread-safe (call_soon_threadsafe), so sync views and signals can publish.
+
+Streams are opened with a short-lived, single-use ticket (make_stream_ticket)
+rather than the access token, which would end up in access logs.
+"""
+
+import logging
+import threading
+import time
+import uuid
+from collections import deque
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.core.cache import cache
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from common.cache import get_namespace_version, get_namespace_versions, invalidate_namespace
+
+from .models import Notification
+
+logger = logging.getLogger(__name__)
+
+TICKET_SALT = "notifications.stream"
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def state_namespace(user_id):
+    """Cache namespace whose version changes with the user's read state."""
+    return f"notification_state:{user_id}"
+
+
+# ============ Stream tickets ============
+
+
+def make_stream_ticket(user):
+    """A signed ticket that opens one stream for ``user``."""
+    return signing.dumps({"user": user.pk, "nonce": uuid.uuid4().hex}, salt=TICKET_SALT)
+
+
+def redeem_stream_ticket(ticket):
+    """
+    The active user a ticket was issued to, or None if the ticket is invalid,
+    older than NOTIFICATION_STREAM_TICKET_TTL or already used.
+    """
+    ttl = _setting("NOTIFICATION_STREAM_TICKET_TTL", 30)
+    try:
+        claims = signing.loads(ticket, salt=TICKET_SALT, max_age=ttl)
+    except signing.BadSignature:
+        return None
+    if not cache.add(f"notification_stream_ticket:{claims['nonce']}", True, timeout=ttl + 5):
+        return None
+    return get_user_model().objects.filter(pk=claims["user"], is_active=True).first()
+
+
+# ============ Broker ============
+
+
+def count_unread(user):
+    from .services import get_user_notifications
+
+    return get_user_notifications(user).filter(is_read=False).count()
+
+
+class Subscriber:
+    """One open stream."""
+
+    def __init__(self, user, queue, loop):
+        self.user = user
+        self.user_id = user.pk
+        self.audiences = set(Notification.audiences_for(user))
+        self.date_joined = user.date_joined
+        self.queue = queue
+        self.loop = loop
+
+    def wants(self, notification):
+        if notification.user_id is not None:
+            return notification.user_id == self.user_id
+        return (
+            notification.audience in self.audiences and notification.created_at >= self.date_joined
+        )
+
+    def send(self, event):
+        try:
+            self.loop.call_soon_threadsafe(self.queue.put_nowait, event)
+        except RuntimeError:
+            # Event loop already closed (client went away)
+            pass
+
+
+class NotificationBroker:
+    """Routes notification events to open streams in this process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = set()
+        # Recently published ids, so the poller skips rows already pushed by
+        # signals or by an earlier poll of the overlap window
+        self._recent = deque(maxlen=5000)
+        self._recent_ids = set()
+        self._polled_until = None
+        # user id -> state namespace version last seen
+        self._state_versions = {}
+        self._poller = None
+
+    # ============ Subscriptions ============
+
+    def subscribe(self, user, queue, loop):
+        """Register a stream (call from a sync context; may start the poller)."""
+        subscriber = Subscriber(user, queue, loop)
+        with self._lock:
+            self._subscribers.add(subscriber)
+        if self._polled_until is None:
+            self._prime()
+        self._ensure_poller()
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+            if not self._subscribers:
+                # Nobody to push to: a later stream starts from its own unread
+                # count, so polling must resume from then, not from here
+                self._polled_until = None
+
+    @property
+    def subscriber_count(self):
+        return len(self._subscribers)
+
+    # ============ Publishing ============
+
+    def _mark_published(self, notification_id):
+        """Return False if the id was already published."""
+        with self._lock:
+            if notification_id in self._recent_ids:
+                return False
+            if len(self._recent) == self._recent.maxlen:
+                self._recent_ids.discard(self._recent[0])
+            self._recent.append(notification_id)
+            self._recent_ids.add(notification_id)
+            return True
+
+    def publish(self, notification):
+        """
+        Push a new notification to every stream that should see it.
+        Returns False if it was already published.
+        """
+        if not self._mark_published(notification.pk):
+            return False
+        with self._lock:
+            targets = [s for s in self._subscribers if s.wants(notification)]
+        if not targets:
+            return True
+
+        from .serializers import NotificationSerializer
+
+        event = {"type": "notification", "data": NotificationSerializer(notification).data}
+        for subscriber in targets:
+            subscriber.send(event)
+        return True
+
+    def publish_state_change(self, user_id):
+        """Send a user's streams their unread count after a read-state change."""
+        with self._lock:
+            targets = [s for s in self._subscribers if s.user_id == user_id]
+        if not targets:
+            return
+        self._state_versions[user_id] = get_namespace_version(state_namespace(user_id))
+        event = {"type": "state", "unread_count": count_unread(targets[0].user)}
+        for subscriber in targets:
+            subscriber.send(event)
+
+    # ============ DB polling fallback ============
+
+    def _prime(self):
+        """Start polling from now, treating rows in the overlap window as published."""
+        now = timezone.now()
+        overlap = timedelta(seconds=_setting("NOTIFICATION_STREAM_POLL_OVERLAP", 10))
+        for notification_id in Notification.objects.filter(
+            created_at__gte=now - overlap
+        ).values_list("id", flat=True):
+            self._mark_published(notification_id)
+        self._polled_until = now
+
+    def poll_once(self):
+        """
+        Publish notifications created since the last poll and read-state
+        changes made since then (by any process). Returns the number of
+        notifications published.
+        """
+        if self._polled_until is None:
+            self._prime()
+            self._poll_state()
+            return 0
+
+        now = timezone.now()
+        overlap = timedelta(seconds=_setting("NOTIFICATION_STREAM_POLL_OVERLAP", 10))
+        rows = Notification.objects.filter(created_at__gte=self._polled_until - overlap).order_by(
+            "created_at", "id"
+        )
+        published = sum(1 for notification in rows if self.publish(notification))
+        self._polled_until = now
+        self._poll_state()
+        return published
+
+    def _poll_state(self):
+        """Push unread counts to users whose state namespace changed elsewhere."""
+        with self._lock:
+            user_ids = {s.user_id for s in self._subscribers}
+        versions = get_namespace_versions(state_namespace(user_id) for user_id in user_ids)
+        previous, self._state_versions = self._state_versions, {}
+        for user_id in user_ids:
+            version = versions[state_namespace(user_id)]
+            self._state_versions[user_id] = version
+            if user_id in previous and previous[user_id] != version:
+                self.publish_state_change(user_id)
+
+    def _poll_forever(self, interval):
+        while True:
+            time.sleep(interval)
+            if not self._subscribers:
+                continue
+            try:
+                self.poll_once()
+            except Exception:
+                logger.exception("Notification stream poll failed")
+            finally:
+                close_old_connections()
+
+    def _ensure_poller(self):
+        interval = _setting("NOTIFICATION_STREAM_POLL_INTERVAL", 1.0)
+        if not interval:
+            return
+        with self._lock:
+            if self._poller is not None:
+                return
+            self._poller = threading.Thread(
+                target=self._poll_forever,
+                args=(interval,),
+                name="notification-stream-poller",
+                daemon=True,
+            )
+        self._poller.start()
+
+
+broker = NotificationBroker()
+
+
+def _state_changed(user_id):
+    invalidate_namespace(state_namespace(user_id))
+    broker.publish_state_change(user_id)
+
+
+def _on_notification_saved(sender, instance, created, **kwargs):
+    if created:
+        transaction.on_commit(lambda: broker.publish(instance))
+    elif instance.user_id:
+        transaction.on_commit(lambda: _state_changed(instance.user_id))
+
+
+def _on_read_state_saved(sender, instance, **kwargs):
+    if instance.user_id:
+        transaction.on_commit(lambda: _state_changed(instance.user_id))
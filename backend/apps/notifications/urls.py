@@ -1,8 +1,13 @@
+from django.urls import path
 from rest_framework.routers import DefaultRouter
 
-from .views import NotificationViewSet
+from .views import NotificationViewSet, notification_stream
 
 router = DefaultRouter()
 router.register(r"notifications", NotificationViewSet, basename="notification")
 
-urlpatterns = router.urls
+urlpatterns = [
+    # Before the router so "stream" is not taken as a notification id
+    path("notifications/stream/", notification_stream, name="notification-stream"),
+    *router.urls,
+]
@@ -1,9 +1,25 @@
+import asyncio
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
 from rest_framework import permissions, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
 
-from .models import Notification
+from .models import NotificationReceipt
 from .serializers import NotificationSerializer
+from .services import (
+    delete_notification,
+    get_user_notifications,
+    mark_all_notifications_read,
+    mark_notification_read,
+)
+from .stream import broker, count_unread, make_stream_ticket, redeem_stream_ticket
 
 
 class NotificationViewSet(viewsets.ModelViewSet):
@@ -14,8 +30,8 @@ class NotificationViewSet(viewsets.ModelViewSet):
     http_method_names = ["get", "post", "patch", "delete"]
 
     def get_queryset(self):
-        """Return notifications for current user only."""
-        return Notification.objects.filter(user=self.request.user)
+        """Return the current user's notifications plus broadcasts they can see."""
+        return get_user_notifications(self.request.user)
 
     def create(self, request, *args, **kwargs):
         """Block direct creation - notifications are created via services only."""
@@ -24,22 +40,147 @@ class NotificationViewSet(viewsets.ModelViewSet):
             status=status.HTTP_405_METHOD_NOT_ALLOWED,
         )
 
+    def perform_update(self, serializer):
+        """Broadcast rows are shared, so their read flag is stored per user."""
+        notification = serializer.instance
+        if not notification.is_broadcast:
+            serializer.save()
+            notification.is_read = notification.read
+            return
+        if "read" in serializer.validated_data:
+            NotificationReceipt.objects.update_or_create(
+                notification=notification,
+                user=self.request.user,
+                defaults={"read": serializer.validated_data["read"]},
+            )
+        notification.is_read = serializer.validated_data.get("read", notification.is_read)
+
+    def perform_destroy(self, instance):
+        delete_notification(instance, self.request.user)
+
+    @action(detail=False, methods=["post"], url_path="stream-ticket")
+    def stream_ticket(self, request):
+        """
+        Issue a ticket for opening the event stream (single use, valid for
+        NOTIFICATION_STREAM_TICKET_TTL seconds), so the access token stays out
+        of the stream URL.
+        """
+        return Response(
+            {
+                "ticket": make_stream_ticket(request.user),
+                "expires_in": settings.NOTIFICATION_STREAM_TICKET_TTL,
+            }
+        )
+
     @action(detail=False, methods=["get"], url_path="unread-count")
     def unread_count(self, request):
         """Get count of unread notifications."""
-        count = self.get_queryset().filter(read=False).count()
+        count = self.get_queryset().filter(is_read=False).count()
         return Response({"unread_count": count})
 
     @action(detail=True, methods=["patch"], url_path="read")
     def mark_read(self, request, pk=None):
         """Mark a single notification as read."""
         notification = self.get_object()
-        notification.read = True
-        notification.save(update_fields=["read"])
+        mark_notification_read(notification, request.user)
         return Response({"status": "marked as read"})
 
     @action(detail=False, methods=["post"], url_path="mark-all-read")
     def mark_all_read(self, request):
         """Mark all notifications as read."""
-        updated = self.get_queryset().filter(read=False).update(read=True)
+        updated = mark_all_notifications_read(request.user)
         return Response({"status": "all marked as read", "count": updated})
+
+
+# ============ Server-Sent Events stream ============
+
+
+def _sse(event, data, event_id=None, retry=None):
+    lines = []
+    if retry is not None:
+        lines.append(f"retry: {retry}")
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, default=str)}")
+    return "\n".join(lines) + "\n\n"
+
+
+def _stream_user(request):
+    """
+    Authenticate a stream request. EventSource cannot send headers, so browsers
+    pass a single-use ?ticket= (POST stream-ticket/); other clients may send
+    the access token in the Authorization header.
+    """
+    ticket = request.GET.get("ticket")
+    if ticket:
+        return redeem_stream_ticket(ticket)
+    auth = JWTAuthentication()
+    header = auth.get_header(request)
+    raw_token = auth.get_raw_token(header) if header else None
+    if not raw_token:
+        return None
+    try:
+        user = auth.get_user(auth.get_validated_token(raw_token))
+    except (InvalidToken, AuthenticationFailed):
+        return None
+    return user if user.is_active else None
+
+
+async def _event_stream(user):
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue()
+    keepalive = getattr(settings, "NOTIFICATION_STREAM_KEEPALIVE", 15)
+    subscriber = await sync_to_async(broker.subscribe)(user, queue, loop)
+    try:
+        count = await sync_to_async(count_unread)(user)
+        yield _sse("unread_count", {"unread_count": count}, retry=3000)
+
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=keepalive)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+
+            if event["type"] == "notification":
+                yield _sse("notification", event["data"], event_id=event["data"]["id"])
+                new_count = count + (0 if event["data"]["read"] else 1)
+            else:
+                # Computed once per user by the broker
+                new_count = event["unread_count"]
+            if new_count != count:
+                count = new_count
+                yield _sse("unread_count", {"unread_count": count})
+    finally:
+        broker.unsubscribe(subscriber)
+
+
+async def notification_stream(request):
+    """
+    Push new notifications and unread-count changes to the current user.
+    GET /api/notifications/stream/?ticket=<ticket from POST stream-ticket/>
+
+    Events: ``unread_count`` ({"unread_count": n}) on connect and whenever it
+    changes, ``notification`` (same payload as the list endpoint) for new items.
+    Needs the ASGI server (sbcc/asgi.py); under WSGI a single unread_count event
+    is sent and the browser reconnects after 30s, i.e. it degrades to polling.
+    """
+    user = await sync_to_async(_stream_user)(request)
+    if user is None:
+        return JsonResponse(
+            {"detail": "Authentication credentials were not provided or are invalid."},
+            status=status.HTTP_401_UNAUTHORIZED,
+        )
+
+    if isinstance(request, ASGIRequest):
+        stream = _event_stream(user)
+    else:
+        count = await sync_to_async(count_unread)(user)
+        stream = [_sse("unread_count", {"unread_count": count}, retry=30000)]
+
+    response = StreamingHttpResponse(stream, content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    # Disable proxy buffering (nginx) so events are flushed immediately
+    response["X-Accel-Buffering"] = "no"
+    return response
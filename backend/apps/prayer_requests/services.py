@@ -1,9 +1,10 @@
 import logging
 
 from django.conf import settings
-from django.core.mail import send_mail
 from django.db.models import Count, Q
 
+from apps.notifications.outbox import queue_email
+
 
 def notify_assignment(prayer_request):
     """Send notification to assigned pastor/elder when a request is assigned."""
@@ -27,12 +28,12 @@ Please log in to the system to view details and add follow-ups.
     """.strip()
 
     try:
-        send_mail(
+        queue_email(
             subject=subject,
             message=message,
             from_email=settings.DEFAULT_FROM_EMAIL,
             recipient_list=[prayer_request.assigned_to.email],
-            fail_silently=False,
+            kind="prayer_request",
         )
 
         # Also send in-app notification
@@ -5,3 +5,15 @@ class SettingsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.settings"
     verbose_name = "System Settings"
+
+    def ready(self):
+        from common.cache import invalidate_on_change
+        from common.images import register_image_fields
+
+        from .models import SystemSettings, TeamMember
+
+        invalidate_on_change("public_settings", SystemSettings)
+        invalidate_on_change("public_team", TeamMember)
+
+        register_image_fields(SystemSettings, "logo", "login_background")
+        register_image_fields(TeamMember, "photo")
@@ -0,0 +1,28 @@
+# Generated by Django 5.1.4 on 2026-10-19 04:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("settings", "0002_add_team_member_remove_banner_favicon"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="systemsettings",
+            name="login_background_derivatives",
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name="systemsettings",
+            name="logo_derivatives",
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name="teammember",
+            name="photo_derivatives",
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
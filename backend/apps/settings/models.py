@@ -41,6 +41,9 @@ class SystemSettings(models.Model):
         null=True,
         help_text="Background image for login page",
     )
+    # Resized copies generated by common.images (srcset + blur placeholder)
+    logo_derivatives = models.JSONField(default=dict, blank=True, editable=False)
+    login_background_derivatives = models.JSONField(default=dict, blank=True, editable=False)
 
     # About page content
     mission = models.TextField(
@@ -158,6 +161,7 @@ class TeamMember(models.Model):
         null=True,
         help_text="Profile photo (recommended: 300x300px)",
     )
+    photo_derivatives = models.JSONField(default=dict, blank=True, editable=False)
     order = models.PositiveIntegerField(
         default=0,
         help_text="Display order (lower numbers appear first)",
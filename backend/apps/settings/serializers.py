@@ -1,5 +1,7 @@
 from rest_framework import serializers
 
+from common.images import image_variants
+
 from .models import SystemSettings, TeamMember
 
 
@@ -46,6 +48,9 @@ class SystemSettingsSerializer(serializers.ModelSerializer):
 class PublicSettingsSerializer(serializers.ModelSerializer):
     """Public serializer for unauthenticated access (branding/about info only)."""
 
+    logo_variants = serializers.SerializerMethodField()
+    login_background_variants = serializers.SerializerMethodField()
+
     class Meta:
         model = SystemSettings
         fields = [
@@ -53,7 +58,9 @@ class PublicSettingsSerializer(serializers.ModelSerializer):
             "church_name",
             "tagline",
             "logo",
+            "logo_variants",
             "login_background",
+            "login_background_variants",
             "mission",
             "vision",
             "history",
@@ -67,6 +74,12 @@ class PublicSettingsSerializer(serializers.ModelSerializer):
             "service_schedule",
         ]
 
+    def get_logo_variants(self, obj):
+        return image_variants(obj, "logo")
+
+    def get_login_background_variants(self, obj):
+        return image_variants(obj, "login_background")
+
 
 class TeamMemberSerializer(serializers.ModelSerializer):
     """Serializer for team members."""
@@ -95,6 +108,7 @@ class PublicTeamMemberSerializer(serializers.ModelSerializer):
     """Public serializer for team members (limited fields)."""
 
     role_display = serializers.CharField(source="get_role_display", read_only=True)
+    photo_variants = serializers.SerializerMethodField()
 
     class Meta:
         model = TeamMember
@@ -106,4 +120,8 @@ class PublicTeamMemberSerializer(serializers.ModelSerializer):
             "title",
             "bio",
             "photo",
+            "photo_variants",
         ]
+
+    def get_photo_variants(self, obj):
+        return image_variants(obj, "photo")
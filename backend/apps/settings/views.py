@@ -3,6 +3,7 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from common.cache import cached_view
 from common.permissions import IsAdmin
 
 from .models import SystemSettings, TeamMember
@@ -59,11 +60,12 @@ class SystemSettingsView(APIView):
 class PublicSettingsView(APIView):
     """
     Public API endpoint for branding and about information.
-    No authentication required.
+    No authentication required. Cached server-side; supports ETag/If-None-Match.
     """
 
     permission_classes = [AllowAny]
 
+    @cached_view("public_settings", max_age=60, stale_while_revalidate=600)
     def get(self, request):
         """Get public system settings (branding, contact, about)."""
         settings = SystemSettings.get_settings()
@@ -91,10 +93,12 @@ class PublicTeamView(APIView):
     """
     Public API endpoint for team members.
     Returns only active team members for the public site.
+    Cached server-side; supports ETag/If-None-Match.
     """
 
     permission_classes = [AllowAny]
 
+    @cached_view("public_team", max_age=60, stale_while_revalidate=600)
     def get(self, request):
         """Get active team members for public display."""
         team = TeamMember.objects.filter(is_active=True).order_by("order", "name")
@@ -0,0 +1,20 @@
+from django.apps import AppConfig
+
+
+class TasksConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "apps.tasks"
+    verbose_name = "Tasks"
+
+    def ready(self):
+        from django.db.models.signals import post_delete, post_save
+
+        from core.scheduler import register_job
+
+        from .models import Task
+        from .services import _on_task_changed, update_overdue_tasks
+
+        post_save.connect(_on_task_changed, sender=Task)
+        post_delete.connect(_on_task_changed, sender=Task)
+
+        register_job("tasks.update_overdue", "5 * * * *", update_overdue_tasks)
@@ -3,10 +3,28 @@ import uuid
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models import Case, F, Value, When
 from django.utils import timezone
 
 User = get_user_model()
 
+# Statuses that never become overdue
+CLOSED_STATUSES = ["completed", "cancelled"]
+
+
+def effective_status_expression(today=None):
+    """
+    Database expression for Task.effective_status, the status with overdue
+    applied as of ``today``. Annotate it as ``current_status``.
+    """
+    today = today or timezone.now().date()
+    return Case(
+        When(status__in=CLOSED_STATUSES, then=F("status")),
+        When(end_date__lt=today, then=Value("overdue")),
+        default=F("status"),
+        output_field=models.CharField(),
+    )
+
 
 class Task(models.Model):
     """
@@ -97,6 +115,17 @@ class Task(models.Model):
     def __str__(self):
         return f"{self.title} ({self.get_status_display()})"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Scope as loaded, so a task moved to another ministry or assignee
+        # also invalidates the statistics of the scope it left
+        instance._loaded_scope = (
+            instance.__dict__.get("ministry_id"),
+            instance.__dict__.get("assigned_to_id"),
+        )
+        return instance
+
     def clean(self):
         """Validate timeline dates"""
         if self.start_date and self.end_date:
@@ -106,16 +135,17 @@ class Task(models.Model):
         if self.progress_percentage < 0 or self.progress_percentage > 100:
             raise ValidationError({"progress_percentage": "Progress must be between 0 and 100"})
 
-    def save(self, *args, **kwargs):
-        """Auto-update status based on timeline and progress"""
-        self.full_clean()
+    def apply_derived_status(self, today=None):
+        """Set overdue/completed status from the timeline and progress (no queries)."""
+        today = today or timezone.now().date()
 
-        # Auto-update status to overdue if past end_date and not completed
-        if self.end_date < timezone.now().date() and self.status not in [
-            "completed",
-            "cancelled",
-        ]:
-            self.status = "overdue"
+        # Auto-update status to overdue if past end_date and not completed,
+        # and back once the end date has been moved out again
+        if self.status not in CLOSED_STATUSES:
+            if self.end_date < today:
+                self.status = "overdue"
+            elif self.status == "overdue":
+                self.status = "in_progress" if self.progress_percentage else "pending"
 
         # Auto-update status based on progress
         if self.progress_percentage == 100 and self.status != "completed":
@@ -123,7 +153,32 @@ class Task(models.Model):
             if not self.completed_at:
                 self.completed_at = timezone.now()
 
+    def save(self, *args, **kwargs):
+        """
+        Auto-update status based on timeline and progress.
+
+        Runs clean() but not full_clean(): field and foreign key validation
+        belong to the serializers (and services.validate_tasks for bulk
+        writes), so a save costs no extra queries.
+        """
+        self.clean()
+        self.apply_derived_status()
         super().save(*args, **kwargs)
+        # A current_status annotated when loading is stale now
+        self.__dict__.pop("current_status", None)
+
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        self.__dict__.pop("current_status", None)
+
+    @property
+    def effective_status(self):
+        """Status with overdue applied as of today (annotated as current_status in lists)."""
+        if "current_status" in self.__dict__:
+            return self.current_status
+        if self.status not in CLOSED_STATUSES and self.end_date < timezone.now().date():
+            return "overdue"
+        return self.status
 
     @property
     def is_overdue(self):
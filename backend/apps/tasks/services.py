@@ -1,9 +1,24 @@
-from datetime import timedelta
-
-from django.db.models import Count
+import base64
+import binascii
+import json
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db.models import Case, Count, F, IntegerField, Q, Value, When, Window
+from django.db.models.functions import RowNumber
 from django.utils import timezone
 
-from .models import Task
+from common.cache import get_namespace_version, invalidate_namespace, make_key
+
+from .models import Task, effective_status_expression
+
+User = get_user_model()
+
+# Statistics are cached per (ministry, assignee) scope and invalidated per scope
+STATS_NAMESPACE = "task_stats"
+STATS_CACHE_TIMEOUT = 60 * 60
 
 
 def get_upcoming_tasks(days=7, ministry=None, assigned_to=None):
@@ -71,11 +86,24 @@ def get_in_progress_tasks(ministry=None, assigned_to=None):
     return queryset.order_by("end_date", "-priority")
 
 
-def get_task_statistics(ministry=None, assigned_to=None):
-    """
-    Get task statistics for dashboard
-    Returns counts by status, priority, etc.
-    """
+def _scope_id(value):
+    """Normalize a ministry/user filter (instance, id or id string) to a string."""
+    value = getattr(value, "pk", value)
+    return str(value) if value not in (None, "") else None
+
+
+def _stats_namespaces(ministry=None, assigned_to=None):
+    """Cache namespaces a statistics scope depends on."""
+    ministry, assigned_to = _scope_id(ministry), _scope_id(assigned_to)
+    namespaces = []
+    if ministry:
+        namespaces.append(f"{STATS_NAMESPACE}:ministry:{ministry}")
+    if assigned_to:
+        namespaces.append(f"{STATS_NAMESPACE}:assignee:{assigned_to}")
+    return namespaces or [f"{STATS_NAMESPACE}:all"]
+
+
+def _compute_task_statistics(ministry=None, assigned_to=None, today=None):
     queryset = Task.objects.filter(is_active=True)
 
     if ministry:
@@ -84,34 +112,221 @@ def get_task_statistics(ministry=None, assigned_to=None):
     if assigned_to:
         queryset = queryset.filter(assigned_to=assigned_to)
 
-    today = timezone.now().date()
+    today = today or timezone.now().date()
+    month_start = today.replace(day=1)
+    next_month = (month_start + timedelta(days=32)).replace(day=1)
 
-    stats = {
-        "total": queryset.count(),
-        "by_status": dict(
-            queryset.values("status").annotate(count=Count("id")).values_list("status", "count")
+    # Every counter in one scan of the scope's tasks
+    counters = {
+        "total": Count("id"),
+        "overdue": Count(
+            "id", filter=Q(end_date__lt=today, status__in=["pending", "in_progress", "overdue"])
         ),
-        "by_priority": dict(
-            queryset.values("priority").annotate(count=Count("id")).values_list("priority", "count")
+        "due_this_week": Count(
+            "id",
+            filter=Q(
+                end_date__gte=today,
+                end_date__lt=today + timedelta(days=7),
+                status__in=["pending", "in_progress"],
+            ),
         ),
-        "overdue": queryset.filter(
-            end_date__lt=today, status__in=["pending", "in_progress", "overdue"]
-        ).count(),
-        "due_this_week": queryset.filter(
-            end_date__gte=today,
-            end_date__lt=today + timedelta(days=7),
-            status__in=["pending", "in_progress"],
-        ).count(),
-        "completed_this_month": queryset.filter(
-            completed_at__year=today.year,
-            completed_at__month=today.month,
-            status="completed",
-        ).count(),
+        "completed_this_month": Count(
+            "id",
+            filter=Q(
+                completed_at__date__gte=month_start,
+                completed_at__date__lt=next_month,
+                status="completed",
+            ),
+        ),
+    }
+    for value, _ in Task.STATUS_CHOICES:
+        counters[f"status:{value}"] = Count("id", filter=Q(status=value))
+    for value, _ in Task.PRIORITY_CHOICES:
+        counters[f"priority:{value}"] = Count("id", filter=Q(priority=value))
+    row = queryset.order_by().aggregate(**counters)
+
+    return {
+        "total": row["total"],
+        # Only statuses/priorities that occur, as with a GROUP BY
+        "by_status": {
+            value: row[f"status:{value}"]
+            for value, _ in Task.STATUS_CHOICES
+            if row[f"status:{value}"]
+        },
+        "by_priority": {
+            value: row[f"priority:{value}"]
+            for value, _ in Task.PRIORITY_CHOICES
+            if row[f"priority:{value}"]
+        },
+        "overdue": row["overdue"],
+        "due_this_week": row["due_this_week"],
+        "completed_this_month": row["completed_this_month"],
     }
 
+
+def get_task_statistics(ministry=None, assigned_to=None):
+    """
+    Get task statistics for dashboard
+    Returns counts by status, priority, etc.
+
+    Computed with one conditional-aggregate query and cached per
+    (ministry, assigned_to) scope until a task in that scope changes.
+    """
+    today = timezone.now().date()
+    versions = [get_namespace_version(ns) for ns in _stats_namespaces(ministry, assigned_to)]
+    key = make_key(STATS_NAMESPACE, _scope_id(ministry), _scope_id(assigned_to), today, *versions)
+    stats = cache.get(key)
+    if stats is None:
+        stats = _compute_task_statistics(ministry, assigned_to, today)
+        cache.set(key, stats, STATS_CACHE_TIMEOUT)
     return stats
 
 
+def get_dashboard_tasks(days=7, ministry=None, assigned_to=None):
+    """
+    Upcoming, overdue and in-progress tasks for the dashboard widgets, from
+    one query. Each list matches get_upcoming_tasks, get_overdue_tasks and
+    get_in_progress_tasks respectively.
+    """
+    today = timezone.now().date()
+    upcoming = Q(end_date__gte=today, end_date__lte=today + timedelta(days=days), status="pending")
+    overdue = Q(end_date__lt=today, status__in=["pending", "in_progress", "overdue"])
+    in_progress = Q(status="in_progress")
+
+    queryset = Task.objects.filter(upcoming | overdue | in_progress, is_active=True)
+    if ministry:
+        queryset = queryset.filter(ministry=ministry)
+    if assigned_to:
+        queryset = queryset.filter(assigned_to=assigned_to)
+
+    lists = {"upcoming": [], "overdue": [], "in_progress": []}
+    for task in queryset.select_related("assigned_to", "ministry").order_by(
+        "end_date", "-priority"
+    ):
+        if task.end_date < today and task.status in ("pending", "in_progress", "overdue"):
+            lists["overdue"].append(task)
+        elif task.status == "pending" and task.end_date >= today:
+            lists["upcoming"].append(task)
+        # An overdue in-progress task is in both lists
+        if task.status == "in_progress":
+            lists["in_progress"].append(task)
+    return lists
+
+
+# ============ Board ============
+
+BOARD_PAGE_SIZE = 20
+BOARD_MAX_PAGE_SIZE = 100
+
+PRIORITY_RANK = {"urgent": 4, "high": 3, "medium": 2, "low": 1}
+
+
+def _priority_rank():
+    return Case(
+        *[When(priority=value, then=Value(rank)) for value, rank in PRIORITY_RANK.items()],
+        default=Value(0),
+        output_field=IntegerField(),
+    )
+
+
+def encode_board_cursor(task, served):
+    """Opaque cursor after ``task`` (the last row served) in its column."""
+    payload = [
+        task.current_status,
+        task.priority_rank,
+        task.end_date.isoformat(),
+        task.pk,
+        served,
+    ]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+def decode_board_cursor(cursor):
+    """
+    Returns:
+        tuple: (status, priority_rank, end_date, id, served)
+
+    Raises:
+        ValueError: if the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        status, rank, end_date, pk, served = json.loads(raw)
+        return str(status), int(rank), date.fromisoformat(end_date), int(pk), int(served)
+    except (TypeError, ValueError, binascii.Error):
+        raise ValueError("Invalid cursor") from None
+
+
+def _after(rank, end_date, pk):
+    """Rows after a cursor in board order (priority desc, end date, id)."""
+    return (
+        Q(priority_rank__lt=rank)
+        | Q(priority_rank=rank, end_date__gt=end_date)
+        | Q(priority_rank=rank, end_date=end_date, pk__gt=pk)
+    )
+
+
+def get_task_board(queryset, columns=None, limit=BOARD_PAGE_SIZE, cursors=()):
+    """
+    Tasks grouped into board columns by effective status, one page per column.
+
+    One query: rows are numbered per column with ROW_NUMBER() OVER
+    (PARTITION BY status ...) and only the first ``limit`` + 1 of each column
+    are fetched; a COUNT window over the same partition gives each column's
+    remaining rows. Columns page with keyset cursors, so deep pages cost the
+    same as the first.
+
+    Args:
+        queryset: Visible tasks (role filtering already applied)
+        columns: Statuses to include (default: all)
+        limit: Rows per column
+        cursors: Cursors from previous pages (at most one per column)
+
+    Returns:
+        dict: status -> {"results": [Task, ...], "next": cursor or None,
+        "total": approximate column size}
+
+    Raises:
+        ValueError: on a malformed cursor
+    """
+    columns = list(columns or [value for value, _ in Task.STATUS_CHOICES])
+    served = {}
+    condition = Q()
+    for cursor in cursors:
+        status, rank, end_date, pk, count = decode_board_cursor(cursor)
+        served[status] = count
+        condition &= ~Q(current_status=status) | _after(rank, end_date, pk)
+
+    partition = [F("current_status")]
+    order = [F("priority_rank").desc(), F("end_date").asc(), F("pk").asc()]
+    rows = (
+        queryset.annotate(
+            current_status=effective_status_expression(), priority_rank=_priority_rank()
+        )
+        .filter(condition, current_status__in=columns)
+        .annotate(
+            row_number=Window(RowNumber(), partition_by=partition, order_by=order),
+            remaining=Window(Count("pk"), partition_by=partition),
+        )
+        .filter(row_number__lte=limit + 1)
+        .order_by("current_status", "row_number")
+    )
+
+    board = {
+        status: {"results": [], "next": None, "total": served.get(status, 0)} for status in columns
+    }
+    for task in rows:
+        column = board[task.current_status]
+        if task.row_number == 1:
+            column["total"] += task.remaining
+        if task.row_number <= limit:
+            column["results"].append(task)
+        else:
+            last = column["results"][-1]
+            column["next"] = encode_board_cursor(last, served.get(task.current_status, 0) + limit)
+    return board
+
+
 def update_task_progress(task, progress_percentage, user):
     """
     Update task progress and auto-update status
@@ -142,17 +357,145 @@ def mark_task_completed(task, user):
     return task
 
 
-def update_overdue_tasks():
+def update_overdue_tasks(today=None):
     """
     Batch update tasks to mark them as overdue
-    Should be run periodically (e.g., daily cron job)
+    Should be run periodically (registered with the scheduler, hourly)
+
+    Set-based: one UPDATE flips open tasks past their end date to overdue and
+    another returns overdue tasks whose end date was moved out. Reads don't
+    depend on it being current; they use effective_status_expression.
+
+    Returns:
+        int: tasks newly marked overdue
     """
-    today = timezone.now().date()
+    today = today or timezone.now().date()
 
     updated = Task.objects.filter(
         end_date__lt=today,
         status__in=["pending", "in_progress"],
         is_active=True,
-    ).update(status="overdue")
+    ).update(status="overdue", updated_at=timezone.now())
+    reverted = Task.objects.filter(status="overdue", end_date__gte=today).update(
+        status=Case(
+            When(progress_percentage__gt=0, then=Value("in_progress")), default=Value("pending")
+        ),
+        updated_at=timezone.now(),
+    )
+
+    if updated or reverted:
+        # update() sends no signals; drop every cached scope
+        invalidate_namespace(STATS_NAMESPACE)
+    return updated
 
+
+# ============ Bulk writes ============
+
+
+def validate_tasks(tasks):
+    """
+    Validate many unsaved or changed tasks without a query per task.
+
+    Runs each task's clean() and checks that referenced users and ministries
+    exist with one query per model; field-level checks that the serializers
+    already perform are not repeated.
+
+    Raises:
+        ValidationError: {"<index>": ["<field>: <message>", ...]} for every
+            invalid task
+    """
+    from apps.ministries.models import Ministry
+
+    errors = {}
+    for index, task in enumerate(tasks):
+        try:
+            task.clean()
+        except ValidationError as e:
+            errors[index] = e.message_dict
+
+    user_ids = {
+        value
+        for task in tasks
+        for value in (task.created_by_id, task.assigned_to_id, task.completed_by_id)
+        if value is not None
+    }
+    ministry_ids = {task.ministry_id for task in tasks if task.ministry_id is not None}
+    users = set(User.objects.filter(pk__in=user_ids).values_list("pk", flat=True))
+    ministries = set(Ministry.objects.filter(pk__in=ministry_ids).values_list("pk", flat=True))
+
+    for index, task in enumerate(tasks):
+        if task.created_by_id is None:
+            errors.setdefault(index, {})["created_by"] = ["This field cannot be null."]
+        for field in ("created_by", "assigned_to", "completed_by"):
+            value = getattr(task, f"{field}_id")
+            if value is not None and value not in users:
+                errors.setdefault(index, {})[field] = [f"User {value} does not exist."]
+        if task.ministry_id is not None and task.ministry_id not in ministries:
+            errors.setdefault(index, {})["ministry"] = [
+                f"Ministry {task.ministry_id} does not exist."
+            ]
+
+    if errors:
+        raise ValidationError(
+            {
+                str(index): [
+                    f"{field}: {message}" for field, msgs in fields.items() for message in msgs
+                ]
+                for index, fields in errors.items()
+            }
+        )
+
+
+def bulk_create_tasks(tasks, validate=True, batch_size=500):
+    """
+    Insert many tasks (imports) with bulk_create.
+
+    Tasks get the same derived status as Task.save() would give them.
+    With validate=False the caller vouches for the data (e.g. rows already
+    validated by a serializer) and no validation queries are run.
+    """
+    tasks = list(tasks)
+    if validate:
+        validate_tasks(tasks)
+    today = timezone.now().date()
+    for task in tasks:
+        task.apply_derived_status(today)
+    created = Task.objects.bulk_create(tasks, batch_size=batch_size)
+    invalidate_namespace(STATS_NAMESPACE)
+    return created
+
+
+def bulk_update_tasks(tasks, fields, validate=True, batch_size=500):
+    """
+    Save changes to many tasks with bulk_update.
+
+    Status (and completed_at) are re-derived and written too. With
+    validate=False no validation queries are run.
+
+    Returns:
+        int: rows updated
+    """
+    tasks = list(tasks)
+    if validate:
+        validate_tasks(tasks)
+    today = timezone.now().date()
+    now = timezone.now()
+    for task in tasks:
+        task.apply_derived_status(today)
+        task.updated_at = now
+    fields = list(dict.fromkeys([*fields, "status", "completed_at", "updated_at"]))
+    updated = Task.objects.bulk_update(tasks, fields, batch_size=batch_size)
+    invalidate_namespace(STATS_NAMESPACE)
     return updated
+
+
+def _on_task_changed(sender, instance, **kwargs):
+    """Invalidate the statistics of every scope the task was or is in."""
+    scopes = {(instance.ministry_id, instance.assigned_to_id)}
+    scopes.add(getattr(instance, "_loaded_scope", (None, None)))
+    namespaces = {f"{STATS_NAMESPACE}:all"}
+    for ministry, assigned_to in scopes:
+        namespaces.update(_stats_namespaces(ministry, None))
+        namespaces.update(_stats_namespaces(None, assigned_to))
+    invalidate_namespace(*namespaces)
+    instance._loaded_scope = (instance.ministry_id, instance.assigned_to_id)
@@ -1,4 +1,5 @@
 from django.db import transaction
+from django.db.models import Prefetch, Q
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import permissions, status, viewsets
 from rest_framework.decorators import action
@@ -6,8 +7,10 @@ from rest_framework.filters import OrderingFilter, SearchFilter
 from rest_framework.response import Response
 
 from common.permissions import IsAdminOrPastorReadOnly
+from common.querysets import QueryPlan, QueryPlanMixin
+from common.uploads import DirectUploadMixin
 
-from .models import Task, TaskAttachment, TaskComment
+from .models import Task, TaskAttachment, TaskComment, effective_status_expression
 from .serializers import (
     TaskAttachmentSerializer,
     TaskCommentSerializer,
@@ -16,16 +19,42 @@ from .serializers import (
     TaskSerializer,
 )
 from .services import (
+    BOARD_MAX_PAGE_SIZE,
+    BOARD_PAGE_SIZE,
+    decode_board_cursor,
+    get_dashboard_tasks,
     get_in_progress_tasks,
     get_overdue_tasks,
+    get_task_board,
     get_task_statistics,
     get_upcoming_tasks,
     mark_task_completed,
     update_task_progress,
 )
 
-
-class TaskViewSet(viewsets.ModelViewSet):
+# Columns TaskListSerializer renders
+LIST_FIELDS = [
+    "id",
+    "title",
+    "priority",
+    "status",
+    "start_date",
+    "end_date",
+    "progress_percentage",
+    "created_at",
+    "created_by__first_name",
+    "created_by__last_name",
+    "assigned_to__first_name",
+    "assigned_to__last_name",
+    "ministry__name",
+]
+
+
+def _current_status(request):
+    return {"current_status": effective_status_expression()}
+
+
+class TaskViewSet(QueryPlanMixin, viewsets.ModelViewSet):
     """
     ViewSet for Task management
 
@@ -35,9 +64,29 @@ class TaskViewSet(viewsets.ModelViewSet):
     - Users can see tasks assigned to them or their ministry
     """
 
-    queryset = Task.objects.select_related(
-        "created_by", "assigned_to", "ministry", "completed_by"
-    ).prefetch_related("comments", "attachments")
+    queryset = Task.objects.all()
+    query_plans = {
+        # TaskListSerializer: no nested rows, only the columns it renders
+        "list": QueryPlan(
+            select=["created_by", "assigned_to", "ministry"],
+            annotate=_current_status,
+            only=LIST_FIELDS,
+        ),
+        # The board annotates current_status itself (get_task_board)
+        "board": QueryPlan(select=["created_by", "assigned_to", "ministry"], only=LIST_FIELDS),
+        "destroy": QueryPlan(),
+        # TaskSerializer with nested comments and attachments
+        "default": QueryPlan(
+            select=["created_by", "assigned_to", "ministry", "completed_by"],
+            annotate=_current_status,
+            prefetch=[
+                Prefetch("comments", queryset=TaskComment.objects.select_related("user")),
+                Prefetch(
+                    "attachments", queryset=TaskAttachment.objects.select_related("uploaded_by")
+                ),
+            ],
+        ),
+    }
     serializer_class = TaskSerializer
     permission_classes = [permissions.IsAuthenticated, IsAdminOrPastorReadOnly]
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
@@ -48,7 +97,7 @@ class TaskViewSet(viewsets.ModelViewSet):
 
     def get_serializer_class(self):
         """Use lightweight serializer for list views"""
-        if self.action == "list":
+        if self.action in ["list", "board"]:
             return TaskListSerializer
         elif self.action in ["dashboard_upcoming", "dashboard_overdue", "dashboard_in_progress"]:
             return TaskDashboardSerializer
@@ -70,10 +119,8 @@ class TaskViewSet(viewsets.ModelViewSet):
 
         # Ministry leaders see their ministry's tasks
         if user.role == "ministry_leader":
-            led_ministries = user.led_ministries.values_list("id", flat=True)
-            return queryset.filter(ministry_id__in=led_ministries) | queryset.filter(
-                assigned_to=user
-            )
+            led_ministries = user.led_ministries.values("id")
+            return queryset.filter(Q(ministry_id__in=led_ministries) | Q(assigned_to=user))
 
         # Others see only tasks assigned to them
         return queryset.filter(assigned_to=user)
@@ -210,7 +257,15 @@ class TaskViewSet(viewsets.ModelViewSet):
         Get upcoming tasks for dashboard widget
         GET /api/tasks/dashboard_upcoming/?days=7&ministry=1
         """
-        days = int(request.query_params.get("days", 7))
+        try:
+            days = int(request.query_params.get("days", 7))
+            if days < 1:
+                raise ValueError
+        except ValueError:
+            return Response(
+                {"detail": "days must be a positive integer"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
         ministry_id = request.query_params.get("ministry")
         assigned_to_id = request.query_params.get("assigned_to")
 
@@ -257,6 +312,91 @@ class TaskViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(tasks, many=True)
         return Response(serializer.data)
 
+    @action(detail=False, methods=["get"])
+    def board(self, request):
+        """
+        Kanban board: every status column in one response
+        GET /api/tasks/board/?limit=20&ministry=1&search=...
+        GET /api/tasks/board/?cursor=<next of a column>   (more of that column)
+
+        Columns group tasks by effective status (overdue applied as of today)
+        and hold up to ``limit`` tasks each, by priority then end date, with
+        a cursor for the next page and the column's total. ``columns``
+        (comma-separated statuses) limits the columns returned; a request
+        with cursors returns only the cursors' columns unless ``columns`` is
+        given. Same visibility and filters as the task list.
+        """
+        params = request.query_params
+        try:
+            limit = min(int(params.get("limit", BOARD_PAGE_SIZE)), BOARD_MAX_PAGE_SIZE)
+            if limit < 1:
+                raise ValueError
+        except ValueError:
+            return Response(
+                {"detail": "limit must be a positive integer"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        statuses = [value for value, _ in Task.STATUS_CHOICES]
+        cursors = params.getlist("cursor")
+        try:
+            cursor_columns = [decode_board_cursor(cursor)[0] for cursor in cursors]
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        if params.get("columns"):
+            columns = [value for value in params["columns"].split(",") if value in statuses]
+        else:
+            columns = [value for value in statuses if value in cursor_columns] or statuses
+
+        # Column membership is the effective status, not the stored one
+        queryset = self.filter_queryset(self.get_queryset()).order_by()
+        board = get_task_board(queryset, columns=columns, limit=limit, cursors=cursors)
+
+        serializer_class = self.get_serializer_class()
+        context = self.get_serializer_context()
+        return Response(
+            {
+                "limit": limit,
+                "columns": [
+                    {
+                        "status": value,
+                        "total": board[value]["total"],
+                        "next": board[value]["next"],
+                        "results": serializer_class(
+                            board[value]["results"], many=True, context=context
+                        ).data,
+                    }
+                    for value in columns
+                ],
+            }
+        )
+
+    @action(detail=False, methods=["get"], permission_classes=[permissions.IsAuthenticated])
+    def dashboard(self, request):
+        """
+        Statistics and all dashboard widget lists in one response
+        GET /api/tasks/dashboard/?days=7&ministry=1&assigned_to=2
+
+        Returns: { statistics, upcoming, overdue, in_progress }
+        """
+        try:
+            days = int(request.query_params.get("days", 7))
+            if days < 1:
+                raise ValueError
+        except ValueError:
+            return Response(
+                {"detail": "days must be a positive integer"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        ministry_id = request.query_params.get("ministry") or None
+        assigned_to_id = request.query_params.get("assigned_to") or None
+
+        lists = get_dashboard_tasks(days=days, ministry=ministry_id, assigned_to=assigned_to_id)
+        data = {"statistics": get_task_statistics(ministry=ministry_id, assigned_to=assigned_to_id)}
+        for name, tasks in lists.items():
+            data[name] = TaskDashboardSerializer(tasks, many=True).data
+        return Response(data)
+
     @action(detail=False, methods=["get"], permission_classes=[permissions.IsAuthenticated])
     def statistics(self, request):
         """
@@ -315,8 +455,13 @@ class TaskCommentViewSet(viewsets.ModelViewSet):
         serializer.save(user=self.request.user)
 
 
-class TaskAttachmentViewSet(viewsets.ModelViewSet):
-    """ViewSet for Task Attachments"""
+class TaskAttachmentViewSet(DirectUploadMixin, viewsets.ModelViewSet):
+    """
+    ViewSet for Task Attachments
+
+    Large files go through upload_url/finalize (common/uploads.py) instead of
+    a multipart POST.
+    """
 
     queryset = TaskAttachment.objects.select_related("task", "uploaded_by")
     serializer_class = TaskAttachmentSerializer
@@ -332,6 +477,11 @@ class TaskAttachmentViewSet(viewsets.ModelViewSet):
 
         return queryset
 
+    upload_parent_field = "task"
+
+    def direct_upload_fields(self, file_name, content_type):
+        return {"content_type": content_type[:100]}
+
     def perform_create(self, serializer):
         """Set uploaded_by to current user"""
         serializer.save(uploaded_by=self.request.user)
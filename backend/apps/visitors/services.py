@@ -8,6 +8,15 @@ from .models import VisitorAttendance
 class AttendanceService:
     """Service class for visitor attendance operations."""
 
+    @staticmethod
+    def follow_up_status_for(visit_count):
+        """(follow_up_status, is_first_time) of a visitor with ``visit_count`` visits."""
+        if visit_count <= 1:
+            return "visited_1x", True
+        if visit_count == 2:
+            return "visited_2x", False
+        return "regular", False
+
     @staticmethod
     def check_in_visitor(visitor, service_date=None, user=None):
         """
@@ -33,16 +42,10 @@ class AttendanceService:
 
             # Auto-update follow_up_status based on visit count
             visit_count = visitor.attendance_records.count()
-
-            if visit_count == 1:
-                visitor.follow_up_status = "visited_1x"
-                visitor.is_first_time = True
-            elif visit_count == 2:
-                visitor.follow_up_status = "visited_2x"
-                visitor.is_first_time = False
-            elif visit_count >= 3:
-                visitor.follow_up_status = "regular"
-                visitor.is_first_time = False
+            if visit_count:
+                visitor.follow_up_status, visitor.is_first_time = (
+                    AttendanceService.follow_up_status_for(visit_count)
+                )
 
             visitor.save(update_fields=["follow_up_status", "is_first_time", "updated_at"])
 
@@ -0,0 +1,283 @@
+"""
+Shared cache helpers.
+
+Keys are namespaced and versioned: every namespace carries a version token, and
+invalidating a namespace just replaces that token so all previously cached keys
+become unreachable (they expire on their own). This works the same on the
+database, file and Redis backends configured in settings.CACHES.
+
+cached_view can also emit HTTP caching headers (ETag, Last-Modified,
+Cache-Control) and answer conditional GETs with 304 Not Modified. Last-Modified
+is the namespace's invalidation time, or for entries with a timeout (whose
+content also changes with the clock) the time the entry was built.
+"""
+
+import functools
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models.signals import post_delete, post_save
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+logger = logging.getLogger(__name__)
+
+# Namespaces registered through cached_view / invalidate_on_change (for metrics)
+_namespaces = set()
+
+# Hit/miss counts not yet added to the shared counters: (namespace, outcome) -> n
+_pending = Counter()
+_pending_lock = threading.Lock()
+_pending_since = time.monotonic()
+
+
+def _version_key(namespace):
+    return f"ns:{namespace}:version"
+
+
+def _metric_key(namespace, outcome):
+    return f"metrics:{namespace}:{outcome}"
+
+
+def _new_version():
+    """Version tokens are time based so an evicted token never resurrects stale keys."""
+    return format(time.time_ns(), "x")
+
+
+def get_namespace_version(namespace):
+    """Return the current version token for a namespace, creating it if missing."""
+    key = _version_key(namespace)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _new_version(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def get_namespace_versions(namespaces):
+    """
+    Current version tokens of many namespaces in one cache round trip, for
+    change detection (None for a namespace never invalidated or created).
+    """
+    keys = {_version_key(namespace): namespace for namespace in namespaces}
+    found = cache.get_many(list(keys))
+    return {namespace: found.get(key) for key, namespace in keys.items()}
+
+
+def get_namespace_timestamp(namespace):
+    """Return when the namespace was last invalidated (epoch seconds)."""
+    return int(get_namespace_version(namespace), 16) / 1e9
+
+
+def make_key(namespace, *parts):
+    """Build a versioned cache key, e.g. ``public_events:v18c3...:<parts>``."""
+    suffix = ":".join(str(part) for part in parts)
+    return f"{namespace}:v{get_namespace_version(namespace)}:{suffix}"
+
+
+def invalidate_namespace(*namespaces):
+    """Invalidate every key cached under the given namespaces."""
+    for namespace in namespaces:
+        cache.set(_version_key(namespace), _new_version(), timeout=None)
+        logger.debug("Cache namespace invalidated: %s", namespace)
+
+
+def invalidate_on_change(namespace, *models):
+    """
+    Invalidate a namespace whenever one of the models is saved or deleted.
+    Call from an AppConfig.ready() method.
+    """
+    _namespaces.add(namespace)
+
+    def _receiver(sender, **kwargs):
+        invalidate_namespace(namespace)
+
+    for model in models:
+        uid = f"cache-invalidate:{namespace}:{model._meta.label}"
+        post_save.connect(_receiver, sender=model, weak=False, dispatch_uid=f"{uid}:save")
+        post_delete.connect(_receiver, sender=model, weak=False, dispatch_uid=f"{uid}:delete")
+
+
+# ============ Metrics ============
+
+
+def _flush_metrics():
+    """Add this process's pending counts to the shared counters."""
+    global _pending_since
+    with _pending_lock:
+        pending = dict(_pending)
+        _pending.clear()
+        _pending_since = time.monotonic()
+    for (namespace, outcome), count in pending.items():
+        key = _metric_key(namespace, outcome)
+        try:
+            cache.incr(key, count)
+        except ValueError:
+            # Counter missing (first use or evicted)
+            if not cache.add(key, count, timeout=None):
+                try:
+                    cache.incr(key, count)
+                except ValueError:
+                    pass
+
+
+def _record(namespace, outcome):
+    """
+    Count a hit or miss in memory. Counts reach the shared cache at most every
+    CACHE_METRICS_FLUSH_INTERVAL seconds: on the database backend incr is a
+    read plus a write, too slow (and racy) to do on every cached response.
+    """
+    with _pending_lock:
+        _pending[(namespace, outcome)] += 1
+        due = time.monotonic() - _pending_since >= getattr(
+            settings, "CACHE_METRICS_FLUSH_INTERVAL", 60
+        )
+    if due:
+        _flush_metrics()
+
+
+def get_cache_stats():
+    """
+    Return hit/miss counters and hit rate for every known namespace (other
+    processes' counts from the last CACHE_METRICS_FLUSH_INTERVAL may be missing).
+    """
+    _flush_metrics()
+    stats = {}
+    for namespace in sorted(_namespaces):
+        hits = cache.get(_metric_key(namespace, "hits")) or 0
+        misses = cache.get(_metric_key(namespace, "misses")) or 0
+        total = hits + misses
+        stats[namespace] = {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / total * 100, 2) if total else 0,
+        }
+    return stats
+
+
+def reset_cache_stats():
+    """Reset all hit/miss counters."""
+    with _pending_lock:
+        _pending.clear()
+    cache.delete_many(
+        [
+            _metric_key(namespace, outcome)
+            for namespace in _namespaces
+            for outcome in ("hits", "misses")
+        ]
+    )
+
+
+# ============ View caching ============
+
+
+def _find_request(args):
+    """Locate the request among view args (function views and APIView methods)."""
+    for arg in args[:2]:
+        if hasattr(arg, "method") and hasattr(arg, "get_full_path"):
+            return arg
+    return None
+
+
+def request_fingerprint(request, vary_on_user=False):
+    """Stable digest of path + sorted query params (+ user id when requested)."""
+    params = sorted((key, value) for key in request.GET for value in request.GET.getlist(key))
+    raw = f"{request.path}?{params}"
+    if vary_on_user:
+        user = getattr(request, "user", None)
+        raw += f"|user={getattr(user, 'pk', None)}"
+    return hashlib.sha256(raw.encode()).hexdigest()[:32]
+
+
+def compute_etag(data):
+    """Strong ETag from the serialized response data."""
+    payload = json.dumps(data, cls=DjangoJSONEncoder, sort_keys=True, separators=(",", ":"))
+    return '"%s"' % hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+
+def _apply_http_caching(request, response, entry, max_age, stale_while_revalidate):
+    """Add validators/Cache-Control and turn matching conditional GETs into 304s."""
+    last_modified = int(entry["last_modified"])
+    not_modified = get_conditional_response(
+        request, etag=entry["etag"], last_modified=last_modified, response=response
+    )
+    if not_modified is not response:
+        response = not_modified
+
+    response["ETag"] = entry["etag"]
+    response["Last-Modified"] = http_date(last_modified)
+    cache_control = {"public": True, "max_age": max_age}
+    if stale_while_revalidate:
+        cache_control["stale_while_revalidate"] = stale_while_revalidate
+    patch_cache_control(response, **cache_control)
+    return response
+
+
+def cached_view(
+    namespace, timeout=None, vary_on_user=False, max_age=None, stale_while_revalidate=None
+):
+    """
+    Cache successful GET responses of a DRF view.
+
+    Works on @api_view functions and APIView/ViewSet methods. Only response.data
+    is stored, so the cached value is plain data and renderer-independent.
+
+    Args:
+        namespace: Cache namespace (invalidate with invalidate_namespace)
+        timeout: Seconds to keep the response (default: CACHES TIMEOUT)
+        vary_on_user: Include the authenticated user in the key
+        max_age: When set, send ETag/Last-Modified/Cache-Control headers and
+            answer If-None-Match / If-Modified-Since with 304 (public views only)
+        stale_while_revalidate: Seconds clients/CDNs may serve a stale copy
+            while revalidating in the background
+    """
+    _namespaces.add(namespace)
+
+    def decorator(view_func):
+        @functools.wraps(view_func)
+        def wrapper(*args, **kwargs):
+            request = _find_request(args)
+            if request is None or request.method not in ("GET", "HEAD"):
+                return view_func(*args, **kwargs)
+
+            key = make_key(namespace, request_fingerprint(request, vary_on_user))
+            entry = cache.get(key)
+            if entry is not None:
+                _record(namespace, "hits")
+                response = Response(entry["data"])
+            else:
+                _record(namespace, "misses")
+                built_at = time.time()
+                response = view_func(*args, **kwargs)
+                if response.status_code != 200 or getattr(response, "data", None) is None:
+                    return response
+                entry = {
+                    "data": response.data,
+                    "etag": compute_etag(response.data),
+                    # Timed entries change on expiry without an invalidation
+                    "last_modified": (
+                        get_namespace_timestamp(namespace) if timeout is None else built_at
+                    ),
+                }
+                if timeout is None:
+                    cache.set(key, entry)
+                else:
+                    cache.set(key, entry, timeout)
+
+            if max_age is not None:
+                response = _apply_http_caching(
+                    request, response, entry, max_age, stale_while_revalidate
+                )
+            return response
+
+        return wrapper
+
+    return decorator
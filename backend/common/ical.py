@@ -0,0 +1,166 @@
+"""
+iCalendar (.ics) feeds.
+
+Feeds are plain DRF views returning the calendar text as response data and
+rendered by ICalendarRenderer, so cached_view caches them like any other
+public view: an unchanged feed is served (or answered with 304 Not Modified)
+from the cache without touching the database, until a model change
+invalidates the feed's namespace.
+
+Rebuilding a feed after a change is incremental: each VEVENT is cached under
+its object's ``updated_at`` (cached_vevents), so only the changed objects are
+rendered again.
+"""
+
+from datetime import datetime
+from datetime import timezone as dt_timezone
+from urllib.parse import urlparse
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework.renderers import BaseRenderer
+
+# Per-VEVENT cache entries; keyed by updated_at, so they never need invalidating
+VEVENT_TIMEOUT = 60 * 60 * 24 * 7
+
+
+class ICalendarRenderer(BaseRenderer):
+    media_type = "text/calendar"
+    format = "ics"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if not isinstance(data, str):
+            # Error responses ({"detail": ...})
+            data = str(data.get("detail", "")) if isinstance(data, dict) else ""
+        return data.encode(self.charset)
+
+
+def escape(text):
+    """Escape a TEXT value (RFC 5545 3.3.11)."""
+    return (
+        str(text or "")
+        .replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def fold(line):
+    """Fold a content line at 75 octets (RFC 5545 3.1)."""
+    encoded = line.encode()
+    if len(encoded) <= 75:
+        return line
+    parts, start = [], 0
+    while start < len(encoded):
+        end = min(start + (75 if not parts else 74), len(encoded))
+        # Don't split a UTF-8 sequence
+        while end < len(encoded) and (encoded[end] & 0xC0) == 0x80:
+            end -= 1
+        parts.append(encoded[start:end].decode())
+        start = end
+    return "\r\n ".join(parts)
+
+
+def format_utc(dt):
+    return dt.astimezone(dt_timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def format_local(dt):
+    """DTSTART/DTEND value with TZID, so RRULEs keep their local time."""
+    local = timezone.localtime(dt) if timezone.is_aware(dt) else dt
+    return f";TZID={settings.TIME_ZONE}:{local.strftime('%Y%m%dT%H%M%S')}"
+
+
+def uid(kind, pk):
+    domain = urlparse(settings.FRONTEND_URL).hostname or "localhost"
+    return f"{kind}-{pk}@{domain}"
+
+
+def vevent(
+    uid,
+    start,
+    summary,
+    end=None,
+    description="",
+    location="",
+    status="CONFIRMED",
+    stamp=None,
+    rrule="",
+    recurrence_id=None,
+    categories="",
+):
+    """One VEVENT block: folded content lines joined with CRLF."""
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{uid}",
+        f"DTSTAMP:{format_utc(stamp or timezone.now())}",
+        f"DTSTART{format_local(start)}",
+    ]
+    if end:
+        lines.append(f"DTEND{format_local(end)}")
+    if recurrence_id:
+        lines.append(f"RECURRENCE-ID{format_local(recurrence_id)}")
+    if rrule:
+        lines.append(f"RRULE:{rrule}")
+    lines.append(f"SUMMARY:{escape(summary)}")
+    if description:
+        lines.append(f"DESCRIPTION:{escape(description)}")
+    if location:
+        lines.append(f"LOCATION:{escape(location)}")
+    if categories:
+        lines.append(f"CATEGORIES:{escape(categories)}")
+    lines += [f"STATUS:{status}", "END:VEVENT"]
+    return "\r\n".join(fold(line) for line in lines)
+
+
+def cached_vevents(kind, objects, stamp_of, render):
+    """
+    VEVENT blocks for ``objects``, re-rendering only those changed since cached.
+
+    Args:
+        kind: Cache key prefix (e.g. "event")
+        objects: Model instances
+        stamp_of: object -> datetime or tuple identifying its current version
+        render: object -> VEVENT text
+    """
+    keys = {}
+    for obj in objects:
+        stamp = stamp_of(obj)
+        if isinstance(stamp, datetime):
+            stamp = (stamp,)
+        parts = [value.timestamp() if isinstance(value, datetime) else value for value in stamp]
+        keys[obj] = f"ical:{kind}:{obj.pk}:" + ":".join(str(part) for part in parts)
+
+    cached = cache.get_many(keys.values())
+    fresh = {}
+    blocks = []
+    for obj, key in keys.items():
+        if key not in cached:
+            fresh[key] = cached[key] = render(obj)
+        blocks.append(cached[key])
+    if fresh:
+        cache.set_many(fresh, VEVENT_TIMEOUT)
+    return blocks
+
+
+def calendar(name, vevents, description=""):
+    """A VCALENDAR document wrapping VEVENT blocks."""
+    lines = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        "PRODID:-//SBCC Management//Calendar//EN",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        fold(f"X-WR-CALNAME:{escape(name)}"),
+        f"X-WR-TIMEZONE:{settings.TIME_ZONE}",
+        # Polling hint for clients that honour it
+        "REFRESH-INTERVAL;VALUE=DURATION:PT15M",
+        "X-PUBLISHED-TTL:PT15M",
+    ]
+    if description:
+        lines.append(fold(f"X-WR-CALDESC:{escape(description)}"))
+    return "\r\n".join(lines + list(vevents) + ["END:VCALENDAR", ""])
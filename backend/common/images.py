@@ -0,0 +1,279 @@
+"""
+Image derivative pipeline.
+
+When a registered ImageField receives a new upload, resized WebP and JPEG
+copies are written next to the original (``team/juan.jpg`` ->
+``team/juan.jpg.640w.webp``) together with a tiny blurred placeholder. The
+result is stored on the model in ``<field>_derivatives`` (a JSONField) so
+serializers can build a srcset without touching storage. Derivatives are
+deleted when the image is replaced or cleared, or its instance is deleted.
+
+Processing happens after the upload's transaction commits, on a small thread
+pool (IMAGE_DERIVATIVES_MODE = "thread" | "sync" | "off"). Existing images can
+be (re)processed with ``python manage.py generate_image_derivatives``.
+"""
+
+import base64
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from pathlib import PurePosixPath
+
+from django.apps import apps
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models.signals import post_delete, post_save
+from PIL import Image, ImageFilter, ImageOps
+
+from .storage import write_file
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WIDTHS = (320, 640, 1280)
+FORMATS = {
+    "webp": {"format": "WEBP", "content_type": "image/webp", "quality": 80},
+    "jpeg": {"format": "JPEG", "content_type": "image/jpeg", "quality": 82},
+}
+PLACEHOLDER_WIDTH = 16
+DERIVATIVE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+_executor = None
+
+# Model label -> image field names (used by generate_image_derivatives)
+registered_image_fields = {}
+
+
+def derivatives_field(field_name):
+    """Name of the JSONField holding derivatives for an image field."""
+    return f"{field_name}_derivatives"
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=getattr(settings, "IMAGE_DERIVATIVES_WORKERS", 2),
+            thread_name_prefix="image-derivatives",
+        )
+    return _executor
+
+
+# ============ Rendering ============
+
+
+def _derivative_name(name, width, extension):
+    # Keep the source extension so photo.jpg and photo.png don't share files
+    path = PurePosixPath(name.replace("\\", "/"))
+    return str(path.with_name(f"{path.name}.{width}w.{extension}"))
+
+
+def _encode(image, fmt):
+    options = FORMATS[fmt]
+    if fmt == "jpeg" and image.mode != "RGB":
+        # JPEG has no alpha channel: flatten onto white
+        background = Image.new("RGB", image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel("A") if "A" in image.getbands() else None)
+        image = background
+    buffer = BytesIO()
+    image.save(buffer, options["format"], quality=options["quality"], optimize=True)
+    return buffer.getvalue()
+
+
+def _placeholder(image):
+    """Base64 data URI of a ~16px blurred JPEG for blur-up loading."""
+    height = max(1, round(image.height * PLACEHOLDER_WIDTH / image.width))
+    small = image.resize((PLACEHOLDER_WIDTH, height), Image.Resampling.BILINEAR)
+    small = small.filter(ImageFilter.GaussianBlur(1))
+    data = base64.b64encode(_encode(small, "jpeg")).decode()
+    return f"data:image/jpeg;base64,{data}"
+
+
+def generate_derivatives(field_file, widths=None):
+    """
+    Render and store derivatives for an image.
+
+    Widths larger than the original are skipped; the original width is used
+    instead when every configured width is larger.
+
+    Returns:
+        dict: source name, original size, placeholder and one list of
+        {"width", "name"} per format
+    """
+    storage = field_file.storage
+    widths = widths or getattr(settings, "IMAGE_DERIVATIVE_WIDTHS", DEFAULT_WIDTHS)
+
+    with storage.open(field_file.name, "rb") as fh:
+        image = Image.open(fh)
+        image = ImageOps.exif_transpose(image)
+        image.load()
+
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+
+    targets = sorted({w for w in widths if w < image.width}) or [image.width]
+    derivatives = {
+        "source": field_file.name,
+        "width": image.width,
+        "height": image.height,
+        "placeholder": _placeholder(image),
+    }
+    for fmt, options in FORMATS.items():
+        derivatives[fmt] = []
+        for width in targets:
+            height = max(1, round(image.height * width / image.width))
+            resized = image.resize((width, height), Image.Resampling.LANCZOS)
+            name = write_file(
+                storage,
+                _derivative_name(field_file.name, width, fmt),
+                _encode(resized, fmt),
+                content_type=options["content_type"],
+                cache_control=DERIVATIVE_CACHE_CONTROL,
+            )
+            derivatives[fmt].append({"width": width, "name": name})
+    return derivatives
+
+
+def delete_derivatives(storage, derivatives):
+    """Remove the files listed in a derivatives dict."""
+    for fmt in FORMATS:
+        for item in (derivatives or {}).get(fmt, []):
+            try:
+                storage.delete(item["name"])
+            except Exception as e:
+                logger.warning(f"Could not delete derivative {item['name']}: {e}")
+
+
+# ============ Serialization ============
+
+
+def build_srcset(field_file, derivatives, fmt="webp"):
+    """srcset string, e.g. ``.../a.320w.webp 320w, .../a.640w.webp 640w``."""
+    return ", ".join(
+        f"{field_file.storage.url(item['name'])} {item['width']}w"
+        for item in derivatives.get(fmt, [])
+    )
+
+
+def image_variants(instance, field_name):
+    """
+    Serializer payload for an image field, or None when there is no image
+    or its derivatives have not been generated yet.
+    """
+    field_file = getattr(instance, field_name)
+    derivatives = getattr(instance, derivatives_field(field_name)) or {}
+    if not field_file or derivatives.get("source") != field_file.name:
+        return None
+    return {
+        "srcset": build_srcset(field_file, derivatives, "webp"),
+        "jpeg_srcset": build_srcset(field_file, derivatives, "jpeg"),
+        "placeholder": derivatives["placeholder"],
+        "width": derivatives["width"],
+        "height": derivatives["height"],
+    }
+
+
+# ============ Processing ============
+
+
+def process_image_field(model_label, pk, field_name, force=False):
+    """
+    Generate derivatives for one instance/field and save them on the model.
+    Stale derivatives of a replaced (or cleared) image are deleted.
+
+    Returns:
+        bool: True if the instance was updated
+    """
+    model = apps.get_model(model_label)
+    instance = model.objects.filter(pk=pk).first()
+    if instance is None:
+        return False
+
+    field_file = getattr(instance, field_name)
+    target = derivatives_field(field_name)
+    previous = getattr(instance, target) or {}
+    source = field_file.name if field_file else None
+
+    if previous.get("source") == source and not force:
+        return False
+
+    derivatives = generate_derivatives(field_file) if source else {}
+    if previous:
+        kept = {item["name"] for fmt in FORMATS for item in derivatives.get(fmt, [])}
+        stale = {
+            fmt: [item for item in previous.get(fmt, []) if item["name"] not in kept]
+            for fmt in FORMATS
+        }
+        delete_derivatives(field_file.storage, stale)
+
+    setattr(instance, target, derivatives)
+    # post_save still fires, so cached public responses are invalidated
+    instance.save(update_fields=[target])
+    logger.info(f"Image derivatives updated: {model_label}#{pk}.{field_name}")
+    return True
+
+
+def _run(model_label, pk, field_name):
+    try:
+        process_image_field(model_label, pk, field_name)
+    except Exception:
+        logger.exception(f"Image derivatives failed: {model_label}#{pk}.{field_name}")
+    finally:
+        close_old_connections()
+
+
+def schedule_derivatives(instance, field_name):
+    """Process an image field after the current transaction commits."""
+    mode = getattr(settings, "IMAGE_DERIVATIVES_MODE", "thread")
+    if mode == "off":
+        return
+
+    args = (instance._meta.label, instance.pk, field_name)
+    if mode == "sync":
+        transaction.on_commit(lambda: process_image_field(*args))
+    else:
+        transaction.on_commit(lambda: _get_executor().submit(_run, *args))
+
+
+def register_image_fields(model, *field_names):
+    """
+    Generate derivatives whenever one of the image fields changes, and
+    delete them with the instance. The model needs a ``<field>_derivatives`` JSONField per image field.
+    Call from an AppConfig.ready() method.
+    """
+
+    def _receiver(sender, instance, update_fields=None, raw=False, **kwargs):
+        if raw:
+            return
+        for field_name in field_names:
+            if update_fields is not None and field_name not in update_fields:
+                continue
+            field_file = getattr(instance, field_name)
+            derivatives = getattr(instance, derivatives_field(field_name)) or {}
+            source = field_file.name if field_file else None
+            if derivatives.get("source") != source:
+                schedule_derivatives(instance, field_name)
+
+    def _delete_receiver(sender, instance, **kwargs):
+        for field_name in field_names:
+            derivatives = getattr(instance, derivatives_field(field_name)) or {}
+            if derivatives:
+                storage = getattr(instance, field_name).storage
+                transaction.on_commit(
+                    lambda storage=storage, derivatives=derivatives: delete_derivatives(
+                        storage, derivatives
+                    )
+                )
+
+    post_save.connect(
+        _receiver,
+        sender=model,
+        weak=False,
+        dispatch_uid=f"image-derivatives:{model._meta.label}",
+    )
+    post_delete.connect(
+        _delete_receiver,
+        sender=model,
+        weak=False,
+        dispatch_uid=f"image-derivatives-delete:{model._meta.label}",
+    )
+    registered_image_fields[model._meta.label] = field_names
@@ -0,0 +1,69 @@
+"""
+Per-action query planning for viewsets.
+
+A viewset lists, per action, the relations and annotations its serializer
+reads, and get_queryset builds the queryset to match: list views load only
+the columns they render, detail views prefetch their nested rows, and actions
+that need neither skip both.
+
+    class TaskViewSet(QueryPlanMixin, viewsets.ModelViewSet):
+        queryset = Task.objects.all()
+        query_plans = {
+            "list": QueryPlan(select=["ministry"], only=["id", "title", "ministry__name"]),
+            "default": QueryPlan(select=["ministry"], prefetch=["comments__user"]),
+        }
+
+Role-based filtering stays in the viewset's get_queryset, which calls super()
+to get the planned queryset.
+"""
+
+
+class QueryPlan:
+    """
+    Relations and annotations one action needs.
+
+    Args:
+        select: select_related paths
+        prefetch: prefetch_related lookups (strings or Prefetch objects)
+        only: Columns to load (``relation__field`` for selected relations);
+            None loads every column
+        annotate: Mapping of name -> expression, or a callable taking the
+            request and returning one (for expressions that depend on it)
+    """
+
+    def __init__(self, select=(), prefetch=(), only=None, annotate=None):
+        self.select = list(select)
+        self.prefetch = list(prefetch)
+        self.only = list(only) if only is not None else None
+        self.annotate = annotate or {}
+
+    def apply(self, queryset, request=None):
+        if self.select:
+            queryset = queryset.select_related(*self.select)
+        if self.prefetch:
+            queryset = queryset.prefetch_related(*self.prefetch)
+        annotations = self.annotate(request) if callable(self.annotate) else self.annotate
+        if annotations:
+            queryset = queryset.annotate(**annotations)
+        if self.only is not None:
+            queryset = queryset.only(*self.only)
+        return queryset
+
+
+class QueryPlanMixin:
+    """
+    Build get_queryset() from ``query_plans[action]`` (falling back to
+    ``query_plans["default"]``). Put it before the DRF viewset class.
+    """
+
+    query_plans = {}
+
+    def get_query_plan(self):
+        return self.query_plans.get(self.action) or self.query_plans.get("default")
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        plan = self.get_query_plan()
+        if plan is None:
+            return queryset
+        return plan.apply(queryset, getattr(self, "request", None))
@@ -1,9 +1,12 @@
 import logging
+import os
+import tempfile
 from urllib.parse import urljoin
 
 import boto3
 from botocore.client import Config
 from django.conf import settings
+from django.core.files.base import ContentFile
 from django.core.files.storage import Storage
 from django.utils.deconstruct import deconstructible
 
@@ -78,6 +81,27 @@ class R2Storage(Storage):
             logger.error(f"Failed to upload {name} to R2: {e}")
             raise IOError(f"Error uploading to R2: {str(e)}")
 
+    def put(self, name, content, content_type=None, cache_control=None):
+        """
+        Write a file to an exact key, overwriting any existing object.
+        Unlike save(), the name is not made unique (used for published bundles).
+        """
+        name = name.replace("\\", "/")
+        extra_args = {
+            "ContentType": content_type
+            or getattr(content, "content_type", "application/octet-stream")
+        }
+        if cache_control:
+            extra_args["CacheControl"] = cache_control
+
+        try:
+            self.s3_client.upload_fileobj(content, self.bucket_name, name, ExtraArgs=extra_args)
+            logger.info(f"Uploaded to R2: {name}")
+            return name
+        except Exception as e:
+            logger.error(f"Failed to upload {name} to R2: {e}")
+            raise IOError(f"Error uploading to R2: {str(e)}")
+
     def _open(self, name, mode="rb"):
         """Open file from R2"""
         from django.core.files.base import ContentFile
@@ -111,6 +135,26 @@ class R2Storage(Storage):
         except Exception:
             return 0
 
+    def head(self, name):
+        """Return (size, content_type) of an object, or None if it doesn't exist"""
+        try:
+            obj = self.s3_client.head_object(Bucket=self.bucket_name, Key=name)
+        except Exception:
+            return None
+        return obj["ContentLength"], obj.get("ContentType")
+
+    def presigned_put(self, name, content_type, expires_in):
+        """
+        URL a client can PUT a file to directly, at exactly ``name``.
+        The upload must send the same Content-Type header.
+        """
+        name = name.replace("\\", "/")
+        return self.s3_client.generate_presigned_url(
+            "put_object",
+            Params={"Bucket": self.bucket_name, "Key": name, "ContentType": content_type},
+            ExpiresIn=expires_in,
+        )
+
     def url(self, name):
         """Return public URL for file"""
         return urljoin(self.public_url + "/", name)
@@ -127,3 +171,39 @@ class R2Storage(Storage):
         # Convert back to forward slashes for S3/R2
         result = str(Path(path.parent) / unique_name).replace("\\", "/")
         return result
+
+
+def write_file(storage, name, content, content_type=None, cache_control=None):
+    """
+    Write bytes to an exact path on any storage, replacing any previous file
+    atomically: readers see the old or the new file, never a missing one.
+    R2Storage uploads with Content-Type/Cache-Control metadata for the CDN (a
+    PUT replaces the object in one step); local storages write a temporary
+    file next to the target and rename it over.
+    """
+    if hasattr(storage, "put"):
+        return storage.put(
+            name, ContentFile(content), content_type=content_type, cache_control=cache_control
+        )
+
+    try:
+        path = storage.path(name)
+    except NotImplementedError:
+        # Remote storage without overwrite support
+        if storage.exists(name):
+            storage.delete(name)
+        return storage.save(name, ContentFile(content))
+
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(content)
+        os.chmod(temp_path, getattr(storage, "file_permissions_mode", None) or 0o644)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return name
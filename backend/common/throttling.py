@@ -1,4 +1,9 @@
-"""Custom throttling classes for rate limiting sensitive endpoints."""
+"""
+Custom throttling classes for rate limiting sensitive endpoints.
+
+Counters are stored in the default cache (settings.CACHES), which is shared
+between workers, so limits apply per user/IP rather than per process.
+"""
 
 from rest_framework.throttling import SimpleRateThrottle
 
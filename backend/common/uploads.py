@@ -0,0 +1,223 @@
+"""
+Direct-to-storage uploads.
+
+Attachments are uploaded in two steps so file bytes never pass through a
+Django worker:
+
+    1. POST .../upload_url/  {"<parent>": 1, "file_name": ..., "content_type": ..., "file_size": ...}
+       -> {"upload": {"method": "PUT", "url": ..., "headers": {...}}, "token": ...}
+    2. the client PUTs the file to upload.url
+    3. POST .../finalize/  {"token": ...}
+       -> the attachment, created after checking the stored object (HEAD)
+
+On R2 the URL is a presigned PUT to the bucket. Storages without presigning
+(local development) get a URL to DirectUploadView, which writes the request
+body to the storage. The token is signed (django.core.signing) and carries
+the storage key, so a client can only finalize what it was allowed to upload.
+
+Once an attachment is recorded for a key, DirectUploadView refuses further
+PUTs to it. A presigned URL can't be revoked, so it is only valid for
+DIRECT_UPLOAD_PUT_EXPIRY (a few minutes) instead of the token's lifetime.
+"""
+
+import logging
+import tempfile
+
+from django.apps import apps
+from django.conf import settings
+from django.core import signing
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.http import HttpResponse, JsonResponse
+from django.urls import reverse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+logger = logging.getLogger(__name__)
+
+SALT = "common.direct-upload"
+CHUNK_SIZE = 1024 * 1024
+
+
+def make_upload_token(key, content_type, user_id, **claims):
+    return signing.dumps(
+        {"key": key, "type": content_type, "user": user_id, **claims}, salt=SALT, compress=True
+    )
+
+
+def read_upload_token(token):
+    """
+    Claims of an upload token.
+
+    Raises:
+        ValueError: if the token is invalid or older than DIRECT_UPLOAD_EXPIRY
+    """
+    try:
+        return signing.loads(token, salt=SALT, max_age=settings.DIRECT_UPLOAD_EXPIRY)
+    except signing.SignatureExpired:
+        raise ValueError("Upload expired") from None
+    except signing.BadSignature:
+        raise ValueError("Invalid upload token") from None
+
+
+def upload_target(request, storage, key, content_type, token):
+    """Where and how the client sends the file."""
+    headers = {"Content-Type": content_type}
+    if hasattr(storage, "presigned_put"):
+        url = storage.presigned_put(key, content_type, settings.DIRECT_UPLOAD_PUT_EXPIRY)
+    else:
+        url = request.build_absolute_uri(reverse("direct-upload", kwargs={"token": token}))
+    return {"method": "PUT", "url": url, "headers": headers}
+
+
+def stat_upload(storage, key):
+    """(size, content_type) of an uploaded object, or None if it is missing."""
+    if hasattr(storage, "head"):
+        return storage.head(key)
+    if not storage.exists(key):
+        return None
+    return storage.size(key), None
+
+
+class DirectUploadMixin:
+    """
+    Add ``upload_url`` and ``finalize`` actions to an attachment viewset.
+
+    Set ``upload_parent_field`` to the attachment's foreign key (e.g. "task")
+    and implement ``direct_upload_fields(file_name, content_type)`` returning
+    any model-specific metadata fields.
+    """
+
+    upload_parent_field = None
+
+    def direct_upload_fields(self, file_name, content_type):
+        return {}
+
+    @action(detail=False, methods=["post"])
+    def upload_url(self, request):
+        """
+        Start a direct upload; returns the URL to PUT the file to and a token
+        for finalize.
+        """
+        model = self.get_queryset().model
+        parent_id = request.data.get(self.upload_parent_field)
+        file_name = str(request.data.get("file_name") or "").strip()
+        content_type = request.data.get("content_type") or "application/octet-stream"
+        try:
+            file_size = int(request.data.get("file_size", 0))
+        except (TypeError, ValueError):
+            file_size = -1
+
+        if not parent_id or not file_name:
+            return Response(
+                {"detail": f"{self.upload_parent_field} and file_name are required"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if file_size < 0 or file_size > settings.DIRECT_UPLOAD_MAX_SIZE:
+            return Response(
+                {"detail": f"file_size must be at most {settings.DIRECT_UPLOAD_MAX_SIZE} bytes"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        parent_model = model._meta.get_field(self.upload_parent_field).related_model
+        if not str(parent_id).isdigit() or not parent_model.objects.filter(pk=parent_id).exists():
+            return Response(
+                {"detail": f"{parent_model._meta.verbose_name.capitalize()} not found"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        field = model._meta.get_field("file")
+        key = field.generate_filename(
+            model(**{f"{self.upload_parent_field}_id": int(parent_id)}), file_name
+        )
+        token = make_upload_token(
+            key,
+            content_type,
+            request.user.pk,
+            model=model._meta.label,
+            parent=int(parent_id),
+            name=file_name,
+        )
+        return Response(
+            {
+                "upload": upload_target(request, field.storage, key, content_type, token),
+                "token": token,
+                "expires_in": settings.DIRECT_UPLOAD_EXPIRY,
+            }
+        )
+
+    @action(detail=False, methods=["post"])
+    def finalize(self, request):
+        """Record an uploaded file as an attachment once it is in storage."""
+        try:
+            claims = read_upload_token(str(request.data.get("token", "")))
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        if claims["user"] != request.user.pk:
+            return Response({"detail": "Invalid upload token"}, status=status.HTTP_400_BAD_REQUEST)
+
+        model = self.get_queryset().model
+        storage = model._meta.get_field("file").storage
+        stat = stat_upload(storage, claims["key"])
+        if stat is None:
+            return Response({"detail": "Upload not found"}, status=status.HTTP_400_BAD_REQUEST)
+        size, content_type = stat
+        if size > settings.DIRECT_UPLOAD_MAX_SIZE:
+            storage.delete(claims["key"])
+            return Response(
+                {"detail": f"File exceeds {settings.DIRECT_UPLOAD_MAX_SIZE} bytes"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if model.objects.filter(file=claims["key"]).exists():
+            return Response({"detail": "Upload already finalized"}, status=status.HTTP_409_CONFLICT)
+
+        attachment = model.objects.create(
+            **{f"{self.upload_parent_field}_id": claims["parent"]},
+            uploaded_by=request.user,
+            file=claims["key"],
+            file_name=claims["name"],
+            file_size=size,
+            **self.direct_upload_fields(claims["name"], content_type or claims["type"]),
+        )
+        logger.info(f"Direct upload finalized: {claims['key']} ({size} bytes)")
+        serializer = self.get_serializer(attachment)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class DirectUploadView(View):
+    """
+    PUT /api/uploads/{token}/
+
+    Upload target for storages that can't presign (local development). The
+    signed token authorizes the write; the body is streamed to a temporary
+    file and saved under the token's key.
+    """
+
+    def put(self, request, token):
+        try:
+            claims = read_upload_token(token)
+        except ValueError as e:
+            return JsonResponse({"detail": str(e)}, status=400)
+        # The token outlives finalize; don't let it swap out a recorded attachment's bytes
+        model = apps.get_model(claims["model"])
+        if model.objects.filter(file=claims["key"]).exists():
+            return JsonResponse({"detail": "Upload already finalized"}, status=409)
+
+        with tempfile.TemporaryFile() as buffer:
+            size = 0
+            while chunk := request.read(CHUNK_SIZE):
+                size += len(chunk)
+                if size > settings.DIRECT_UPLOAD_MAX_SIZE:
+                    return JsonResponse({"detail": "File too large"}, status=413)
+                buffer.write(chunk)
+            buffer.seek(0)
+
+            # A retried PUT replaces the earlier attempt rather than being renamed
+            if default_storage.exists(claims["key"]):
+                default_storage.delete(claims["key"])
+            default_storage.save(claims["key"], File(buffer, name=claims["key"]))
+        return HttpResponse(status=204)
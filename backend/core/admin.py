@@ -3,3 +3,50 @@
 # - MemberAdmin → apps.members.admin
 # - EventAdmin → apps.events.admin
 # - AttendanceAdmin → apps.attendance.admin
+
+from django.contrib import admin
+
+from .models import JobRun
+from .scheduler import schedule_overview
+
+
+@admin.register(JobRun)
+class JobRunAdmin(admin.ModelAdmin):
+    """Scheduler history; the change list also shows every registered job."""
+
+    list_display = ["job", "status", "started_at", "duration", "rows", "lateness", "host"]
+    list_filter = ["status", "job", "started_at"]
+    search_fields = ["job", "error"]
+    ordering = ["-started_at"]
+    date_hierarchy = "started_at"
+    readonly_fields = [
+        "job",
+        "status",
+        "due_at",
+        "started_at",
+        "finished_at",
+        "duration_ms",
+        "rows",
+        "detail",
+        "error",
+        "host",
+    ]
+
+    def has_add_permission(self, request):
+        return False
+
+    @admin.display(description="Duration", ordering="duration_ms")
+    def duration(self, obj):
+        if obj.duration_ms is None:
+            return "-"
+        return f"{obj.duration_ms / 1000:.1f}s"
+
+    @admin.display(description="Started late by")
+    def lateness(self, obj):
+        if obj.due_at is None:
+            return "-"
+        return f"{max(0, (obj.started_at - obj.due_at).total_seconds()):.0f}s"
+
+    def changelist_view(self, request, extra_context=None):
+        extra_context = {**(extra_context or {}), "scheduled_jobs": schedule_overview()}
+        return super().changelist_view(request, extra_context=extra_context)
@@ -0,0 +1,36 @@
+from django.apps import AppConfig
+
+
+class CoreConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "core"
+    verbose_name = "Dashboard"
+
+    def ready(self):
+        from apps.announcements.models import Announcement
+        from apps.attendance.models import Attendance, AttendanceSheet
+        from apps.events.models import Event
+        from apps.inventory.models import InventoryTracking
+        from apps.members.models import Member
+        from apps.ministries.models import Ministry
+        from apps.settings.models import SystemSettings, TeamMember
+        from apps.tasks.models import Task
+        from common.cache import invalidate_on_change
+
+        from .homepage import publish_on_change, scheduled_publish
+        from .scheduler import prune_job_runs, register_job
+
+        invalidate_on_change(
+            "dashboard",
+            Member,
+            Ministry,
+            Event,
+            InventoryTracking,
+            Task,
+            AttendanceSheet,
+            Attendance,
+        )
+
+        publish_on_change(SystemSettings, TeamMember, Announcement, Event)
+        register_job("core.publish_homepage", "*/5 * * * *", scheduled_publish, timeout=120)
+        register_job("core.prune_job_runs", "30 3 * * *", prune_job_runs)
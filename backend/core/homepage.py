@@ -0,0 +1,196 @@
+"""
+Prebuilt public homepage bundle.
+
+Renders everything the public homepage needs (settings, team, announcements,
+events) into one JSON document and writes it to storage as:
+
+    public/homepage.json              latest bundle, short Cache-Control
+    public/homepage.<version>.json    immutable copy, cacheable forever
+
+The version is a hash of the content, so unchanged content is never rewritten.
+The bundle is republished:
+
+- after any transaction that changes SystemSettings, TeamMember, Announcement
+  or Event (see core/apps.py), on a background thread a few seconds later
+  (HOMEPAGE_BUNDLE_PUBLISH_DELAY), so a burst of saves publishes once and
+  requests don't wait for the upload;
+- every few minutes by the core.publish_homepage job, for content that changes
+  with time (a scheduled announcement's publish_at arriving, events passing);
+- on demand with ``python manage.py publish_homepage``.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+
+from common.storage import write_file
+
+logger = logging.getLogger(__name__)
+
+BUNDLE_DIR = "public"
+LATEST_NAME = f"{BUNDLE_DIR}/homepage.json"
+LATEST_CACHE_CONTROL = "public, max-age=60, stale-while-revalidate=600"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+VERSION_CACHE_KEY = "homepage_bundle:version"
+
+
+def build_homepage_bundle(announcement_limit=10, event_limit=10):
+    """Build the bundle dict using the same queries/serializers as the public API."""
+    from apps.announcements.public_views import (
+        PublicAnnouncementSerializer,
+        get_public_announcements,
+    )
+    from apps.events.public_views import PublicEventSerializer, get_public_events
+    from apps.settings.models import SystemSettings, TeamMember
+    from apps.settings.serializers import PublicSettingsSerializer, PublicTeamMemberSerializer
+
+    team = TeamMember.objects.filter(is_active=True).order_by("order", "name")
+
+    content = {
+        "settings": PublicSettingsSerializer(SystemSettings.get_settings()).data,
+        "team": PublicTeamMemberSerializer(team, many=True).data,
+        "announcements": PublicAnnouncementSerializer(
+            get_public_announcements(limit=announcement_limit), many=True
+        ).data,
+        "events": PublicEventSerializer(get_public_events(limit=event_limit), many=True).data,
+    }
+    payload = json.dumps(content, cls=DjangoJSONEncoder, sort_keys=True)
+
+    return {
+        "version": hashlib.sha256(payload.encode()).hexdigest()[:12],
+        "generated_at": timezone.now().isoformat(),
+        **json.loads(payload),
+    }
+
+
+def get_bundle_storage():
+    """Storage the bundle is written to (HOMEPAGE_BUNDLE_TARGET)."""
+    if getattr(settings, "HOMEPAGE_BUNDLE_TARGET", "storage") == "static":
+        return FileSystemStorage(location=settings.STATIC_ROOT, base_url=settings.STATIC_URL)
+    return default_storage
+
+
+def publish_homepage_bundle(force=False):
+    """
+    Render and write the bundle.
+
+    Returns:
+        dict: version, url, and whether files were written
+    """
+    bundle = build_homepage_bundle()
+    version = bundle["version"]
+    storage = get_bundle_storage()
+
+    if not force and cache.get(VERSION_CACHE_KEY) == version and storage.exists(LATEST_NAME):
+        return {"version": version, "url": storage.url(LATEST_NAME), "written": False}
+
+    body = json.dumps(bundle, cls=DjangoJSONEncoder).encode()
+    write_file(
+        storage,
+        f"{BUNDLE_DIR}/homepage.{version}.json",
+        body,
+        content_type="application/json",
+        cache_control=IMMUTABLE_CACHE_CONTROL,
+    )
+    write_file(
+        storage,
+        LATEST_NAME,
+        body,
+        content_type="application/json",
+        cache_control=LATEST_CACHE_CONTROL,
+    )
+    cache.set(VERSION_CACHE_KEY, version, timeout=None)
+
+    logger.info("Published homepage bundle %s", version)
+    return {"version": version, "url": storage.url(LATEST_NAME), "written": True}
+
+
+# Pending debounced publish (threading.Timer), if any
+_timer = None
+_timer_lock = threading.Lock()
+
+
+def _publish_in_background():
+    global _timer
+    with _timer_lock:
+        _timer = None
+    try:
+        publish_homepage_bundle()
+    except Exception:
+        logger.exception("Failed to publish homepage bundle")
+    finally:
+        # This thread's own database connection
+        connection.close()
+
+
+def _start_publish_timer():
+    global _timer
+    with _timer_lock:
+        if _timer is not None:
+            return
+        delay = getattr(settings, "HOMEPAGE_BUNDLE_PUBLISH_DELAY", 2)
+        _timer = threading.Timer(delay, _publish_in_background)
+        _timer.daemon = True
+        _timer.start()
+
+
+def schedule_homepage_publish():
+    """
+    Publish on a background thread shortly after the current transaction
+    commits. Changes made before the pending publish starts share it.
+    """
+    if not getattr(settings, "HOMEPAGE_BUNDLE_AUTO_PUBLISH", True):
+        return
+    transaction.on_commit(_start_publish_timer)
+
+
+def cancel_homepage_publish():
+    """Drop a pending background publish; returns whether one was pending."""
+    global _timer
+    with _timer_lock:
+        timer, _timer = _timer, None
+    if timer is None:
+        return False
+    timer.cancel()
+    return True
+
+
+def flush_homepage_publish():
+    """
+    Run a pending background publish now (tests, shutdown).
+
+    Returns:
+        dict from publish_homepage_bundle, or None if nothing was pending
+    """
+    if not cancel_homepage_publish():
+        return None
+    return publish_homepage_bundle()
+
+
+def scheduled_publish():
+    """Republish the homepage bundle if time-dependent content changed."""
+    if not getattr(settings, "HOMEPAGE_BUNDLE_AUTO_PUBLISH", True):
+        return {"rows": 0, "version": None}
+    result = publish_homepage_bundle()
+    return {"rows": int(result["written"]), "version": result["version"]}
+
+
+def publish_on_change(*models):
+    """Republish the bundle whenever one of the models is saved or deleted."""
+
+    def _receiver(sender, **kwargs):
+        schedule_homepage_publish()
+
+    for model in models:
+        uid = f"homepage-bundle:{model._meta.label}"
+        post_save.connect(_receiver, sender=model, weak=False, dispatch_uid=f"{uid}:save")
+        post_delete.connect(_receiver, sender=model, weak=False, dispatch_uid=f"{uid}:delete")
@@ -0,0 +1,144 @@
+"""
+Management command to benchmark the email backends against local fake servers.
+
+Brevo: sends the same announcement-style email to N recipients, first one API
+call per message with no concurrency (the old behaviour), then with batching
+and the pooled/parallel backend.
+
+SMTP: sends N emails through CustomEmailBackend, first with a new connection
+(connect + EHLO + AUTH + QUIT) per message like send_mail(), then over one
+reused connection.
+
+Prints wall time and call/connection counts. Nothing leaves the machine.
+
+Usage:
+    python manage.py benchmark_email
+    python manage.py benchmark_email --recipients=800 --latency=0.05
+    python manage.py benchmark_email --backend=smtp --recipients=200 --latency=0.005
+"""
+
+import time
+
+from django.core.mail import EmailMessage
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+
+from sbcc.brevo_backend import BrevoEmailBackend
+from sbcc.email_backend import CustomEmailBackend
+from sbcc.email_testing import FakeBrevoServer, FakeSMTPServer
+
+
+class Command(BaseCommand):
+    help = "Benchmark Brevo or SMTP email sending against a local fake server"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--backend",
+            choices=["brevo", "smtp"],
+            default="brevo",
+            help="Backend to benchmark (default: brevo)",
+        )
+        parser.add_argument(
+            "--recipients",
+            type=int,
+            default=800,
+            help="Number of recipients (default: 800)",
+        )
+        parser.add_argument(
+            "--latency",
+            type=float,
+            default=0.05,
+            help="Simulated latency per API call / SMTP reply in seconds (default: 0.05)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="Recipients per API call in batched mode (default: 100)",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=4,
+            help="Concurrent API calls in batched mode (default: 4)",
+        )
+
+    def messages(self, count):
+        return [
+            EmailMessage("Benchmark", "Hello", "bench@example.com", [f"m{i}@example.com"])
+            for i in range(count)
+        ]
+
+    def report(self, label, sent, elapsed, count, calls, connections):
+        self.stdout.write(
+            f"  {label}: {sent} sent in {elapsed:.2f}s ({elapsed / count * 1000:.1f} ms/message), "
+            f"{calls}, {connections} connection(s)"
+        )
+
+    # ============ Brevo ============
+
+    def run_brevo(self, label, count, latency, batch_size, workers):
+        messages = self.messages(count)
+        with FakeBrevoServer(latency=latency) as server:
+            with override_settings(
+                BREVO_API_KEY=server.api_key,
+                BREVO_API_URL=server.url,
+                BREVO_BATCH_SIZE=batch_size,
+                BREVO_MAX_WORKERS=workers,
+            ):
+                start = time.perf_counter()
+                sent = BrevoEmailBackend().send_messages(messages)
+                elapsed = time.perf_counter() - start
+
+        self.report(
+            label,
+            sent,
+            elapsed,
+            count,
+            f"{len(server.requests)} API call(s), peak concurrency {server.max_in_flight}",
+            server.connections,
+        )
+        return elapsed
+
+    # ============ SMTP ============
+
+    def run_smtp(self, label, count, latency, reuse):
+        messages = self.messages(count)
+        with FakeSMTPServer(latency=latency) as server:
+
+            def backend():
+                return CustomEmailBackend(
+                    host=server.host,
+                    port=server.port,
+                    username="bench",
+                    password="bench",
+                    use_tls=False,
+                )
+
+            start = time.perf_counter()
+            if reuse:
+                with backend() as connection:
+                    sent = connection.send_messages(messages)
+            else:
+                sent = sum(backend().send_messages([message]) for message in messages)
+            elapsed = time.perf_counter() - start
+
+        self.report(label, sent, elapsed, count, f"{server.logins} login(s)", server.connections)
+        return elapsed
+
+    def handle(self, *args, **options):
+        count = options["recipients"]
+        latency = options["latency"]
+        self.stdout.write(
+            f"{options['backend']}: {count} recipients, {latency * 1000:.0f} ms simulated latency"
+        )
+
+        if options["backend"] == "smtp":
+            baseline = self.run_smtp("connection per message", count, latency, reuse=False)
+            improved = self.run_smtp("reused connection", count, latency, reuse=True)
+        else:
+            baseline = self.run_brevo("one call per message", count, latency, 1, 1)
+            improved = self.run_brevo(
+                "batched + pooled", count, latency, options["batch_size"], options["workers"]
+            )
+        self.stdout.write(self.style.SUCCESS(f"\nSpeedup: {baseline / improved:.1f}x"))
@@ -0,0 +1,56 @@
+"""
+Management command to generate resized image derivatives for existing uploads.
+
+New uploads are processed automatically; use this to backfill images uploaded
+before the pipeline existed, or to re-render after changing
+IMAGE_DERIVATIVE_WIDTHS.
+
+Usage:
+    python manage.py generate_image_derivatives
+    python manage.py generate_image_derivatives --force
+    python manage.py generate_image_derivatives --model settings.TeamMember
+"""
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from common.images import process_image_field, registered_image_fields
+
+
+class Command(BaseCommand):
+    help = "Generate WebP/JPEG derivatives and blur placeholders for uploaded images"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Re-render images that already have derivatives",
+        )
+        parser.add_argument(
+            "--model",
+            help="Only process one model (app_label.ModelName)",
+        )
+
+    def handle(self, *args, **options):
+        processed = failed = 0
+
+        for label, field_names in registered_image_fields.items():
+            if options["model"] and label.lower() != options["model"].lower():
+                continue
+            model = apps.get_model(label)
+
+            for field_name in field_names:
+                pks = (
+                    model.objects.exclude(**{field_name: ""})
+                    .exclude(**{f"{field_name}__isnull": True})
+                    .values_list("pk", flat=True)
+                )
+                for pk in pks.iterator():
+                    try:
+                        if process_image_field(label, pk, field_name, force=options["force"]):
+                            processed += 1
+                    except Exception as e:
+                        failed += 1
+                        self.stderr.write(f"{label}#{pk}.{field_name}: {e}")
+
+        self.stdout.write(self.style.SUCCESS(f"Processed {processed} image(s), {failed} failed"))
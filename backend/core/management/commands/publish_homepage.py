@@ -0,0 +1,32 @@
+"""
+Management command to publish the public homepage JSON bundle.
+
+Usage:
+    python manage.py publish_homepage
+    python manage.py publish_homepage --force
+"""
+
+from django.core.management.base import BaseCommand
+
+from core.homepage import publish_homepage_bundle
+
+
+class Command(BaseCommand):
+    help = "Render the public homepage bundle and write it to storage"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Rewrite the files even if the content version is unchanged",
+        )
+
+    def handle(self, *args, **options):
+        result = publish_homepage_bundle(force=options["force"])
+
+        if result["written"]:
+            self.stdout.write(
+                self.style.SUCCESS(f"Published bundle {result['version']}: {result['url']}")
+            )
+        else:
+            self.stdout.write(f"Bundle {result['version']} is up to date: {result['url']}")
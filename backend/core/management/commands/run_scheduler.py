@@ -0,0 +1,108 @@
+"""
+Management command that runs periodic jobs registered by the apps.
+
+Runs as a long-lived process by default, checking every --interval seconds
+which jobs are due and running each on its own thread (--once runs them one
+after another). Several schedulers can run at the same time; each job
+takes a lease, so it runs on only one of them. Each check also marks runs
+abandoned by a killed scheduler as failed.
+
+Usage:
+    python manage.py run_scheduler
+    python manage.py run_scheduler --once
+    python manage.py run_scheduler --list
+    python manage.py run_scheduler --run tasks.update_overdue
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+from core.scheduler import (
+    get_job,
+    get_jobs,
+    run_due_jobs,
+    run_job,
+    schedule_overview,
+    start_due_jobs,
+)
+
+
+class Command(BaseCommand):
+    help = "Run periodic maintenance jobs when they are due"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Run the jobs that are due, then exit",
+        )
+        parser.add_argument(
+            "--run",
+            metavar="JOB",
+            help="Run one job now, whether or not it is due",
+        )
+        parser.add_argument(
+            "--list",
+            action="store_true",
+            help="List registered jobs with their last and next run",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=30,
+            help="Seconds between checks for due jobs (default: 30)",
+        )
+
+    def write_run(self, run):
+        line = f"{run.job}: {run.status} in {run.duration_ms} ms"
+        if run.rows is not None:
+            line += f", {run.rows} rows"
+        if run.status == run.STATUS_FAILED:
+            self.stdout.write(self.style.ERROR(f"{line}\n{run.error.splitlines()[0]}"))
+        else:
+            self.stdout.write(line)
+
+    def handle(self, *args, **options):
+        if options["list"]:
+            for job in schedule_overview():
+                last, next_run = job["last_run"], job["next_run_at"]
+                last_text = f"{last.started_at:%Y-%m-%d %H:%M} {last.status}" if last else "never"
+                next_text = f"{next_run:%Y-%m-%d %H:%M}" if next_run else "next tick"
+                self.stdout.write(
+                    f"{job['name']:<36} {job['schedule']:<14} last: {last_text}, next: {next_text}"
+                )
+            return
+
+        if options["run"]:
+            try:
+                job = get_job(options["run"])
+            except KeyError as e:
+                raise CommandError(e.args[0])
+            run = run_job(job, force=True)
+            if run is None:
+                raise CommandError(f"{job.name} is already running elsewhere")
+            self.write_run(run)
+            return
+
+        if options["once"]:
+            for run in run_due_jobs():
+                self.write_run(run)
+            return
+
+        running = {}
+        executor = ThreadPoolExecutor(
+            max_workers=max(len(get_jobs()), 1), thread_name_prefix="scheduler"
+        )
+        try:
+            while True:
+                for run in start_due_jobs(executor, running):
+                    self.write_run(run)
+                close_old_connections()
+                time.sleep(options["interval"])
+        except KeyboardInterrupt:
+            pass
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
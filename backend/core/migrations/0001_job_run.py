@@ -0,0 +1,55 @@
+# Generated by Django 5.1.4 on 2026-10-19 05:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="JobRun",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("job", models.CharField(max_length=100)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("running", "Running"),
+                            ("success", "Success"),
+                            ("failed", "Failed"),
+                        ],
+                        default="running",
+                        max_length=10,
+                    ),
+                ),
+                ("due_at", models.DateTimeField(blank=True, null=True)),
+                ("started_at", models.DateTimeField()),
+                ("finished_at", models.DateTimeField(blank=True, null=True)),
+                ("duration_ms", models.PositiveIntegerField(blank=True, null=True)),
+                (
+                    "rows",
+                    models.IntegerField(blank=True, help_text="Rows changed by the job", null=True),
+                ),
+                ("detail", models.JSONField(blank=True, default=dict)),
+                ("error", models.TextField(blank=True)),
+                ("host", models.CharField(blank=True, max_length=255)),
+            ],
+            options={
+                "db_table": "scheduler_job_runs",
+                "ordering": ["-started_at"],
+                "indexes": [
+                    models.Index(fields=["job", "-started_at"], name="scheduler_j_job_f77609_idx")
+                ],
+            },
+        ),
+    ]
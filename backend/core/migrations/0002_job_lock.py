@@ -0,0 +1,24 @@
+# Generated by Django 5.1.4 on 2026-10-19 07:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0001_job_run"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="JobLock",
+            fields=[
+                ("job", models.CharField(max_length=100, primary_key=True, serialize=False)),
+                ("owner", models.CharField(max_length=255)),
+                ("expires_at", models.DateTimeField()),
+            ],
+            options={
+                "db_table": "scheduler_job_locks",
+            },
+        ),
+    ]
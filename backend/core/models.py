@@ -3,3 +3,61 @@
 # - Member → apps.members.models
 # - Event → apps.events.models
 # - Attendance → apps.attendance.models
+#
+# core only keeps the scheduler's job history (core/scheduler.py).
+
+from django.db import models
+
+
+class JobRun(models.Model):
+    """One run of a periodic job (core/scheduler.py)."""
+
+    STATUS_RUNNING = "running"
+    STATUS_SUCCESS = "success"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_RUNNING, "Running"),
+        (STATUS_SUCCESS, "Success"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    job = models.CharField(max_length=100)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_RUNNING)
+    # When the schedule made the job due (null for the first run of a job)
+    due_at = models.DateTimeField(null=True, blank=True)
+    started_at = models.DateTimeField()
+    finished_at = models.DateTimeField(null=True, blank=True)
+    duration_ms = models.PositiveIntegerField(null=True, blank=True)
+    rows = models.IntegerField(null=True, blank=True, help_text="Rows changed by the job")
+    detail = models.JSONField(default=dict, blank=True)
+    error = models.TextField(blank=True)
+    # hostname:pid of the scheduler process
+    host = models.CharField(max_length=255, blank=True)
+
+    class Meta:
+        db_table = "scheduler_job_runs"
+        ordering = ["-started_at"]
+        indexes = [
+            models.Index(fields=["job", "-started_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.job} at {self.started_at:%Y-%m-%d %H:%M} ({self.status})"
+
+
+class JobLock(models.Model):
+    """
+    Lease on a job held by the scheduler process running it (core/scheduler.py).
+    A lease past expires_at is free, so a killed process can't block the job.
+    """
+
+    job = models.CharField(max_length=100, primary_key=True)
+    # hostname:pid:nonce of the holder
+    owner = models.CharField(max_length=255)
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        db_table = "scheduler_job_locks"
+
+    def __str__(self):
+        return f"{self.job} held by {self.owner} until {self.expires_at:%Y-%m-%d %H:%M}"
@@ -0,0 +1,350 @@
+"""
+Periodic maintenance jobs.
+
+Apps register their jobs from AppConfig.ready() with a cron expression
+(minute hour day-of-month month day-of-week, evaluated in settings.TIME_ZONE):
+
+    from core.scheduler import register_job
+
+    register_job("tasks.update_overdue", "5 * * * *", update_overdue_tasks)
+
+``python manage.py run_scheduler`` runs each job when it comes due (the
+production image starts it from start.sh). While a job runs its scheduler
+holds a lease on it (a JobLock row that expires after the job's timeout), so
+with several scheduler processes a job still runs on only one of them. The
+lease is plain row updates in autocommit, so it works behind a transaction
+pooler where session-level advisory locks don't. Every run is recorded as a
+JobRun with its duration and the number of rows it changed (admin: Dashboard >
+Job runs); runs left "running" by a killed process are marked failed.
+
+A job returns the number of rows it changed, or a dict of details (stored on
+the JobRun) whose "rows" entry is the row count. Runs missed while no
+scheduler was up are not replayed one by one: the job runs once, at the next
+tick. A job that has never run is due immediately.
+
+A job's timeout bounds how long a lease left by a killed scheduler blocks the
+job; frequent jobs register a timeout close to their period. The long-running
+scheduler runs each job on its own thread (start_due_jobs), so a slow nightly
+job doesn't hold up the every-minute ones.
+"""
+
+import logging
+import os
+import socket
+import time
+import traceback
+import uuid
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# name -> Job, filled by AppConfig.ready()
+_jobs = {}
+
+
+# ============ Schedules ============
+
+
+class CronSchedule:
+    """A five-field cron expression: ``*``, ``a-b``, ``*/n``, ``a-b/n`` and lists."""
+
+    # (low, high) per field; day-of-week allows 7 as another Sunday
+    RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 7)]
+
+    def __init__(self, expression):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression needs 5 fields: {expression!r}")
+        self.expression = expression
+        self.minutes, self.hours, self.days, self.months, weekdays = [
+            self._parse(spec, low, high) for spec, (low, high) in zip(fields, self.RANGES)
+        ]
+        self.weekdays = {day % 7 for day in weekdays}
+        # Standard cron: when both day fields are restricted, either may match
+        self.any_day = fields[2] == "*"
+        self.any_weekday = fields[4] == "*"
+
+    @staticmethod
+    def _parse(spec, low, high):
+        values = set()
+        for part in spec.split(","):
+            step = 1
+            if "/" in part:
+                part, step = part.split("/", 1)
+                step = int(step)
+            if part == "*":
+                start, end = low, high
+            elif "-" in part:
+                start, end = (int(value) for value in part.split("-", 1))
+            else:
+                start = int(part)
+                end = high if step > 1 else start
+            if step < 1 or not low <= start <= end <= high:
+                raise ValueError(f"Invalid cron field: {spec!r}")
+            values.update(range(start, end + 1, step))
+        return values
+
+    def _day_matches(self, dt):
+        day = dt.day in self.days
+        # cron counts weekdays from Sunday = 0, Python from Monday = 0
+        weekday = (dt.weekday() + 1) % 7 in self.weekdays
+        if self.any_day or self.any_weekday:
+            return day and weekday
+        return day or weekday
+
+    def next_after(self, dt):
+        """First matching minute strictly after ``dt`` (local time)."""
+        dt = timezone.localtime(dt).replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = dt + timedelta(days=366 * 5)
+        while dt < limit:
+            if dt.month not in self.months or not self._day_matches(dt):
+                dt = (dt + timedelta(days=1)).replace(hour=0, minute=0)
+            elif dt.hour not in self.hours:
+                dt = (dt + timedelta(hours=1)).replace(minute=0)
+            elif dt.minute not in self.minutes:
+                dt += timedelta(minutes=1)
+            else:
+                return dt
+        raise ValueError(f"Cron expression never matches: {self.expression!r}")
+
+    def __str__(self):
+        return self.expression
+
+
+class Job:
+    """A registered periodic job."""
+
+    def __init__(self, name, schedule, func, description="", timeout=3600):
+        self.name = name
+        self.schedule = CronSchedule(schedule)
+        self.func = func
+        self.description = description or (func.__doc__ or "").strip().split("\n")[0]
+        # Upper bound on a run; the lease expires after this long
+        self.timeout = timeout
+
+
+def register_job(name, schedule, func, description="", timeout=3600):
+    """Register (or replace) a periodic job. Call from an AppConfig.ready() method."""
+    _jobs[name] = Job(name, schedule, func, description, timeout)
+    return _jobs[name]
+
+
+def get_jobs():
+    return dict(sorted(_jobs.items()))
+
+
+def get_job(name):
+    try:
+        return _jobs[name]
+    except KeyError:
+        raise KeyError(f"Unknown job {name!r}; registered: {', '.join(sorted(_jobs))}") from None
+
+
+# ============ Locking ============
+
+
+def _process_name():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+@contextmanager
+def job_lock(job):
+    """Try to take the job's lease without waiting; yields whether it was acquired."""
+    from .models import JobLock
+
+    owner = f"{_process_name()}:{uuid.uuid4().hex[:8]}"
+    now = timezone.now()
+    expires_at = now + timedelta(seconds=job.timeout)
+    # Take over an expired lease, or create the first one for this job
+    acquired = bool(
+        JobLock.objects.filter(job=job.name, expires_at__lte=now).update(
+            owner=owner, expires_at=expires_at
+        )
+    )
+    if not acquired:
+        try:
+            with transaction.atomic():
+                JobLock.objects.create(job=job.name, owner=owner, expires_at=expires_at)
+            acquired = True
+        except IntegrityError:
+            acquired = False
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            JobLock.objects.filter(job=job.name, owner=owner).delete()
+
+
+# ============ Running ============
+
+
+def last_run(job):
+    from .models import JobRun
+
+    return JobRun.objects.filter(job=job.name).order_by("-started_at").first()
+
+
+def next_run_at(job, last=None):
+    """When the job is next due (None: it has never run, so it is due now)."""
+    last = last or last_run(job)
+    if last is None:
+        return None
+    return job.schedule.next_after(last.started_at)
+
+
+def is_due(job, now=None):
+    due_at = next_run_at(job)
+    return due_at is None or due_at <= (now or timezone.now())
+
+
+def run_job(job, force=False):
+    """
+    Run a job under its lock and record the run.
+
+    Unless ``force`` is set, the job only runs if it is still due once the lock
+    is held (another scheduler may have just run it).
+
+    Returns:
+        JobRun, or None if the job was locked or not due
+    """
+    from .models import JobRun
+
+    with job_lock(job) as acquired:
+        if not acquired:
+            logger.info(f"Job {job.name} is running elsewhere, skipped")
+            return None
+        due_at = next_run_at(job)
+        now = timezone.now()
+        if not force and due_at is not None and due_at > now:
+            return None
+
+        run = JobRun.objects.create(
+            job=job.name,
+            due_at=due_at,
+            started_at=now,
+            host=_process_name(),
+        )
+        started = time.monotonic()
+        try:
+            result = job.func()
+        except Exception as e:
+            logger.exception(f"Job {job.name} failed")
+            run.status = JobRun.STATUS_FAILED
+            run.error = f"{e.__class__.__name__}: {e}\n\n{traceback.format_exc()}"[-4000:]
+        else:
+            run.status = JobRun.STATUS_SUCCESS
+            if isinstance(result, dict):
+                run.detail = result
+                run.rows = result.get("rows")
+            elif isinstance(result, int):
+                run.rows = result
+        run.finished_at = timezone.now()
+        run.duration_ms = int((time.monotonic() - started) * 1000)
+        run.save(update_fields=["status", "error", "detail", "rows", "finished_at", "duration_ms"])
+
+    logger.info(f"Job {job.name} {run.status} in {run.duration_ms} ms (rows={run.rows})")
+    return run
+
+
+def reap_abandoned_runs():
+    """
+    Mark runs still "running" without a live lease as failed: their scheduler
+    was killed mid-run. Returns the number of runs marked.
+    """
+    from .models import JobLock, JobRun
+
+    now = timezone.now()
+    held = JobLock.objects.filter(job=OuterRef("job"), expires_at__gt=now)
+    reaped = (
+        JobRun.objects.filter(status=JobRun.STATUS_RUNNING)
+        .exclude(Exists(held))
+        .update(
+            status=JobRun.STATUS_FAILED,
+            finished_at=now,
+            error="Abandoned: the scheduler process stopped before the job finished",
+        )
+    )
+    if reaped:
+        logger.warning(f"Marked {reaped} abandoned job runs as failed")
+    return reaped
+
+
+def run_due_jobs(now=None):
+    """Run every job that is due, one after another. Returns the JobRuns."""
+    reap_abandoned_runs()
+    runs = []
+    for job in get_jobs().values():
+        if is_due(job, now):
+            run = run_job(job)
+            if run:
+                runs.append(run)
+    return runs
+
+
+def _run_in_thread(job):
+    try:
+        return run_job(job)
+    finally:
+        # This thread's own database connection
+        connection.close()
+
+
+def start_due_jobs(executor, running, now=None):
+    """
+    Start every due job on ``executor``, unless its previous run started here
+    is still going, so a slow job doesn't hold up the others.
+
+    ``running`` maps job names to the futures of runs in progress; the caller
+    keeps it between ticks. Returns the JobRuns finished since the last call.
+    """
+    reap_abandoned_runs()
+    finished = []
+    for name, future in list(running.items()):
+        if not future.done():
+            continue
+        del running[name]
+        try:
+            run = future.result()
+        except Exception:
+            logger.exception(f"Job {name} could not be run")
+            continue
+        if run:
+            finished.append(run)
+    for job in get_jobs().values():
+        if job.name not in running and is_due(job, now):
+            running[job.name] = executor.submit(_run_in_thread, job)
+    return finished
+
+
+def schedule_overview():
+    """Registered jobs with their last run and next due time (admin, --list)."""
+    overview = []
+    for job in get_jobs().values():
+        last = last_run(job)
+        overview.append(
+            {
+                "name": job.name,
+                "schedule": str(job.schedule),
+                "description": job.description,
+                "last_run": last,
+                "next_run_at": next_run_at(job, last) if last else None,
+            }
+        )
+    return overview
+
+
+def prune_job_runs():
+    """Delete job run history older than SCHEDULER_HISTORY_DAYS."""
+    from .models import JobRun
+
+    days = getattr(settings, "SCHEDULER_HISTORY_DAYS", 30)
+    deleted, _ = JobRun.objects.filter(
+        started_at__lt=timezone.now() - timedelta(days=days)
+    ).delete()
+    return deleted
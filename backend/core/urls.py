@@ -5,5 +5,6 @@ from . import views
 urlpatterns = [
     path("stats/", views.dashboard_stats, name="dashboard-stats"),
     path("activities/", views.recent_activities, name="dashboard-activities"),
+    path("cache-stats/", views.cache_stats, name="dashboard-cache-stats"),
     path("health/", views.health_check, name="health-check"),
 ]
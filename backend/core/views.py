@@ -12,12 +12,15 @@ from apps.inventory.models import InventoryTracking
 from apps.members.models import Member
 from apps.ministries.models import Ministry
 from apps.tasks.models import Task
+from common.cache import cached_view, get_cache_stats
+from common.permissions import IsAdmin
 
 logger = logging.getLogger(__name__)
 
 
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
+@cached_view("dashboard", timeout=60, vary_on_user=True)
 def dashboard_stats(request):
     """
     GET /api/dashboard/stats/
@@ -205,6 +208,16 @@ def recent_activities(request):
     return Response({"activities": activities[:20], "count": len(activities)})
 
 
+@api_view(["GET"])
+@permission_classes([IsAuthenticated, IsAdmin])
+def cache_stats(request):
+    """
+    GET /api/dashboard/cache-stats/
+    Cache hit/miss counters per namespace (admin only)
+    """
+    return Response({"namespaces": get_cache_stats()})
+
+
 @api_view(["GET", "HEAD"])
 @permission_classes([AllowAny])
 def health_check(request):
@@ -7,6 +7,7 @@ sleep 2
 
 echo "🔄 Running migrations..."
 python manage.py migrate --noinput
+python manage.py createcachetable
 
 echo "📦 Collecting static files..."
 python manage.py collectstatic --noinput --clear
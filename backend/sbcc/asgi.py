@@ -2,6 +2,9 @@
 ASGI config for sbcc project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Production runs it under gunicorn with uvicorn workers (see Dockerfile) so the
+notification stream (GET /api/notifications/stream/) can hold connections open
+without tying up a worker; locally use ``uvicorn sbcc.asgi:application --reload``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
@@ -3,11 +3,54 @@ Brevo (Sendinblue) Email Backend using HTTP API.
 
 Uses Brevo's HTTP API to send emails instead of SMTP.
 This bypasses network restrictions that block outgoing SMTP on cloud platforms like Railway.
+
+Messages that only differ by recipient (e.g. one per member from send_mass_mail)
+are grouped into a single batch call using Brevo's ``messageVersions``, API calls
+run concurrently on a small thread pool, and all calls share one keep-alive
+connection pool. Per-recipient outcomes are available in ``backend.results``.
 """
 
+import logging
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
 from django.conf import settings
 from django.core.mail.backends.base import BaseEmailBackend
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """Process-wide requests session with a keep-alive connection pool."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            pool_size = getattr(settings, "BREVO_MAX_WORKERS", 4)
+            # Only retry what Brevo did not process: connection errors and 429s
+            retry = Retry(
+                total=3,
+                connect=2,
+                read=0,
+                status=3,
+                status_forcelist=[429],
+                allowed_methods=["POST"],
+                backoff_factor=0.5,
+                respect_retry_after_header=True,
+                raise_on_status=False,
+            )
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
 
 
 class BrevoEmailBackend(BaseEmailBackend):
@@ -17,6 +60,12 @@ class BrevoEmailBackend(BaseEmailBackend):
     Required settings:
         BREVO_API_KEY: Your Brevo API key
         DEFAULT_FROM_EMAIL: The from address for emails (must be verified in Brevo)
+
+    Optional settings:
+        BREVO_API_URL: API endpoint (overridden in tests/benchmarks)
+        BREVO_BATCH_SIZE: Max messageVersions per API call (default 1000)
+        BREVO_MAX_WORKERS: Concurrent API calls (default 4)
+        BREVO_TIMEOUT: Seconds per API call (default 10)
     """
 
     API_URL = "https://api.brevo.com/v3/smtp/email"
@@ -24,86 +73,158 @@ class BrevoEmailBackend(BaseEmailBackend):
     def __init__(self, fail_silently=False, **kwargs):
         super().__init__(fail_silently=fail_silently, **kwargs)
         self.api_key = getattr(settings, "BREVO_API_KEY", "")
+        self.api_url = getattr(settings, "BREVO_API_URL", None) or self.API_URL
+        self.batch_size = getattr(settings, "BREVO_BATCH_SIZE", 1000)
+        self.max_workers = getattr(settings, "BREVO_MAX_WORKERS", 4)
+        self.timeout = getattr(settings, "BREVO_TIMEOUT", 10)
+        # Per-recipient results of the last send_messages() call;
+        # "index" is the message's position in the list that was sent
+        self.results = []
 
     def send_messages(self, email_messages):
         """Send one or more EmailMessage objects and return the number sent."""
+        self.results = []
         if not self.api_key:
             if not self.fail_silently:
                 raise ValueError("BREVO_API_KEY is not configured")
             return 0
 
+        email_messages = list(email_messages)
+        calls = self._build_calls(email_messages)
+        if not calls:
+            return 0
+
+        if len(calls) == 1 or self.max_workers <= 1:
+            outcomes = [self._post(call) for call in calls]
+        else:
+            with ThreadPoolExecutor(
+                max_workers=min(self.max_workers, len(calls)), thread_name_prefix="brevo"
+            ) as pool:
+                outcomes = list(pool.map(self._post, calls))
+
+        # Position of each message in the caller's list, reported in results
+        positions = {id(message): i for i, message in enumerate(email_messages)}
         num_sent = 0
-        for message in email_messages:
-            try:
-                if self._send(message):
+        errors = []
+        for call, (ok, message_ids, error) in zip(calls, outcomes):
+            for index, message in enumerate(call["messages"]):
+                recipients = list(message.to) + list(message.cc) + list(message.bcc)
+                message_id = message_ids[index] if ok and index < len(message_ids) else None
+                for email in recipients:
+                    self.results.append(
+                        {
+                            "index": positions[id(message)],
+                            "email": email,
+                            "status": "sent" if ok else "failed",
+                            "message_id": message_id,
+                            "error": error,
+                        }
+                    )
+                if ok:
                     num_sent += 1
-            except Exception as e:
-                if not self.fail_silently:
-                    raise
-                print(f"Brevo email failed: {e}")
+            if not ok:
+                errors.append(error)
+
+        if errors and not self.fail_silently:
+            raise Exception(f"Brevo API error: {errors[0]} ({len(errors)} failed call(s))")
         return num_sent
 
-    def _send(self, message):
-        """Send a single EmailMessage via Brevo HTTP API."""
-        # Parse the from email
+    # ============ Payloads ============
+
+    def _content(self, message):
+        """Everything except the recipients, used to group identical messages."""
         from_email = message.from_email or settings.DEFAULT_FROM_EMAIL
         from_name, from_addr = self._parse_email(from_email)
-
-        # Build recipient lists
-        to_list = [{"email": addr} for addr in (message.to or [])]
-        cc_list = [{"email": addr} for addr in (message.cc or [])]
-        bcc_list = [{"email": addr} for addr in (message.bcc or [])]
-
-        if not to_list:
-            return False
-
-        # Build the payload
-        payload = {
+        content = {
             "sender": {"name": from_name, "email": from_addr},
-            "to": to_list,
             "subject": message.subject,
         }
 
-        # Add CC and BCC if present
-        if cc_list:
-            payload["cc"] = cc_list
-        if bcc_list:
-            payload["bcc"] = bcc_list
-
         # Handle HTML vs plain text
         if hasattr(message, "alternatives") and message.alternatives:
-            for content, mimetype in message.alternatives:
+            for body, mimetype in message.alternatives:
                 if mimetype == "text/html":
-                    payload["htmlContent"] = content
+                    content["htmlContent"] = body
                     break
             if message.body:
-                payload["textContent"] = message.body
+                content["textContent"] = message.body
         else:
-            payload["textContent"] = message.body
-
-        # Send via Brevo API
+            content["textContent"] = message.body
+
+        if message.reply_to:
+            _, reply_addr = self._parse_email(message.reply_to[0])
+            content["replyTo"] = {"email": reply_addr}
+        return content
+
+    def _recipients(self, message):
+        recipients = {"to": [{"email": addr} for addr in message.to]}
+        if message.cc:
+            recipients["cc"] = [{"email": addr} for addr in message.cc]
+        if message.bcc:
+            recipients["bcc"] = [{"email": addr} for addr in message.bcc]
+        return recipients
+
+    def _build_calls(self, email_messages):
+        """
+        Group messages with identical content into batch calls.
+
+        Returns:
+            list of {"payload": dict, "messages": [EmailMessage]}
+        """
+        groups = {}
+        for message in email_messages:
+            if not message.to:
+                continue
+            content = self._content(message)
+            key = repr(sorted(content.items()))
+            groups.setdefault(key, (content, []))[1].append(message)
+
+        calls = []
+        for content, messages in groups.values():
+            for start in range(0, len(messages), self.batch_size):
+                chunk = messages[start : start + self.batch_size]
+                payload = dict(content)
+                if len(chunk) == 1:
+                    payload.update(self._recipients(chunk[0]))
+                else:
+                    payload["messageVersions"] = [self._recipients(m) for m in chunk]
+                calls.append({"payload": payload, "messages": chunk})
+        return calls
+
+    # ============ HTTP ============
+
+    def _post(self, call):
+        """
+        Make one API call.
+
+        Returns:
+            tuple: (ok, message ids, error message)
+        """
         headers = {
             "accept": "application/json",
             "api-key": self.api_key,
             "content-type": "application/json",
         }
-
-        response = requests.post(self.API_URL, json=payload, headers=headers, timeout=10)
-
-        if response.status_code in (200, 201):
-            print(f"Brevo email sent: {response.json()}")
-            return True
-        else:
-            error_msg = f"Brevo API error: {response.status_code} - {response.text}"
-            print(error_msg)
-            if not self.fail_silently:
-                raise Exception(error_msg)
-            return False
+        try:
+            response = get_session().post(
+                self.api_url, json=call["payload"], headers=headers, timeout=self.timeout
+            )
+        except requests.RequestException as e:
+            logger.error(f"Brevo request failed: {e}")
+            return False, [], str(e)
+
+        if response.status_code in (200, 201, 202):
+            data = response.json() if response.content else {}
+            message_ids = data.get("messageIds") or [data.get("messageId")]
+            logger.info(f"Brevo accepted {len(call['messages'])} message(s)")
+            return True, message_ids, None
+
+        error = f"{response.status_code} - {response.text[:500]}"
+        logger.error(f"Brevo API error: {error}")
+        return False, [], error
 
     def _parse_email(self, email_string):
         """Parse 'Name <email@example.com>' format into (name, email)."""
-        import re
-
         match = re.match(r"^(.+?)\s*<(.+?)>$", email_string)
         if match:
             return match.group(1).strip(), match.group(2).strip()
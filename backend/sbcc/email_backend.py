@@ -1,7 +1,10 @@
 import smtplib
 import ssl
+import time
 
+from django.conf import settings
 from django.core.mail.backends.smtp import EmailBackend
+from django.core.mail.message import sanitize_address
 
 
 class CustomEmailBackend(EmailBackend):
@@ -10,8 +13,34 @@ class CustomEmailBackend(EmailBackend):
     Uses a custom SSL context that doesn't verify certificates.
     NOTE: This is acceptable for development. Production environments
     typically don't have this issue.
+
+    The connection is meant to be reused for many messages:
+
+        connection = get_connection()
+        with connection:                      # one connect/STARTTLS/login
+            connection.send_messages(batch1)
+            ...
+            connection.send_messages(batch2)  # NOOP first if idle, reconnect if dropped
+
+    Every send_messages() call records per-recipient outcomes in
+    ``connection.results`` (same shape as the Brevo backend), and a failed
+    message does not stop the rest of the batch.
     """
 
+    # Exceptions that mean the connection is gone (before DATA: retry once on
+    # a fresh one)
+    DISCONNECTED = (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError)
+
+    def __init__(self, keepalive_interval=None, **kwargs):
+        super().__init__(**kwargs)
+        # Seconds a connection may sit idle before it is checked with NOOP
+        if keepalive_interval is None:
+            keepalive_interval = getattr(settings, "EMAIL_KEEPALIVE_INTERVAL", 30)
+        self.keepalive_interval = keepalive_interval
+        self.results = []
+        self.connects = 0
+        self._last_used = 0
+
     def open(self):
         if self.connection:
             return False
@@ -33,8 +62,135 @@ class CustomEmailBackend(EmailBackend):
             if self.username and self.password:
                 self.connection.login(self.username, self.password)
 
+            self.connects += 1
+            self._last_used = time.monotonic()
             return True
         except Exception:
+            self._drop()
             if self.fail_silently:
                 return False
             raise
+
+    def _drop(self):
+        """Forget a connection without a QUIT round trip (it may be dead)."""
+        if self.connection:
+            try:
+                self.connection.close()
+            except Exception:
+                pass
+        self.connection = None
+
+    def _ensure_alive(self):
+        """NOOP a connection that has been idle; reconnect if the server dropped it."""
+        if self.connection and time.monotonic() - self._last_used >= self.keepalive_interval:
+            try:
+                code, _ = self.connection.noop()
+                if code == 250:
+                    self._last_used = time.monotonic()
+                    return
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._drop()
+        if not self.connection:
+            self.open()
+
+    def _envelope(self, from_email, recipients):
+        """
+        MAIL FROM / RCPT TO, as in SMTP.sendmail. Nothing has been handed to
+        the server yet if this fails, so it is safe to retry.
+        """
+        connection = self.connection
+        connection.ehlo_or_helo_if_needed()
+        code, response = connection.mail(from_email)
+        if code == 421:
+            raise smtplib.SMTPServerDisconnected(response)
+        if code != 250:
+            connection.rset()
+            raise smtplib.SMTPSenderRefused(code, response, from_email)
+        refused = {}
+        for recipient in recipients:
+            code, response = connection.rcpt(recipient)
+            if code == 421:
+                raise smtplib.SMTPServerDisconnected(response)
+            if code not in (250, 251):
+                refused[recipient] = (code, response)
+        if len(refused) == len(recipients):
+            connection.rset()
+            raise smtplib.SMTPRecipientsRefused(refused)
+
+    def _data(self, message):
+        """DATA; once it has started the server may have accepted the message."""
+        code, response = self.connection.data(message.as_bytes(linesep="\r\n"))
+        if code != 250:
+            self.connection.rset()
+            raise smtplib.SMTPDataError(code, response)
+
+    def _send_one(self, email_message):
+        """
+        Send one message and return its Message-ID.
+
+        A connection lost before DATA (idle NOOP, MAIL FROM, RCPT TO) is
+        reopened and the envelope retried once. A connection lost during
+        DATA is reported as a failure instead: the server may already have
+        queued the message, and the outbox retry policy decides what to do.
+        """
+        encoding = email_message.encoding or settings.DEFAULT_CHARSET
+        from_email = sanitize_address(email_message.from_email, encoding)
+        recipients = [sanitize_address(addr, encoding) for addr in email_message.recipients()]
+        message = email_message.message()
+
+        self._ensure_alive()
+        try:
+            self._envelope(from_email, recipients)
+        except self.DISCONNECTED:
+            self._drop()
+            self.open()
+            self._envelope(from_email, recipients)
+        try:
+            self._data(message)
+        except self.DISCONNECTED:
+            self._drop()
+            raise
+        self._last_used = time.monotonic()
+        return message["Message-ID"]
+
+    def send_messages(self, email_messages):
+        """Send messages over one connection; returns the number sent."""
+        self.results = []
+        if not email_messages:
+            return 0
+        with self._lock:
+            new_conn_created = self.open()
+            if not self.connection or new_conn_created is None:
+                return 0
+
+            num_sent = 0
+            first_error = None
+            for index, message in enumerate(email_messages):
+                if not message.recipients():
+                    continue
+                error = message_id = None
+                try:
+                    message_id = self._send_one(message)
+                except Exception as e:
+                    error = str(e) or e.__class__.__name__
+                    first_error = first_error or e
+                if not error:
+                    num_sent += 1
+                for email in message.recipients():
+                    self.results.append(
+                        {
+                            "index": index,
+                            "email": email,
+                            "status": "failed" if error else "sent",
+                            "message_id": message_id,
+                            "error": error,
+                        }
+                    )
+
+            if new_conn_created:
+                self.close()
+
+        if first_error and not self.fail_silently:
+            raise first_error
+        return num_sent
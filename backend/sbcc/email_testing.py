@@ -0,0 +1,293 @@
+"""
+Local stand-ins for external email services, for tests and benchmarks.
+
+FakeBrevoServer speaks enough of the Brevo transactional email API
+(POST /v3/smtp/email, including messageVersions batches) to exercise
+sbcc.brevo_backend without network access:
+
+    with FakeBrevoServer(latency=0.05) as server:
+        settings.BREVO_API_URL = server.url
+        ...
+        server.requests        # JSON payloads received
+        server.connections     # TCP connections opened (keep-alive reuse)
+        server.max_in_flight   # peak concurrent requests
+
+FakeSMTPServer is a small SMTP stub (in the spirit of aiosmtpd's Debugging
+handler, without the dependency) for sbcc.email_backend.CustomEmailBackend:
+
+    with FakeSMTPServer(latency=0.01) as server:
+        settings.EMAIL_HOST, settings.EMAIL_PORT = server.host, server.port
+        ...
+        server.messages        # (mail_from, rcpt_tos, data) per accepted message
+        server.connections     # TCP connections opened
+        server.logins / server.noops
+        server.drop_connections()   # simulate the server hanging up
+        server.hang_up_after_data = True   # accept the next message, then
+                                           # hang up before replying 250
+"""
+
+import base64
+import json
+import socket
+import socketserver
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _BrevoHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status, data):
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        server = self.server.fake
+        payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+
+        with server.lock:
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+            server.requests.append(payload)
+        try:
+            if server.latency:
+                time.sleep(server.latency)
+
+            if self.headers.get("api-key") != server.api_key:
+                return self._reply(401, {"code": "unauthorized", "message": "Key not found"})
+
+            versions = payload.get("messageVersions")
+            recipients = [r["email"] for v in (versions or [payload]) for r in v.get("to", [])]
+            if server.fail_status or server.fail_recipients.intersection(recipients):
+                return self._reply(
+                    server.fail_status or 400,
+                    {"code": "invalid_parameter", "message": "Rejected by fake server"},
+                )
+
+            if versions:
+                ids = [f"<{uuid.uuid4().hex}@fake.brevo>" for _ in versions]
+                return self._reply(201, {"messageIds": ids})
+            return self._reply(201, {"messageId": f"<{uuid.uuid4().hex}@fake.brevo>"})
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+
+class _CountingServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def process_request(self, request, client_address):
+        with self.fake.lock:
+            self.fake.connections += 1
+        super().process_request(request, client_address)
+
+
+class FakeBrevoServer:
+    """Threaded fake of the Brevo API on 127.0.0.1 (random port)."""
+
+    def __init__(self, api_key="test-key", latency=0, fail_status=None, fail_recipients=()):
+        self.api_key = api_key
+        self.latency = latency
+        self.fail_status = fail_status
+        self.fail_recipients = set(fail_recipients)
+        self.lock = threading.Lock()
+        self.requests = []
+        self.connections = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/v3/smtp/email"
+
+    @property
+    def recipients(self):
+        """Every "to" address received, in order."""
+        return [
+            r["email"]
+            for payload in self.requests
+            for version in (payload.get("messageVersions") or [payload])
+            for r in version.get("to", [])
+        ]
+
+    def start(self):
+        self._server = _CountingServer(("127.0.0.1", 0), _BrevoHandler)
+        self._server.fake = self
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    disable_nagle_algorithm = True
+
+    def reply(self, line):
+        if self.fake.latency:
+            time.sleep(self.fake.latency)
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def readline(self):
+        raw = self.rfile.readline()
+        if not raw:
+            raise ConnectionAbortedError("client went away")
+        return raw.decode("utf-8", "replace").rstrip("\r\n")
+
+    def handle(self):
+        fake = self.fake = self.server.fake
+        with fake.lock:
+            fake.connections += 1
+            fake.sockets.add(self.request)
+        try:
+            self.reply("220 fake.smtp ESMTP ready")
+            self.session()
+        except (OSError, ValueError):
+            pass
+        finally:
+            with fake.lock:
+                fake.sockets.discard(self.request)
+
+    def session(self):
+        fake = self.fake
+        mail_from, rcpt_tos = None, []
+        while True:
+            line = self.readline()
+            command, _, arg = line.partition(" ")
+            command = command.upper()
+
+            if command in ("EHLO", "HELO"):
+                if command == "EHLO":
+                    self.reply("250-fake.smtp")
+                    self.reply("250 AUTH PLAIN LOGIN")
+                else:
+                    self.reply("250 fake.smtp")
+            elif command == "AUTH":
+                mechanism, _, initial = arg.partition(" ")
+                if mechanism.upper() == "LOGIN":
+                    self.reply("334 VXNlcm5hbWU6")
+                    self.readline()
+                    self.reply("334 UGFzc3dvcmQ6")
+                    self.readline()
+                elif not initial:
+                    self.reply("334 ")
+                    base64.b64decode(self.readline())
+                with fake.lock:
+                    fake.logins += 1
+                self.reply("235 2.7.0 Authentication successful")
+            elif command == "NOOP":
+                with fake.lock:
+                    fake.noops += 1
+                self.reply("250 OK")
+            elif command == "RSET":
+                mail_from, rcpt_tos = None, []
+                self.reply("250 OK")
+            elif command == "MAIL":
+                mail_from, rcpt_tos = arg.split(":", 1)[1].strip(" <>").split(">")[0], []
+                self.reply("250 OK")
+            elif command == "RCPT":
+                address = arg.split(":", 1)[1].strip(" <>").split(">")[0]
+                if address in fake.reject_recipients:
+                    self.reply("550 5.1.1 Mailbox unavailable")
+                else:
+                    rcpt_tos.append(address)
+                    self.reply("250 OK")
+            elif command == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                lines = []
+                while True:
+                    data_line = self.readline()
+                    if data_line == ".":
+                        break
+                    lines.append(data_line[1:] if data_line.startswith("..") else data_line)
+                with fake.lock:
+                    fake.messages.append((mail_from, rcpt_tos, "\n".join(lines)))
+                    hang_up, fake.hang_up_after_data = fake.hang_up_after_data, False
+                if hang_up:
+                    return
+                mail_from, rcpt_tos = None, []
+                self.reply("250 OK queued")
+            elif command == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("502 Command not implemented")
+
+
+class _SMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class FakeSMTPServer:
+    """Threaded SMTP stub on 127.0.0.1 (random port), no TLS."""
+
+    def __init__(self, latency=0, reject_recipients=()):
+        self.latency = latency
+        self.reject_recipients = set(reject_recipients)
+        self.lock = threading.Lock()
+        self.messages = []
+        self.connections = 0
+        self.logins = 0
+        self.noops = 0
+        self.hang_up_after_data = False
+        self.sockets = set()
+        self._server = None
+        self._thread = None
+
+    @property
+    def host(self):
+        return self._server.server_address[0]
+
+    @property
+    def port(self):
+        return self._server.server_address[1]
+
+    def drop_connections(self):
+        """Close every open client connection from the server side."""
+        with self.lock:
+            sockets = list(self.sockets)
+        for sock in sockets:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def start(self):
+        self._server = _SMTPServer(("127.0.0.1", 0), _SMTPHandler)
+        self._server.fake = self
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.drop_connections()
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
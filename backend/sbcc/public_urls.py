@@ -6,7 +6,9 @@ All endpoints require no authentication.
 from django.urls import path
 
 from apps.announcements.public_views import PublicAnnouncementsView
+from apps.events.feeds import EventsFeedView
 from apps.events.public_views import PublicEventsView
+from apps.ministries.feeds import ShiftFeedView
 from apps.prayer_requests.public_views import PublicPrayerRequestSubmitView
 from apps.settings.views import PublicSettingsView, PublicTeamView
 
@@ -25,4 +27,12 @@ urlpatterns = [
     ),
     # Events
     path("events/", PublicEventsView.as_view(), name="public-events"),
+    # Calendar subscriptions (.ics)
+    path("calendar/events.ics", EventsFeedView.as_view(), name="public-events-feed"),
+    path(
+        "calendar/ministries/<int:ministry_id>/events.ics",
+        EventsFeedView.as_view(),
+        name="public-ministry-events-feed",
+    ),
+    path("calendar/shifts/<str:token>.ics", ShiftFeedView.as_view(), name="public-shift-feed"),
 ]
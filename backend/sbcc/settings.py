@@ -67,7 +67,7 @@ INSTALLED_APPS = [
     "apps.members",  # Member model (depends on User, Ministry)
     "apps.events",  # Event model (depends on User, Ministry)
     "apps.attendance",  # Attendance (depends on Member, Event)
-    # Core (dashboard only - no models)
+    # Core (dashboard, homepage bundle, periodic job scheduler)
     "core",
     # Future apps
     "apps.announcements",
@@ -128,6 +128,48 @@ DATABASES = {
 }
 
 
+# Cache
+# Shared across gunicorn workers so throttle counters and cached responses are consistent.
+# CACHE_BACKEND options:
+#   database (default) - uses the main database, no extra service (run `createcachetable`)
+#   file               - local directory, shared by workers on the same machine
+#   redis              - any Redis-compatible server at REDIS_URL (requires `pip install redis`)
+#   locmem             - per-process memory (development only)
+CACHE_BACKEND = config("CACHE_BACKEND", default="database")
+
+if CACHE_BACKEND == "redis":
+    _default_cache = {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": config("REDIS_URL"),
+    }
+elif CACHE_BACKEND == "file":
+    _default_cache = {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": config("CACHE_FILE_PATH", default=str(BASE_DIR / ".cache")),
+    }
+elif CACHE_BACKEND == "locmem":
+    _default_cache = {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "sbcc",
+    }
+else:
+    _default_cache = {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "sbcc_cache",
+    }
+
+CACHES = {
+    "default": {
+        **_default_cache,
+        "KEY_PREFIX": config("CACHE_KEY_PREFIX", default="sbcc"),
+        "TIMEOUT": config("CACHE_DEFAULT_TIMEOUT", default=300, cast=int),
+    }
+}
+# Cache hit/miss counts are kept per process and added to the shared counters at
+# most this often (seconds), so counting doesn't add cache writes to cached responses
+CACHE_METRICS_FLUSH_INTERVAL = 60
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -215,10 +257,70 @@ else:
         },
     }
 
+# Public homepage bundle (core/homepage.py)
+# "storage" writes to the default storage (R2/media); "static" writes to STATIC_ROOT for
+# whitenoise (new files are picked up on restart, or immediately with WHITENOISE_AUTOREFRESH)
+HOMEPAGE_BUNDLE_TARGET = config("HOMEPAGE_BUNDLE_TARGET", default="storage")
+HOMEPAGE_BUNDLE_AUTO_PUBLISH = config("HOMEPAGE_BUNDLE_AUTO_PUBLISH", default=True, cast=bool)
+# Seconds between a content change and the background republish (batches bursts of saves)
+HOMEPAGE_BUNDLE_PUBLISH_DELAY = 2
+
+# Uploaded image derivatives (common/images.py)
+# "thread" processes uploads on a background pool after commit, "sync" inline after commit
+IMAGE_DERIVATIVES_MODE = config("IMAGE_DERIVATIVES_MODE", default="thread")
+IMAGE_DERIVATIVES_WORKERS = config("IMAGE_DERIVATIVES_WORKERS", default=2, cast=int)
+IMAGE_DERIVATIVE_WIDTHS = (320, 640, 1280)
+
+# Announcement email delivery jobs (apps/announcements/services.py)
+# "thread" resolves and queues recipients in the background after send_now, "sync" inline
+# after commit; `python manage.py deliver_announcements` resumes interrupted jobs
+ANNOUNCEMENT_DELIVERY_MODE = config("ANNOUNCEMENT_DELIVERY_MODE", default="thread")
+# Announcements with email_on_publish are emailed when publish_at passes. The deployed image
+# dispatches from the every-minute scheduler job (announcements.dispatch), so mail starts
+# going out 60-90 seconds after publish_at; a separate `deliver_announcements` worker polls
+# every ANNOUNCEMENT_DISPATCH_INTERVAL seconds instead. Announcements that came due more than
+# ANNOUNCEMENT_DISPATCH_MAX_AGE_HOURS ago (e.g. before the dispatcher existed) are skipped
+ANNOUNCEMENT_DISPATCH_INTERVAL = config("ANNOUNCEMENT_DISPATCH_INTERVAL", default=15, cast=int)
+ANNOUNCEMENT_DISPATCH_BATCH_SIZE = 20
+ANNOUNCEMENT_DISPATCH_MAX_AGE_HOURS = 24
+
+# QR check-in tokens (apps/attendance/checkin.py) stay valid this long after the event ends
+CHECKIN_TOKEN_TTL_HOURS = config("CHECKIN_TOKEN_TTL_HOURS", default=12, cast=int)
+
+# Periodic jobs (core/scheduler.py), run by `python manage.py run_scheduler`
+SCHEDULER_HISTORY_DAYS = config("SCHEDULER_HISTORY_DAYS", default=30, cast=int)
+
+# Notification SSE stream (apps/notifications/stream.py), served by sbcc/asgi.py
+# Each worker polls for notifications created by other workers (0 disables)
+NOTIFICATION_STREAM_POLL_INTERVAL = config(
+    "NOTIFICATION_STREAM_POLL_INTERVAL", default=1.0, cast=float
+)
+NOTIFICATION_STREAM_KEEPALIVE = 15
+# Seconds the poller re-scans behind its last poll, for rows that commit late
+NOTIFICATION_STREAM_POLL_OVERLAP = 10
+# Seconds a stream ticket (POST /api/notifications/stream-ticket/) stays valid
+NOTIFICATION_STREAM_TICKET_TTL = 30
+
+# Notification retention in days per type (apps/notifications/retention.py)
+# Applied by `python manage.py prune_notifications`; "default" covers unlisted types
+NOTIFICATION_RETENTION_DAYS = {
+    "default": 180,
+    "announcement": 90,
+    "attendance": 90,
+    "system": 60,
+}
+
 # Max file upload size (10MB for church documents)
 FILE_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB
 DATA_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024
 
+# Direct-to-storage attachment uploads (common/uploads.py): largest file accepted
+# and how long an upload URL/token stays valid (seconds)
+DIRECT_UPLOAD_MAX_SIZE = config("DIRECT_UPLOAD_MAX_SIZE", default=100 * 1024 * 1024, cast=int)
+DIRECT_UPLOAD_EXPIRY = config("DIRECT_UPLOAD_EXPIRY", default=3600, cast=int)
+# Presigned PUT URLs can't be revoked after finalize, so they expire quickly
+DIRECT_UPLOAD_PUT_EXPIRY = config("DIRECT_UPLOAD_PUT_EXPIRY", default=300, cast=int)
+
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
@@ -292,6 +394,23 @@ SIMPLE_JWT = {
 # Uses Brevo HTTP API for production (bypasses SMTP port blocking on Railway)
 # Falls back to Gmail SMTP for local development
 BREVO_API_KEY = config("BREVO_API_KEY", default="")
+# Brevo batching/pooling (sbcc/brevo_backend.py): recipients per API call,
+# concurrent calls per send and per-call timeout in seconds
+BREVO_BATCH_SIZE = config("BREVO_BATCH_SIZE", default=1000, cast=int)
+BREVO_MAX_WORKERS = config("BREVO_MAX_WORKERS", default=4, cast=int)
+BREVO_TIMEOUT = config("BREVO_TIMEOUT", default=10, cast=int)
+
+# Email outbox (apps/notifications/outbox.py): emails are queued in the database
+# and delivered by `python manage.py send_queued_emails`
+EMAIL_OUTBOX_WORKERS = config("EMAIL_OUTBOX_WORKERS", default=4, cast=int)
+EMAIL_OUTBOX_BATCH_SIZE = config("EMAIL_OUTBOX_BATCH_SIZE", default=100, cast=int)
+EMAIL_OUTBOX_RATE_LIMIT = config("EMAIL_OUTBOX_RATE_LIMIT", default=0, cast=float)  # per second
+EMAIL_OUTBOX_MAX_ATTEMPTS = config("EMAIL_OUTBOX_MAX_ATTEMPTS", default=6, cast=int)
+EMAIL_OUTBOX_RETRY_BASE = 60  # seconds; doubles per attempt
+EMAIL_OUTBOX_RETRY_MAX = 3600
+# Emails queued with send_now (password resets) go out right after commit: "thread" on a
+# background pool so the response time does not depend on the mail provider, "sync" inline
+EMAIL_OUTBOX_SEND_NOW_MODE = config("EMAIL_OUTBOX_SEND_NOW_MODE", default="thread")
 
 if BREVO_API_KEY:
     # Production: Use Brevo HTTP API (works on Railway, bypasses SMTP blocking)
@@ -304,6 +423,8 @@ else:
     EMAIL_USE_TLS = config("EMAIL_USE_TLS", default=True, cast=bool)
     EMAIL_HOST_USER = config("EMAIL_HOST_USER", default="")
     EMAIL_HOST_PASSWORD = config("EMAIL_HOST_PASSWORD", default="")
+    # Idle seconds before a reused SMTP connection is checked with NOOP
+    EMAIL_KEEPALIVE_INTERVAL = config("EMAIL_KEEPALIVE_INTERVAL", default=30, cast=int)
 
 DEFAULT_FROM_EMAIL = config(
     "DEFAULT_FROM_EMAIL", default="SBCC Management <no-reply@pbcm-sbcc.online>"
@@ -10,6 +10,7 @@ from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import include, path
 
+from common.uploads import DirectUploadView
 from core.views import health_check
 
 urlpatterns = [
@@ -33,6 +34,8 @@ urlpatterns = [
     path("api/", include("apps.notifications.urls")),
     # Dashboard (aggregates data from multiple apps)
     path("api/dashboard/", include("core.urls")),
+    # Upload target for direct attachment uploads when storage can't presign
+    path("api/uploads/<str:token>/", DirectUploadView.as_view(), name="direct-upload"),
     # Public APIs (no auth required)
     path("api/public/", include("sbcc.public_urls")),
 ]
@@ -0,0 +1,31 @@
+#!/bin/sh
+# Production entrypoint (Dockerfile CMD): prepare the database and static
+# files, start the background workers, then run the web server.
+#
+# Background workers (email outbox, periodic job scheduler) run in this
+# container and are restarted if they exit. Set RUN_EMAIL_WORKER=false or
+# RUN_SCHEDULER=false when they run as separate services (docker-compose).
+# Replicas can all run them: outbox rows and jobs are claimed in the database.
+set -e
+
+python manage.py migrate --noinput
+python manage.py createcachetable
+python manage.py collectstatic --noinput
+
+supervise() {
+    while true; do
+        "$@" || echo "$* exited with status $?"
+        echo "Restarting $* in 5s"
+        sleep 5
+    done
+}
+
+if [ "${RUN_EMAIL_WORKER:-true}" = "true" ]; then
+    supervise python manage.py send_queued_emails &
+fi
+if [ "${RUN_SCHEDULER:-true}" = "true" ]; then
+    supervise python manage.py run_scheduler &
+fi
+
+exec gunicorn sbcc.asgi:application -k uvicorn_worker.UvicornWorker \
+    --bind "0.0.0.0:${PORT:-8000}" --workers 2
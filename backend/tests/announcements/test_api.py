@@ -1,14 +1,15 @@
 # tests/announcements/test_api.py
-from datetime import timedelta
-from unittest.mock import patch
+from datetime import date, timedelta
 
 import pytest
 from django.urls import reverse
 from django.utils import timezone
 from rest_framework import status
 
-from apps.announcements.models import Announcement
+from apps.announcements.models import Announcement, AnnouncementDelivery
+from apps.members.models import Member
 from apps.ministries.models import Ministry
+from apps.notifications.models import OutboxEmail
 
 
 # =============================================================================
@@ -47,7 +48,28 @@ class TestAnnouncementPermissions:
         )
 
         assert response.status_code == status.HTTP_201_CREATED
-        assert Announcement.objects.filter(title="New Announcement").exists()
+        announcement = Announcement.objects.get(title="New Announcement")
+        # Not emailed unless asked for
+        assert announcement.email_on_publish is False
+
+    def test_create_announcement_with_email_on_publish(self, admin_client):
+        """Test the email opt-in is set from the API."""
+        url = reverse("announcement-list")
+        response = admin_client.post(
+            url,
+            {
+                "title": "Emailed",
+                "body": "Announcement body content.",
+                "audience": "all",
+                "publish_at": timezone.now().isoformat(),
+                "email_on_publish": True,
+            },
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data["email_on_publish"] is True
+        assert Announcement.objects.get(title="Emailed").email_on_publish
 
     def test_create_announcement_as_regular_user(self, readonly_client):
         """Test read-only users cannot create announcements."""
@@ -248,38 +270,82 @@ class TestSendNowEndpoint:
 
         assert response.status_code == status.HTTP_403_FORBIDDEN
 
-    @patch("apps.announcements.views.send_announcement_email")
-    def test_send_now_success(self, mock_send, admin_client, announcement):
-        """Test successful send_now call."""
-        mock_send.return_value = {
-            "success": True,
-            "message": "Announcement sent successfully",
-            "sent": 5,
-            "total": 5,
-        }
+    def test_send_now_success(self, admin_client, announcement, django_capture_on_commit_callbacks):
+        """Test send_now starts a background delivery and returns 202."""
+        for i in range(3):
+            Member.objects.create(
+                first_name="Member",
+                last_name=str(i),
+                email=f"send_now{i}@example.com",
+                phone=f"555000{i}",
+                date_of_birth=date(1990, 1, 1),
+                is_active=True,
+            )
 
         url = reverse("announcement-send-now", kwargs={"pk": announcement.pk})
+        with django_capture_on_commit_callbacks(execute=True):
+            response = admin_client.post(url)
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert response.data["recipients"] == 3
+        assert response.data["new_recipients"] == 3
+        assert response.data["delivery"]["status"] == "pending"
+
+        response = admin_client.get(
+            reverse("announcement-delivery", kwargs={"pk": announcement.pk})
+        )
+        assert response.data["status"] == "done"
+        assert response.data["queued"] == 3
+        assert OutboxEmail.objects.filter(kind="announcement").count() == 3
+        announcement.refresh_from_db()
+        assert announcement.sent is True
+
+    def test_send_now_again_reports_new_recipients(
+        self, admin_client, announcement, django_capture_on_commit_callbacks
+    ):
+        """Test re-sending says who it reaches instead of silently sending to fewer."""
+
+        def add_member(i):
+            Member.objects.create(
+                first_name="Member",
+                last_name=str(i),
+                email=f"resend{i}@example.com",
+                phone=f"555100{i}",
+                date_of_birth=date(1990, 1, 1),
+                is_active=True,
+            )
+
+        for i in range(2):
+            add_member(i)
+        url = reverse("announcement-send-now", kwargs={"pk": announcement.pk})
+        with django_capture_on_commit_callbacks(execute=True):
+            admin_client.post(url)
+
         response = admin_client.post(url)
 
         assert response.status_code == status.HTTP_200_OK
-        assert response.data["sent"] == 5
-        mock_send.assert_called_once_with(announcement)
-
-    @patch("apps.announcements.views.send_announcement_email")
-    def test_send_now_failure(self, mock_send, admin_client, announcement):
-        """Test send_now handles failure."""
-        mock_send.return_value = {
-            "success": False,
-            "message": "SMTP error",
-            "sent": 0,
-            "total": 5,
-        }
-
+        assert response.data["recipients"] == 2
+        assert response.data["already_queued"] == 2
+        assert response.data["new_recipients"] == 0
+
+        add_member(2)
+        with django_capture_on_commit_callbacks(execute=True):
+            response = admin_client.post(url)
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert response.data["already_queued"] == 2
+        assert response.data["new_recipients"] == 1
+        assert "1 new recipients" in response.data["message"]
+        assert OutboxEmail.objects.filter(kind="announcement").count() == 3
+
+    def test_send_now_no_recipients(self, admin_client, announcement):
+        """Test send_now rejects an announcement nobody would receive."""
         url = reverse("announcement-send-now", kwargs={"pk": announcement.pk})
         response = admin_client.post(url)
 
-        assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
         assert "error" in response.data
+        assert not AnnouncementDelivery.objects.exists()
 
 
 # =============================================================================
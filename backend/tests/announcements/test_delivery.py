@@ -0,0 +1,232 @@
+"""
+Tests for resumable announcement delivery jobs (apps/announcements/services.py).
+"""
+
+from datetime import date, timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from apps.announcements.models import Announcement, AnnouncementDelivery, DeliveryRecipient
+from apps.announcements.services import (
+    delivery_progress,
+    dispatch_due_announcements,
+    resume_deliveries,
+    run_delivery,
+    start_delivery,
+)
+from apps.members.models import Member
+from apps.notifications.models import Notification, OutboxEmail
+from apps.notifications.outbox import process_outbox
+
+
+def make_members(count, domain="example.com", start=0):
+    for i in range(start, start + count):
+        Member.objects.create(
+            first_name="Member",
+            last_name=str(i),
+            email=f"m{i:03d}@{domain}",
+            phone=f"555{i:07d}",
+            date_of_birth=date(1990, 1, 1),
+            is_active=True,
+        )
+
+
+@pytest.fixture
+def delivery(announcement, settings):
+    settings.ANNOUNCEMENT_DELIVERY_MODE = "off"
+    delivery, _ = start_delivery(announcement)
+    return delivery
+
+
+@pytest.mark.django_db
+class TestRunDelivery:
+    """Tests for resolving and queueing recipients."""
+
+    def test_queues_every_recipient_in_chunks(self, announcement, delivery):
+        make_members(7)
+
+        result = run_delivery(delivery.pk, chunk_size=3)
+
+        assert result.status == AnnouncementDelivery.STATUS_DONE
+        assert result.resolved is True
+        assert delivery.recipients.count() == 7
+        assert not delivery.recipients.filter(queued_at__isnull=True).exists()
+        assert OutboxEmail.objects.filter(kind="announcement").count() == 7
+        announcement.refresh_from_db()
+        assert announcement.sent is True
+
+    def test_resume_after_crash_does_not_duplicate(self, delivery):
+        make_members(6)
+        # Simulate a runner that died while resolving: the first three
+        # recipients are resolved and queued, the rest were never reached
+        run_delivery(delivery.pk, chunk_size=100)
+        recipients = list(delivery.recipients.order_by("email"))
+        OutboxEmail.objects.filter(id__in=[r.outbox_email_id for r in recipients[3:]]).delete()
+        DeliveryRecipient.objects.filter(id__in=[r.id for r in recipients[3:]]).delete()
+        AnnouncementDelivery.objects.filter(pk=delivery.pk).update(
+            status=AnnouncementDelivery.STATUS_RUNNING,
+            resolved=False,
+            resolved_through=recipients[2].email,
+            heartbeat_at=timezone.now() - timedelta(hours=1),
+        )
+        make_members(2, start=6)
+
+        resumed = resume_deliveries()
+
+        assert [d.pk for d in resumed] == [delivery.pk]
+        emails = list(OutboxEmail.objects.values_list("to", flat=True))
+        assert len(emails) == 8
+        assert len({tuple(to) for to in emails}) == 8
+
+    def test_live_runner_keeps_lease(self, delivery):
+        AnnouncementDelivery.objects.filter(pk=delivery.pk).update(
+            status=AnnouncementDelivery.STATUS_RUNNING, heartbeat_at=timezone.now()
+        )
+
+        assert run_delivery(delivery.pk) is None
+        assert resume_deliveries() == []
+
+    def test_resend_only_queues_new_members(self, announcement, delivery):
+        make_members(2)
+        run_delivery(delivery.pk)
+        make_members(1, start=2)
+
+        start_delivery(announcement)
+        run_delivery(delivery.pk)
+
+        assert OutboxEmail.objects.count() == 3
+
+    def test_command_resumes_pending_jobs(self, delivery):
+        make_members(2)
+        out = StringIO()
+
+        call_command("deliver_announcements", "--once", stdout=out)
+
+        assert "Done: 1 deliveries processed" in out.getvalue()
+        delivery.refresh_from_db()
+        assert delivery.status == AnnouncementDelivery.STATUS_DONE
+
+
+@pytest.mark.django_db
+class TestDeliveryProgress:
+    """Tests for progress reporting and retrying failed recipients."""
+
+    def test_progress_reports_failures(self, delivery, settings):
+        settings.EMAIL_BACKEND = "tests.notifications.test_outbox.FlakyBackend"
+        settings.EMAIL_OUTBOX_MAX_ATTEMPTS = 1
+        make_members(3)
+        make_members(1, domain="bounce.example.com", start=3)
+        run_delivery(delivery.pk)
+
+        process_outbox(workers=1)
+        progress = delivery_progress(delivery)
+
+        assert progress["total"] == 4
+        assert progress["queued"] == 4
+        assert progress["sent"] == 3
+        assert progress["failed"] == 1
+        assert progress["in_queue"] == 0
+        assert progress["failures"][0]["email"] == "m003@bounce.example.com"
+        assert "550" in progress["failures"][0]["error"]
+
+    def test_delivery_endpoint(self, admin_client, announcement, delivery):
+        make_members(2)
+        url = reverse("announcement-delivery", kwargs={"pk": announcement.pk})
+
+        assert admin_client.get(url).data["pending"] == 0
+        run_delivery(delivery.pk)
+        response = admin_client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["status"] == "done"
+        assert response.data["in_queue"] == 2
+
+    def test_delivery_endpoint_not_sent(self, admin_client, announcement):
+        url = reverse("announcement-delivery", kwargs={"pk": announcement.pk})
+
+        assert admin_client.get(url).status_code == status.HTTP_404_NOT_FOUND
+
+    def test_retry_requeues_dead_emails(self, admin_client, announcement, delivery, settings):
+        settings.EMAIL_BACKEND = "tests.notifications.test_outbox.FlakyBackend"
+        settings.EMAIL_OUTBOX_MAX_ATTEMPTS = 1
+        make_members(1, domain="bounce.example.com")
+        run_delivery(delivery.pk)
+        process_outbox(workers=1)
+
+        url = reverse("announcement-retry-delivery", kwargs={"pk": announcement.pk})
+        response = admin_client.post(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["requeued"] == 1
+        assert OutboxEmail.objects.get().status == OutboxEmail.STATUS_PENDING
+
+
+@pytest.mark.django_db
+class TestScheduledDispatch:
+    """Tests for emailing scheduled announcements when they come due."""
+
+    def schedule(self, publish_in, **kwargs):
+        kwargs.setdefault("email_on_publish", True)
+        return Announcement.objects.create(
+            title="Scheduled",
+            body="Body",
+            publish_at=timezone.now() + publish_in,
+            **kwargs,
+        )
+
+    def test_dispatches_due_announcements_once(self):
+        due = self.schedule(timedelta(minutes=-1))
+        self.schedule(timedelta(minutes=5))
+
+        result = dispatch_due_announcements()
+
+        assert result["dispatched"] == 1
+        assert 55 <= result["max_lag_seconds"] < 120
+        delivery = AnnouncementDelivery.objects.get()
+        assert delivery.announcement == due
+        assert delivery.scheduled is True
+        assert Notification.objects.filter(type="announcement").count() == 1
+        assert dispatch_due_announcements()["dispatched"] == 0
+
+    def test_skips_stale_expired_inactive_sent_and_opted_out(self):
+        self.schedule(timedelta(days=-3))
+        self.schedule(timedelta(minutes=-5), expire_at=timezone.now() - timedelta(minutes=1))
+        self.schedule(timedelta(minutes=-5), is_active=False)
+        self.schedule(timedelta(minutes=-5), sent=True)
+        self.schedule(timedelta(minutes=-5), email_on_publish=False)
+
+        assert dispatch_due_announcements()["dispatched"] == 0
+
+    def test_dispatches_in_batches(self):
+        for _ in range(5):
+            self.schedule(timedelta(minutes=-1))
+
+        assert dispatch_due_announcements(batch_size=2)["dispatched"] == 5
+        assert AnnouncementDelivery.objects.count() == 5
+
+    def test_send_now_announcement_not_dispatched_again(self, announcement, delivery):
+        announcement.publish_at = timezone.now() - timedelta(minutes=1)
+        announcement.email_on_publish = True
+        announcement.save()
+
+        assert dispatch_due_announcements()["dispatched"] == 0
+
+    def test_command_emails_due_announcement_with_latency(self):
+        make_members(2)
+        announcement = self.schedule(timedelta(seconds=-2))
+        out = StringIO()
+
+        call_command("deliver_announcements", "--once", stdout=out)
+        process_outbox(workers=1)
+
+        assert "Dispatched 1 scheduled announcement(s)" in out.getvalue()
+        announcement.refresh_from_db()
+        assert announcement.sent is True
+        progress = delivery_progress(announcement.delivery)
+        assert progress["sent"] == 2
+        assert 0 < progress["latency_seconds"] < 60
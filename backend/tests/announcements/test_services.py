@@ -1,10 +1,11 @@
 from datetime import date
-from unittest.mock import patch
 
 import pytest
 
+from apps.announcements.models import AnnouncementDelivery
 from apps.members.models import Member
 from apps.ministries.models import MinistryMember
+from apps.notifications.models import OutboxEmail
 
 
 @pytest.mark.django_db
@@ -73,10 +74,9 @@ class TestAnnouncementServices:
         assert None not in recipients
         assert "" not in recipients
 
-    @patch("apps.announcements.services.send_mass_mail")
-    def test_send_announcement_email_marks_as_sent(self, mock_mail, announcement):
-        """Test that send_announcement_email marks announcement as sent."""
-        from apps.announcements.services import send_announcement_email
+    def test_delivery_marks_as_sent(self, announcement, django_capture_on_commit_callbacks):
+        """Test that a finished delivery job marks the announcement as sent."""
+        from apps.announcements.services import delivery_progress, start_delivery
 
         # Create member with email (no User needed)
         Member.objects.create(
@@ -88,19 +88,22 @@ class TestAnnouncementServices:
             is_active=True,
         )
 
-        mock_mail.return_value = 1
+        with django_capture_on_commit_callbacks(execute=True):
+            delivery, created = start_delivery(announcement)
 
-        result = send_announcement_email(announcement)
-
-        assert result["success"] is True
+        assert created is True
+        delivery.refresh_from_db()
+        assert delivery.status == AnnouncementDelivery.STATUS_DONE
         announcement.refresh_from_db()
         assert announcement.sent is True
+        queued = OutboxEmail.objects.filter(kind="announcement")
+        assert queued.count() == delivery_progress(delivery)["queued"]
+        assert ["testmember_send@example.com"] in [e.to for e in queued]
 
-    def test_send_announcement_email_no_recipients(self, announcement):
-        """Test send_announcement_email with no recipients."""
-        from apps.announcements.services import send_announcement_email
+    def test_recipient_counts_no_recipients(self, announcement):
+        """Test recipient_counts reports an audience nobody would receive."""
+        from apps.announcements.services import recipient_counts
 
-        result = send_announcement_email(announcement)
+        counts = recipient_counts(announcement)
 
-        assert result["success"] is False
-        assert result["message"] == "No recipients found"
+        assert counts == {"recipients": 0, "already_queued": 0, "new_recipients": 0}
@@ -0,0 +1,251 @@
+"""
+Tests for QR code check-in (apps/attendance/checkin.py).
+"""
+
+import time
+from datetime import timedelta
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from apps.attendance import checkin
+from apps.attendance.models import Attendance, AttendanceSheet
+from apps.attendance.services import get_absence_report
+from apps.events.models import Event, EventRegistration
+from apps.members.models import Member
+from apps.visitors.models import Visitor, VisitorAttendance
+
+
+@pytest.fixture
+def members(db, ministry):
+    return Member.objects.bulk_create(
+        Member(first_name="Scan", last_name=str(i), email=f"scan{i}@example.com", ministry=ministry)
+        for i in range(50)
+    )
+
+
+@pytest.fixture
+def fellowship(admin_user):
+    return Event.objects.create(
+        title="Fellowship Night",
+        event_type="fellowship",
+        status="published",
+        date=timezone.now(),
+        organizer=admin_user,
+    )
+
+
+@pytest.fixture
+def visitor(db):
+    return Visitor.objects.create(full_name="First Timer")
+
+
+class TestTokens:
+    """Tests for signing and verifying tokens."""
+
+    def test_round_trip(self):
+        token = checkin.make_token(checkin.ATTENDANCE, 47, 28)
+
+        assert token.startswith("a2f.1c.")
+        assert checkin.read_token(token) == (checkin.ATTENDANCE, 47, 28)
+
+    @pytest.mark.parametrize(
+        "token",
+        ["", "garbage", "a2f.1c.ffffffff", "x2f.1c.ffffffff.AAAA"],
+    )
+    def test_malformed(self, token):
+        with pytest.raises(ValueError, match=checkin.INVALID):
+            checkin.read_token(token)
+
+    def test_tampered(self):
+        token = checkin.make_token(checkin.REGISTRATION, 5, 9)
+
+        with pytest.raises(ValueError, match=checkin.INVALID):
+            checkin.read_token("r6" + token[2:])
+
+    def test_expired(self):
+        token = checkin.make_token(
+            checkin.VISITOR, 3, expires=timezone.now() - timedelta(seconds=1)
+        )
+
+        with pytest.raises(ValueError, match=checkin.EXPIRED):
+            checkin.read_token(token)
+
+    def test_signed_with_secret_key(self, settings):
+        token = checkin.make_token(checkin.ATTENDANCE, 1, 1)
+        settings.SECRET_KEY = "another-secret-key-for-this-test-only-0123456789"
+
+        with pytest.raises(ValueError, match=checkin.INVALID):
+            checkin.read_token(token)
+
+    def test_verification_is_fast(self):
+        tokens = [checkin.make_token(checkin.ATTENDANCE, i, 1) for i in range(1000)]
+
+        started = time.perf_counter()
+        for token in tokens:
+            checkin.read_token(token)
+
+        assert (time.perf_counter() - started) / len(tokens) < 0.001
+
+
+@pytest.mark.django_db
+class TestScan:
+    """Tests for recording scanned tokens."""
+
+    def test_service_attendance_in_bulk(
+        self, attendance_event, members, django_assert_max_num_queries
+    ):
+        tokens = [
+            checkin.make_token(checkin.ATTENDANCE, m.pk, attendance_event.pk) for m in members
+        ]
+
+        with django_assert_max_num_queries(10):
+            report = checkin.scan_tokens(tokens)
+
+        assert report["counts"] == {checkin.CHECKED_IN: 50}
+        sheet = AttendanceSheet.objects.get(event=attendance_event)
+        assert sheet.date == timezone.localdate()
+        assert Attendance.objects.filter(sheet=sheet, attended=True).count() == 50
+        member = Member.objects.get(pk=members[0].pk)
+        assert member.last_attended == timezone.localdate()
+
+    def test_marks_existing_absent_record(self, attendance_record):
+        token = checkin.make_token(
+            checkin.ATTENDANCE, attendance_record.member_id, attendance_record.sheet.event_id
+        )
+
+        first = checkin.scan_tokens([token])
+        again = checkin.scan_tokens([token])
+
+        attendance_record.refresh_from_db()
+        assert attendance_record.attended
+        assert attendance_record.check_in_time is not None
+        assert first["results"][0]["status"] == checkin.CHECKED_IN
+        assert again["results"][0]["status"] == checkin.ALREADY_CHECKED_IN
+
+    def test_event_registrations(self, fellowship, attendance_member, second_attendance_member):
+        EventRegistration.objects.create(event=fellowship, member=attendance_member)
+        tokens = [
+            checkin.make_token(checkin.REGISTRATION, attendance_member.pk, fellowship.pk),
+            checkin.make_token(checkin.REGISTRATION, second_attendance_member.pk, fellowship.pk),
+        ]
+
+        report = checkin.scan_tokens(tokens)
+
+        assert [r["status"] for r in report["results"]] == [
+            checkin.CHECKED_IN,
+            checkin.NOT_REGISTERED,
+        ]
+        assert EventRegistration.objects.get(member=attendance_member).attended
+
+    def test_visitors(self, visitor, admin_user):
+        token = checkin.make_token(checkin.VISITOR, visitor.pk)
+
+        report = checkin.scan_tokens([token, token], user=admin_user)
+
+        assert report["counts"] == {checkin.CHECKED_IN: 2}
+        attendance = VisitorAttendance.objects.get(visitor=visitor)
+        assert attendance.added_by == admin_user
+        visitor.refresh_from_db()
+        assert visitor.follow_up_status == "visited_1x"
+        assert checkin.scan_tokens([token])["counts"] == {checkin.ALREADY_CHECKED_IN: 1}
+
+    def test_refreshes_cached_absence_report(
+        self,
+        attendance_event,
+        attendance_member,
+        attendance_sheet_factory,
+        django_capture_on_commit_callbacks,
+    ):
+        for days_offset in (-1, -2, -3):
+            sheet = attendance_sheet_factory(days_offset=days_offset)
+            Attendance.objects.create(sheet=sheet, member=attendance_member, attended=False)
+        assert get_absence_report()[0]["total_events"] == 3
+
+        token = checkin.make_token(checkin.ATTENDANCE, attendance_member.pk, attendance_event.pk)
+        with django_capture_on_commit_callbacks(execute=True):
+            checkin.scan_tokens([token])
+
+        report = get_absence_report()[0]
+        assert report["total_events"] == 4
+        assert report["last_attended"] == timezone.localdate().isoformat()
+
+    def test_mixed_batch_keeps_order(self, attendance_event, attendance_member):
+        expired = timezone.now() - timedelta(minutes=1)
+        tokens = [
+            "not-a-token",
+            checkin.make_token(checkin.ATTENDANCE, attendance_member.pk, attendance_event.pk),
+            checkin.make_token(checkin.ATTENDANCE, 99999, attendance_event.pk),
+            checkin.make_token(checkin.ATTENDANCE, attendance_member.pk, 99999),
+            checkin.make_token(checkin.ATTENDANCE, attendance_member.pk, 1, expires=expired),
+        ]
+
+        report = checkin.scan_tokens(tokens)
+
+        assert [r["status"] for r in report["results"]] == [
+            checkin.INVALID,
+            checkin.CHECKED_IN,
+            checkin.NOT_FOUND,
+            checkin.NOT_FOUND,
+            checkin.EXPIRED,
+        ]
+
+
+@pytest.mark.django_db
+class TestCheckInAPI:
+    """Tests for /api/attendance/checkin/"""
+
+    def test_issue_and_scan(self, admin_client, attendance_event, attendance_member):
+        response = admin_client.get(
+            reverse("checkin-tokens"),
+            {"event": attendance_event.pk, "members": attendance_member.pk},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["kind"] == "attendance"
+        assert response.data["expires_at"] > attendance_event.end_date
+        token = response.data["tokens"][0]["token"]
+
+        response = admin_client.post(reverse("checkin-scan"), {"tokens": [token]}, format="json")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["results"][0]["status"] == checkin.CHECKED_IN
+        assert response.data["results"][0]["id"] == attendance_member.pk
+
+    def test_registration_tokens_default_to_registered_members(
+        self, admin_client, fellowship, attendance_member, second_attendance_member
+    ):
+        EventRegistration.objects.create(event=fellowship, member=attendance_member)
+
+        response = admin_client.get(reverse("checkin-tokens"), {"event": fellowship.pk})
+
+        assert response.data["kind"] == "registration"
+        assert [item["member"] for item in response.data["tokens"]] == [attendance_member.pk]
+
+    def test_visitor_tokens(self, admin_client, visitor):
+        response = admin_client.get(reverse("checkin-tokens"), {"visitors": str(visitor.pk)})
+
+        token = response.data["tokens"][0]["token"]
+        assert checkin.read_token(token) == (checkin.VISITOR, visitor.pk, 0)
+
+    def test_rejects_bad_input(self, admin_client):
+        assert (
+            admin_client.get(reverse("checkin-tokens")).status_code == status.HTTP_400_BAD_REQUEST
+        )
+        assert (
+            admin_client.get(reverse("checkin-tokens"), {"event": 99999}).status_code
+            == status.HTTP_404_NOT_FOUND
+        )
+        response = admin_client.post(reverse("checkin-scan"), {"tokens": "abc"}, format="json")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_requires_admin_or_pastor(self, api_client, create_user, attendance_event):
+        url = reverse("checkin-scan")
+        assert api_client.post(url, {"tokens": []}, format="json").status_code == 401
+
+        api_client.force_authenticate(create_user(username="leader", role="ministry_leader"))
+        response = api_client.post(url, {"tokens": []}, format="json")
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
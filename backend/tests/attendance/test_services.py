@@ -11,8 +11,51 @@ from django.core import mail
 from django.utils import timezone
 
 from apps.attendance.models import Attendance, AttendanceSheet
-from apps.attendance.services import notify_inactive_members, send_pastoral_care_email
+from apps.attendance.services import (
+    get_absence_report,
+    notify_inactive_members,
+    refresh_absence_report,
+    send_pastoral_care_email,
+)
 from apps.members.models import Member
+from apps.notifications.outbox import process_outbox
+
+
+# =============================================================================
+# Absence Report Cache Tests
+# =============================================================================
+@pytest.mark.django_db
+class TestAbsenceReport:
+    """Tests for the cached frequent-absence report."""
+
+    def test_report_served_from_cache(self, attendance_member, attendance_sheet_factory):
+        for i in range(3):
+            Attendance.objects.create(
+                sheet=attendance_sheet_factory(days_offset=-i * 7),
+                member=attendance_member,
+                attended=False,
+            )
+
+        assert refresh_absence_report() == 1
+        with patch("apps.attendance.services.check_frequent_absences") as mock_check:
+            report = get_absence_report()
+
+        mock_check.assert_not_called()
+        assert report[0]["member_id"] == attendance_member.id
+
+    def test_attendance_change_drops_cached_report(
+        self, attendance_member, attendance_sheet_factory
+    ):
+        assert get_absence_report() == []
+
+        for i in range(3):
+            Attendance.objects.create(
+                sheet=attendance_sheet_factory(days_offset=-i * 7),
+                member=attendance_member,
+                attended=False,
+            )
+
+        assert len(get_absence_report()) == 1
 
 
 # =============================================================================
@@ -25,6 +68,7 @@ class TestPastoralCareEmail:
     def test_send_pastoral_care_email_success(self, attendance_member):
         """Test sending a pastoral care email to a member with email."""
         result = send_pastoral_care_email(attendance_member)
+        process_outbox()
 
         assert result is True
         assert len(mail.outbox) == 1
@@ -46,14 +90,15 @@ class TestPastoralCareEmail:
         """Test sending email with custom church name."""
         custom_name = "Test Church of God"
         send_pastoral_care_email(attendance_member, church_name=custom_name)
+        process_outbox()
 
         assert custom_name in mail.outbox[0].subject
         assert custom_name in mail.outbox[0].body
 
-    @patch("apps.attendance.services.send_mail")
-    def test_send_pastoral_care_email_handles_failure(self, mock_send_mail, attendance_member):
+    @patch("apps.attendance.services.queue_email")
+    def test_send_pastoral_care_email_handles_failure(self, mock_queue_email, attendance_member):
         """Test that email failure returns False."""
-        mock_send_mail.side_effect = Exception("SMTP Error")
+        mock_queue_email.side_effect = Exception("SMTP Error")
 
         result = send_pastoral_care_email(attendance_member)
 
@@ -132,6 +177,7 @@ class TestNotifyInactiveMembers:
     def test_notify_inactive_members_sends_emails(self, member_with_absences):
         """Test that emails are sent when dry_run is False."""
         results = notify_inactive_members(threshold=3, days=60, dry_run=False)
+        process_outbox()
 
         assert results["dry_run"] is False
         assert results["emails_sent"] >= 1
@@ -15,19 +15,32 @@ TEST_PASSWORD = "TestPass123!"
 class TestForgotPasswordAPI:
     """Tests for forgot password endpoint."""
 
-    @patch("apps.authentication.serializers.send_mail")
-    def test_forgot_password_sends_email(self, mock_send_mail, api_client, admin_user):
+    @patch("apps.authentication.serializers.queue_email")
+    def test_forgot_password_sends_email(self, mock_queue_email, api_client, admin_user):
         """Test forgot password sends email for existing user."""
         url = reverse("authentication:forgot-password")
         response = api_client.post(url, {"email": admin_user.email})
 
         assert response.status_code == 200
         assert "password reset link has been sent" in response.data["message"].lower()
-        mock_send_mail.assert_called_once()
+        mock_queue_email.assert_called_once()
 
         # Verify token was created
         assert PasswordResetToken.objects.filter(user=admin_user).exists()
 
+    def test_forgot_password_email_sent_after_commit(
+        self, api_client, admin_user, django_capture_on_commit_callbacks
+    ):
+        """Test the reset email goes out right away, without waiting for the worker."""
+        from django.core import mail
+
+        url = reverse("authentication:forgot-password")
+        with django_capture_on_commit_callbacks(execute=True):
+            api_client.post(url, {"email": admin_user.email})
+
+        assert len(mail.outbox) == 1
+        assert mail.outbox[0].to == [admin_user.email]
+
     def test_forgot_password_nonexistent_email(self, api_client):
         """Test forgot password with non-existent email still returns success (security)."""
         url = reverse("authentication:forgot-password")
@@ -2,10 +2,13 @@ import os
 
 import pytest
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.db import connections
 from rest_framework.test import APIClient
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from core.homepage import cancel_homepage_publish
+
 # Import all shared fixtures
 pytest_plugins = [
     "tests.fixtures.users",
@@ -34,6 +37,46 @@ def close_db_connections():
         conn.close()
 
 
+@pytest.fixture(autouse=True)
+def isolated_cache(settings):
+    """Use a fresh in-memory cache per test so cached responses never leak between tests."""
+    settings.CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "sbcc-tests",
+        }
+    }
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def sync_image_derivatives(settings):
+    """Generate image derivatives inline (after commit) instead of on a thread pool."""
+    settings.IMAGE_DERIVATIVES_MODE = "sync"
+
+
+@pytest.fixture(autouse=True)
+def sync_announcement_delivery(settings):
+    """Run announcement delivery jobs inline (after commit) instead of on a thread."""
+    settings.ANNOUNCEMENT_DELIVERY_MODE = "sync"
+
+
+@pytest.fixture(autouse=True)
+def sync_outbox_send_now(settings):
+    """Send send_now emails inline (after commit) instead of on a thread."""
+    settings.EMAIL_OUTBOX_SEND_NOW_MODE = "sync"
+
+
+@pytest.fixture(autouse=True)
+def deferred_homepage_publish(settings):
+    """Keep background homepage publishes from firing (tests flush them explicitly)."""
+    settings.HOMEPAGE_BUNDLE_PUBLISH_DELAY = 3600
+    yield
+    cancel_homepage_publish()
+
+
 @pytest.fixture(autouse=True)
 def relax_throttling(settings):
     """Relax throttling limits in tests to avoid rate-limit flakiness."""
@@ -6,6 +6,8 @@ Covers CRUD operations, registration actions, filtering, and integration tests.
 from datetime import timedelta
 
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 from rest_framework import status
@@ -131,10 +133,10 @@ class TestEventRegistration:
         assert response.status_code == status.HTTP_400_BAD_REQUEST
         assert "Already registered" in response.data["detail"]
 
-    def test_register_full_event_fails(
+    def test_register_full_event_waitlists(
         self, auth_client, full_event, member_for_event, second_member
     ):
-        """Test that registration for full event fails."""
+        """Test that registration for a full event joins the waitlist."""
         # Fill the event (max_attendees=2)
         EventRegistration.objects.create(event=full_event, member=member_for_event)
         EventRegistration.objects.create(event=full_event, member=second_member)
@@ -147,11 +149,19 @@ class TestEventRegistration:
         )
 
         url = reverse("event-register", kwargs={"pk": full_event.pk})
-        response = auth_client.post(url, {"member_id": third_member.id}, format="json")
+        response = auth_client.post(
+            url, {"member_id": third_member.id, "waitlist": False}, format="json"
+        )
 
         assert response.status_code == status.HTTP_400_BAD_REQUEST
         assert "full" in response.data["detail"].lower()
 
+        response = auth_client.post(url, {"member_id": third_member.id}, format="json")
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert response.data["position"] == 1
+        assert not EventRegistration.objects.filter(event=full_event, member=third_member).exists()
+
     def test_unregister_member(self, auth_client, event, event_registration):
         """Test unregistering a member from an event."""
         url = reverse("event-unregister", kwargs={"pk": event.pk})
@@ -221,6 +231,23 @@ class TestEventFiltersAndSearch:
         titles = [e["title"] for e in response.data["results"]]
         assert "Sunday Service" in titles
 
+    def test_list_query_count_is_constant(self, admin_client, event_factory, member_for_event):
+        """Test that listing events doesn't query per event."""
+        url = reverse("event-list")
+
+        def count_queries():
+            with CaptureQueriesContext(connection) as queries:
+                assert admin_client.get(url, {"page_size": 50}).status_code == 200
+            return len(queries)
+
+        event_factory(max_attendees=5)
+        few = count_queries()
+        for i in range(10):
+            event = event_factory(title=f"Event {i}", max_attendees=5)
+            EventRegistration.objects.create(event=event, member=member_for_event)
+
+        assert count_queries() == few
+
     def test_ordering(self, admin_client, event, past_event):
         """Test ordering events."""
         url = reverse("event-list")
@@ -245,7 +272,7 @@ class TestEventIntegration:
     """Integration tests for complete workflows."""
 
     def test_complete_event_workflow(self, admin_client, admin_user, ministry):
-        """Test complete event lifecycle: create, register, check capacity."""
+        """Test complete event lifecycle: create, register, check capacity, waitlist."""
         # 1. Create event with limited capacity
         date = timezone.now() + timedelta(days=7)
         response = admin_client.post(
@@ -280,17 +307,18 @@ class TestEventIntegration:
         assert event.is_full
         assert event.registered_count == 2
 
-        # 4. Third registration should fail
+        # 4. Third registration goes to the waitlist
         response = admin_client.post(url, {"member_id": member3.id}, format="json")
-        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.status_code == status.HTTP_202_ACCEPTED
 
         # 5. Unregister one member
         unregister_url = reverse("event-unregister", kwargs={"pk": event_id})
-        admin_client.delete(unregister_url, QUERY_STRING=f"member_id={member1.id}")
+        response = admin_client.delete(unregister_url, QUERY_STRING=f"member_id={member1.id}")
 
-        # 6. Now third can register
+        # 6. Third is promoted from the waitlist
+        assert [r["member"] for r in response.data["promoted"]] == [member3.id]
         response = admin_client.post(url, {"member_id": member3.id}, format="json")
-        assert response.status_code == status.HTTP_201_CREATED
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
 
         # 7. Verify registrations
         registrations_url = reverse("event-registrations", kwargs={"pk": event_id})
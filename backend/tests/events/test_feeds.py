@@ -0,0 +1,116 @@
+"""
+Tests for the iCalendar event feeds (apps/events/feeds.py).
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from apps.events.recurrence import materialize_occurrence
+from common import ical
+
+
+def local(*args):
+    return timezone.make_aware(datetime(*args))
+
+
+@pytest.mark.django_db
+class TestEventsFeed:
+    """Tests for GET /api/public/calendar/events.ics"""
+
+    def test_published_events(self, api_client, event, draft_event, past_event):
+        response = api_client.get(reverse("public-events-feed"))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Type"].startswith("text/calendar")
+        body = response.content.decode()
+        assert body.startswith("BEGIN:VCALENDAR\r\n")
+        assert body.count("BEGIN:VEVENT") == 2
+        assert f"UID:{ical.uid('event', event.pk)}" in body
+        assert f"UID:{ical.uid('event', draft_event.pk)}" not in body
+
+    def test_recurring_event_and_override(self, api_client, event_factory):
+        start = timezone.now().replace(microsecond=0) + timedelta(days=1)
+        parent = event_factory(
+            title="Sunday Service",
+            date=start,
+            recurrence_pattern="weekly",
+            recurrence_end_date=(start + timedelta(weeks=8)).date(),
+        )
+        occurrence, _ = materialize_occurrence(parent, start + timedelta(weeks=1))
+        occurrence.status = "cancelled"
+        occurrence.save()
+
+        body = api_client.get(reverse("public-events-feed")).content.decode()
+
+        assert body.count("BEGIN:VEVENT") == 2
+        assert "RRULE:FREQ=WEEKLY;UNTIL=" in body
+        assert body.count(f"UID:{ical.uid('event', parent.pk)}") == 2
+        assert "RECURRENCE-ID;TZID=" in body
+        assert "STATUS:CANCELLED" in body
+
+    def test_ministry_feed(self, api_client, event, event_factory, ministry):
+        event_factory(title="Other", ministry=None)
+
+        response = api_client.get(
+            reverse("public-ministry-events-feed", kwargs={"ministry_id": ministry.pk})
+        )
+
+        assert response.content.decode().count("BEGIN:VEVENT") == 1
+        missing = api_client.get(
+            reverse("public-ministry-events-feed", kwargs={"ministry_id": 99999})
+        )
+        assert missing.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_unchanged_feed_served_without_queries(
+        self, api_client, event, django_assert_num_queries
+    ):
+        url = reverse("public-events-feed")
+        etag = api_client.get(url)["ETag"]
+
+        with django_assert_num_queries(0):
+            response = api_client.get(url)
+            not_modified = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert not_modified.status_code == status.HTTP_304_NOT_MODIFIED
+        assert "max-age=900" in response["Cache-Control"]
+
+    def test_change_rebuilds_feed_incrementally(self, api_client, event, event_factory):
+        other = event_factory(title="Youth Night")
+        url = reverse("public-events-feed")
+        etag = api_client.get(url)["ETag"]
+
+        rendered = []
+        original = ical.vevent
+
+        def counting_vevent(*args, **kwargs):
+            rendered.append(kwargs["summary"])
+            return original(*args, **kwargs)
+
+        event.title = "Renamed Service"
+        event.save()
+        with pytest.MonkeyPatch.context() as patch:
+            patch.setattr(ical, "vevent", counting_vevent)
+            response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert "SUMMARY:Renamed Service" in response.content.decode()
+        assert rendered == ["Renamed Service"]
+        assert other.title in response.content.decode()
+
+
+class TestICalFormatting:
+    """Tests for iCalendar text helpers."""
+
+    def test_escape_and_fold(self):
+        line = "DESCRIPTION:" + ical.escape("Bring food; chairs, and\nsmiles " + "é" * 60)
+
+        folded = ical.fold(line)
+
+        assert "\\;" in folded and "\\," in folded and "\\n" in folded
+        assert all(len(part.encode()) <= 75 for part in folded.split("\r\n"))
+        assert folded.replace("\r\n ", "") == line
@@ -0,0 +1,320 @@
+"""
+Tests for lazily expanded recurring events (apps/events/recurrence.py).
+"""
+
+from datetime import datetime, timedelta
+from importlib import import_module
+from io import StringIO
+
+import pytest
+from django.apps import apps
+from django.core.management import call_command
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Q
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from apps.events.models import Event, EventRegistration
+from apps.events.recurrence import expand_events, materialize_occurrence, occurrence_starts
+
+
+def local(*args):
+    return timezone.make_aware(datetime(*args))
+
+
+@pytest.fixture
+def sunday_service(event_factory):
+    """Weekly service starting Sunday 2026-03-01 09:00."""
+    start = local(2026, 3, 1, 9, 0)
+    return event_factory(
+        title="Sunday Service",
+        date=start,
+        end_date=start + timedelta(hours=2),
+        recurrence_pattern="weekly",
+    )
+
+
+@pytest.mark.django_db
+class TestOccurrenceStarts:
+    """Tests for expanding rules into occurrence dates."""
+
+    def test_preset_pattern_stored_as_rule(self, sunday_service):
+        assert sunday_service.recurrence_rule == "FREQ=WEEKLY"
+
+        sunday_service.recurrence_pattern = "none"
+        sunday_service.save(update_fields=["recurrence_pattern"])
+        sunday_service.refresh_from_db()
+
+        assert sunday_service.recurrence_rule == ""
+
+    def test_monthly_keeps_day_of_month(self, event_factory):
+        event = event_factory(date=local(2026, 1, 15, 18, 0), recurrence_pattern="monthly")
+
+        starts = occurrence_starts(event, local(2026, 1, 1), local(2026, 5, 1))
+
+        assert [start.date().isoformat() for start in starts] == [
+            "2026-01-15",
+            "2026-02-15",
+            "2026-03-15",
+            "2026-04-15",
+        ]
+        assert {timezone.localtime(start).hour for start in starts} == {18}
+
+    def test_custom_rule_and_end_date(self, event_factory):
+        event = event_factory(
+            date=local(2026, 3, 3, 19, 0),
+            recurrence_pattern="custom",
+            recurrence_rule="FREQ=WEEKLY;BYDAY=TU,TH",
+            recurrence_end_date=datetime(2026, 3, 12).date(),
+        )
+
+        starts = occurrence_starts(event, local(2026, 3, 1), local(2026, 4, 1))
+
+        assert [start.day for start in starts] == [3, 5, 10, 12]
+
+
+@pytest.mark.django_db
+class TestExpandEvents:
+    """Tests for reading a window of events."""
+
+    def test_virtual_occurrences(self, sunday_service):
+        events = expand_events(local(2026, 3, 1), local(2026, 4, 1))
+
+        assert [event.date.day for event in events] == [1, 8, 15, 22, 29]
+        assert events[0].pk == sunday_service.pk
+        virtual = events[1]
+        assert virtual.is_virtual
+        assert virtual.parent_event == sunday_service
+        assert virtual.end_date - virtual.date == timedelta(hours=2)
+        assert Event.objects.count() == 1
+
+    def test_single_query(self, sunday_service, event_factory, django_assert_num_queries):
+        event_factory(title="Retreat", date=local(2026, 3, 20, 8, 0))
+        materialize_occurrence(sunday_service, local(2026, 3, 8, 9, 0))
+
+        with django_assert_num_queries(1):
+            events = expand_events(local(2026, 3, 1), local(2026, 4, 1))
+            [event.ministry and event.organizer for event in events]
+
+        assert len(events) == 6
+
+    def test_materialized_occurrence_replaces_slot(self, sunday_service):
+        occurrence, created = materialize_occurrence(sunday_service, local(2026, 3, 8, 9, 0))
+        occurrence.date = local(2026, 3, 8, 17, 0)  # moved to the evening
+        occurrence.save()
+
+        events = expand_events(local(2026, 3, 1), local(2026, 3, 15))
+
+        assert created
+        assert [(event.pk, event.date) for event in events] == [
+            (sunday_service.pk, sunday_service.date),
+            (occurrence.pk, occurrence.date),
+        ]
+
+    def test_cancelled_occurrence_hidden_by_filters(self, sunday_service):
+        occurrence, _ = materialize_occurrence(sunday_service, local(2026, 3, 8, 9, 0))
+        occurrence.status = "cancelled"
+        occurrence.save()
+
+        events = expand_events(local(2026, 3, 1), local(2026, 3, 15))
+        published = expand_events(
+            local(2026, 3, 1), local(2026, 3, 15), filters=Q(status="published")
+        )
+
+        assert len(events) == 2
+        assert [event.pk for event in published] == [sunday_service.pk]
+
+    def test_materialize_rejects_other_dates(self, sunday_service):
+        with pytest.raises(ValueError):
+            materialize_occurrence(sunday_service, local(2026, 3, 9, 9, 0))
+
+
+@pytest.mark.django_db
+class TestRecurrenceAPI:
+    """Tests for the calendar, materialize and register endpoints."""
+
+    def test_calendar(self, auth_client, sunday_service, event_factory):
+        event_factory(title="Draft", date=local(2026, 3, 10, 9, 0), status_val="draft")
+        url = reverse("event-calendar")
+
+        response = auth_client.get(
+            url, {"start": "2026-03-01", "end": "2026-03-22", "status": "published"}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [item["date"][:10] for item in response.data] == [
+            "2026-03-01",
+            "2026-03-08",
+            "2026-03-15",
+        ]
+        assert response.data[1]["id"] is None
+        assert response.data[1]["is_virtual"] is True
+        assert response.data[1]["parent_event"] == sunday_service.pk
+
+    def test_calendar_requires_bounded_window(self, auth_client):
+        url = reverse("event-calendar")
+
+        assert auth_client.get(url).status_code == status.HTTP_400_BAD_REQUEST
+        response = auth_client.get(url, {"start": "2026-01-01", "end": "2028-01-01"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_list_with_window_is_expanded(self, auth_client, sunday_service):
+        url = reverse("event-list")
+
+        response = auth_client.get(url, {"start": "2026-03-01", "end": "2026-04-01"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["count"] == 5
+
+    def test_register_for_occurrence(self, auth_client, sunday_service, member_for_event):
+        url = reverse("event-register", kwargs={"pk": sunday_service.pk})
+
+        response = auth_client.post(
+            url,
+            {"member_id": member_for_event.pk, "occurrence_date": "2026-03-15T09:00:00+08:00"},
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        occurrence = Event.objects.get(parent_event=sunday_service)
+        assert occurrence.original_date == local(2026, 3, 15, 9, 0)
+        assert EventRegistration.objects.get().event == occurrence
+
+        response = auth_client.post(
+            url,
+            {"member_id": member_for_event.pk, "occurrence_date": "2026-03-16T09:00:00+08:00"},
+            format="json",
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_materialize(self, admin_client, sunday_service):
+        url = reverse("event-materialize", kwargs={"pk": sunday_service.pk})
+
+        response = admin_client.post(url, {"date": "2026-03-22T09:00:00+08:00"}, format="json")
+        again = admin_client.post(url, {"date": "2026-03-22T09:00:00+08:00"}, format="json")
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert again.status_code == status.HTTP_200_OK
+        assert again.data["id"] == response.data["id"]
+        assert response.data["is_virtual"] is False
+
+    def test_custom_pattern_requires_rule(self, admin_client, admin_user):
+        url = reverse("event-list")
+        data = {
+            "title": "Midweek",
+            "event_type": "prayer_meeting",
+            "date": "2026-03-04T19:00:00+08:00",
+            "location": "Room A",
+            "organizer": admin_user.pk,
+            "recurrence_pattern": "custom",
+        }
+
+        assert admin_client.post(url, data, format="json").status_code == 400
+        data["recurrence_rule"] = "FREQ=WEEKLY;BYDAY=XX"
+        assert admin_client.post(url, data, format="json").status_code == 400
+        data["recurrence_rule"] = "FREQ=WEEKLY;BYDAY=WE"
+        response = admin_client.post(url, data, format="json")
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data["recurrence_rule"] == "FREQ=WEEKLY;BYDAY=WE"
+
+
+@pytest.mark.django_db
+class TestGenerateRecurringEvents:
+    """Tests for bulk generation of stored occurrences."""
+
+    def test_bulk_generation_is_idempotent(self, event_factory):
+        for i in range(200):
+            event_factory(title=f"Weekly {i}", days_offset=0, recurrence_pattern="weekly")
+        out = StringIO()
+
+        with CaptureQueriesContext(connection) as queries:
+            call_command("generate_recurring_events", "--weeks=52", stdout=out)
+
+        # Parents and existing slots are read once, not per event
+        selects = [query for query in queries if query["sql"].startswith("SELECT")]
+        assert len(selects) == 2
+
+        assert Event.objects.filter(parent_event__isnull=False).count() == 200 * 52
+        assert "Occurrences created: 10400 in 11 batch(es)" in out.getvalue()
+
+        out = StringIO()
+        call_command("generate_recurring_events", "--weeks=52", stdout=out)
+        assert "Occurrences already stored: 10400" in out.getvalue()
+        assert "Occurrences created: 0" in out.getvalue()
+
+    def test_generate_occurrences_returns_the_new_rows(self, event_factory):
+        start = (timezone.now() + timedelta(days=1)).replace(second=0, microsecond=0)
+        weekly = event_factory(
+            title="Weekly", date=start, end_date=start, recurrence_pattern="weekly"
+        )
+        existing, _ = materialize_occurrence(weekly, weekly.date + timedelta(weeks=1))
+
+        created = weekly.generate_occurrences(weeks_ahead=4)
+
+        assert all(occurrence.pk for occurrence in created)
+        assert existing.pk not in {occurrence.pk for occurrence in created}
+        stored = set(Event.objects.filter(parent_event=weekly).values_list("pk", flat=True))
+        assert {occurrence.pk for occurrence in created} == stored - {existing.pk}
+        assert weekly.generate_occurrences(weeks_ahead=4) == []
+
+    def test_dry_run(self, sunday_service):
+        out = StringIO()
+
+        call_command("generate_recurring_events", "--weeks=8", "--dry-run", stdout=out)
+
+        assert "Would create" in out.getvalue()
+        assert not Event.objects.filter(parent_event=sunday_service).exists()
+
+    def test_slot_is_unique(self, sunday_service):
+        materialize_occurrence(sunday_service, local(2026, 3, 8, 9, 0))
+
+        with pytest.raises(IntegrityError), transaction.atomic():
+            Event.objects.create(
+                title="Duplicate",
+                date=local(2026, 3, 8, 9, 0),
+                location="Main Hall",
+                parent_event=sunday_service,
+                original_date=local(2026, 3, 8, 9, 0),
+            )
+
+
+@pytest.mark.django_db
+class TestLazyRecurrenceMigration:
+    """Tests for the data step of migration 0005 on old generated occurrences."""
+
+    def test_old_monthly_rows_take_rule_slots(self, event_factory, member_for_event):
+        start = local(2030, 1, 15, 18, 0)
+        parent = event_factory(
+            title="Prayer Night",
+            date=start,
+            end_date=start + timedelta(hours=2),
+            recurrence_pattern="monthly",
+        )
+
+        def generated(days, **kwargs):
+            # As the old generator stored them: fixed 30-day steps, no original_date
+            date = start + timedelta(days=days)
+            values = {"title": "Prayer Night", "end_date": date + timedelta(hours=2), **kwargs}
+            return event_factory(date=date, parent_event=parent, **values)
+
+        untouched = generated(30)
+        edited = generated(60, title="Prayer Night (Chapel)")
+        on_slot = generated(90)
+        registered = generated(150)
+        EventRegistration.objects.create(event=registered, member=member_for_event)
+
+        import_module("apps.events.migrations.0005_lazy_recurrence").fill_recurrence(apps, None)
+
+        assert not Event.objects.filter(pk=untouched.pk).exists()
+        original_dates = dict(
+            Event.objects.filter(parent_event=parent).values_list("pk", "original_date")
+        )
+        assert original_dates == {
+            edited.pk: local(2030, 3, 15, 18, 0),
+            on_slot.pk: local(2030, 4, 15, 18, 0),
+            registered.pk: local(2030, 6, 15, 18, 0),
+        }
+        listed = expand_events(local(2030, 2, 1), local(2030, 7, 1), Q(title__startswith="Prayer"))
+        assert len(listed) == 5  # one per month
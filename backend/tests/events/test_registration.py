@@ -0,0 +1,320 @@
+"""
+Tests for counter-based event capacity and the waitlist (apps/events/services.py).
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from django.db import OperationalError, connection
+from django.urls import reverse
+from rest_framework import status
+
+from apps.events import services
+from apps.events.models import Event, EventRegistration, EventWaitlistEntry
+from apps.events.services import (
+    promote_waitlist,
+    register_member,
+    register_members,
+    unregister_member,
+)
+from apps.members.models import Member
+from common.cache import get_namespace_version
+
+
+@pytest.fixture
+def members(db):
+    def _create(count, prefix="member"):
+        return Member.objects.bulk_create(
+            Member(first_name=prefix, last_name=str(i), email=f"{prefix}{i}@example.com")
+            for i in range(count)
+        )
+
+    return _create
+
+
+@pytest.mark.django_db
+class TestRegisteredCount:
+    """Tests for the maintained registered_count column."""
+
+    def test_counts_every_path(self, event, members):
+        first, second, third = members(3)
+
+        register_member(event, first)
+        EventRegistration.objects.create(event=event, member=second)
+        EventRegistration.objects.create(event=event, member=third)
+        EventRegistration.objects.filter(member=third).delete()
+        event.refresh_from_db()
+
+        assert event.registered_count == 2
+        second.delete()  # cascades to the registration
+        event.refresh_from_db()
+        assert event.registered_count == 1
+
+    def test_save_keeps_concurrent_count(self, event, members):
+        stale = Event.objects.get(pk=event.pk)
+        register_member(event, members(1)[0])
+
+        stale.title = "Renamed"
+        stale.save()
+        event.refresh_from_db()
+
+        assert event.registered_count == 1
+        assert event.title == "Renamed"
+
+    def test_duplicate_does_not_count(self, full_event, members):
+        member = members(1)[0]
+        register_member(full_event, member)
+
+        with pytest.raises(ValueError, match="Already registered"):
+            register_member(full_event, member)
+
+        full_event.refresh_from_db()
+        assert full_event.registered_count == 1
+
+
+@pytest.mark.django_db
+class TestWaitlist:
+    """Tests for waitlisting and promotion."""
+
+    def test_overflow_is_waitlisted_in_order(self, full_event, members):
+        people = members(5)
+        results = [register_member(full_event, person) for person in people]
+
+        assert [waitlisted for _, waitlisted in results] == [False, False, True, True, True]
+        assert [entry.position for entry, _ in results[2:]] == [1, 2, 3]
+        assert full_event.registered_count == 2
+
+    def test_cancellation_promotes_first_in_line(self, full_event, members):
+        people = members(4)
+        for person in people:
+            register_member(full_event, person)
+
+        promoted = unregister_member(full_event, people[0].pk)
+
+        assert [registration.member for registration in promoted] == [people[2]]
+        assert list(full_event.waitlist.values_list("member", flat=True)) == [people[3].pk]
+        assert full_event.registered_count == 2
+
+    def test_leaving_waitlist(self, full_event, members):
+        people = members(3)
+        for person in people:
+            register_member(full_event, person)
+
+        assert unregister_member(full_event, people[2].pk) == []
+        assert not EventWaitlistEntry.objects.exists()
+
+    def test_raising_capacity_promotes(self, admin_client, full_event, members):
+        for person in members(4):
+            register_member(full_event, person)
+        url = reverse("event-detail", kwargs={"pk": full_event.pk})
+
+        response = admin_client.patch(url, {"max_attendees": 3}, format="json")
+
+        assert response.status_code == status.HTTP_200_OK
+        full_event.refresh_from_db()
+        assert full_event.registered_count == 3
+        assert full_event.waitlist.count() == 1
+
+    def test_waitlist_endpoint_lists_positions(
+        self, auth_client, full_event, members, django_assert_num_queries
+    ):
+        people = members(5)
+        for person in people:
+            register_member(full_event, person)
+        url = reverse("event-waitlist", kwargs={"pk": full_event.pk})
+        auth_client.get(url)
+
+        # user + event + entries
+        with django_assert_num_queries(3):
+            response = auth_client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [item["member"] for item in response.data] == [p.pk for p in people[2:]]
+        assert [item["position"] for item in response.data] == [1, 2, 3]
+
+    def test_promote_without_room_is_noop(self, full_event, members):
+        for person in members(3):
+            register_member(full_event, person)
+
+        assert promote_waitlist(full_event) == []
+
+    def test_any_deletion_promotes_after_commit(
+        self, full_event, members, django_capture_on_commit_callbacks
+    ):
+        people = members(4)
+        for person in people:
+            register_member(full_event, person)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            EventRegistration.objects.get(member=people[0]).delete()
+        with django_capture_on_commit_callbacks(execute=True):
+            people[1].delete()  # cascades to the registration
+
+        registered = EventRegistration.objects.filter(event=full_event)
+        assert set(registered.values_list("member", flat=True)) == {people[2].pk, people[3].pk}
+        assert not full_event.waitlist.exists()
+        full_event.refresh_from_db()
+        assert full_event.registered_count == 2
+
+    def test_unregister_promotes_once(
+        self, full_event, members, django_capture_on_commit_callbacks
+    ):
+        people = members(3)
+        for person in people:
+            register_member(full_event, person)
+
+        with django_capture_on_commit_callbacks(execute=True) as callbacks:
+            promoted = unregister_member(full_event, people[0].pk)
+
+        assert [registration.member for registration in promoted] == [people[2]]
+        assert callbacks == []
+
+    def test_unregister_endpoint_reports_promotion(self, auth_client, full_event, members):
+        people = members(3)
+        for person in people:
+            register_member(full_event, person)
+        url = reverse("event-unregister", kwargs={"pk": full_event.pk})
+
+        response = auth_client.delete(url, QUERY_STRING=f"member_id={people[1].pk}")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [item["member"] for item in response.data["promoted"]] == [people[2].pk]
+
+        waitlist = auth_client.get(reverse("event-waitlist", kwargs={"pk": full_event.pk}))
+        assert waitlist.data == []
+
+
+@pytest.mark.django_db
+class TestBulkRegistration:
+    """Tests for registering groups of members at once."""
+
+    def test_fills_places_then_waitlists(self, full_event, members):
+        people = members(5)
+
+        outcomes = register_members(full_event, [person.pk for person in people])
+
+        assert list(outcomes.values()) == [services.REGISTERED] * 2 + [services.WAITLISTED] * 3
+        assert full_event.registered_count == 2
+        full_event.refresh_from_db()
+        assert full_event.registered_count == 2
+        assert [entry.member for entry in full_event.waitlist.all()] == people[2:]
+
+    def test_drops_cached_public_events(
+        self, full_event, members, django_capture_on_commit_callbacks
+    ):
+        before = get_namespace_version("public_events")
+
+        with django_capture_on_commit_callbacks(execute=True):
+            register_members(full_event, [person.pk for person in members(2)])
+
+        assert get_namespace_version("public_events") != before
+
+    def test_existing_and_unknown_members(self, full_event, members):
+        first, second, third = members(3)
+        register_member(full_event, first)
+        register_member(full_event, second)
+        register_member(full_event, third)
+
+        outcomes = register_members(full_event, [first.pk, third.pk, 99999], waitlist=False)
+
+        assert outcomes == {
+            first.pk: services.ALREADY_REGISTERED,
+            third.pk: services.ALREADY_WAITLISTED,
+            99999: services.NOT_FOUND,
+        }
+
+    def test_refused_without_waitlist(self, full_event, members):
+        people = members(3)
+
+        outcomes = register_members(full_event, [person.pk for person in people], waitlist=False)
+
+        assert outcomes[people[2].pk] == services.FULL
+        assert not full_event.waitlist.exists()
+
+    def test_waitlisted_member_gets_freed_place(self, full_event, members):
+        people = members(3)
+        for person in people:
+            register_member(full_event, person)
+        EventRegistration.objects.filter(member=people[0]).delete()
+
+        outcomes = register_members(full_event, [people[2].pk])
+
+        assert outcomes == {people[2].pk: services.REGISTERED}
+        assert not full_event.waitlist.exists()
+
+    def test_constant_queries(self, event_factory, members, django_assert_num_queries):
+        small, large = members(2, "small"), members(200, "large")
+        first = event_factory(title="Retreat", max_attendees=1)
+        second = event_factory(title="Camp", max_attendees=100)
+
+        with django_assert_num_queries(9) as small_queries:
+            register_members(first, [person.pk for person in small])
+        with django_assert_num_queries(len(small_queries)):
+            register_members(second, [person.pk for person in large])
+
+        second.refresh_from_db()
+        assert second.registered_count == 100
+        assert second.waitlist.count() == 100
+
+    def test_endpoint_with_ministry(self, admin_client, event, ministry, members):
+        people = members(4)
+        Member.objects.filter(pk__in=[person.pk for person in people[:2]]).update(ministry=ministry)
+        # Members of a ministry through their second ministry count too
+        Member.objects.filter(pk=people[2].pk).update(ministry_2=ministry)
+        url = reverse("event-bulk-register", kwargs={"pk": event.pk})
+
+        response = admin_client.post(url, {"ministry_id": ministry.pk}, format="json")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["counts"] == {services.REGISTERED: 3}
+        assert response.data["registered_count"] == 3
+        registered = {result["member"] for result in response.data["results"]}
+        assert registered == {person.pk for person in people[:3]}
+
+    def test_endpoint_with_unknown_ministry(self, admin_client, event):
+        url = reverse("event-bulk-register", kwargs={"pk": event.pk})
+
+        response = admin_client.post(url, {"ministry_id": 99999}, format="json")
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_endpoint_requires_members(self, admin_client, event):
+        url = reverse("event-bulk-register", kwargs={"pk": event.pk})
+
+        response = admin_client.post(url, {"member_ids": "1,2"}, format="json")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_registrations_never_overbook(event_factory, members):
+    """200 simultaneous RSVPs for 50 places: exactly 50 registered, 150 waitlisted."""
+    event = event_factory(title="Retreat", max_attendees=50)
+    people = members(200)
+    start = threading.Barrier(20)
+
+    def rsvp(member):
+        try:
+            start.wait(timeout=5)
+        except threading.BrokenBarrierError:
+            pass
+        try:
+            while True:
+                try:
+                    return register_member(Event.objects.get(pk=event.pk), member)[1]
+                except OperationalError:
+                    # SQLite allows one writer at a time ("database is locked")
+                    time.sleep(0.005)
+        finally:
+            connection.close()
+
+    with ThreadPoolExecutor(max_workers=20) as pool:
+        waitlisted = list(pool.map(rsvp, people))
+
+    event.refresh_from_db()
+    assert waitlisted.count(False) == 50
+    assert event.registered_count == 50
+    assert EventRegistration.objects.filter(event=event).count() == 50
+    assert EventWaitlistEntry.objects.filter(event=event).count() == 150
@@ -271,6 +271,31 @@ class TestMeetingMinutesAttachments:
         assert response.status_code == status.HTTP_200_OK
         assert all(a["meeting_minutes"] == meeting_minutes.id for a in response.data["results"])
 
+    def test_direct_upload(self, admin_client, meeting_minutes, settings, tmp_path):
+        """Test uploading an attachment through upload_url and finalize."""
+        from apps.meeting_minutes.models import MeetingMinutesAttachment
+
+        settings.MEDIA_ROOT = tmp_path
+        started = admin_client.post(
+            reverse("meeting-minutes-attachments-upload-url"),
+            {"meeting_minutes": meeting_minutes.pk, "file_name": "agenda.docx", "file_size": 4},
+            format="json",
+        )
+        upload = started.data["upload"]
+        admin_client.generic("PUT", upload["url"], b"docx", content_type="application/msword")
+
+        response = admin_client.post(
+            reverse("meeting-minutes-attachments-finalize"),
+            {"token": started.data["token"]},
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        attachment = MeetingMinutesAttachment.objects.get(pk=response.data["id"])
+        assert attachment.file_type == "docx"
+        assert attachment.file_size == 4
+        assert attachment.file.name.startswith("meeting_minutes/")
+
     def test_delete_attachment(self, admin_client, meeting_attachment):
         """Test deleting an attachment."""
         url = reverse(
@@ -0,0 +1,106 @@
+"""
+Tests for the per-member shift calendar feed (apps/ministries/feeds.py).
+"""
+
+from datetime import time, timedelta
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from apps.ministries.feeds import feed_token
+from apps.ministries.models import Assignment, Shift
+
+
+@pytest.fixture
+def assignment(test_ministry, member_with_email):
+    shift = Shift.objects.create(
+        ministry=test_ministry,
+        date=timezone.localdate() + timedelta(days=3),
+        start_time=time(22, 0),
+        end_time=time(2, 0),
+        notes="Night watch",
+    )
+    return Assignment.objects.create(shift=shift, member=member_with_email)
+
+
+@pytest.mark.django_db
+class TestShiftFeed:
+    """Tests for GET /api/public/calendar/shifts/{token}.ics"""
+
+    def test_member_shifts(self, api_client, assignment, member_without_email, test_ministry):
+        other = Shift.objects.create(
+            ministry=test_ministry,
+            date=timezone.localdate(),
+            start_time=time(8, 0),
+            end_time=time(10, 0),
+        )
+        Assignment.objects.create(shift=other, member=member_without_email)
+        url = reverse("public-shift-feed", kwargs={"token": feed_token(assignment.member)})
+
+        response = api_client.get(url)
+
+        body = response.content.decode()
+        assert response.status_code == status.HTTP_200_OK
+        assert body.count("BEGIN:VEVENT") == 1
+        assert f"SUMMARY:{test_ministry.name} shift" in body
+        # Overnight shift ends the next day
+        end = assignment.shift.date + timedelta(days=1)
+        assert f"DTEND;TZID=Asia/Manila:{end:%Y%m%d}T020000" in body
+
+    def test_invalid_token(self, api_client, assignment):
+        token = feed_token(assignment.member).replace(str(assignment.member.pk), "999", 1)
+
+        response = api_client.get(reverse("public-shift-feed", kwargs={"token": token}))
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_cached_until_shift_changes(self, api_client, assignment, django_assert_num_queries):
+        url = reverse("public-shift-feed", kwargs={"token": feed_token(assignment.member)})
+        api_client.get(url)
+
+        with django_assert_num_queries(0):
+            api_client.get(url)
+
+        assignment.shift.notes = "Bring a flashlight"
+        assignment.shift.save()
+        assert "Bring a flashlight" in api_client.get(url).content.decode()
+
+    def test_feed_url_action(self, admin_client, assignment):
+        response = admin_client.get(
+            reverse("assignment-calendar-feed"), {"member": assignment.member.pk}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["url"].endswith(
+            f"/calendar/shifts/{feed_token(assignment.member)}.ics"
+        )
+
+    def test_feed_url_action_rejects_bad_member(self, admin_client):
+        response = admin_client.get(reverse("assignment-calendar-feed"), {"member": "abc"})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_feed_url_action_only_for_admins_or_own_member(
+        self, auth_client, user, assignment, member_without_email
+    ):
+        url = reverse("assignment-calendar-feed")
+
+        assert auth_client.get(url, {"member": assignment.member.pk}).status_code == 403
+        assert auth_client.get(url, {"member": member_without_email.pk}).status_code == 403
+
+        assignment.member.email = user.email.upper()
+        assignment.member.save()
+        assert auth_client.get(url, {"member": assignment.member.pk}).status_code == 200
+
+    def test_rotating_revokes_old_url(self, admin_client, assignment):
+        url = reverse("assignment-calendar-feed")
+        old = admin_client.get(url, {"member": assignment.member.pk}).data["url"]
+        assert admin_client.get(old).status_code == status.HTTP_200_OK
+
+        new = admin_client.post(f"{url}?member={assignment.member.pk}").data["url"]
+
+        assert new != old
+        assert admin_client.get(old).status_code == status.HTTP_404_NOT_FOUND
+        assert admin_client.get(new).status_code == status.HTTP_200_OK
@@ -60,9 +60,9 @@ class TestRotateAndAssign:
         assert summary["created"] == 0
         assert test_ministry.id in summary["skipped_no_members"]
 
-    @patch("apps.ministries.utils.send_mail")
+    @patch("apps.ministries.utils.queue_email")
     def test_rotation_sends_email_when_notify_true(
-        self, mock_send_mail, test_ministry, ministry_member_with_email, upcoming_shift
+        self, mock_queue_email, test_ministry, ministry_member_with_email, upcoming_shift
     ):
         """Test that email is sent when notify=True and member has email."""
         summary = rotate_and_assign(
@@ -75,11 +75,11 @@ class TestRotateAndAssign:
         assert summary["created"] == 1
         assert summary["emailed"] == 1
         assert summary["skipped_no_email"] == 0
-        mock_send_mail.assert_called_once()
+        mock_queue_email.assert_called_once()
 
-    @patch("apps.ministries.utils.send_mail")
+    @patch("apps.ministries.utils.queue_email")
     def test_rotation_tracks_skipped_no_email(
-        self, mock_send_mail, test_ministry, ministry_member_without_email, upcoming_shift
+        self, mock_queue_email, test_ministry, ministry_member_without_email, upcoming_shift
     ):
         """Test that rotation tracks when emails are skipped due to missing address."""
         summary = rotate_and_assign(
@@ -92,14 +92,14 @@ class TestRotateAndAssign:
         assert summary["created"] == 1
         assert summary["emailed"] == 0
         assert summary["skipped_no_email"] == 1
-        mock_send_mail.assert_not_called()
+        mock_queue_email.assert_not_called()
 
-    @patch("apps.ministries.utils.send_mail")
+    @patch("apps.ministries.utils.queue_email")
     def test_rotation_handles_email_failure(
-        self, mock_send_mail, test_ministry, ministry_member_with_email, upcoming_shift
+        self, mock_queue_email, test_ministry, ministry_member_with_email, upcoming_shift
     ):
         """Test that rotation handles email sending failures gracefully."""
-        mock_send_mail.side_effect = Exception("SMTP connection failed")
+        mock_queue_email.side_effect = Exception("SMTP connection failed")
 
         summary = rotate_and_assign(
             ministry_ids=[test_ministry.id],
@@ -185,10 +185,10 @@ class TestRotateShiftsAPI:
         assert "skipped_no_email" in response.data
         assert response.data["skipped_no_email"] == 1
 
-    @patch("apps.ministries.utils.send_mail")
+    @patch("apps.ministries.utils.queue_email")
     def test_rotate_shifts_with_notify_true(
         self,
-        mock_send_mail,
+        mock_queue_email,
         admin_client,
         test_ministry,
         ministry_member_with_email,
@@ -204,4 +204,4 @@ class TestRotateShiftsAPI:
 
         assert response.status_code == status.HTTP_200_OK
         assert response.data["emailed"] == 1
-        mock_send_mail.assert_called_once()
+        mock_queue_email.assert_called_once()
@@ -8,6 +8,7 @@ from django.urls import reverse
 from rest_framework import status
 
 from apps.notifications.models import Notification
+from apps.notifications.services import broadcast_notification, get_user_notifications
 
 
 # =============================================================================
@@ -253,3 +254,93 @@ class TestNotificationSerializer:
         ]
         for field in expected_fields:
             assert field in response.data, f"Missing field: {field}"
+
+
+# =============================================================================
+# Broadcast Tests
+# =============================================================================
+@pytest.mark.django_db
+class TestBroadcastNotificationsAPI:
+    """Broadcasts are stored once but behave like personal notifications in the API."""
+
+    @pytest.fixture
+    def broadcast(self, user, admin_user):
+        return broadcast_notification(Notification.AUDIENCE_ALL, "announcement", "Sunday Service")
+
+    def test_list_merges_personal_and_broadcast(self, auth_client, notification, broadcast):
+        response = auth_client.get(reverse("notification-list"))
+
+        results = response.data.get("results", response.data)
+        assert {n["id"] for n in results} == {notification.id, broadcast.id}
+        assert all(n["read"] is False for n in results)
+
+    def test_list_query_count_is_constant(
+        self, auth_client, user, broadcast, django_assert_max_num_queries
+    ):
+        for i in range(10):
+            broadcast_notification(Notification.AUDIENCE_ALL, "system", f"Broadcast {i}")
+
+        with django_assert_max_num_queries(3):
+            auth_client.get(reverse("notification-list"))
+
+    def test_unread_count_includes_broadcasts(self, auth_client, notification, broadcast):
+        response = auth_client.get(reverse("notification-unread-count"))
+
+        assert response.data["unread_count"] == 2
+
+    def test_mark_broadcast_read(self, auth_client, admin_user, broadcast):
+        url = reverse("notification-mark-read", kwargs={"pk": broadcast.pk})
+        auth_client.patch(url)
+
+        response = auth_client.get(reverse("notification-detail", kwargs={"pk": broadcast.pk}))
+        assert response.data["read"] is True
+        # Other users are unaffected
+        assert get_user_notifications(admin_user).get(pk=broadcast.pk).is_read is False
+
+    def test_patch_read_on_broadcast(self, auth_client, broadcast):
+        url = reverse("notification-detail", kwargs={"pk": broadcast.pk})
+        response = auth_client.patch(url, {"read": True}, format="json")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["read"] is True
+        broadcast.refresh_from_db()
+        assert broadcast.read is False
+
+    def test_mark_old_broadcast_unread_after_mark_all(self, auth_client, broadcast):
+        auth_client.post(reverse("notification-mark-all-read"))
+        url = reverse("notification-detail", kwargs={"pk": broadcast.pk})
+
+        response = auth_client.patch(url, {"read": False}, format="json")
+
+        assert response.data["read"] is False
+        assert auth_client.get(url).data["read"] is False
+        listed = auth_client.get(reverse("notification-list")).data["results"]
+        assert [n["read"] for n in listed if n["id"] == broadcast.pk] == [False]
+        unread = auth_client.get(reverse("notification-unread-count"))
+        assert unread.data["unread_count"] == 1
+
+    def test_mark_all_read_covers_broadcasts(self, auth_client, notification, broadcast):
+        response = auth_client.post(reverse("notification-mark-all-read"))
+
+        assert response.data["count"] == 2
+        unread = auth_client.get(reverse("notification-unread-count"))
+        assert unread.data["unread_count"] == 0
+
+    def test_delete_broadcast_hides_it_for_user_only(self, auth_client, admin_user, broadcast):
+        url = reverse("notification-detail", kwargs={"pk": broadcast.pk})
+        response = auth_client.delete(url)
+
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        assert Notification.objects.filter(pk=broadcast.pk).exists()
+        assert auth_client.get(url).status_code == status.HTTP_404_NOT_FOUND
+        assert get_user_notifications(admin_user).filter(pk=broadcast.pk).exists()
+
+    def test_admin_broadcast_hidden_from_other_roles(self, api_client, create_user):
+        leader = create_user(username="leader", email="leader@example.com", role="ministry_leader")
+        broadcast_notification(Notification.AUDIENCE_ADMINS, "system", "Admins only")
+        api_client.force_authenticate(leader)
+
+        response = api_client.get(reverse("notification-list"))
+
+        results = response.data.get("results", response.data)
+        assert results == []
@@ -0,0 +1,272 @@
+"""
+Tests for the email outbox (apps/notifications/outbox.py).
+"""
+
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.db import transaction
+from django.test import Client
+from django.utils import timezone
+
+from apps.notifications.models import OutboxEmail
+from apps.notifications.outbox import (
+    _deliver_in_thread,
+    deliver_now,
+    outbox_stats,
+    process_outbox,
+    queue_email,
+    queue_mass_email,
+    retry_now,
+)
+from sbcc.email_testing import FakeBrevoServer
+
+
+class FlakyBackend(EmailBackend):
+    """locmem backend that refuses addresses at bounce.example.com."""
+
+    def send_messages(self, messages):
+        for message in messages:
+            if any(addr.endswith("@bounce.example.com") for addr in message.to):
+                raise OSError("550 Mailbox unavailable")
+        return super().send_messages(messages)
+
+
+@pytest.fixture
+def flaky_backend(settings):
+    settings.EMAIL_BACKEND = "tests.notifications.test_outbox.FlakyBackend"
+
+
+@pytest.mark.django_db
+class TestQueueing:
+    """Tests for writing to the outbox."""
+
+    def test_queue_email(self):
+        row = queue_email("Hi", "Body", ["a@example.com", ""], kind="test")
+
+        assert row.status == OutboxEmail.STATUS_PENDING
+        assert row.to == ["a@example.com"]
+        assert len(mail.outbox) == 0
+
+    def test_no_recipients_not_queued(self):
+        assert queue_email("Hi", "Body", [""]) is None
+        assert not OutboxEmail.objects.exists()
+
+    def test_rolled_back_with_transaction(self):
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                queue_email("Hi", "Body", ["a@example.com"])
+                raise RuntimeError("business change failed")
+
+        assert not OutboxEmail.objects.exists()
+
+    def test_queue_mass_email(self):
+        rows = queue_mass_email(
+            [("Hi", "Body", None, [f"m{i}@example.com"]) for i in range(3)]
+            + [("Hi", "", None, [])],
+            kind="announcement",
+        )
+
+        assert len(rows) == 3
+        assert all(row.pk for row in rows)
+        assert OutboxEmail.objects.filter(kind="announcement").count() == 3
+
+    def test_send_now_delivers_after_commit(self, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True):
+            row = queue_email("Reset", "Link", ["a@example.com"], send_now=True)
+            assert len(mail.outbox) == 0
+
+        row.refresh_from_db()
+        assert row.status == OutboxEmail.STATUS_SENT
+        assert len(mail.outbox) == 1
+
+    def test_send_now_failure_stays_queued(self, flaky_backend, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True):
+            row = queue_email("Reset", "Link", ["x@bounce.example.com"], send_now=True)
+
+        row.refresh_from_db()
+        assert row.status == OutboxEmail.STATUS_PENDING
+        assert row.attempts == 1 and row.last_error
+
+    def test_send_now_runs_off_the_request_thread(
+        self, settings, monkeypatch, django_capture_on_commit_callbacks
+    ):
+        settings.EMAIL_OUTBOX_SEND_NOW_MODE = "thread"
+        submitted = []
+
+        class Executor:
+            def submit(self, fn, *args):
+                submitted.append((fn, args))
+
+        monkeypatch.setattr("apps.notifications.outbox._get_executor", Executor)
+        with django_capture_on_commit_callbacks(execute=True):
+            row = queue_email("Reset", "Link", ["a@example.com"], send_now=True)
+
+        assert len(mail.outbox) == 0
+        assert submitted == [(_deliver_in_thread, ([row.id],))]
+        deliver_now([row.id])
+        row.refresh_from_db()
+        assert row.status == OutboxEmail.STATUS_SENT
+
+    def test_send_now_skips_rows_claimed_by_a_worker(self):
+        row = queue_email("Reset", "Link", ["a@example.com"])
+        process_outbox()
+
+        assert deliver_now([row.id])["claimed"] == 0
+        assert len(mail.outbox) == 1
+
+
+@pytest.mark.django_db
+class TestProcessOutbox:
+    """Tests for the worker loop."""
+
+    def test_delivers_due_emails(self):
+        for i in range(5):
+            queue_email("Hi", "Body", [f"m{i}@example.com"])
+
+        result = process_outbox(workers=2)
+
+        assert result == {"claimed": 5, "sent": 5, "retried": 0, "dead": 0}
+        assert len(mail.outbox) == 5
+        assert OutboxEmail.objects.filter(status=OutboxEmail.STATUS_SENT).count() == 5
+        assert not OutboxEmail.objects.filter(sent_at__isnull=True).exists()
+
+    def test_skips_rows_not_yet_due(self):
+        row = queue_email("Hi", "Body", ["a@example.com"])
+        OutboxEmail.objects.filter(pk=row.pk).update(
+            next_attempt_at=timezone.now() + timedelta(minutes=5)
+        )
+
+        assert process_outbox()["claimed"] == 0
+
+    def test_failure_retried_with_backoff(self, flaky_backend, settings):
+        settings.EMAIL_OUTBOX_RETRY_BASE = 60
+        queue_email("Hi", "Body", ["ok@example.com"])
+        bad = queue_email("Hi", "Body", ["x@bounce.example.com"])
+
+        result = process_outbox(workers=1)
+
+        assert result["sent"] == 1
+        assert result["retried"] == 1
+        bad.refresh_from_db()
+        assert bad.status == OutboxEmail.STATUS_PENDING
+        assert bad.attempts == 1
+        assert "550" in bad.last_error
+        delay = bad.next_attempt_at - timezone.now()
+        assert timedelta(seconds=50) < delay <= timedelta(seconds=60)
+
+        # Second failure doubles the delay
+        OutboxEmail.objects.filter(pk=bad.pk).update(next_attempt_at=timezone.now())
+        process_outbox()
+        bad.refresh_from_db()
+        assert bad.attempts == 2
+        assert bad.next_attempt_at - timezone.now() > timedelta(seconds=110)
+
+    def test_dead_letter_after_max_attempts(self, flaky_backend, settings):
+        settings.EMAIL_OUTBOX_MAX_ATTEMPTS = 2
+        bad = queue_email("Hi", "Body", ["x@bounce.example.com"])
+
+        process_outbox()
+        OutboxEmail.objects.filter(pk=bad.pk).update(next_attempt_at=timezone.now())
+        result = process_outbox()
+
+        assert result["dead"] == 1
+        bad.refresh_from_db()
+        assert bad.status == OutboxEmail.STATUS_DEAD
+        assert process_outbox()["claimed"] == 0
+
+    def test_stale_claims_released(self):
+        row = queue_email("Hi", "Body", ["a@example.com"])
+        OutboxEmail.objects.filter(pk=row.pk).update(
+            status=OutboxEmail.STATUS_SENDING, locked_at=timezone.now() - timedelta(hours=1)
+        )
+
+        assert process_outbox()["sent"] == 1
+
+    def test_rate_limit_caps_batch(self):
+        for i in range(5):
+            queue_email("Hi", "Body", [f"m{i}@example.com"])
+
+        result = process_outbox(rate_limit=50)
+
+        assert result["claimed"] == 5
+        assert process_outbox(rate_limit=2)["claimed"] == 0
+
+        OutboxEmail.objects.update(status=OutboxEmail.STATUS_PENDING)
+        assert process_outbox(rate_limit=2)["claimed"] == 2
+
+    def test_threads_send_concurrently(self, settings):
+        with FakeBrevoServer(latency=0.05) as server:
+            settings.EMAIL_BACKEND = "sbcc.brevo_backend.BrevoEmailBackend"
+            settings.BREVO_API_KEY = server.api_key
+            settings.BREVO_API_URL = server.url
+            for i in range(8):
+                queue_email(f"Subject {i}", "Body", [f"m{i}@example.com"])
+
+            result = process_outbox(workers=4)
+
+        assert result["sent"] == 8
+        assert server.max_in_flight > 1
+
+    def test_brevo_partial_failure(self, settings):
+        with FakeBrevoServer(fail_recipients=["x@example.com"]) as server:
+            settings.EMAIL_BACKEND = "sbcc.brevo_backend.BrevoEmailBackend"
+            settings.BREVO_API_KEY = server.api_key
+            settings.BREVO_API_URL = server.url
+            queue_email("A", "Body", ["ok@example.com"])
+            bad = queue_email("B", "Body", ["x@example.com"])
+
+            result = process_outbox(workers=1)
+
+        assert result["sent"] == 1
+        assert result["retried"] == 1
+        bad.refresh_from_db()
+        assert "Rejected by fake server" in bad.last_error
+
+
+@pytest.mark.django_db
+class TestMonitoring:
+    """Tests for stats, retry and the admin/command views of the queue."""
+
+    def test_stats_and_retry_now(self, flaky_backend, settings):
+        settings.EMAIL_OUTBOX_MAX_ATTEMPTS = 1
+        queue_email("Hi", "Body", ["x@bounce.example.com"])
+        queue_email("Hi", "Body", ["ok@example.com"])
+        process_outbox()
+
+        stats = outbox_stats()
+        assert stats["counts"]["dead"] == 1
+        assert stats["counts"]["sent"] == 1
+        assert stats["failures"][0][1] == 1
+
+        assert retry_now(OutboxEmail.objects.all()) == 1
+        assert outbox_stats()["due"] == 1
+
+    def test_command_once_and_stats(self):
+        queue_email("Hi", "Body", ["a@example.com"])
+        out = StringIO()
+
+        call_command("send_queued_emails", "--once", stdout=out)
+        call_command("send_queued_emails", "--stats", stdout=out)
+
+        assert "Done: 1 sent" in out.getvalue()
+        assert "sent=1" in out.getvalue()
+        assert len(mail.outbox) == 1
+
+    def test_admin_changelist_shows_queue(self, super_admin_user, settings):
+        settings.STORAGES = {
+            **settings.STORAGES,
+            "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+        }
+        queue_email("Hi", "Body", ["a@example.com"])
+        client = Client()
+        client.force_login(super_admin_user)
+
+        response = client.get("/admin/notifications/outboxemail/")
+
+        assert response.status_code == 200
+        assert b"Due now" in response.content
@@ -0,0 +1,150 @@
+"""
+Tests for notification retention (apps/notifications/retention.py).
+"""
+
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from apps.notifications.models import Notification, NotificationReceipt
+from apps.notifications.retention import (
+    expired_notifications,
+    get_table_sizes,
+    prune_notifications,
+    read_archive,
+)
+from apps.notifications.services import broadcast_notification, mark_notification_read
+from apps.notifications.stream import broker
+
+
+@pytest.fixture(autouse=True)
+def retention_settings(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    settings.NOTIFICATION_RETENTION_DAYS = {"default": 180, "system": 30}
+
+
+def make_notification(user, days_old, notification_type="system", title="Old"):
+    notification = Notification.objects.create(user=user, type=notification_type, title=title)
+    # created_at is auto_now_add, so backdate with update()
+    Notification.objects.filter(pk=notification.pk).update(
+        created_at=timezone.now() - timedelta(days=days_old)
+    )
+    notification.refresh_from_db()
+    return notification
+
+
+@pytest.mark.django_db
+class TestExpiredNotifications:
+    """Tests for per-type TTL selection."""
+
+    def test_type_specific_ttl(self, user):
+        old_system = make_notification(user, 31, "system")
+        recent_system = make_notification(user, 29, "system")
+        old_event = make_notification(user, 31, "event")
+
+        expired = set(expired_notifications())
+
+        assert old_system in expired
+        assert recent_system not in expired
+        assert old_event not in expired
+
+    def test_default_ttl_for_unlisted_types(self, user):
+        old_event = make_notification(user, 181, "event")
+
+        assert list(expired_notifications()) == [old_event]
+
+
+@pytest.mark.django_db
+class TestPruneNotifications:
+    """Tests for batched archive + delete."""
+
+    def test_deletes_in_batches(self, user):
+        for _ in range(5):
+            make_notification(user, 40)
+        kept = make_notification(user, 1)
+
+        result = prune_notifications(batch_size=2, archive=False)
+
+        assert result["deleted"] == 5
+        assert result["batches"] == 3
+        assert list(Notification.objects.all()) == [kept]
+
+    def test_max_batches_bounds_the_run(self, user):
+        for _ in range(5):
+            make_notification(user, 40)
+
+        result = prune_notifications(batch_size=2, archive=False, max_batches=1)
+
+        assert result["deleted"] == 2
+        assert Notification.objects.count() == 3
+
+    def test_dry_run_keeps_rows(self, user):
+        make_notification(user, 40)
+
+        result = prune_notifications(dry_run=True)
+
+        assert result["expired"] == 1
+        assert Notification.objects.count() == 1
+
+    def test_archive_round_trip(self, user):
+        old = make_notification(user, 40, title="Archived")
+
+        result = prune_notifications()
+
+        assert len(result["archives"]) == 1
+        [row] = list(read_archive(result["archives"][0]))
+        assert row["id"] == old.id
+        assert row["user_id"] == user.id
+        assert row["title"] == "Archived"
+        assert row["created_at"] == int(old.created_at.timestamp())
+
+    def test_broadcast_receipts_removed(self, user):
+        broadcast = broadcast_notification(Notification.AUDIENCE_ALL, "system", "Old broadcast")
+        mark_notification_read(broadcast, user)
+        Notification.objects.filter(pk=broadcast.pk).update(
+            created_at=timezone.now() - timedelta(days=40)
+        )
+
+        prune_notifications(archive=False)
+
+        assert not NotificationReceipt.objects.exists()
+
+    def test_refreshes_read_state_once_per_user(
+        self, user, monkeypatch, django_capture_on_commit_callbacks
+    ):
+        for _ in range(5):
+            make_notification(user, 40)
+        refreshed = []
+        monkeypatch.setattr(broker, "publish_state_change", refreshed.append)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            prune_notifications(batch_size=2, archive=False)
+
+        assert refreshed == [user.pk]
+
+
+@pytest.mark.django_db
+class TestPruneNotificationsCommand:
+    """Tests for the prune_notifications management command."""
+
+    def test_reports_sizes_before_and_after(self, user):
+        make_notification(user, 40)
+        out = StringIO()
+
+        call_command("prune_notifications", "--no-archive", stdout=out)
+
+        output = out.getvalue()
+        assert "=== Before ===" in output
+        assert "=== After ===" in output
+        assert "Deleted 1 of 1" in output
+        assert "notifications:" in output
+
+    def test_table_sizes(self, user):
+        make_notification(user, 1)
+
+        sizes = get_table_sizes()
+
+        assert sizes["rows"] == 1
@@ -5,8 +5,16 @@ Tests for Notification services.
 import pytest
 
 from apps.authentication.models import User
-from apps.notifications.models import Notification
-from apps.notifications.services import create_notification, notify_admins
+from apps.notifications.models import Notification, NotificationReceipt, NotificationWatermark
+from apps.notifications.services import (
+    broadcast_notification,
+    create_notification,
+    delete_notification,
+    get_user_notifications,
+    mark_all_notifications_read,
+    mark_notification_read,
+    notify_admins,
+)
 
 
 @pytest.mark.django_db
@@ -64,7 +72,7 @@ class TestNotifyAdmins:
     """Tests for notify_admins service function."""
 
     def test_notify_admins_creates_notifications(self, admin_user, super_admin_user, create_user):
-        """Test that notify_admins creates notifications for admin roles."""
+        """Test that notify_admins creates one broadcast visible to admin roles."""
         # Create a ministry_leader (not included in admin notifications)
         ministry_leader = create_user(
             username="ministry_leader_test",
@@ -72,22 +80,23 @@ class TestNotifyAdmins:
             role="ministry_leader",
         )
 
-        notifications = notify_admins(
+        notification = notify_admins(
             notification_type="system",
             title="Admin Alert",
             message="Attention needed",
             link="/admin",
         )
 
-        # Should create for admin and super_admin, not for ministry_leader
-        assert len(notifications) >= 2
+        # Stored once, not once per admin
+        assert notification.is_broadcast
+        assert Notification.objects.filter(title="Admin Alert").count() == 1
 
-        # Verify admin got notification
-        assert Notification.objects.filter(user=admin_user, title="Admin Alert").exists()
-        assert Notification.objects.filter(user=super_admin_user, title="Admin Alert").exists()
+        # Verify admins see the notification
+        assert get_user_notifications(admin_user).filter(title="Admin Alert").exists()
+        assert get_user_notifications(super_admin_user).filter(title="Admin Alert").exists()
 
         # Ministry leader should NOT get notification
-        assert not Notification.objects.filter(user=ministry_leader, title="Admin Alert").exists()
+        assert not get_user_notifications(ministry_leader).filter(title="Admin Alert").exists()
 
     def test_notify_admins_includes_pastors(self, create_user):
         """Test that notify_admins includes pastor role."""
@@ -102,16 +111,69 @@ class TestNotifyAdmins:
             title="Pastor Alert",
         )
 
-        assert Notification.objects.filter(user=pastor, title="Pastor Alert").exists()
+        assert get_user_notifications(pastor).filter(title="Pastor Alert").exists()
 
-    def test_notify_admins_returns_empty_if_no_admins(self, db):
+    def test_notify_admins_returns_none_if_no_admins(self, db):
         """Test notify_admins when no admin users exist."""
         # Delete all admin/pastor users
         User.objects.filter(role__in=["admin", "super_admin", "pastor"]).delete()
 
-        notifications = notify_admins(
+        notification = notify_admins(
             notification_type="system",
             title="No Recipients",
         )
 
-        assert notifications == []
+        assert notification is None
+        assert not Notification.objects.filter(title="No Recipients").exists()
+
+
+@pytest.mark.django_db
+class TestBroadcastNotifications:
+    """Tests for fan-out-on-read broadcasts and per-user read state."""
+
+    @pytest.fixture
+    def broadcast(self, user, admin_user):
+        return broadcast_notification(
+            Notification.AUDIENCE_ALL, "announcement", "Sunday Service", link="/announcements"
+        )
+
+    def test_broadcast_visible_to_audience(self, user, admin_user, broadcast):
+        assert get_user_notifications(user).filter(pk=broadcast.pk).exists()
+        assert get_user_notifications(admin_user).filter(pk=broadcast.pk).exists()
+
+    def test_broadcast_hidden_from_users_who_joined_later(self, broadcast, create_user):
+        newcomer = create_user(username="newcomer", email="newcomer@example.com")
+
+        assert not get_user_notifications(newcomer).filter(pk=broadcast.pk).exists()
+
+    def test_read_receipt_is_per_user(self, user, admin_user, broadcast):
+        mark_notification_read(broadcast, user)
+
+        assert get_user_notifications(user).get(pk=broadcast.pk).is_read is True
+        assert get_user_notifications(admin_user).get(pk=broadcast.pk).is_read is False
+        broadcast.refresh_from_db()
+        assert broadcast.read is False
+
+    def test_mark_all_read_uses_watermark(self, user, broadcast):
+        create_notification(user, "system", "Personal")
+
+        count = mark_all_notifications_read(user)
+
+        assert count == 2
+        assert not get_user_notifications(user).filter(is_read=False).exists()
+        assert NotificationWatermark.objects.filter(user=user).exists()
+        assert not NotificationReceipt.objects.filter(user=user).exists()
+
+    def test_broadcast_after_watermark_is_unread(self, user, broadcast):
+        mark_all_notifications_read(user)
+
+        later = broadcast_notification(Notification.AUDIENCE_ALL, "system", "Later")
+
+        unread = get_user_notifications(user).filter(is_read=False)
+        assert list(unread) == [later]
+
+    def test_delete_broadcast_only_hides_for_user(self, user, admin_user, broadcast):
+        delete_notification(broadcast, user)
+
+        assert not get_user_notifications(user).filter(pk=broadcast.pk).exists()
+        assert get_user_notifications(admin_user).filter(pk=broadcast.pk).exists()
@@ -0,0 +1,244 @@
+"""
+Tests for the notification Server-Sent Events stream.
+"""
+
+import asyncio
+from datetime import timedelta
+
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from django.test import AsyncClient
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.authentication.models import User
+from apps.notifications.models import Notification
+from apps.notifications.services import (
+    broadcast_notification,
+    create_notification,
+    mark_all_notifications_read,
+)
+from apps.notifications.stream import NotificationBroker, broker, make_stream_ticket
+
+
+@pytest.fixture(autouse=True)
+def no_poller(settings):
+    """Streams in tests are fed explicitly; never start the polling thread."""
+    settings.NOTIFICATION_STREAM_POLL_INTERVAL = 0
+
+
+def access_token(user):
+    return str(RefreshToken.for_user(user).access_token)
+
+
+async def next_event(stream):
+    return (await asyncio.wait_for(anext(stream), timeout=2)).decode()
+
+
+@pytest.mark.django_db
+class TestNotificationStreamEndpoint:
+    """Tests for GET /api/notifications/stream/"""
+
+    def test_requires_token(self, api_client):
+        response = api_client.get(reverse("notification-stream"))
+
+        assert response.status_code == 401
+
+    def test_invalid_ticket(self, api_client):
+        response = api_client.get(reverse("notification-stream"), {"ticket": "bogus"})
+
+        assert response.status_code == 401
+
+    def test_access_token_not_accepted_in_url(self, api_client, user):
+        response = api_client.get(reverse("notification-stream"), {"token": access_token(user)})
+
+        assert response.status_code == 401
+
+    def test_ticket_is_single_use(self, auth_client, api_client):
+        ticket = auth_client.post(reverse("notification-stream-ticket")).data["ticket"]
+        api_client.credentials()
+
+        first = api_client.get(reverse("notification-stream"), {"ticket": ticket})
+        second = api_client.get(reverse("notification-stream"), {"ticket": ticket})
+
+        assert first.status_code == 200
+        assert second.status_code == 401
+
+    def test_ticket_expires(self, api_client, user, settings):
+        ticket = make_stream_ticket(user)
+        settings.NOTIFICATION_STREAM_TICKET_TTL = -1
+
+        response = api_client.get(reverse("notification-stream"), {"ticket": ticket})
+
+        assert response.status_code == 401
+
+    def test_header_token_still_works(self, api_client, user):
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {access_token(user)}")
+
+        assert api_client.get(reverse("notification-stream")).status_code == 200
+
+    def test_pushes_unread_count_and_new_notifications(self, user, notification):
+        ticket = make_stream_ticket(user)
+
+        async def run():
+            response = await AsyncClient().get(reverse("notification-stream"), {"ticket": ticket})
+            assert response["Content-Type"] == "text/event-stream"
+            stream = aiter(response.streaming_content)
+
+            first = await next_event(stream)
+            assert "event: unread_count" in first
+            assert '"unread_count": 1' in first
+
+            new = await sync_to_async(create_notification)(user, "system", "Pushed")
+            await sync_to_async(broker.publish)(new)
+
+            pushed = await next_event(stream)
+            assert "event: notification" in pushed
+            assert f"id: {new.id}" in pushed
+            assert '"title": "Pushed"' in pushed
+            assert '"unread_count": 2' in await next_event(stream)
+
+            await sync_to_async(mark_all_notifications_read)(user)
+            await sync_to_async(broker.publish_state_change)(user.pk)
+            assert '"unread_count": 0' in await next_event(stream)
+
+            await stream.aclose()
+
+        async_to_sync(run)()
+        assert broker.subscriber_count == 0
+
+    def test_wsgi_degrades_to_single_event(self, api_client, user, notification):
+        response = api_client.get(
+            reverse("notification-stream"), {"ticket": make_stream_ticket(user)}
+        )
+
+        body = b"".join(response.streaming_content).decode()
+        assert "retry: 30000" in body
+        assert '"unread_count": 1' in body
+
+
+@pytest.mark.django_db
+class TestNotificationBroker:
+    """Tests for routing and the DB-polling fallback."""
+
+    @pytest.fixture
+    def loop(self):
+        loop = asyncio.new_event_loop()
+        yield loop
+        loop.close()
+
+    def subscribe(self, stream_broker, user, loop):
+        queue = asyncio.Queue()
+        stream_broker.subscribe(user, queue, loop)
+        return queue
+
+    def drain(self, loop, queue):
+        loop.run_until_complete(asyncio.sleep(0))
+        events = []
+        while not queue.empty():
+            events.append(queue.get_nowait())
+        return events
+
+    def test_poll_publishes_rows_from_other_workers(self, user, loop):
+        stream_broker = NotificationBroker()
+        queue = self.subscribe(stream_broker, user, loop)
+        stream_broker.poll_once()
+
+        # bulk_create sends no signals, like a row written by another process
+        create_notification(User.objects.filter(pk=user.pk), "system", "From elsewhere")
+        assert stream_broker.poll_once() == 1
+
+        events = self.drain(loop, queue)
+        assert [e["data"]["title"] for e in events] == ["From elsewhere"]
+
+    def test_each_notification_published_once(self, user, loop):
+        stream_broker = NotificationBroker()
+        queue = self.subscribe(stream_broker, user, loop)
+        stream_broker.poll_once()
+
+        notification = create_notification(user, "system", "Hello")
+        stream_broker.publish(notification)
+        stream_broker.poll_once()
+
+        assert len(self.drain(loop, queue)) == 1
+
+    def test_broadcasts_routed_by_audience(self, user, create_user, loop):
+        leader = create_user(username="leader", email="leader@example.com", role="ministry_leader")
+        stream_broker = NotificationBroker()
+        pastor_queue = self.subscribe(stream_broker, user, loop)
+        leader_queue = self.subscribe(stream_broker, leader, loop)
+
+        stream_broker.publish(
+            broadcast_notification(Notification.AUDIENCE_ADMINS, "system", "Admins")
+        )
+        stream_broker.publish(broadcast_notification(Notification.AUDIENCE_ALL, "system", "All"))
+
+        assert [e["data"]["title"] for e in self.drain(loop, pastor_queue)] == ["Admins", "All"]
+        assert [e["data"]["title"] for e in self.drain(loop, leader_queue)] == ["All"]
+
+    def test_personal_notifications_only_reach_owner(self, user, admin_user, loop):
+        stream_broker = NotificationBroker()
+        admin_queue = self.subscribe(stream_broker, admin_user, loop)
+
+        stream_broker.publish(create_notification(user, "system", "Private"))
+
+        assert self.drain(loop, admin_queue) == []
+
+    def test_poll_picks_up_rows_that_commit_late(self, user, loop):
+        stream_broker = NotificationBroker()
+        queue = self.subscribe(stream_broker, user, loop)
+        stream_broker.poll_once()
+        stream_broker.poll_once()
+
+        # Stamped before the last poll, visible only after it (a slow transaction)
+        create_notification(User.objects.filter(pk=user.pk), "system", "Late commit")
+        Notification.objects.filter(title="Late commit").update(
+            created_at=timezone.now() - timedelta(seconds=3)
+        )
+
+        assert stream_broker.poll_once() == 1
+        assert stream_broker.poll_once() == 0
+        assert [e["data"]["title"] for e in self.drain(loop, queue)] == ["Late commit"]
+
+    def test_poll_resumes_from_reconnect_after_idle_gap(self, user, loop):
+        stream_broker = NotificationBroker()
+        first = stream_broker.subscribe(user, asyncio.Queue(), loop)
+        stream_broker.poll_once()
+        stream_broker.unsubscribe(first)
+
+        # Created elsewhere while nobody was listening; the reconnecting
+        # client counts it in its initial unread count
+        create_notification(User.objects.filter(pk=user.pk), "system", "While idle")
+        queue = self.subscribe(stream_broker, user, loop)
+
+        assert stream_broker.poll_once() == 0
+        assert self.drain(loop, queue) == []
+
+    def test_poll_pushes_read_state_changed_elsewhere(
+        self, user, notification, loop, django_capture_on_commit_callbacks
+    ):
+        stream_broker = NotificationBroker()
+        queue = self.subscribe(stream_broker, user, loop)
+        stream_broker.poll_once()
+
+        # Another worker marks everything read
+        with django_capture_on_commit_callbacks(execute=True):
+            mark_all_notifications_read(user)
+        stream_broker.poll_once()
+
+        assert self.drain(loop, queue) == [{"type": "state", "unread_count": 0}]
+        stream_broker.poll_once()
+        assert self.drain(loop, queue) == []
+
+    def test_unread_count_computed_once_per_user(
+        self, user, notification, loop, django_assert_num_queries
+    ):
+        stream_broker = NotificationBroker()
+        queues = [self.subscribe(stream_broker, user, loop) for _ in range(3)]
+
+        with django_assert_num_queries(1):
+            stream_broker.publish_state_change(user.pk)
+
+        for queue in queues:
+            assert self.drain(loop, queue) == [{"type": "state", "unread_count": 1}]
@@ -138,9 +138,9 @@ class TestPrayerRequestAssignment:
 
         assert response.status_code == status.HTTP_400_BAD_REQUEST
 
-    @patch("apps.prayer_requests.services.send_mail")
+    @patch("apps.prayer_requests.services.queue_email")
     def test_assignment_sends_notification(
-        self, mock_send_mail, admin_client, prayer_request, pastor_user
+        self, mock_queue_email, admin_client, prayer_request, pastor_user
     ):
         """Test that assignment triggers notification."""
         url = reverse("prayer-request-assign", kwargs={"pk": prayer_request.pk})
@@ -150,7 +150,7 @@ class TestPrayerRequestAssignment:
             format="json",
         )
 
-        mock_send_mail.assert_called_once()
+        mock_queue_email.assert_called_once()
 
 
 # =============================================================================
@@ -7,15 +7,15 @@ import pytest
 class TestPrayerRequestServices:
     """Tests for prayer request services."""
 
-    @patch("apps.prayer_requests.services.send_mail")
-    def test_notify_assignment_sends_email(self, mock_send_mail, assigned_prayer_request):
+    @patch("apps.prayer_requests.services.queue_email")
+    def test_notify_assignment_sends_email(self, mock_queue_email, assigned_prayer_request):
         """Test that notify_assignment sends an email."""
         from apps.prayer_requests.services import notify_assignment
 
         result = notify_assignment(assigned_prayer_request)
 
         assert result is True
-        mock_send_mail.assert_called_once()
+        mock_queue_email.assert_called_once()
 
     def test_notify_assignment_no_assignee(self, prayer_request):
         """Test notify_assignment when no assigned user."""
@@ -0,0 +1,135 @@
+"""
+Tests for the kanban board endpoint (GET /api/tasks/board/).
+"""
+
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from apps.tasks.models import Task
+
+
+@pytest.fixture
+def board_tasks(admin_user, user, ministry):
+    today = timezone.now().date()
+    priorities = ["low", "medium", "high", "urgent"]
+    return Task.objects.bulk_create(
+        Task(
+            title=f"{state} {i}",
+            status=state,
+            priority=priorities[i % 4],
+            start_date=today - timedelta(days=30),
+            end_date=today + timedelta(days=i + 1),
+            created_by=admin_user,
+            assigned_to=user,
+            ministry=ministry,
+        )
+        for state, count in [("pending", 25), ("in_progress", 7), ("completed", 3)]
+        for i in range(count)
+    )
+
+
+def column(response, state):
+    return next(c for c in response.data["columns"] if c["status"] == state)
+
+
+@pytest.mark.django_db
+class TestTaskBoard:
+    """Tests for board columns, paging and visibility."""
+
+    def test_all_columns_in_one_query(self, admin_client, board_tasks):
+        url = reverse("task-board")
+        admin_client.get(url)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = admin_client.get(url, {"limit": 10})
+
+        assert response.status_code == status.HTTP_200_OK
+        task_queries = [q["sql"] for q in queries.captured_queries if '"tasks"' in q["sql"]]
+        assert len(task_queries) == 1
+        assert "ROW_NUMBER() OVER" in task_queries[0]
+        assert [c["status"] for c in response.data["columns"]] == [
+            "pending",
+            "in_progress",
+            "completed",
+            "cancelled",
+            "overdue",
+        ]
+        pending = column(response, "pending")
+        assert len(pending["results"]) == 10 and pending["total"] == 25
+        assert pending["next"]
+        in_progress = column(response, "in_progress")
+        assert in_progress["total"] == 7 and in_progress["next"] is None
+        assert column(response, "cancelled") == {
+            "status": "cancelled",
+            "total": 0,
+            "next": None,
+            "results": [],
+        }
+
+    def test_columns_are_ordered_by_priority_then_end_date(self, admin_client, board_tasks):
+        response = admin_client.get(reverse("task-board"), {"columns": "in_progress"})
+
+        results = column(response, "in_progress")["results"]
+        assert [r["priority"] for r in results] == [
+            "urgent",
+            "high",
+            "high",
+            "medium",
+            "medium",
+            "low",
+            "low",
+        ]
+        assert results[1]["end_date"] < results[2]["end_date"]
+
+    def test_cursor_walks_a_column(self, admin_client, board_tasks):
+        url = reverse("task-board")
+        response = admin_client.get(url, {"limit": 10})
+        seen = [r["id"] for r in column(response, "pending")["results"]]
+
+        cursor = column(response, "pending")["next"]
+        while cursor:
+            response = admin_client.get(url, {"limit": 10, "cursor": cursor})
+            assert [c["status"] for c in response.data["columns"]] == ["pending"]
+            page = column(response, "pending")
+            assert page["total"] == 25
+            seen += [r["id"] for r in page["results"]]
+            cursor = page["next"]
+
+        assert len(seen) == len(set(seen)) == 25
+
+    def test_overdue_column_uses_effective_status(self, admin_client, board_tasks):
+        late = board_tasks[0]
+        Task.objects.filter(pk=late.pk).update(end_date=timezone.now().date() - timedelta(days=1))
+
+        response = admin_client.get(reverse("task-board"))
+
+        assert [r["id"] for r in column(response, "overdue")["results"]] == [late.pk]
+        assert column(response, "pending")["total"] == 24
+
+    def test_visibility_follows_task_list(self, api_client, create_user, board_tasks, admin_user):
+        other = create_user(username="helper", email="helper@example.com", role="multimedia")
+        today = timezone.now().date()
+        Task.objects.create(
+            title="Helper task",
+            start_date=today,
+            end_date=today + timedelta(days=3),
+            created_by=admin_user,
+            assigned_to=other,
+        )
+        api_client.force_authenticate(other)
+
+        response = api_client.get(reverse("task-board"))
+
+        assert sum(c["total"] for c in response.data["columns"]) == 1
+
+    @pytest.mark.parametrize("params", [{"limit": 0}, {"limit": "x"}, {"cursor": "%%%"}])
+    def test_bad_parameters(self, admin_client, params):
+        response = admin_client.get(reverse("task-board"), params)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
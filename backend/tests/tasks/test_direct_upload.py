@@ -0,0 +1,179 @@
+"""
+Tests for direct-to-storage attachment uploads (common/uploads.py).
+"""
+
+import pytest
+from django.core import signing
+from django.core.files.storage import default_storage
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.tasks.models import TaskAttachment
+from common.storage import R2Storage
+from common.uploads import SALT
+
+
+@pytest.fixture
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+def start(client, task, content=b"", name="budget.pdf"):
+    return client.post(
+        reverse("task-attachment-upload-url"),
+        {
+            "task": task.pk,
+            "file_name": name,
+            "content_type": "application/pdf",
+            "file_size": len(content),
+        },
+        format="json",
+    )
+
+
+def put(client, upload, content):
+    return client.generic(
+        "PUT", upload["url"], content, content_type=upload["headers"]["Content-Type"]
+    )
+
+
+def finalize(client, token):
+    return client.post(reverse("task-attachment-finalize"), {"token": token}, format="json")
+
+
+@pytest.mark.django_db
+class TestDirectUpload:
+    """Tests for upload_url -> PUT -> finalize."""
+
+    def test_full_flow(self, admin_client, task, media_root):
+        content = b"%PDF-1.4 quarterly budget"
+        started = start(admin_client, task, content)
+        assert started.status_code == status.HTTP_200_OK
+        upload = started.data["upload"]
+        assert upload["method"] == "PUT"
+
+        assert put(admin_client, upload, content).status_code == status.HTTP_204_NO_CONTENT
+        response = finalize(admin_client, started.data["token"])
+
+        assert response.status_code == status.HTTP_201_CREATED
+        attachment = TaskAttachment.objects.get(pk=response.data["id"])
+        assert attachment.task == task
+        assert attachment.file_name == "budget.pdf"
+        assert attachment.file_size == len(content)
+        assert attachment.content_type == "application/pdf"
+        assert attachment.file.name.startswith("task_attachments/")
+        with default_storage.open(attachment.file.name) as stored:
+            assert stored.read() == content
+
+    def test_files_over_the_form_limit(self, admin_client, task, media_root, settings):
+        content = b"x" * (settings.DATA_UPLOAD_MAX_MEMORY_SIZE + 1024)
+        started = start(admin_client, task, content)
+
+        assert put(admin_client, started.data["upload"], content).status_code == 204
+        response = finalize(admin_client, started.data["token"])
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data["file_size"] == len(content)
+
+    def test_finalize_without_upload(self, admin_client, task, media_root):
+        started = start(admin_client, task)
+
+        response = finalize(admin_client, started.data["token"])
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert not TaskAttachment.objects.exists()
+
+    def test_finalize_twice(self, admin_client, task, media_root):
+        started = start(admin_client, task, b"data")
+        put(admin_client, started.data["upload"], b"data")
+        finalize(admin_client, started.data["token"])
+
+        response = finalize(admin_client, started.data["token"])
+
+        assert response.status_code == status.HTTP_409_CONFLICT
+        assert TaskAttachment.objects.count() == 1
+
+    def test_put_after_finalize_refused(self, admin_client, task, media_root):
+        started = start(admin_client, task, b"original")
+        put(admin_client, started.data["upload"], b"original")
+        attachment = TaskAttachment.objects.get(
+            pk=finalize(admin_client, started.data["token"]).data["id"]
+        )
+
+        response = put(admin_client, started.data["upload"], b"replaced")
+
+        assert response.status_code == status.HTTP_409_CONFLICT
+        with default_storage.open(attachment.file.name) as stored:
+            assert stored.read() == b"original"
+
+    def test_oversize_upload_is_removed(self, admin_client, task, media_root, settings):
+        started = start(admin_client, task, b"small")
+        put(admin_client, started.data["upload"], b"x" * 100)
+        settings.DIRECT_UPLOAD_MAX_SIZE = 50
+
+        response = finalize(admin_client, started.data["token"])
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert not any(media_root.rglob("*.pdf"))
+
+    def test_declared_size_is_checked(self, admin_client, task, settings):
+        settings.DIRECT_UPLOAD_MAX_SIZE = 10
+
+        response = start(admin_client, task, b"x" * 11)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_tampered_token(self, admin_client, task, media_root):
+        started = start(admin_client, task, b"data")
+        claims = signing.loads(started.data["token"], salt=SALT)
+        forged = signing.dumps({**claims, "key": "../settings.py"}, salt="other")
+
+        upload = {**started.data["upload"], "url": reverse("direct-upload", args=[forged])}
+
+        assert put(admin_client, upload, b"data").status_code == status.HTTP_400_BAD_REQUEST
+        assert finalize(admin_client, forged).status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_token_is_bound_to_the_user(self, admin_client, user, task, media_root):
+        started = start(admin_client, task, b"data")
+        put(admin_client, started.data["upload"], b"data")
+        other = APIClient()
+        other.force_authenticate(user)
+
+        response = finalize(other, started.data["token"])
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_expired_token(self, admin_client, task, media_root, settings):
+        started = start(admin_client, task, b"data")
+        settings.DIRECT_UPLOAD_EXPIRY = -1
+
+        response = finalize(admin_client, started.data["token"])
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data["detail"] == "Upload expired"
+
+    def test_unknown_task(self, admin_client, task):
+        response = admin_client.post(
+            reverse("task-attachment-upload-url"),
+            {"task": 99999, "file_name": "a.pdf", "file_size": 1},
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_r2_presigned_put(settings):
+    settings.USE_R2_STORAGE = True
+    settings.R2_ENDPOINT_URL = "https://account.r2.cloudflarestorage.com"
+    settings.R2_ACCESS_KEY_ID = "key"
+    settings.R2_SECRET_ACCESS_KEY = "secret"
+    settings.R2_BUCKET_NAME = "sbcc-files"
+    settings.R2_PUBLIC_URL = "https://files.example.com"
+
+    url = R2Storage().presigned_put("task_attachments/a.pdf", "application/pdf", 600)
+
+    assert url.startswith("https://")
+    assert "task_attachments/a.pdf" in url
+    assert "X-Amz-Signature=" in url and "X-Amz-Expires=600" in url
@@ -0,0 +1,125 @@
+"""
+Tests for overdue-status maintenance and bulk task writes.
+"""
+
+from datetime import timedelta
+
+import pytest
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.db.models import F
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.tasks.models import Task, effective_status_expression
+from apps.tasks.services import bulk_create_tasks, bulk_update_tasks, update_overdue_tasks
+
+
+def days(n):
+    return timezone.now().date() + timedelta(days=n)
+
+
+@pytest.mark.django_db
+class TestEffectiveStatus:
+    """Tests for the overdue expression and the maintained status."""
+
+    def test_expression_matches_property(self, task_factory):
+        task_factory(title="Open", status_val="pending")
+        task_factory(title="Late", days_offset_start=-9, days_offset_end=-1)
+        task_factory(title="Done", days_offset_start=-9, days_offset_end=-1, progress=100)
+        late = task_factory(title="Unflipped", days_offset_start=-9, days_offset_end=3)
+        Task.objects.filter(pk=late.pk).update(end_date=days(-1))
+
+        annotated = Task.objects.annotate(current_status=effective_status_expression())
+
+        for task in annotated:
+            assert task.current_status == Task.objects.get(pk=task.pk).effective_status
+        assert annotated.get(pk=late.pk).current_status == "overdue"
+
+    def test_list_reports_overdue_before_the_flip(self, admin_client, task):
+        Task.objects.filter(pk=task.pk).update(end_date=days(-1))
+
+        response = admin_client.get(reverse("task-list"))
+
+        assert response.data["results"][0]["status"] == "pending"
+        assert response.data["results"][0]["effective_status"] == "overdue"
+
+    def test_cancel_returns_fresh_status(self, admin_client, overdue_task):
+        response = admin_client.post(reverse("task-cancel", kwargs={"pk": overdue_task.pk}))
+
+        assert response.data["effective_status"] == "cancelled"
+
+    def test_save_runs_no_validation_queries(self, task, django_assert_num_queries):
+        task.title = "Renamed"
+
+        with django_assert_num_queries(1):
+            task.save()
+
+    def test_save_still_checks_timeline(self, task):
+        task.end_date = task.start_date - timedelta(days=1)
+
+        with pytest.raises(ValidationError):
+            task.save()
+
+    def test_scheduled_flip_and_revert(self, task_factory):
+        late = task_factory(title="Late", days_offset_start=-9, days_offset_end=3)
+        extended = task_factory(
+            title="Extended", days_offset_start=-9, days_offset_end=-2, progress=40
+        )
+        Task.objects.filter(pk=late.pk).update(end_date=days(-1))
+        Task.objects.filter(pk=extended.pk).update(end_date=F("end_date") + timedelta(days=10))
+
+        assert update_overdue_tasks() == 1
+
+        late.refresh_from_db()
+        extended.refresh_from_db()
+        assert late.status == "overdue"
+        assert extended.status == "in_progress"
+
+
+@pytest.mark.django_db
+class TestBulkWrites:
+    """Tests for bulk_create_tasks and bulk_update_tasks."""
+
+    def build(self, count, admin_user, **kwargs):
+        fields = {"start_date": days(-5), "end_date": days(5), "created_by": admin_user}
+        fields.update(kwargs)
+        return [Task(title=f"Imported {i}", **fields) for i in range(count)]
+
+    def test_import_with_constant_queries(self, admin_user, user, ministry):
+        tasks = self.build(300, admin_user, assigned_to=user, ministry=ministry)
+        tasks[0].end_date = days(-1)
+
+        with CaptureQueriesContext(connection) as queries:
+            bulk_create_tasks(tasks)
+
+        # users + ministries; the INSERTs are batched by the backend
+        selects = [q for q in queries.captured_queries if q["sql"].startswith("SELECT")]
+        assert len(selects) == 2
+        assert Task.objects.count() == 300
+        assert Task.objects.filter(status="overdue").count() == 1
+
+    def test_invalid_rows_are_reported_together(self, admin_user):
+        tasks = self.build(3, admin_user)
+        tasks[0].end_date = days(-10)
+        tasks[2].assigned_to_id = 99999
+
+        with pytest.raises(ValidationError) as exc_info:
+            bulk_create_tasks(tasks)
+
+        assert set(exc_info.value.error_dict) == {"0", "2"}
+        assert not Task.objects.exists()
+
+    def test_skip_validation(self, admin_user, django_assert_num_queries):
+        with django_assert_num_queries(1):
+            bulk_create_tasks(self.build(10, admin_user), validate=False)
+
+    def test_bulk_update_derives_status(self, task_factory):
+        tasks = [task_factory(title=f"Task {i}") for i in range(3)]
+        for task in tasks:
+            task.progress_percentage = 100
+
+        bulk_update_tasks(tasks, ["progress_percentage"])
+
+        assert Task.objects.filter(status="completed", completed_at__isnull=False).count() == 3
@@ -0,0 +1,105 @@
+"""
+Tests for per-action query planning on TaskViewSet (common/querysets.py).
+"""
+
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from apps.tasks.models import Task, TaskComment
+from apps.tasks.views import TaskViewSet
+
+
+def make_tasks(count, created_by, assigned_to=None, ministry=None):
+    today = timezone.now().date()
+    return Task.objects.bulk_create(
+        Task(
+            title=f"Task {i}",
+            description="Collect the offering reports and file them with the treasurer.",
+            start_date=today,
+            end_date=today + timedelta(days=7),
+            created_by=created_by,
+            assigned_to=assigned_to,
+            ministry=ministry,
+        )
+        for i in range(count)
+    )
+
+
+def transferred(queryset):
+    """Characters of row data the database sends back for ``queryset``."""
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return sum(len(str(value)) for row in cursor.fetchall() for value in row)
+
+
+@pytest.mark.django_db
+class TestTaskQueryPlans:
+    """Query counts per action."""
+
+    def test_list_is_constant(self, admin_client, admin_user, user, ministry):
+        url = reverse("task-list")
+        make_tasks(3, admin_user, user, ministry)
+        admin_client.get(url)
+
+        with CaptureQueriesContext(connection) as few:
+            admin_client.get(url, {"page_size": 50})
+        make_tasks(40, admin_user, user, ministry)
+        with CaptureQueriesContext(connection) as many:
+            response = admin_client.get(url, {"page_size": 50})
+
+        assert response.data["count"] == 43
+        assert len(many) == len(few) <= 3
+        assert not any("task_comments" in query["sql"] for query in many.captured_queries)
+
+    def test_retrieve_prefetches_nested_rows(
+        self, admin_client, task, task_attachment, admin_user, user, django_assert_num_queries
+    ):
+        url = reverse("task-detail", kwargs={"pk": task.pk})
+        admin_client.get(url)
+        for commenter in (admin_user, user, admin_user):
+            TaskComment.objects.create(task=task, user=commenter, comment="Update")
+
+        # user + task + comments (with users) + attachments (with uploaders)
+        with django_assert_num_queries(4):
+            response = admin_client.get(url)
+
+        assert len(response.data["comments"]) == 3
+        assert response.data["comments"][0]["user_name"]
+        assert len(response.data["attachments"]) == 1
+
+    def test_destroy_loads_no_relations(self, admin_client, task):
+        viewset = TaskViewSet(action="destroy")
+
+        plan = viewset.get_query_plan()
+
+        assert plan.select == [] and plan.prefetch == []
+
+    def test_ministry_leader_filter_is_one_condition(
+        self, ministry_leader_client, ministry_leader_user, ministry, admin_user
+    ):
+        ministry.leader = ministry_leader_user
+        ministry.save()
+        make_tasks(2, admin_user, ministry=ministry)
+        make_tasks(1, admin_user, assigned_to=ministry_leader_user)
+        make_tasks(3, admin_user)
+
+        response = ministry_leader_client.get(reverse("task-list"))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["count"] == 3
+
+    def test_list_plan_transfers_less(self, admin_user, user, ministry):
+        make_tasks(10_000, admin_user, user, ministry)
+        queryset = Task.objects.all()
+
+        listed = transferred(TaskViewSet.query_plans["list"].apply(queryset))
+        detailed = transferred(TaskViewSet.query_plans["default"].apply(queryset))
+
+        assert listed < detailed / 2
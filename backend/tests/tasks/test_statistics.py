@@ -0,0 +1,131 @@
+"""
+Tests for cached task statistics and the combined dashboard endpoint.
+"""
+
+from datetime import timedelta
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from apps.ministries.models import Ministry
+from apps.tasks.models import Task
+from apps.tasks.services import get_task_statistics, update_overdue_tasks
+
+
+@pytest.fixture
+def dashboard_tasks(task, in_progress_task, overdue_task, completed_task):
+    return task, in_progress_task, overdue_task, completed_task
+
+
+@pytest.mark.django_db
+class TestTaskStatistics:
+    """Tests for get_task_statistics."""
+
+    def test_counters_in_one_query(self, dashboard_tasks, django_assert_num_queries):
+        with django_assert_num_queries(1):
+            stats = get_task_statistics()
+
+        # completed_task finished 10 days ago, which may be last month
+        assert stats.pop("completed_this_month") in (0, 1)
+        assert stats == {
+            "total": 4,
+            "by_status": {"pending": 1, "in_progress": 1, "overdue": 1, "completed": 1},
+            "by_priority": {"medium": 1, "high": 2, "urgent": 1},
+            "overdue": 1,
+            "due_this_week": 1,
+        }
+
+    def test_cached_until_scope_changes(self, dashboard_tasks, ministry, django_assert_num_queries):
+        task = dashboard_tasks[0]
+        other = Ministry.objects.create(name="Outreach")
+        get_task_statistics(ministry=ministry)
+        get_task_statistics(ministry=other.pk)
+
+        with django_assert_num_queries(0):
+            get_task_statistics(ministry=str(ministry.pk))
+
+        task.title = "Renamed"
+        task.save()
+        with django_assert_num_queries(0):
+            get_task_statistics(ministry=other)
+        with django_assert_num_queries(1):
+            assert get_task_statistics(ministry=ministry)["total"] == 4
+
+    def test_moving_task_invalidates_both_scopes(self, dashboard_tasks, ministry):
+        other = Ministry.objects.create(name="Outreach")
+        get_task_statistics(ministry=ministry)
+        get_task_statistics(ministry=other)
+
+        task = Task.objects.get(pk=dashboard_tasks[0].pk)
+        task.ministry = other
+        task.save()
+
+        assert get_task_statistics(ministry=ministry)["total"] == 3
+        assert get_task_statistics(ministry=other)["total"] == 1
+
+    def test_assignee_scope(self, dashboard_tasks, user, admin_user):
+        assert get_task_statistics(assigned_to=user.pk)["total"] == 4
+        assert get_task_statistics(assigned_to=admin_user.pk)["total"] == 0
+
+        dashboard_tasks[0].assigned_to = admin_user
+        dashboard_tasks[0].save()
+
+        assert get_task_statistics(assigned_to=user.pk)["total"] == 3
+        assert get_task_statistics(assigned_to=admin_user.pk)["total"] == 1
+
+    def test_overdue_update_invalidates(self, task_factory):
+        task = task_factory(days_offset_start=-5, days_offset_end=3)
+        assert get_task_statistics()["overdue"] == 0
+
+        Task.objects.filter(pk=task.pk).update(end_date=timezone.now().date() - timedelta(days=1))
+        update_overdue_tasks()
+
+        assert get_task_statistics()["by_status"] == {"overdue": 1}
+
+
+@pytest.mark.django_db
+class TestDashboardEndpoint:
+    """Tests for GET /api/tasks/dashboard/"""
+
+    def test_lists_and_statistics(self, admin_client, dashboard_tasks):
+        response = admin_client.get(reverse("task-dashboard"), {"days": 7})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [t["title"] for t in response.data["upcoming"]] == [
+            "Prepare Sunday Service Materials"
+        ]
+        assert [t["title"] for t in response.data["overdue"]] == ["Submit Annual Report"]
+        assert [t["title"] for t in response.data["in_progress"]] == ["Update Church Website"]
+        assert response.data["statistics"]["total"] == 4
+
+    @pytest.mark.parametrize("days", ["week", "0", "-3"])
+    def test_invalid_days(self, admin_client, days):
+        for name in ("task-dashboard", "task-dashboard-upcoming"):
+            response = admin_client.get(reverse(name), {"days": days})
+
+            assert response.status_code == status.HTTP_400_BAD_REQUEST
+            assert response.data["detail"] == "days must be a positive integer"
+
+    def test_matches_widget_endpoints(self, admin_client, dashboard_tasks, ministry):
+        params = {"days": 3, "ministry": ministry.pk}
+        combined = admin_client.get(reverse("task-dashboard"), params).data
+
+        for name in ("upcoming", "overdue", "in_progress"):
+            widget = admin_client.get(reverse(f"task-dashboard-{name.replace('_', '-')}"), params)
+            assert combined[name] == widget.data
+
+    def test_fixed_query_count(
+        self, admin_client, task_factory, dashboard_tasks, django_assert_max_num_queries
+    ):
+        url = reverse("task-dashboard")
+        admin_client.get(url)  # authenticate and warm the statistics cache
+
+        for i in range(30):
+            task_factory(title=f"Extra {i}", status_val="in_progress")
+        admin_client.get(url)
+        with django_assert_max_num_queries(2):
+            response = admin_client.get(url)
+
+        assert len(response.data["in_progress"]) == 31
@@ -0,0 +1,160 @@
+"""
+Tests for the Brevo HTTP email backend (sbcc/brevo_backend.py),
+run against the local fake Brevo server.
+"""
+
+from datetime import date
+
+import pytest
+from django.core.mail import EmailMessage, EmailMultiAlternatives, get_connection
+from django.utils import timezone
+
+from apps.announcements.models import Announcement
+from apps.members.models import Member
+from apps.notifications.outbox import process_outbox
+from sbcc.email_testing import FakeBrevoServer
+
+
+@pytest.fixture
+def brevo(settings):
+    with FakeBrevoServer() as server:
+        settings.EMAIL_BACKEND = "sbcc.brevo_backend.BrevoEmailBackend"
+        settings.BREVO_API_KEY = server.api_key
+        settings.BREVO_API_URL = server.url
+        settings.DEFAULT_FROM_EMAIL = "SBCC <no-reply@example.com>"
+        yield server
+
+
+def messages(count, subject="Hello", body="Body"):
+    return [EmailMessage(subject, body, None, [f"member{i}@example.com"]) for i in range(count)]
+
+
+class TestBrevoBatching:
+    """Tests for grouping and batching."""
+
+    def test_identical_messages_sent_in_one_call(self, brevo):
+        connection = get_connection()
+
+        sent = connection.send_messages(messages(5))
+
+        assert sent == 5
+        assert len(brevo.requests) == 1
+        payload = brevo.requests[0]
+        assert payload["sender"] == {"name": "SBCC", "email": "no-reply@example.com"}
+        assert len(payload["messageVersions"]) == 5
+        assert "to" not in payload
+        assert brevo.recipients == [f"member{i}@example.com" for i in range(5)]
+
+    def test_single_message_uses_plain_payload(self, brevo):
+        get_connection().send_messages(messages(1))
+
+        assert brevo.requests[0]["to"] == [{"email": "member0@example.com"}]
+        assert "messageVersions" not in brevo.requests[0]
+
+    def test_different_content_sent_separately(self, brevo):
+        batch = messages(2, subject="A") + messages(2, subject="B")
+
+        sent = get_connection().send_messages(batch)
+
+        assert sent == 4
+        assert sorted(p["subject"] for p in brevo.requests) == ["A", "B"]
+
+    def test_html_alternative(self, brevo):
+        message = EmailMultiAlternatives("Hi", "Plain", None, ["a@example.com"])
+        message.attach_alternative("<p>Html</p>", "text/html")
+
+        get_connection().send_messages([message])
+
+        assert brevo.requests[0]["htmlContent"] == "<p>Html</p>"
+        assert brevo.requests[0]["textContent"] == "Plain"
+
+    def test_batch_size_limits_versions_per_call(self, brevo, settings):
+        settings.BREVO_BATCH_SIZE = 2
+
+        sent = get_connection().send_messages(messages(5))
+
+        assert sent == 5
+        assert sorted(len(p.get("messageVersions", [p])) for p in brevo.requests) == [1, 2, 2]
+
+    def test_calls_run_concurrently_and_reuse_connections(self, brevo, settings):
+        settings.BREVO_BATCH_SIZE = 1
+        settings.BREVO_MAX_WORKERS = 4
+        brevo.latency = 0.05
+
+        sent = get_connection().send_messages(messages(12))
+
+        assert sent == 12
+        assert 1 < brevo.max_in_flight <= 4
+        # Keep-alive pool: far fewer TCP connections than requests
+        assert brevo.connections <= 4
+
+
+class TestBrevoResults:
+    """Tests for per-recipient results and errors."""
+
+    def test_results_per_recipient(self, brevo):
+        connection = get_connection()
+
+        connection.send_messages(messages(3))
+
+        assert [r["status"] for r in connection.results] == ["sent"] * 3
+        assert all(r["message_id"] for r in connection.results)
+
+    def test_failed_call_reported(self, brevo, settings):
+        settings.BREVO_BATCH_SIZE = 1
+        brevo.fail_recipients = {"member1@example.com"}
+        connection = get_connection(fail_silently=True)
+
+        sent = connection.send_messages(messages(3))
+
+        assert sent == 2
+        failed = [r["email"] for r in connection.results if r["status"] == "failed"]
+        assert failed == ["member1@example.com"]
+
+    def test_failure_raises_unless_silent(self, brevo):
+        brevo.fail_status = 400
+
+        with pytest.raises(Exception, match="Brevo API error"):
+            get_connection().send_messages(messages(2))
+
+    def test_missing_api_key(self, brevo, settings):
+        settings.BREVO_API_KEY = ""
+
+        with pytest.raises(ValueError):
+            get_connection().send_messages(messages(1))
+
+
+@pytest.mark.django_db
+class TestAnnouncementEmailOverBrevo:
+    """Queued announcement emails are delivered as one Brevo batch call."""
+
+    def test_announcement_sent_in_one_call(
+        self, brevo, admin_user, django_capture_on_commit_callbacks
+    ):
+        from apps.announcements.services import delivery_progress, start_delivery
+
+        announcement = Announcement.objects.create(
+            title="Test Announcement",
+            body="Body",
+            audience=Announcement.AUDIENCE_ALL,
+            publish_at=timezone.now(),
+            created_by=admin_user,
+        )
+        for i in range(30):
+            Member.objects.create(
+                first_name=f"Member{i}",
+                last_name="Test",
+                email=f"bulk{i}@example.com",
+                phone="1234567890",
+                date_of_birth=date(1990, 1, 1),
+                is_active=True,
+            )
+
+        with django_capture_on_commit_callbacks(execute=True):
+            delivery, _ = start_delivery(announcement)
+        queued = delivery_progress(delivery)
+        delivered = process_outbox(batch_size=100, workers=1)
+
+        assert queued["queued"] == queued["total"] >= 30
+        assert delivered["sent"] == queued["total"]
+        assert len(brevo.requests) == 1
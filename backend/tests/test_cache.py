@@ -0,0 +1,145 @@
+"""
+Tests for the shared cache helpers (common/cache.py).
+"""
+
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from apps.announcements.models import Announcement
+from apps.settings.models import TeamMember
+from common.cache import (
+    get_cache_stats,
+    get_namespace_version,
+    invalidate_namespace,
+    make_key,
+    reset_cache_stats,
+)
+
+
+class TestNamespacedKeys:
+    """Tests for key building and versioned invalidation."""
+
+    def test_make_key_includes_namespace_and_version(self):
+        key = make_key("demo", "a", 1)
+
+        assert key.startswith("demo:v")
+        assert key.endswith(":a:1")
+
+    def test_version_is_stable_until_invalidated(self):
+        first = get_namespace_version("demo")
+        assert get_namespace_version("demo") == first
+
+        invalidate_namespace("demo")
+
+        assert get_namespace_version("demo") != first
+
+    def test_invalidation_hides_old_entries(self):
+        cache.set(make_key("demo", "x"), "cached")
+        assert cache.get(make_key("demo", "x")) == "cached"
+
+        invalidate_namespace("demo")
+
+        assert cache.get(make_key("demo", "x")) is None
+
+    def test_invalidation_is_scoped_to_namespace(self):
+        cache.set(make_key("other", "x"), "kept")
+
+        invalidate_namespace("demo")
+
+        assert cache.get(make_key("other", "x")) == "kept"
+
+
+@pytest.mark.django_db
+class TestCachedView:
+    """Tests for cached_view on the public endpoints."""
+
+    def test_second_request_is_served_from_cache(self, api_client, django_assert_num_queries):
+        TeamMember.objects.create(name="Juan", title="Pastor", role="pastor")
+        url = reverse("public-team")
+
+        first = api_client.get(url)
+        with django_assert_num_queries(0):
+            second = api_client.get(url)
+
+        assert second.status_code == status.HTTP_200_OK
+        assert second.data == first.data
+
+    def test_save_invalidates_cached_response(self, api_client):
+        member = TeamMember.objects.create(name="Juan", title="Pastor", role="pastor")
+        url = reverse("public-team")
+        api_client.get(url)
+
+        member.title = "Senior Pastor"
+        member.save()
+        response = api_client.get(url)
+
+        assert response.data[0]["title"] == "Senior Pastor"
+
+    def test_delete_invalidates_cached_response(self, api_client):
+        member = TeamMember.objects.create(name="Juan", title="Pastor", role="pastor")
+        url = reverse("public-team")
+        api_client.get(url)
+
+        member.delete()
+        response = api_client.get(url)
+
+        assert response.data == []
+
+    def test_query_params_are_part_of_key(self, api_client):
+        for i in range(3):
+            Announcement.objects.create(
+                title=f"Announcement {i}",
+                body="Body",
+                audience="all",
+                publish_at=timezone.now() - timedelta(hours=1),
+            )
+        url = reverse("public-announcements")
+
+        assert api_client.get(url, {"limit": 1}).data["count"] == 1
+        assert api_client.get(url, {"limit": 3}).data["count"] == 3
+
+    def test_hit_rate_metrics(self, api_client):
+        reset_cache_stats()
+        url = reverse("public-team")
+
+        api_client.get(url)
+        api_client.get(url)
+        api_client.get(url)
+
+        stats = get_cache_stats()["public_team"]
+        assert stats["misses"] == 1
+        assert stats["hits"] == 2
+        assert stats["hit_rate"] == pytest.approx(66.67)
+
+    def test_hits_counted_without_cache_writes(self, api_client, monkeypatch):
+        url = reverse("public-team")
+        api_client.get(url)
+        get_cache_stats()
+        writes = []
+        monkeypatch.setattr(cache, "incr", lambda *args, **kwargs: writes.append(args))
+
+        api_client.get(url)
+        api_client.get(url)
+
+        assert writes == []
+
+
+@pytest.mark.django_db
+class TestCacheStatsEndpoint:
+    """Tests for GET /api/dashboard/cache-stats/"""
+
+    def test_admin_can_view_stats(self, admin_client):
+        response = admin_client.get(reverse("dashboard-cache-stats"))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert "public_team" in response.data["namespaces"]
+
+    def test_non_admin_forbidden(self, auth_client):
+        response = auth_client.get(reverse("dashboard-cache-stats"))
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
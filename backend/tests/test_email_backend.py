@@ -0,0 +1,148 @@
+"""
+Tests for the SMTP email backend (sbcc/email_backend.py),
+run against the local fake SMTP server.
+"""
+
+import time
+
+import pytest
+from django.core.mail import EmailMessage
+
+from apps.notifications.outbox import close_idle_connections, process_outbox, queue_email
+from sbcc.email_backend import CustomEmailBackend
+from sbcc.email_testing import FakeSMTPServer
+
+
+@pytest.fixture
+def smtp_server():
+    with FakeSMTPServer(reject_recipients={"bad@example.com"}) as server:
+        yield server
+
+
+def backend(server, **kwargs):
+    return CustomEmailBackend(
+        host=server.host,
+        port=server.port,
+        username="user",
+        password="secret",
+        use_tls=False,
+        **kwargs,
+    )
+
+
+def messages(*addresses):
+    return [EmailMessage("Hello", "Body", "from@example.com", [addr]) for addr in addresses]
+
+
+class TestConnectionReuse:
+    """Tests for sending many messages on one connection."""
+
+    def test_one_connection_for_batch(self, smtp_server):
+        connection = backend(smtp_server)
+
+        sent = connection.send_messages(messages("a@example.com", "b@example.com", "c@example.com"))
+
+        assert sent == 3
+        assert smtp_server.connections == 1
+        assert smtp_server.logins == 1
+        assert [m[1] for m in smtp_server.messages] == [
+            ["a@example.com"],
+            ["b@example.com"],
+            ["c@example.com"],
+        ]
+
+    def test_connection_kept_across_calls(self, smtp_server):
+        with backend(smtp_server) as connection:
+            connection.send_messages(messages("a@example.com"))
+            connection.send_messages(messages("b@example.com"))
+
+        assert smtp_server.connections == 1
+        assert connection.connects == 1
+
+    def test_idle_connection_checked_with_noop(self, smtp_server):
+        with backend(smtp_server, keepalive_interval=0) as connection:
+            connection.send_messages(messages("a@example.com"))
+            connection.send_messages(messages("b@example.com"))
+
+        assert smtp_server.noops >= 1
+        assert smtp_server.connections == 1
+
+    def test_reconnects_after_server_drop(self, smtp_server):
+        with backend(smtp_server, keepalive_interval=3600) as connection:
+            connection.send_messages(messages("a@example.com"))
+            smtp_server.drop_connections()
+            time.sleep(0.05)
+
+            sent = connection.send_messages(messages("b@example.com"))
+
+        assert sent == 1
+        assert connection.connects == 2
+        assert len(smtp_server.messages) == 2
+
+    def test_no_resend_when_dropped_during_data(self, smtp_server):
+        connection = backend(smtp_server, fail_silently=True)
+        smtp_server.hang_up_after_data = True
+
+        sent = connection.send_messages(messages("a@example.com", "b@example.com"))
+
+        # The server may have queued the first message: report it, don't resend
+        assert sent == 1
+        assert [r["status"] for r in connection.results] == ["failed", "sent"]
+        assert [m[1] for m in smtp_server.messages] == [["a@example.com"], ["b@example.com"]]
+        assert connection.connects == 2
+
+
+class TestResults:
+    """Tests for per-recipient results."""
+
+    def test_rejected_message_does_not_stop_batch(self, smtp_server):
+        connection = backend(smtp_server, fail_silently=True)
+
+        sent = connection.send_messages(
+            messages("a@example.com", "bad@example.com", "c@example.com")
+        )
+
+        assert sent == 2
+        statuses = {r["email"]: r["status"] for r in connection.results}
+        assert statuses == {
+            "a@example.com": "sent",
+            "bad@example.com": "failed",
+            "c@example.com": "sent",
+        }
+        assert all(r["message_id"] for r in connection.results if r["status"] == "sent")
+
+    def test_raises_after_sending_the_rest(self, smtp_server):
+        connection = backend(smtp_server)
+
+        with pytest.raises(Exception):
+            connection.send_messages(messages("bad@example.com", "c@example.com"))
+
+        assert [m[1] for m in smtp_server.messages] == [["c@example.com"]]
+
+
+@pytest.mark.django_db
+class TestOutboxOverSMTP:
+    """The outbox worker keeps SMTP connections open between batches."""
+
+    def test_connection_reused_between_batches(self, smtp_server, settings):
+        settings.EMAIL_BACKEND = "sbcc.email_backend.CustomEmailBackend"
+        settings.EMAIL_HOST = smtp_server.host
+        settings.EMAIL_PORT = smtp_server.port
+        settings.EMAIL_USE_TLS = False
+        settings.EMAIL_HOST_USER = "user"
+        settings.EMAIL_HOST_PASSWORD = "secret"
+
+        try:
+            queue_email("Hi", "Body", ["a@example.com"])
+            first = process_outbox(workers=1)
+            queue_email("Hi", "Body", ["b@example.com"])
+            queue_email("Hi", "Body", ["bad@example.com"])
+            second = process_outbox(workers=1)
+        finally:
+            close_idle_connections()
+
+        assert first["sent"] == 1
+        assert second["sent"] == 1
+        assert second["retried"] == 1
+        assert smtp_server.connections == 1
+        assert smtp_server.logins == 1
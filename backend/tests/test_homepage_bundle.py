@@ -0,0 +1,155 @@
+"""
+Tests for the prebuilt public homepage bundle (core/homepage.py).
+"""
+
+import json
+from datetime import timedelta
+
+import pytest
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.utils import timezone
+
+from apps.announcements.models import Announcement
+from apps.events.models import Event
+from apps.settings.models import SystemSettings, TeamMember
+from common.storage import write_file
+from core.homepage import (
+    LATEST_NAME,
+    build_homepage_bundle,
+    flush_homepage_publish,
+    publish_homepage_bundle,
+    scheduled_publish,
+)
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    """Write bundles to a temporary media directory."""
+    settings.MEDIA_ROOT = tmp_path
+    settings.HOMEPAGE_BUNDLE_TARGET = "storage"
+    return tmp_path
+
+
+@pytest.fixture
+def homepage_content(db, admin_user):
+    settings = SystemSettings.get_settings()
+    settings.church_name = "SBCC"
+    settings.save()
+    TeamMember.objects.create(name="Juan", title="Senior Pastor", role="pastor")
+    Announcement.objects.create(
+        title="Welcome",
+        body="Hello",
+        audience="all",
+        publish_at=timezone.now() - timedelta(hours=1),
+    )
+    Event.objects.create(
+        title="Sunday Service",
+        event_type="service",
+        status="published",
+        date=timezone.now() + timedelta(days=3),
+        location="Main Hall",
+        organizer=admin_user,
+    )
+
+
+def _read(name):
+    with default_storage.open(name) as fh:
+        return json.loads(fh.read())
+
+
+@pytest.mark.django_db
+class TestBuildHomepageBundle:
+    """Tests for build_homepage_bundle."""
+
+    def test_contains_all_sections(self, homepage_content):
+        bundle = build_homepage_bundle()
+
+        assert bundle["settings"]["church_name"] == "SBCC"
+        assert [m["name"] for m in bundle["team"]] == ["Juan"]
+        assert [a["title"] for a in bundle["announcements"]] == ["Welcome"]
+        assert [e["title"] for e in bundle["events"]] == ["Sunday Service"]
+        assert len(bundle["version"]) == 12
+
+    def test_version_is_content_based(self, homepage_content):
+        first = build_homepage_bundle()
+        assert build_homepage_bundle()["version"] == first["version"]
+
+        TeamMember.objects.create(name="Maria", title="Deacon", role="deacon")
+
+        assert build_homepage_bundle()["version"] != first["version"]
+
+
+@pytest.mark.django_db
+class TestPublishHomepageBundle:
+    """Tests for publish_homepage_bundle and auto-publishing."""
+
+    def test_writes_latest_and_versioned_files(self, homepage_content):
+        result = publish_homepage_bundle()
+
+        assert result["written"] is True
+        latest = _read(LATEST_NAME)
+        versioned = _read(f"public/homepage.{result['version']}.json")
+        assert latest == versioned
+        assert latest["version"] == result["version"]
+
+    def test_unchanged_content_is_not_rewritten(self, homepage_content):
+        publish_homepage_bundle()
+
+        assert publish_homepage_bundle()["written"] is False
+        assert publish_homepage_bundle(force=True)["written"] is True
+
+    def test_republished_in_background_after_commit(self, django_capture_on_commit_callbacks):
+
+        with django_capture_on_commit_callbacks(execute=True):
+            TeamMember.objects.create(name="Juan", title="Senior Pastor", role="pastor")
+            TeamMember.objects.create(name="Maria", title="Deacon", role="deacon")
+
+        # Nothing written on the request thread; the saves share one publish
+        assert not default_storage.exists(LATEST_NAME)
+        assert flush_homepage_publish()["written"] is True
+        assert flush_homepage_publish() is None
+        assert [m["name"] for m in _read(LATEST_NAME)["team"]] == ["Juan", "Maria"]
+
+    def test_scheduled_publish_picks_up_time_changes(self, homepage_content):
+        Announcement.objects.create(
+            title="Coming soon",
+            body="Later",
+            audience="all",
+            publish_at=timezone.now() + timedelta(hours=1),
+        )
+        assert scheduled_publish()["rows"] == 1
+        assert scheduled_publish()["rows"] == 0
+
+        Announcement.objects.filter(title="Coming soon").update(
+            publish_at=timezone.now() - timedelta(minutes=1)
+        )
+
+        assert scheduled_publish()["rows"] == 1
+        assert "Coming soon" in [a["title"] for a in _read(LATEST_NAME)["announcements"]]
+
+    def test_scheduled_publish_disabled(self, homepage_content, settings):
+        settings.HOMEPAGE_BUNDLE_AUTO_PUBLISH = False
+
+        assert scheduled_publish() == {"rows": 0, "version": None}
+        assert not default_storage.exists(LATEST_NAME)
+
+    def test_rewrite_replaces_file_in_place(self, media_root):
+        write_file(default_storage, "public/data.json", b"old")
+        write_file(default_storage, "public/data.json", b"new")
+
+        assert default_storage.open("public/data.json").read() == b"new"
+        assert sorted(p.name for p in (media_root / "public").iterdir()) == ["data.json"]
+
+    def test_auto_publish_can_be_disabled(self, settings, django_capture_on_commit_callbacks):
+        settings.HOMEPAGE_BUNDLE_AUTO_PUBLISH = False
+
+        with django_capture_on_commit_callbacks() as callbacks:
+            TeamMember.objects.create(name="Maria", title="Deacon", role="deacon")
+
+        assert callbacks == []
+
+    def test_management_command(self, homepage_content):
+        call_command("publish_homepage")
+
+        assert default_storage.exists(LATEST_NAME)
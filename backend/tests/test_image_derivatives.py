@@ -0,0 +1,186 @@
+"""
+Tests for the image derivative pipeline (common/images.py).
+"""
+
+import io
+from datetime import timedelta
+
+import pytest
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from PIL import Image
+
+from apps.announcements.models import Announcement
+from apps.settings.models import TeamMember
+from common.images import generate_derivatives
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    """Write uploads and derivatives to a temporary media directory."""
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+def make_image(width=800, height=600, fmt="JPEG", mode="RGB", name="photo.jpg"):
+    buffer = io.BytesIO()
+    Image.new(mode, (width, height), (200, 80, 40) if mode == "RGB" else (200, 80, 40, 128)).save(
+        buffer, fmt
+    )
+    content_type = "image/png" if fmt == "PNG" else "image/jpeg"
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type=content_type)
+
+
+def create_announcement(photo):
+    return Announcement.objects.create(
+        title="Welcome",
+        body="Hello",
+        audience="all",
+        publish_at=timezone.now() - timedelta(hours=1),
+        photo=photo,
+    )
+
+
+@pytest.mark.django_db
+class TestGenerateDerivatives:
+    """Tests for rendering derivatives."""
+
+    def test_widths_and_formats(self, settings):
+        settings.IMAGE_DERIVATIVES_MODE = "off"
+        announcement = create_announcement(make_image(width=800, height=600))
+
+        derivatives = generate_derivatives(announcement.photo)
+
+        assert derivatives["source"] == announcement.photo.name
+        assert (derivatives["width"], derivatives["height"]) == (800, 600)
+        assert derivatives["placeholder"].startswith("data:image/jpeg;base64,")
+        for fmt in ("webp", "jpeg"):
+            assert [item["width"] for item in derivatives[fmt]] == [320, 640]
+            for item in derivatives[fmt]:
+                assert item["name"].startswith("announcements/")
+                with default_storage.open(item["name"]) as fh:
+                    image = Image.open(fh)
+                    assert image.format == fmt.upper()
+                    assert image.width == item["width"]
+
+    def test_small_image_keeps_original_width(self, settings):
+        settings.IMAGE_DERIVATIVES_MODE = "off"
+        announcement = create_announcement(make_image(width=200, height=100))
+
+        derivatives = generate_derivatives(announcement.photo)
+
+        assert [item["width"] for item in derivatives["webp"]] == [200]
+
+    def test_transparent_png(self, settings):
+        settings.IMAGE_DERIVATIVES_MODE = "off"
+        announcement = create_announcement(
+            make_image(width=400, height=400, fmt="PNG", mode="RGBA", name="logo.png")
+        )
+
+        derivatives = generate_derivatives(announcement.photo)
+
+        assert [item["width"] for item in derivatives["jpeg"]] == [320]
+
+    def test_same_stem_different_extension(self, settings):
+        settings.IMAGE_DERIVATIVES_MODE = "off"
+        jpeg = create_announcement(make_image(name="photo.jpg"))
+        png = create_announcement(make_image(fmt="PNG", name="photo.png"))
+
+        jpeg_names = {item["name"] for item in generate_derivatives(jpeg.photo)["webp"]}
+        png_names = {item["name"] for item in generate_derivatives(png.photo)["webp"]}
+
+        assert not jpeg_names & png_names
+
+
+@pytest.mark.django_db
+class TestDerivativesOnUpload:
+    """Tests for automatic processing after upload."""
+
+    def test_upload_generates_derivatives_after_commit(self, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True):
+            announcement = create_announcement(make_image())
+
+        announcement.refresh_from_db()
+        assert announcement.photo_derivatives["source"] == announcement.photo.name
+
+    def test_not_processed_before_commit(self):
+        announcement = create_announcement(make_image())
+
+        announcement.refresh_from_db()
+        assert announcement.photo_derivatives == {}
+
+    def test_replacing_photo_removes_old_derivatives(self, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True):
+            member = TeamMember.objects.create(name="Juan", title="Pastor", photo=make_image())
+        member.refresh_from_db()
+        old_names = [item["name"] for item in member.photo_derivatives["webp"]]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            member.photo = make_image(name="new.jpg")
+            member.save()
+
+        member.refresh_from_db()
+        assert member.photo_derivatives["source"] == member.photo.name
+        assert not any(default_storage.exists(name) for name in old_names)
+
+    def test_clearing_photo_clears_derivatives(self, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True):
+            member = TeamMember.objects.create(name="Juan", title="Pastor", photo=make_image())
+
+        with django_capture_on_commit_callbacks(execute=True):
+            member.photo = None
+            member.save()
+
+        member.refresh_from_db()
+        assert member.photo_derivatives == {}
+
+    def test_deleting_instance_removes_derivatives(self, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True):
+            member = TeamMember.objects.create(name="Juan", title="Pastor", photo=make_image())
+        member.refresh_from_db()
+        names = [item["name"] for fmt in ("webp", "jpeg") for item in member.photo_derivatives[fmt]]
+        assert all(default_storage.exists(name) for name in names)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            member.delete()
+
+        assert not any(default_storage.exists(name) for name in names)
+
+    def test_public_api_exposes_srcset(self, api_client, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True):
+            TeamMember.objects.create(name="Juan", title="Pastor", photo=make_image())
+
+        response = api_client.get(reverse("public-team"))
+
+        variants = response.data[0]["photo_variants"]
+        assert variants["srcset"].endswith("640w")
+        assert ".320w.webp 320w" in variants["srcset"]
+        assert ".640w.jpeg 640w" in variants["jpeg_srcset"]
+        assert variants["placeholder"].startswith("data:image/jpeg;base64,")
+        assert (variants["width"], variants["height"]) == (800, 600)
+
+    def test_variants_none_until_generated(self, api_client):
+        TeamMember.objects.create(name="Juan", title="Pastor", photo=make_image())
+
+        response = api_client.get(reverse("public-team"))
+
+        assert response.data[0]["photo"] is not None
+        assert response.data[0]["photo_variants"] is None
+
+
+@pytest.mark.django_db
+class TestGenerateImageDerivativesCommand:
+    """Tests for the generate_image_derivatives backfill command."""
+
+    def test_backfills_existing_images(self, settings):
+        settings.IMAGE_DERIVATIVES_MODE = "off"
+        member = TeamMember.objects.create(name="Juan", title="Pastor", photo=make_image())
+        TeamMember.objects.create(name="Maria", title="Deacon")
+
+        call_command("generate_image_derivatives", "--model", "settings.TeamMember")
+
+        member.refresh_from_db()
+        assert member.photo_derivatives["source"] == member.photo.name
@@ -3,17 +3,22 @@ Tests for public API endpoints.
 These endpoints require no authentication.
 """
 
+import time
 from datetime import timedelta
 
 import pytest
+from django.core.cache import cache
+from django.test import RequestFactory
 from django.urls import reverse
 from django.utils import timezone
 from rest_framework import status
 
 from apps.announcements.models import Announcement
-from apps.events.models import Event
+from apps.events.models import Event, EventRegistration
+from apps.members.models import Member
 from apps.ministries.models import Ministry
 from apps.prayer_requests.models import PrayerRequest
+from common.cache import make_key, request_fingerprint
 
 
 # =============================================================================
@@ -275,6 +280,37 @@ class TestPublicEventsAPI:
         assert "Past Event" in titles
         assert "Upcoming Event" not in titles
 
+    def test_query_count_is_constant(self, api_client, user, ministry, django_assert_num_queries):
+        """Test that ?limit=50 takes one query however many events are listed."""
+        members = Member.objects.bulk_create(
+            Member(first_name="Guest", last_name=str(i), email=f"guest{i}@example.com")
+            for i in range(3)
+        )
+        for i in range(20):
+            event = Event.objects.create(
+                title=f"Event {i}",
+                event_type="service",
+                status="published",
+                date=timezone.now() + timedelta(days=i - 10),
+                location="Main Hall",
+                organizer=user,
+                ministry=ministry if i % 2 else None,
+                max_attendees=5,
+                recurrence_pattern="weekly" if i < 3 else "none",
+            )
+            for member in members[: i % 4]:
+                EventRegistration.objects.create(event=event, member=member)
+
+        with django_assert_num_queries(1):
+            response = api_client.get(reverse("public-events"), {"limit": 50})
+
+        assert response.data["count"] == 50
+        assert {item["registered_count"] for item in response.data["results"]} == {0, 1, 2, 3}
+        three_registered = [
+            item for item in response.data["results"] if item["available_slots"] == 2
+        ]
+        assert three_registered and not any(item["is_full"] for item in three_registered)
+
     def test_filter_by_event_type(self, api_client, published_event):
         """Test filtering by event type."""
         url = reverse("public-events")
@@ -303,3 +339,93 @@ class TestPublicSettingsAPI:
         assert response.status_code == status.HTTP_200_OK
         assert "app_name" in response.data
         assert "church_name" in response.data
+
+
+# =============================================================================
+# HTTP Caching Tests
+# =============================================================================
+@pytest.mark.django_db
+class TestPublicHttpCaching:
+    """Tests for ETag / Last-Modified / Cache-Control on public endpoints."""
+
+    @pytest.mark.parametrize(
+        "url_name",
+        ["public-settings", "public-team", "public-announcements", "public-events"],
+    )
+    def test_validators_and_cache_control(self, api_client, url_name):
+        """Test that public responses carry validators and Cache-Control."""
+        response = api_client.get(reverse(url_name))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["ETag"].startswith('"')
+        assert "Last-Modified" in response
+        assert "public" in response["Cache-Control"]
+        assert "max-age=60" in response["Cache-Control"]
+        assert "stale-while-revalidate" in response["Cache-Control"]
+
+    def test_if_none_match_returns_304(self, api_client, published_announcement):
+        """Test that a matching ETag returns 304 without touching the database."""
+        url = reverse("public-announcements")
+        etag = api_client.get(url)["ETag"]
+
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response["ETag"] == etag
+
+    def test_if_modified_since_returns_304(self, api_client):
+        """Test that an up-to-date If-Modified-Since returns 304."""
+        url = reverse("public-settings")
+        last_modified = api_client.get(url)["Last-Modified"]
+
+        response = api_client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_timed_entry_last_modified_moves_on_expiry(
+        self, api_client, published_announcement, monkeypatch
+    ):
+        """Test that content changing with time isn't 304'd by If-Modified-Since."""
+        url = reverse("public-announcements")
+        last_modified = api_client.get(url)["Last-Modified"]
+
+        # A scheduled announcement comes due (no save signal) and the entry expires
+        Announcement.objects.bulk_create(
+            [Announcement(title="Scheduled", body="Due now", audience="all", is_active=True)]
+        )
+        cache.delete(
+            make_key("public_announcements", request_fingerprint(RequestFactory().get(url)))
+        )
+        later = time.time() + 120
+        monkeypatch.setattr("common.cache.time.time", lambda: later)
+
+        response = api_client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Last-Modified"] != last_modified
+        assert len(response.data["results"]) == 2
+
+    def test_etag_changes_after_save(self, api_client, published_announcement):
+        """Test that saving the model invalidates the cached response and ETag."""
+        url = reverse("public-announcements")
+        etag = api_client.get(url)["ETag"]
+
+        published_announcement.title = "Updated Title"
+        published_announcement.save()
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["ETag"] != etag
+        assert response.data["results"][0]["title"] == "Updated Title"
+
+    def test_cached_response_uses_no_queries(
+        self, api_client, published_event, django_assert_num_queries
+    ):
+        """Test that repeated requests are served from the response cache."""
+        url = reverse("public-events")
+        api_client.get(url, {"limit": 5})
+
+        with django_assert_num_queries(0):
+            response = api_client.get(url, {"limit": 5})
+
+        assert response.status_code == status.HTTP_200_OK
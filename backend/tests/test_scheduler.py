@@ -0,0 +1,243 @@
+"""
+Tests for the periodic job scheduler (core/scheduler.py).
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import Client
+from django.utils import timezone
+
+from core import scheduler
+from core.models import JobLock, JobRun
+from core.scheduler import CronSchedule, register_job, run_due_jobs, run_job, start_due_jobs
+
+
+def local(*args):
+    return timezone.make_aware(datetime(*args))
+
+
+@pytest.fixture
+def jobs(monkeypatch):
+    """Run with an empty job registry."""
+    monkeypatch.setattr(scheduler, "_jobs", {})
+    return scheduler._jobs
+
+
+class TestCronSchedule:
+    """Tests for cron expression matching."""
+
+    @pytest.mark.parametrize(
+        "expression,after,expected",
+        [
+            ("5 * * * *", local(2026, 3, 2, 10, 5), local(2026, 3, 2, 11, 5)),
+            ("*/15 * * * *", local(2026, 3, 2, 10, 16), local(2026, 3, 2, 10, 30)),
+            ("0 2 * * *", local(2026, 3, 2, 23, 0), local(2026, 3, 3, 2, 0)),
+            ("30 8 * * 1", local(2026, 3, 2, 9, 0), local(2026, 3, 9, 8, 30)),  # Mondays
+            ("0 9 1 1,7 *", local(2026, 3, 2, 0, 0), local(2026, 7, 1, 9, 0)),
+            ("0 0 * * 7", local(2026, 3, 2, 0, 0), local(2026, 3, 8, 0, 0)),  # 7 = Sunday
+        ],
+    )
+    def test_next_after(self, expression, after, expected):
+        assert CronSchedule(expression).next_after(after) == expected
+
+    def test_day_of_month_or_weekday(self):
+        # Both restricted: the 15th or any Friday
+        schedule = CronSchedule("0 0 15 * 5")
+
+        assert schedule.next_after(local(2026, 3, 2, 0, 0)) == local(2026, 3, 6, 0, 0)
+
+    @pytest.mark.parametrize("expression", ["* * * *", "60 * * * *", "*/0 * * * *", "5-2 * * * *"])
+    def test_invalid(self, expression):
+        with pytest.raises(ValueError):
+            CronSchedule(expression)
+
+
+@pytest.mark.django_db
+class TestRunJob:
+    """Tests for running jobs and recording their history."""
+
+    def test_records_rows_and_duration(self, jobs):
+        job = register_job("test.count", "0 * * * *", lambda: 7)
+
+        run = run_job(job)
+
+        assert run.status == JobRun.STATUS_SUCCESS
+        assert run.rows == 7
+        assert run.duration_ms is not None
+        assert run.finished_at is not None
+
+    def test_dict_result_stored_as_detail(self, jobs):
+        job = register_job("test.detail", "0 * * * *", lambda: {"rows": 3, "batches": 1})
+
+        run = run_job(job)
+
+        assert run.rows == 3
+        assert run.detail == {"rows": 3, "batches": 1}
+
+    def test_failure_recorded(self, jobs):
+        def broken():
+            raise RuntimeError("database on fire")
+
+        run = run_job(register_job("test.broken", "0 * * * *", broken))
+
+        assert run.status == JobRun.STATUS_FAILED
+        assert "RuntimeError: database on fire" in run.error
+
+    def test_runs_only_when_due(self, jobs):
+        calls = []
+        register_job("test.hourly", "0 * * * *", lambda: calls.append(1))
+
+        assert len(run_due_jobs()) == 1  # never run: due now
+        assert run_due_jobs() == []
+        JobRun.objects.update(started_at=timezone.now() - timedelta(hours=2))
+        assert len(run_due_jobs()) == 1
+        assert len(calls) == 2
+
+        run = JobRun.objects.order_by("-started_at").first()
+        assert run.due_at is not None
+        assert run.due_at <= run.started_at
+
+    def test_missed_runs_run_once(self, jobs):
+        register_job("test.minutely", "* * * * *", lambda: 0)
+        run_due_jobs()
+        JobRun.objects.update(started_at=timezone.now() - timedelta(hours=1))
+
+        assert len(run_due_jobs()) == 1
+        assert run_due_jobs() == []
+
+    def test_locked_job_skipped(self, jobs):
+        job = register_job("test.locked", "* * * * *", lambda: 0)
+        lease = JobLock.objects.create(
+            job="test.locked", owner="other-runner", expires_at=timezone.now() + timedelta(hours=1)
+        )
+
+        assert run_job(job, force=True) is None
+        assert not JobRun.objects.exists()
+
+        # A lease left behind by a killed process expires
+        lease.expires_at = timezone.now() - timedelta(seconds=1)
+        lease.save()
+        assert run_job(job, force=True) is not None
+        assert not JobLock.objects.exists()
+
+    def test_lease_held_while_running(self, jobs):
+        def job_func():
+            assert JobLock.objects.filter(job="test.leased").exists()
+            assert run_job(job, force=True) is None
+            return 0
+
+        job = register_job("test.leased", "* * * * *", job_func)
+
+        assert run_job(job, force=True).status == JobRun.STATUS_SUCCESS
+
+    def test_abandoned_runs_reaped(self, jobs):
+        register_job("test.a", "0 * * * *", lambda: 0)
+        started = timezone.now() - timedelta(hours=2)
+        abandoned = JobRun.objects.create(job="test.a", started_at=started)
+        live = JobRun.objects.create(job="test.b", started_at=started)
+        JobLock.objects.create(
+            job="test.b", owner="live-runner", expires_at=timezone.now() + timedelta(hours=1)
+        )
+
+        run_due_jobs()
+
+        abandoned.refresh_from_db()
+        live.refresh_from_db()
+        assert abandoned.status == JobRun.STATUS_FAILED
+        assert "Abandoned" in abandoned.error
+        assert live.status == JobRun.STATUS_RUNNING
+
+
+@pytest.mark.django_db(transaction=True)
+def test_slow_job_does_not_hold_up_others(jobs):
+    release = threading.Event()
+    register_job("test.slow", "0 * * * *", lambda: 0 if release.wait(5) else 1)
+    register_job("test.fast", "* * * * *", lambda: 1)
+    running = {}
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        start_due_jobs(executor, running)
+        running["test.fast"].result(timeout=5)
+        finished = start_due_jobs(executor, running)
+
+        assert "test.fast" in [run.job for run in finished]
+        # Still running: not started a second time
+        assert "test.slow" in running
+        release.set()
+        running["test.slow"].result(timeout=5)
+
+    assert JobRun.objects.filter(job="test.slow").count() == 1
+    assert JobRun.objects.get(job="test.slow").status == JobRun.STATUS_SUCCESS
+
+
+@pytest.mark.django_db
+class TestRunSchedulerCommand:
+    """Tests for manage.py run_scheduler."""
+
+    def test_once_runs_due_jobs(self, jobs):
+        register_job("test.a", "0 * * * *", lambda: 2)
+        out = StringIO()
+
+        call_command("run_scheduler", "--once", stdout=out)
+
+        assert "test.a: success" in out.getvalue()
+        assert "2 rows" in out.getvalue()
+
+    def test_run_and_list(self, jobs):
+        register_job("test.a", "0 * * * *", lambda: 1)
+        out = StringIO()
+
+        call_command("run_scheduler", "--run", "test.a", stdout=out)
+        call_command("run_scheduler", "--run", "test.a", stdout=out)
+        call_command("run_scheduler", "--list", stdout=out)
+
+        assert JobRun.objects.filter(job="test.a").count() == 2
+        assert "next: " in out.getvalue()
+        with pytest.raises(CommandError):
+            call_command("run_scheduler", "--run", "test.missing")
+
+    def test_apps_register_jobs(self):
+        names = set(scheduler.get_jobs())
+
+        assert {
+            "tasks.update_overdue",
+            "attendance.absence_report",
+            "authentication.flush_expired_tokens",
+            "announcements.dispatch",
+            "notifications.prune",
+            "core.publish_homepage",
+        } <= names
+
+    def test_frequent_jobs_have_short_leases(self):
+        jobs = scheduler.get_jobs()
+
+        assert jobs["announcements.dispatch"].timeout <= 120
+        assert jobs["core.publish_homepage"].timeout <= 120
+
+    def test_all_registered_jobs_run(self, settings, tmp_path):
+        settings.MEDIA_ROOT = tmp_path
+        runs = run_due_jobs()
+
+        assert {run.status for run in runs} == {JobRun.STATUS_SUCCESS}
+        assert len(runs) == len(scheduler.get_jobs())
+
+    def test_admin_shows_schedule(self, super_admin_user, settings):
+        settings.STORAGES = {
+            **settings.STORAGES,
+            "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+        }
+        run_job(scheduler.get_job("tasks.update_overdue"))
+        client = Client()
+        client.force_login(super_admin_user)
+
+        response = client.get("/admin/core/jobrun/")
+
+        assert response.status_code == 200
+        assert b"Scheduled jobs" in response.content
+        assert b"tasks.update_overdue" in response.content
@@ -6,6 +6,14 @@ export const notificationsApi = {
   markAsRead: (id) => api.patch(`/notifications/${id}/read/`),
   markAllAsRead: () => api.post('/notifications/mark-all-read/'),
   delete: (id) => api.delete(`/notifications/${id}/`),
+  // Server-Sent Events URL. EventSource cannot send headers, so the stream is
+  // opened with a short-lived single-use ticket instead of the access token.
+  streamUrl: async () => {
+    const { data } = await api.post('/notifications/stream-ticket/');
+    return `${api.defaults.baseURL}/notifications/stream/?ticket=${encodeURIComponent(
+      data.ticket
+    )}`;
+  },
 };
 
 export default notificationsApi;
@@ -19,6 +19,7 @@ const AnnouncementModal = ({ isOpen, onClose, onSubmit, announcement = null, sub
     publish_at: '',
     expire_at: '',
     is_active: true,
+    email_on_publish: false,
   });
   const fileInputRef = useRef(null);
   const { photoFile, photoPreview, photoError, handlePhotoChange, clearPhoto } = usePhotoUpload();
@@ -34,6 +35,7 @@ const AnnouncementModal = ({ isOpen, onClose, onSubmit, announcement = null, sub
         publish_at: formatDateTimeInput(announcement.publish_at),
         expire_at: formatDateTimeInput(announcement.expire_at),
         is_active: announcement.is_active ?? true,
+        email_on_publish: announcement.email_on_publish ?? false,
       });
       clearPhoto();
       setDeleteExistingPhoto(false);
@@ -68,6 +70,7 @@ const AnnouncementModal = ({ isOpen, onClose, onSubmit, announcement = null, sub
     }
 
     formDataToSend.append('is_active', formData.is_active);
+    formDataToSend.append('email_on_publish', formData.email_on_publish);
 
     // Handle photo upload/deletion
     if (photoFile) {
@@ -228,6 +231,21 @@ const AnnouncementModal = ({ isOpen, onClose, onSubmit, announcement = null, sub
             </label>
           </div>
 
+          {/* Email on Publish */}
+          <div className="flex items-center gap-2">
+            <input
+              type="checkbox"
+              id="email_on_publish"
+              disabled={submitting}
+              checked={formData.email_on_publish}
+              onChange={(e) => setFormData({ ...formData, email_on_publish: e.target.checked })}
+              className="w-4 h-4 text-[#FDB54A] border-gray-300 rounded focus:ring-[#FDB54A] disabled:cursor-not-allowed"
+            />
+            <label htmlFor="email_on_publish" className="text-sm font-medium text-gray-700">
+              Email the audience when this is published
+            </label>
+          </div>
+
           {/* Photo Upload */}
           <div>
             <label className="block text-sm font-medium text-gray-700 mb-1">
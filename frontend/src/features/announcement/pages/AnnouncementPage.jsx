@@ -125,8 +125,12 @@ const AnnouncementPage = () => {
       const result = await sendNow(sendNowModal.announcement.id);
       setSendNowModal({ isOpen: false, announcement: null });
 
-      // Success notification
-      showSuccess(`Announcement sent! ${result.emails_sent} email(s) delivered.`);
+      // Success notification (a re-send only reaches new recipients)
+      showSuccess(
+        result.already_queued
+          ? result.message
+          : `Announcement is being sent to ${result.new_recipients} recipient(s).`
+      );
     } catch (error) {
       console.error('Error sending announcement:', error);
       const errorMsg = error.response?.data?.error || 'Failed to send notifications.';
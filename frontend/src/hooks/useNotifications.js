@@ -2,8 +2,11 @@ import { useState, useEffect, useCallback } from 'react';
 import { notificationsApi } from '../api/notifications';
 
 /**
- * Hook for managing in-app notifications with polling.
- * @param {number} pollInterval - Polling interval in ms (default 30s)
+ * Hook for managing in-app notifications.
+ * Updates are pushed over Server-Sent Events; polling is only used when the
+ * stream is unavailable (no EventSource, or a stream ticket can't be issued,
+ * e.g. the session expired).
+ * @param {number} pollInterval - Fallback polling interval in ms (default 30s)
  */
 export function useNotifications(pollInterval = 30000) {
   const [notifications, setNotifications] = useState([]);
@@ -28,9 +31,60 @@ export function useNotifications(pollInterval = 30000) {
   useEffect(() => {
     fetchNotifications();
 
-    // Poll for new notifications
-    const interval = setInterval(fetchNotifications, pollInterval);
-    return () => clearInterval(interval);
+    let interval = null;
+    const startPolling = () => {
+      if (!interval) interval = setInterval(fetchNotifications, pollInterval);
+    };
+
+    if (typeof EventSource === 'undefined') {
+      startPolling();
+      return () => clearInterval(interval);
+    }
+
+    let source = null;
+    let reconnect = null;
+    let closed = false;
+    let delay = 3000;
+
+    // Tickets are single use, so every (re)connection fetches a new one rather
+    // than letting EventSource retry the same URL
+    const connect = async () => {
+      let url;
+      try {
+        url = await notificationsApi.streamUrl();
+      } catch {
+        startPolling();
+        return;
+      }
+      if (closed) return;
+
+      source = new EventSource(url);
+      const openedAt = Date.now();
+      source.addEventListener('notification', (event) => {
+        const notification = JSON.parse(event.data);
+        setNotifications((prev) =>
+          [notification, ...prev.filter((n) => n.id !== notification.id)].slice(0, 20)
+        );
+      });
+      source.addEventListener('unread_count', (event) => {
+        setUnreadCount(JSON.parse(event.data).unread_count);
+      });
+      source.onerror = () => {
+        source.close();
+        // Back off when streams end right away (e.g. the backend runs under
+        // WSGI and sends one event per connection)
+        delay = Date.now() - openedAt > 60000 ? 3000 : Math.min(delay * 2, pollInterval);
+        if (!closed) reconnect = setTimeout(connect, delay);
+      };
+    };
+    connect();
+
+    return () => {
+      closed = true;
+      if (source) source.close();
+      clearTimeout(reconnect);
+      clearInterval(interval);
+    };
   }, [fetchNotifications, pollInterval]);
 
   const markAsRead = async (id) => {